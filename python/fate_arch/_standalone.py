@@ -45,6 +45,9 @@ deserialize = c_pickle.loads
 # default message max size in bytes = 1MB
 DEFAULT_MESSAGE_MAX_SIZE = 1048576
 
+# number of kvs routed to partitions at a time
+ROUTE_BATCH_SIZE = 65536
+
 
 # noinspection PyPep8Naming
 class Table(object):
@@ -307,15 +310,21 @@ class Table(object):
             for p in range(self._partitions):
                 env = s.enter_context(self._get_env_for_partition(p, write=True))
                 txn_map[p] = env, env.begin(write=True)
-            for k, v in kv_list:
+            kv_iter = iter(kv_list)
+            while is_success:
+                batch = []
                 try:
-                    k_bytes, v_bytes = _kv_to_bytes(k=k, v=v)
-                    p = _hash_key_to_partition(k_bytes, self._partitions)
-                    is_success = is_success and txn_map[p][1].put(k_bytes, v_bytes)
+                    for k, v in itertools.islice(kv_iter, ROUTE_BATCH_SIZE):
+                        batch.append(_kv_to_bytes(k=k, v=v))
+                    if not batch:
+                        break
+                    for p, kvs in _route_to_partitions(batch, self._partitions):
+                        with txn_map[p][1].cursor() as cursor:
+                            consumed, _ = cursor.putmulti(kvs)
+                        is_success = is_success and consumed == len(kvs)
                 except Exception as e:
                     is_success = False
-                    LOGGER.exception(f"put_all for k={k} v={v} fail. exception: {e}")
-                    break
+                    LOGGER.exception(f"put_all for batch of {len(batch)} kvs fail. exception: {e}")
             for p, (env, txn) in txn_map.items():
                 txn.commit() if is_success else txn.abort()
 
@@ -865,6 +874,47 @@ def _hash_key_to_partition(key, partitions):
     return int(b)
 
 
+_JUMP_HASH_MULTIPLIER = np.uint64(2862933555777941757)
+
+
+def _hash_keys_to_partitions(keys, partitions):
+    """
+    vectorized _hash_key_to_partition, route a batch of serialized keys to partitions.
+    Only the low 64 bits of sha1 digest take part in jump consistent hash, so partitions are the same as those of
+    _hash_key_to_partition and tables written by single key puts or earlier versions stay readable
+    """
+    if partitions < 1:
+        raise ValueError("partitions must be a positive number")
+    if partitions == 1:
+        return np.zeros(len(keys), dtype=np.int64)
+    sha1 = hashlib.sha1
+    _keys = np.frombuffer(b"".join([sha1(key).digest()[:8] for key in keys]), dtype="<u8").copy()
+    b = np.full(len(keys), -1, dtype=np.int64)
+    j = np.zeros(len(keys), dtype=np.float64)
+    active = np.arange(len(keys))
+    with np.errstate(over="ignore"):
+        while len(active) > 0:
+            b[active] = j[active]
+            _keys[active] = _keys[active] * _JUMP_HASH_MULTIPLIER + np.uint64(1)
+            j[active] = (b[active] + 1).astype(np.float64) * \
+                (float(1 << 31) / ((_keys[active] >> np.uint64(33)).astype(np.float64) + 1.0))
+            active = active[j[active] < partitions]
+    return b
+
+
+def _route_to_partitions(kv_bytes, partitions):
+    """
+    group serialized kvs by partition, yield (partition, kvs) pairs
+    """
+    partition_of_keys = _hash_keys_to_partitions([k_bytes for k_bytes, _ in kv_bytes], partitions)
+    order = np.argsort(partition_of_keys, kind="stable")
+    sorted_partitions = partition_of_keys[order]
+    bounds = np.flatnonzero(np.diff(sorted_partitions)) + 1
+    for group in np.split(order, bounds):
+        if len(group) > 0:
+            yield int(partition_of_keys[group[0]]), [kv_bytes[i] for i in group.tolist()]
+
+
 def _do_map(p: _UnaryProcess):
     rtn = p.output_operand()
     with ExitStack() as s:
@@ -875,12 +925,15 @@ def _do_map(p: _UnaryProcess):
             txn_map[partition] = s.enter_context(env.begin(write=True))
         source_txn = s.enter_context(source_env.begin())
         cursor = s.enter_context(source_txn.cursor())
-        for k_bytes, v_bytes in cursor:
-            k, v = deserialize(k_bytes), deserialize(v_bytes)
-            k1, v1 = p.get_func()(k, v)
-            k1_bytes, v1_bytes = serialize(k1), serialize(v1)
-            partition = _hash_key_to_partition(k1_bytes, p.operand.num_partitions)
-            txn_map[partition].put(k1_bytes, v1_bytes)
+        func = p.get_func()
+        mapped = (func(deserialize(k_bytes), deserialize(v_bytes)) for k_bytes, v_bytes in cursor)
+        while True:
+            batch = [(serialize(k1), serialize(v1)) for k1, v1 in itertools.islice(mapped, ROUTE_BATCH_SIZE)]
+            if not batch:
+                break
+            for partition, kvs in _route_to_partitions(batch, p.operand.num_partitions):
+                with txn_map[partition].cursor() as cursor:
+                    cursor.putmulti(kvs)
     return rtn
 
 
@@ -964,15 +1017,19 @@ def _do_map_reduce_in_partitions(p: _MapReduceProcess):
             raise ValueError("mapper function should return a iterable of pair")
         reducer = p.get_reducer()
 
-        for k, v in mapped:
-            k_bytes = serialize(k)
-            partition = _hash_key_to_partition(k_bytes, partitions)
-            # todo: not atomic, fix me
-            pre_v = txn_map[partition].get(k_bytes, None)
-            if pre_v is None:
-                txn_map[partition].put(k_bytes, serialize(v))
-            else:
-                txn_map[partition].put(k_bytes, serialize(reducer(deserialize(pre_v), v)))
+        mapped = iter(mapped)
+        while True:
+            batch = [(serialize(k), v) for k, v in itertools.islice(mapped, ROUTE_BATCH_SIZE)]
+            if not batch:
+                break
+            partition_of_keys = _hash_keys_to_partitions([k_bytes for k_bytes, _ in batch], partitions)
+            for (k_bytes, v), partition in zip(batch, partition_of_keys.tolist()):
+                # todo: not atomic, fix me
+                pre_v = txn_map[partition].get(k_bytes, None)
+                if pre_v is None:
+                    txn_map[partition].put(k_bytes, serialize(v))
+                else:
+                    txn_map[partition].put(k_bytes, serialize(reducer(deserialize(pre_v), v)))
     return rtn
 
 
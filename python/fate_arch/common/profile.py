@@ -13,7 +13,12 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 #
+import collections
+import contextlib
 import hashlib
+import json
+import os
+import threading
 import time
 import typing
 
@@ -29,6 +34,12 @@ _PROFILE_LOG_ENABLED = False
 _START_TIME = None
 _END_TIME = None
 
+# spans are kept in memory between profile_start and profile_ends if trace export is enabled,
+# oldest spans are dropped beyond max_spans
+DEFAULT_MAX_SPANS = 100000
+_TRACE_EXPORT_PATH = None
+_TRACE_PARTY = None
+
 
 class _TimerItem(object):
     def __init__(self):
@@ -64,6 +75,121 @@ class _TimerItem(object):
         return self.__str__()
 
 
+class _Span(object):
+    """
+    a timed operation on a thread, with structured args such as bytes, rows and partitions
+    """
+
+    def __init__(self, name, cat, args=None):
+        self.name = name
+        self.cat = cat
+        self.args = args if args is not None else {}
+        self.tid = threading.get_ident()
+        self.start = time.time()
+        self.end = None
+
+    def set_args(self, **kwargs):
+        self.args.update(kwargs)
+
+    def done(self):
+        self.end = time.time()
+        _SpanRecorder.record(self)
+
+    def as_trace_event(self, pid):
+        return {
+            "name": self.name,
+            "cat": self.cat,
+            "ph": "X",
+            "ts": self.start * 1e6,
+            "dur": (self.end - self.start) * 1e6,
+            "pid": pid,
+            "tid": self.tid,
+            "args": {k: v if isinstance(v, (int, float, bool, str)) or v is None else str(v)
+                     for k, v in self.args.items()},
+        }
+
+
+class _SpanRecorder(object):
+    _SPANS: typing.Deque[_Span] = collections.deque(maxlen=DEFAULT_MAX_SPANS)
+    _dropped = 0
+
+    @classmethod
+    def record(cls, span: _Span):
+        if not _PROFILE_LOG_ENABLED or _TRACE_EXPORT_PATH is None:
+            return
+        if len(cls._SPANS) == cls._SPANS.maxlen:
+            cls._dropped += 1
+        cls._SPANS.append(span)
+
+    @classmethod
+    def clear(cls, max_spans=None):
+        cls._SPANS = collections.deque(maxlen=max_spans if max_spans is not None else cls._SPANS.maxlen)
+        cls._dropped = 0
+
+    @classmethod
+    def trace_events(cls, party=None):
+        # parties run in different processes, so traces of all parties can be merged into one timeline
+        pid = os.getpid()
+        process_name = str(party) if party is not None else f"pid:{pid}"
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": process_name}}]
+        thread_names = {t.ident: t.name for t in threading.enumerate()}
+        for tid in sorted({span.tid for span in cls._SPANS}):
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                           "args": {"name": thread_names.get(tid, str(tid))}})
+        events.extend(span.as_trace_event(pid) for span in cls._SPANS)
+        return events
+
+
+def start_span(span_name, span_cat, **kwargs) -> _Span:
+    """
+    start a span, call done() of returned span to record it
+    """
+    return _Span(span_name, span_cat, kwargs)
+
+
+@contextlib.contextmanager
+def trace_span(span_name, span_cat, **kwargs):
+    """
+    record a span around a block, args can be added by span.set_args inside the block,
+    nothing is recorded if profile is not started
+    """
+    span = _Span(span_name, span_cat, kwargs)
+    try:
+        yield span
+    finally:
+        span.done()
+
+
+def get_trace_events(party=None):
+    """
+    spans recorded since profile_start, in Chrome trace event format
+    """
+    return _SpanRecorder.trace_events(party)
+
+
+def export_chrome_trace(path, party=None):
+    """
+    write recorded spans to a Chrome trace / Perfetto json file, one process per party
+    """
+    dir_name = os.path.dirname(path)
+    if dir_name:
+        os.makedirs(dir_name, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"traceEvents": get_trace_events(party), "displayTimeUnit": "ms",
+                   "otherData": {"dropped_spans": _SpanRecorder._dropped}}, f)
+    profile_logger.info(f"{len(_SpanRecorder._SPANS)} spans exported to {path}")
+
+
+def enable_trace_export(path, party=None, max_spans=DEFAULT_MAX_SPANS):
+    """
+    record spans from now on, and export them to path when profile ends, at most max_spans latest spans are kept
+    """
+    global _TRACE_EXPORT_PATH, _TRACE_PARTY
+    _TRACE_EXPORT_PATH = path
+    _TRACE_PARTY = party
+    _SpanRecorder.clear(max_spans)
+
+
 class _ComputingTimerItem(object):
     def __init__(self, function_name: str, function_stack):
         self.function_name = function_name
@@ -76,6 +202,7 @@ class _ComputingTimer(object):
 
     def __init__(self, function_name: str, function_stack_list):
         self._start = time.time()
+        self._span = _Span(function_name, "computing")
 
         function_stack = "\n".join(function_stack_list)
         self._hash = hashlib.blake2b(function_stack.encode('utf-8'), digest_size=5).hexdigest()
@@ -88,9 +215,11 @@ class _ComputingTimer(object):
         if _PROFILE_LOG_ENABLED:
             profile_logger.debug(f"[computing#{self._hash}]start")
 
-    def done(self, function_string):
+    def done(self, function_string, **span_args):
         elapse = time.time() - self._start
         self._STATS[self._hash].item.add(elapse)
+        self._span.set_args(function=function_string, stack_hash=self._hash, **span_args)
+        self._span.done()
         if _PROFILE_LOG_ENABLED:
             profile_logger.debug(f"[computing#{self._hash}]done, elapse: {elapse}, function: {function_string}")
 
@@ -182,13 +311,16 @@ class _FederationRemoteTimer(_FederationTimer):
         self._parties = parties
         self._start_time = time.time()
         self._end_time = None
+        self._span = _Span(full_name, "federation.remote", {"tag": tag, "local": local, "parties": parties})
 
         if self._full_name not in self._REMOTE_STATS:
             self._REMOTE_STATS[self._full_name] = _TimerItem()
 
-    def done(self, federation):
+    def done(self, federation, **span_args):
         self._end_time = time.time()
         self._REMOTE_STATS[self._full_name].add(self.elapse)
+        self._span.set_args(**span_args)
+        self._span.done()
         profile_logger.debug(f"[federation.remote.{self._full_name}.{self._tag}]"
                              f"{self._local_party}->{self._parties} done")
 
@@ -213,13 +345,16 @@ class _FederationGetTimer(_FederationTimer):
         self._parties = parties
         self._start_time = time.time()
         self._end_time = None
+        self._span = _Span(full_name, "federation.get", {"tag": tag, "local": local, "parties": parties})
 
         if self._full_name not in self._GET_STATS:
             self._GET_STATS[self._full_name] = _TimerItem()
 
-    def done(self, federation):
+    def done(self, federation, **span_args):
         self._end_time = time.time()
         self._GET_STATS[self._full_name].add(self.elapse)
+        self._span.set_args(**span_args)
+        self._span.done()
         profile_logger.debug(f"[federation.get.{self._full_name}.{self._tag}]"
                              f"{self._local_party}<-{self._parties} done")
 
@@ -248,6 +383,7 @@ def federation_get_timer(name, full_name, tag, local, parties):
 def profile_start():
     global _PROFILE_LOG_ENABLED
     _PROFILE_LOG_ENABLED = True
+    _SpanRecorder.clear()
 
     global _START_TIME
     _START_TIME = time.time()
@@ -284,6 +420,13 @@ def profile_ends():
     profile_logger.info(f"\nComputing:\n{computing_base_table}\n\nFederation:\n{federation_base_table}\n")
     profile_logger.debug(f"\nDetailed Computing:\n{computing_detailed_table}\n")
 
+    if _TRACE_EXPORT_PATH is not None:
+        try:
+            export_chrome_trace(_TRACE_EXPORT_PATH, _TRACE_PARTY)
+        except Exception as e:
+            profile_logger.warning(f"export trace to {_TRACE_EXPORT_PATH} failed: {e}")
+        _SpanRecorder.clear()
+
     global _PROFILE_LOG_ENABLED
     _PROFILE_LOG_ENABLED = False
 
@@ -295,6 +438,15 @@ def _pretty_table_str(v):
         return f"{type(v).__name__}"
 
 
+def _table_span_args(args, rtn):
+    span_args = {}
+    if args and isinstance(args[0], CTableABC):
+        span_args["partitions"] = args[0].partitions
+    if isinstance(rtn, CTableABC):
+        span_args["output_partitions"] = rtn.partitions
+    return span_args
+
+
 def _func_annotated_string(func, *args, **kwargs):
     pretty_args = []
     for k, v in inspect.signature(func).bind(*args, **kwargs).arguments.items():
@@ -317,7 +469,7 @@ def computing_profile(func):
         timer = _ComputingTimer(func.__name__, function_call_stack)
         rtn = func(*args, **kwargs)
         function_string = f"{_func_annotated_string(func, *args, **kwargs)} -> {_pretty_table_str(rtn)}"
-        timer.done(function_string)
+        timer.done(function_string, **_table_span_args(args, rtn))
         return rtn
 
     return _fn
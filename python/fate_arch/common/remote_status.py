@@ -32,8 +32,9 @@ def _clear_callback(future):
 
 def add_remote_futures(fs: typing.List[concurrent.futures.Future]):
     for f in fs:
-        f.add_done_callback(_clear_callback)
+        # callback runs at once if future is done already
         _remote_futures.add(f)
+        f.add_done_callback(_clear_callback)
 
 
 def wait_all_remote_done(timeout=None):
@@ -15,14 +15,16 @@
 #
 
 
+import concurrent.futures
 import json
 import sys
+import threading
 import typing
 from pickle import dumps as p_dumps, loads as p_loads
 
 from fate_arch.abc import CTableABC
 from fate_arch.abc import FederationABC, GarbageCollectionABC
-from fate_arch.common import Party
+from fate_arch.common import Party, profile, remote_status
 from fate_arch.common.log import getLogger
 from fate_arch.federation import FederationDataType
 from fate_arch.federation._datastream import Datastream
@@ -33,19 +35,30 @@ LOGGER = getLogger()
 NAME_DTYPE_TAG = "<dtype>"
 _SPLIT_ = "^"
 
+# max number of remotes queued or being sent in background, 0 means remote synchronously
+DEFAULT_REMOTE_MAX_IN_FLIGHT = 8
 
-def _get_splits(obj, max_message_size):
-    obj_bytes = p_dumps(obj, protocol=4)
+
+def _get_splits(obj_bytes, max_message_size):
     byte_size = len(obj_bytes)
     num_slice = (byte_size - 1) // max_message_size + 1
     if num_slice <= 1:
-        return obj, num_slice
+        return obj_bytes, num_slice
     else:
         _max_size = max_message_size
         kv = [(i, obj_bytes[slice(i * _max_size, (i + 1) * _max_size)]) for i in range(num_slice)]
         return kv, num_slice
 
 
+class _SerializedObj(object):
+    """
+    pickled object waiting to be sent
+    """
+
+    def __init__(self, obj_bytes):
+        self.obj_bytes = obj_bytes
+
+
 class FederationBase(FederationABC):
     @staticmethod
     def from_conf(
@@ -62,7 +75,8 @@ class FederationBase(FederationABC):
             party: Party,
             mq,
             max_message_size,
-            conf=None
+            conf=None,
+            remote_max_in_flight=DEFAULT_REMOTE_MAX_IN_FLIGHT
     ):
         self._session_id = session_id
         self._party = party
@@ -74,6 +88,13 @@ class FederationBase(FederationABC):
         self._max_message_size = max_message_size
         self._conf = conf
 
+        # remotes are sent one by one by a background worker to keep order of messages
+        self._remote_max_in_flight = remote_max_in_flight
+        self._remote_window = threading.BoundedSemaphore(max(remote_max_in_flight, 1))
+        self._remote_executor = None
+        self._remote_futures = set()
+        self._remote_exception = None
+
     def __getstate__(self):
         pass
 
@@ -90,6 +111,9 @@ class FederationBase(FederationABC):
         log_str = f"[federation.get](name={name}, tag={tag}, parties={parties})"
         LOGGER.debug(f"[{log_str}]start to get")
 
+        # channels are not shared with the remote worker, pending remotes are flushed at sync point
+        self.wait_remote_done()
+
         _name_dtype_keys = [
             _SPLIT_.join([party.role, party.party_id, name, tag, "get"])
             for party in parties
@@ -137,8 +161,10 @@ class FederationBase(FederationABC):
                     conf=self._conf
                 )
 
-                table = computing_session.parallelize(range(partitions), partitions, include_key=False)
-                table = table.mapPartitionsWithIndex(receive_func)
+                with profile.trace_span("receive_table", "federation.transfer", name=name, tag=tag,
+                                        partitions=partitions, party=str(party)):
+                    table = computing_session.parallelize(range(partitions), partitions, include_key=False)
+                    table = table.mapPartitionsWithIndex(receive_func)
 
                 # add gc
                 gc.add_gc_action(tag, table, "__del__", {})
@@ -150,7 +176,9 @@ class FederationBase(FederationABC):
                     rtn.append(table)
                 else:
                     obj_bytes = b''.join(map(lambda t: t[1], sorted(table.collect(), key=lambda x: x[0])))
-                    obj = p_loads(obj_bytes)
+                    with profile.trace_span("deserialize", "federation.serialize", name=name, tag=tag,
+                                            bytes=len(obj_bytes)):
+                        obj = p_loads(obj_bytes)
                     rtn.append(obj)
         else:
             party_topic_infos = self._get_party_topic_infos(parties, name)
@@ -173,6 +201,72 @@ class FederationBase(FederationABC):
             parties: typing.List[Party],
             gc: GarbageCollectionABC,
     ) -> typing.NoReturn:
+        """
+        objects are serialized before return so that later modification by caller is not sent, objects fitting in
+        one message are published by a background worker, at most remote_max_in_flight remotes are pending,
+        use wait_remote_done to wait for them.
+        tables and objects split into tables are sent by computing jobs, which are run on caller thread after
+        pending remotes are done, for computing engines do not support jobs submitted by threads concurrently
+        """
+        self._raise_remote_exception()
+        if not isinstance(v, CTableABC):
+            with profile.trace_span("serialize", "federation.serialize", name=name, tag=tag) as span:
+                v = _SerializedObj(p_dumps(v, protocol=4))
+                span.set_args(bytes=len(v.obj_bytes))
+
+        if self._remote_max_in_flight <= 0:
+            return self._remote(v, name, tag, parties, gc)
+
+        if isinstance(v, CTableABC) or len(v.obj_bytes) > self._max_message_size:
+            # channels are not shared with the remote worker either
+            self.wait_remote_done()
+            return self._remote(v, name, tag, parties, gc)
+
+        with profile.trace_span("acquire_window", "federation.wait", name=name, tag=tag):
+            self._remote_window.acquire()
+        try:
+            if self._remote_executor is None:
+                self._remote_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="federation_remote")
+            future = self._remote_executor.submit(self._remote, v, name, tag, parties, gc)
+        except BaseException:
+            self._remote_window.release()
+            raise
+        self._remote_futures.add(future)
+        future.add_done_callback(self._remote_done_callback)
+        remote_status.add_remote_futures([future])
+
+    def _remote_done_callback(self, future):
+        self._remote_window.release()
+        self._remote_futures.discard(future)
+        if future.exception() is not None and self._remote_exception is None:
+            LOGGER.error(f"[federation.remote]remote in background fail: {future.exception()}",
+                         exc_info=future.exception())
+            self._remote_exception = future.exception()
+
+    def _raise_remote_exception(self):
+        if self._remote_exception is not None:
+            e, self._remote_exception = self._remote_exception, None
+            raise e
+
+    def wait_remote_done(self, timeout=None):
+        """
+        wait for all pending remotes, raise exception of failed remote if any
+        """
+        futures = list(self._remote_futures)
+        if futures:
+            LOGGER.debug(f"[federation.remote]waiting for {len(futures)} pending remotes")
+            concurrent.futures.wait(futures, timeout=timeout)
+        self._raise_remote_exception()
+
+    def _remote(
+            self,
+            v,
+            name: str,
+            tag: str,
+            parties: typing.List[Party],
+            gc: GarbageCollectionABC,
+    ):
         log_str = f"[federation.remote](name={name}, tag={tag}, parties={parties})"
 
         _name_dtype_keys = [
@@ -185,11 +279,12 @@ class FederationBase(FederationABC):
             channel_infos = self._get_channels(party_topic_infos=party_topic_infos)
 
             if not isinstance(v, CTableABC):
-                v, num_slice = _get_splits(v, self._max_message_size)
+                v, num_slice = _get_splits(v.obj_bytes, self._max_message_size)
                 if num_slice > 1:
                     v = computing_session.parallelize(data=v, partition=1, include_key=True)
                     body = {"dtype": FederationDataType.SPLIT_OBJECT, "partitions": v.partitions}
                 else:
+                    v = _SerializedObj(v)
                     body = {"dtype": FederationDataType.OBJECT}
 
             else:
@@ -217,8 +312,6 @@ class FederationBase(FederationABC):
             )
 
             party_topic_infos = self._get_party_topic_infos(parties, name, partitions=partitions)
-            # add gc
-            gc.add_gc_action(tag, v, "__del__", {})
 
             send_func = self._get_partition_send_func(
                 name=name,
@@ -232,14 +325,20 @@ class FederationBase(FederationABC):
                 conf=self._conf
             )
             # noinspection PyProtectedMember
-            v.mapPartitionsWithIndex(send_func)
+            with profile.trace_span("send_table", "federation.transfer", name=name, tag=tag, rows=total_size,
+                                    partitions=partitions):
+                v.mapPartitionsWithIndex(send_func)
+            # add gc after table is sent
+            gc.add_gc_action(tag, v, "__del__", {})
         else:
             LOGGER.debug(f"[{log_str}]start to remote obj")
             party_topic_infos = self._get_party_topic_infos(parties, name)
             channel_infos = self._get_channels(party_topic_infos=party_topic_infos)
-            self._send_obj(
-                name=name, tag=tag, data=p_dumps(v), channel_infos=channel_infos
-            )
+            with profile.trace_span("send", "federation.transfer", name=name, tag=tag, bytes=len(v.obj_bytes),
+                                    parties=len(channel_infos)):
+                self._send_obj(
+                    name=name, tag=tag, data=v.obj_bytes, channel_infos=channel_infos
+                )
 
         LOGGER.debug(f"[{log_str}]finish to remote")
 
@@ -349,6 +448,7 @@ class FederationBase(FederationABC):
             }
             LOGGER.debug(f"[federation._send_obj]properties:{properties}.")
             info.produce(body=data, properties=properties)
+        self._flush_channels(channel_infos)
 
     def _send_kv(
             self, name, tag, data, channel_infos, partition_size, partitions, message_key
@@ -371,6 +471,12 @@ class FederationBase(FederationABC):
             print(f"[federation._send_kv]info: {info}, properties: {properties}.")
             info.produce(body=data, properties=properties)
 
+    @staticmethod
+    def _flush_channels(channel_infos):
+        # channels publish messages in batch, wait for the rest to be confirmed by broker
+        for info in channel_infos:
+            info.flush()
+
     def _get_partition_send_func(
             self,
             name,
@@ -461,6 +567,7 @@ class FederationBase(FederationABC):
             partitions=partitions,
             message_key=message_key,
         )
+        self._flush_channels(channel_infos)
 
         return [(index, 1)]
 
@@ -490,7 +597,12 @@ class FederationBase(FederationABC):
 
         channel_info = self._query_receive_topic(channel_info)
 
+        # time before a message arrives is spent on waiting for the other party
+        wait_span = profile.start_span("wait", "federation.wait", name=name, tag=tag, party_id=party_id)
         for id, properties, body in self._get_consume_message(channel_info):
+            if wait_span is not None:
+                wait_span.done()
+                wait_span = None
             LOGGER.debug(
                 f"[federation._receive_obj] properties: {properties}"
             )
@@ -505,7 +617,9 @@ class FederationBase(FederationABC):
             )
             # object
             if properties["content_type"] == "text/plain":
-                recv_obj = p_loads(body)
+                with profile.trace_span("deserialize", "federation.serialize", name=properties["message_id"],
+                                        tag=properties["correlation_id"], bytes=len(body)):
+                    recv_obj = p_loads(body)
                 self._consume_ack(channel_info, id)
                 LOGGER.debug(
                     f"[federation._receive_obj] cache_key: {cache_key}, wish_cache_key: {wish_cache_key}"
@@ -0,0 +1,181 @@
+#
+#  Copyright 2022 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+
+import collections
+import os
+import threading
+import time
+from multiprocessing.managers import BaseManager
+
+from fate_arch.common.log import getLogger
+
+LOGGER = getLogger()
+
+
+class _Queues(object):
+    """
+    message queues kept by the broker, messages delivered to a consumer are put back to the front of queue
+    if the consumer is canceled before acking them
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._queues = collections.defaultdict(collections.deque)
+        # consumer id -> {delivery tag: (queue name, message)}
+        self._unacked = collections.defaultdict(dict)
+        self._delivery_tag = 0
+        self._published_messages = 0
+        self._published_bytes = 0
+
+    def publish(self, messages):
+        """
+        messages: list of (queue name, body, properties), published atomically
+        """
+        with self._cond:
+            for queue_name, body, properties in messages:
+                self._queues[queue_name].append((body, properties))
+                self._published_bytes += len(body)
+            self._published_messages += len(messages)
+            self._cond.notify_all()
+
+    def get(self, queue_name, consumer_id, timeout):
+        """
+        wait at most timeout seconds for a message, returns (delivery tag, properties, body) or None
+        """
+        deadline = time.time() + timeout
+        with self._cond:
+            while not self._queues[queue_name]:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            message = self._queues[queue_name].popleft()
+            self._delivery_tag += 1
+            self._unacked[consumer_id][self._delivery_tag] = (queue_name, message)
+            body, properties = message
+            return self._delivery_tag, properties, body
+
+    def ack(self, consumer_id, delivery_tag):
+        with self._cond:
+            self._unacked[consumer_id].pop(delivery_tag, None)
+
+    def cancel(self, consumer_id):
+        with self._cond:
+            unacked = self._unacked.pop(consumer_id, {})
+            for delivery_tag in sorted(unacked.keys(), reverse=True):
+                queue_name, message = unacked[delivery_tag]
+                self._queues[queue_name].appendleft(message)
+            if unacked:
+                self._cond.notify_all()
+
+    def delete(self, queue_names):
+        with self._cond:
+            for queue_name in queue_names:
+                self._queues.pop(queue_name, None)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "queues": len(self._queues),
+                "queued_messages": sum(len(q) for q in self._queues.values()),
+                "published_messages": self._published_messages,
+                "published_bytes": self._published_bytes,
+            }
+
+
+class _BrokerManager(BaseManager):
+    pass
+
+
+_BrokerManager.register("queues")
+
+# queues of the broker, created in the server process of broker
+_QUEUES = None
+
+
+def _server_queues():
+    global _QUEUES
+    if _QUEUES is None:
+        _QUEUES = _Queues()
+    return _QUEUES
+
+
+class _ServerManager(BaseManager):
+    pass
+
+
+_ServerManager.register("queues", callable=_server_queues)
+
+
+class Broker(object):
+    """
+    a stand-in of the message queue broker served by a manager process started from current process, so that
+    federation over message queues can be tested and benchmarked on one machine without rabbitmq or pulsar.
+    computing workers and parties in other processes connect to it by address and authkey, see `config`
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, authkey: bytes = None):
+        self._authkey = authkey if authkey is not None else os.urandom(16)
+        self._manager = _ServerManager(address=(host, port), authkey=self._authkey)
+        self._manager.start()
+        self._queues = self._manager.queues()
+        LOGGER.debug(f"[inprocess.broker]serving at {self.address}")
+
+    @property
+    def address(self):
+        return self._manager.address
+
+    @property
+    def config(self) -> dict:
+        return {"host": self.address[0], "port": self.address[1], "authkey": self._authkey.hex()}
+
+    def stats(self):
+        return self._queues.stats()
+
+    def shutdown(self):
+        self._queues = None
+        self._manager.shutdown()
+
+
+class _ClientPool(object):
+    """
+    one connection to a broker per process, proxies open a connection per thread on their own
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queues = {}
+
+    def queues(self, address, authkey):
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._queues = {}
+            key = tuple(address)
+            if key not in self._queues:
+                manager = _BrokerManager(address=key, authkey=authkey)
+                manager.connect()
+                self._queues[key] = manager.queues()
+            return self._queues[key]
+
+
+_POOL = _ClientPool()
+
+
+def get_queues(address, authkey):
+    return _POOL.queues(address, authkey)
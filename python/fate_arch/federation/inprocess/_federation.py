@@ -0,0 +1,119 @@
+#
+#  Copyright 2022 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+
+from fate_arch.common import Party
+from fate_arch.common.log import getLogger
+from fate_arch.federation._federation import FederationBase, DEFAULT_REMOTE_MAX_IN_FLIGHT
+from fate_arch.federation.inprocess._broker import get_queues
+from fate_arch.federation.inprocess._mq_channel import MQChannel, DEFAULT_PUBLISH_BATCH_SIZE
+
+LOGGER = getLogger()
+
+# default message max size in bytes = 1MB
+DEFAULT_MESSAGE_MAX_SIZE = 1048576
+
+
+class MQ(object):
+    def __init__(self, host, port, authkey: bytes):
+        self.host = host
+        self.port = port
+        self.authkey = authkey
+
+    def __str__(self):
+        return f"MQ(host={self.host}, port={self.port}, type=inprocess)"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class _TopicPair(object):
+    def __init__(self, namespace, send, receive):
+        self.namespace = namespace
+        self.send = send
+        self.receive = receive
+
+
+class Federation(FederationBase):
+    """
+    federation over an in-process broker, all parties connect to the same broker, see `Broker.config`
+    """
+
+    @staticmethod
+    def from_conf(
+            federation_session_id: str,
+            party: Party,
+            runtime_conf: dict,
+            **kwargs
+    ):
+        inprocess_config = kwargs["inprocess_config"]
+        LOGGER.debug(f"inprocess_config: {inprocess_config}")
+        mq = MQ(inprocess_config["host"], int(inprocess_config["port"]), bytes.fromhex(inprocess_config["authkey"]))
+
+        inprocess_run = runtime_conf.get("job_parameters", {}).get("inprocess_run", {})
+        max_message_size = int(inprocess_run.get(
+            "max_message_size", inprocess_config.get("max_message_size", DEFAULT_MESSAGE_MAX_SIZE)))
+        remote_max_in_flight = int(inprocess_run.get("remote_max_in_flight", DEFAULT_REMOTE_MAX_IN_FLIGHT))
+        conf = {"publish_batch_size": int(inprocess_run.get("publish_batch_size", DEFAULT_PUBLISH_BATCH_SIZE))}
+
+        return Federation(federation_session_id, party, mq, max_message_size, conf, remote_max_in_flight)
+
+    def __init__(self, session_id, party: Party, mq: MQ, max_message_size, conf=None,
+                 remote_max_in_flight=DEFAULT_REMOTE_MAX_IN_FLIGHT):
+        super().__init__(session_id=session_id, party=party, mq=mq, max_message_size=max_message_size, conf=conf,
+                         remote_max_in_flight=remote_max_in_flight)
+
+    def __getstate__(self):
+        pass
+
+    def destroy(self, parties):
+        self.wait_remote_done()
+        LOGGER.debug("[inprocess.cleanup]start to cleanup...")
+        receive_queues = [topic_pair.receive for topic_pair in self._topic_map.values()]
+        get_queues((self._mq.host, self._mq.port), self._mq.authkey).delete(receive_queues)
+
+    def _maybe_create_topic_and_replication(self, party, topic_suffix):
+        # queues are created on first publish or consume
+        return _TopicPair(
+            namespace=self._session_id,
+            send=f"{self._session_id}-{self._party.role}-{self._party.party_id}-{party.role}-{party.party_id}"
+                 f"-{topic_suffix}",
+            receive=f"{self._session_id}-{party.role}-{party.party_id}-{self._party.role}-{self._party.party_id}"
+                    f"-{topic_suffix}",
+        )
+
+    def _get_channel(
+            self, topic_pair, src_party_id, src_role, dst_party_id, dst_role, mq=None, conf: dict = None):
+        return MQChannel(
+            host=mq.host,
+            port=mq.port,
+            authkey=mq.authkey,
+            namespace=topic_pair.namespace,
+            send_queue_name=topic_pair.send,
+            receive_queue_name=topic_pair.receive,
+            src_party_id=src_party_id,
+            src_role=src_role,
+            dst_party_id=dst_party_id,
+            dst_role=dst_role,
+            extra_args=conf,
+        )
+
+    def _get_consume_message(self, channel_info):
+        for delivery_tag, properties, body in channel_info.consume():
+            yield delivery_tag, properties, body
+
+    def _consume_ack(self, channel_info, id):
+        channel_info.ack(delivery_tag=id)
@@ -0,0 +1,112 @@
+#
+#  Copyright 2022 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+
+import uuid
+
+from fate_arch.common import log
+from fate_arch.federation._nretry import nretry
+from fate_arch.federation.inprocess._broker import get_queues
+
+LOGGER = log.getLogger()
+
+# number of messages published to broker at once
+DEFAULT_PUBLISH_BATCH_SIZE = 64
+# seconds to wait for a message before polling again
+DEFAULT_POLL_TIMEOUT = 1
+
+
+class MQChannel(object):
+
+    def __init__(self,
+                 host,
+                 port,
+                 authkey,
+                 namespace,
+                 send_queue_name,
+                 receive_queue_name,
+                 src_party_id,
+                 src_role,
+                 dst_party_id,
+                 dst_role,
+                 extra_args: dict = None):
+        self._host = host
+        self._port = port
+        self._authkey = authkey
+        self._namespace = namespace
+        self._send_queue_name = send_queue_name
+        self._receive_queue_name = receive_queue_name
+        self._src_party_id = src_party_id
+        self._src_role = src_role
+        self._dst_party_id = dst_party_id
+        self._dst_role = dst_role
+        self._extra_args = extra_args if extra_args is not None else {}
+        self._publish_batch_size = max(int(self._extra_args.get("publish_batch_size", DEFAULT_PUBLISH_BATCH_SIZE)), 1)
+        self._poll_timeout = self._extra_args.get("poll_timeout", DEFAULT_POLL_TIMEOUT)
+
+        self._pending = []
+        self._consumer_id = None
+
+    def __str__(self):
+        return (
+            f"MQChannel(host={self._host}, port={self._port}, namespace={self._namespace}, "
+            f"src_party_id={self._src_party_id}, src_role={self._src_role}, "
+            f"dst_party_id={self._dst_party_id}, dst_role={self._dst_role}, "
+            f"send_queue_name={self._send_queue_name}, receive_queue_name={self._receive_queue_name})"
+        )
+
+    def __repr__(self):
+        return self.__str__()
+
+    def _queues(self):
+        return get_queues((self._host, self._port), self._authkey)
+
+    def produce(self, body, properties: dict):
+        """
+        messages are published every publish_batch_size messages, call flush to publish the rest
+        """
+        self._pending.append((self._send_queue_name, body, dict(properties)))
+        if len(self._pending) >= self._publish_batch_size:
+            self.flush()
+
+    @nretry
+    def flush(self):
+        if self._pending:
+            self._queues().publish(self._pending)
+            self._pending = []
+
+    def consume(self):
+        """
+        yield (delivery tag, properties, body) until canceled
+        """
+        if self._consumer_id is None:
+            self._consumer_id = uuid.uuid1().hex
+        consumer_id = self._consumer_id
+        LOGGER.debug(f"receive queue: {self._receive_queue_name}")
+        while self._consumer_id == consumer_id:
+            message = self._queues().get(self._receive_queue_name, consumer_id, self._poll_timeout)
+            if message is not None:
+                yield message
+
+    @nretry
+    def ack(self, delivery_tag):
+        self._queues().ack(self._consumer_id, delivery_tag)
+
+    @nretry
+    def cancel(self):
+        if self._consumer_id is not None:
+            self._queues().cancel(self._consumer_id)
+            self._consumer_id = None
@@ -17,12 +17,14 @@
 from fate_arch.common import Party
 from fate_arch.common import file_utils
 from fate_arch.common.log import getLogger
-from fate_arch.federation._federation import FederationBase
+from fate_arch.federation._federation import FederationBase, DEFAULT_REMOTE_MAX_IN_FLIGHT
 from fate_arch.federation.pulsar._mq_channel import (
     MQChannel,
     DEFAULT_TENANT,
     DEFAULT_CLUSTER,
     DEFAULT_SUBSCRIPTION_NAME,
+    DEFAULT_PUBLISH_BATCH_SIZE,
+    close_connections,
 )
 from fate_arch.federation.pulsar._pulsar_manager import PulsarManager
 
@@ -86,6 +88,9 @@ class Federation(FederationBase):
 
         LOGGER.debug(f"set max message size to {max_message_size} Bytes")
 
+        remote_max_in_flight = int(pulsar_run.get("remote_max_in_flight", DEFAULT_REMOTE_MAX_IN_FLIGHT))
+        publish_batch_size = int(pulsar_run.get("publish_batch_size", DEFAULT_PUBLISH_BATCH_SIZE))
+
         # topic ttl could be overwritten by run time config
         topic_ttl = int(pulsar_run.get("topic_ttl", topic_ttl))
 
@@ -114,6 +119,8 @@ class Federation(FederationBase):
         conf = pulsar_manager.runtime_config.get(
             "connection", {}
         )
+        # messages published on a channel are confirmed in batch of this size
+        conf = dict(conf, publish_batch_size=publish_batch_size)
 
         LOGGER.debug(f"federation mode={mode}")
 
@@ -127,12 +134,14 @@ class Federation(FederationBase):
             cluster,
             tenant,
             conf,
-            mode
+            mode,
+            remote_max_in_flight
         )
 
     def __init__(self, session_id, party: Party, mq: MQ, pulsar_manager: PulsarManager, max_message_size, topic_ttl,
-                 cluster, tenant, conf, mode):
-        super().__init__(session_id=session_id, party=party, mq=mq, max_message_size=max_message_size, conf=conf)
+                 cluster, tenant, conf, mode, remote_max_in_flight=DEFAULT_REMOTE_MAX_IN_FLIGHT):
+        super().__init__(session_id=session_id, party=party, mq=mq, max_message_size=max_message_size, conf=conf,
+                         remote_max_in_flight=remote_max_in_flight)
 
         self._pulsar_manager = pulsar_manager
         self._topic_ttl = topic_ttl
@@ -146,6 +155,8 @@ class Federation(FederationBase):
     def destroy(self, parties):
         # The idea cleanup strategy is to consume all message in topics,
         # and let pulsar cluster to collect the used topics.
+        self.wait_remote_done()
+        close_connections()
 
         LOGGER.debug("[pulsar.cleanup]start to cleanup...")
 
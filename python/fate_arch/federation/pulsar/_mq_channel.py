@@ -15,6 +15,10 @@
 #
 
 
+import os
+import threading
+from multiprocessing import util
+
 import pulsar
 
 from fate_arch.common import log
@@ -29,6 +33,94 @@ TOPIC_PREFIX = "{}/{}/{}"
 UNIQUE_PRODUCER_NAME = "unique_producer"
 UNIQUE_CONSUMER_NAME = "unique_consumer"
 DEFAULT_SUBSCRIPTION_NAME = "unique"
+# number of messages sent asynchronously before waiting for their receipts
+DEFAULT_PUBLISH_BATCH_SIZE = 64
+
+
+class _ClientPool(object):
+    """
+    pulsar clients are thread safe, one client of a broker is shared by all channels of a process,
+    so are producers of a topic. pooled clients are not inherited by forked processes, and are closed when
+    the process exits, in computing workers as well as in the driver
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._clients = {}
+        self._producers = {}
+
+    def _check_pid(self):
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._clients = {}
+            self._producers = {}
+            # finalizers run at exit of processes started by multiprocessing, while atexit does not
+            util.Finalize(None, self.close_all, exitpriority=0)
+
+    def client(self, host, port):
+        with self._lock:
+            self._check_pid()
+            if (host, port) not in self._clients:
+                self._clients[(host, port)] = pulsar.Client(
+                    service_url="pulsar://{}:{}".format(host, port),
+                    operation_timeout_seconds=30,
+                )
+            return self._clients[(host, port)]
+
+    def producer(self, host, port, topic, producer_config):
+        client = self.client(host, port)
+        with self._lock:
+            if (host, port, topic) not in self._producers:
+                config = dict(
+                    producer_name=UNIQUE_PRODUCER_NAME,
+                    send_timeout_millis=60000,
+                    max_pending_messages=500,
+                    compression_type=pulsar.CompressionType.LZ4,
+                    batching_enabled=True,
+                )
+                config.update(producer_config)
+                self._producers[(host, port, topic)] = client.create_producer(topic, **config)
+            return self._producers[(host, port, topic)]
+
+    def drop(self, host, port, topic=None):
+        """
+        drop a broken producer, or the client and all its producers if topic is None
+        """
+        with self._lock:
+            self._check_pid()
+            for key in list(self._producers.keys()):
+                if key[:2] == (host, port) and (topic is None or key[2] == topic):
+                    self._close(self._producers.pop(key))
+            if topic is None and (host, port) in self._clients:
+                self._close(self._clients.pop((host, port)))
+
+    def close_all(self):
+        with self._lock:
+            self._check_pid()
+            for producer in self._producers.values():
+                self._close(producer)
+            for client in self._clients.values():
+                self._close(client)
+            self._producers = {}
+            self._clients = {}
+
+    @staticmethod
+    def _close(closable):
+        try:
+            closable.close()
+        except Exception as e:
+            LOGGER.debug("meet {} when trying to close {}".format(e, closable))
+
+
+_POOL = _ClientPool()
+
+
+def close_connections():
+    """
+    close clients and producers opened by this process
+    """
+    _POOL.close_all()
 
 
 # A channel cloud only be able to send or receive message.
@@ -63,14 +155,12 @@ class MQChannel(object):
         self._src_role = src_role
         self._dst_party_id = dst_party_id
         self._dst_role = dst_role
-        self._extra_args = extra_args
+        self._extra_args = extra_args if extra_args is not None else {}
 
         # "_channel" is the subscriptor for the topic
         self._producer_send = None
-        self._producer_conn = None
 
         self._consumer_receive = None
-        self._consumer_conn = None
 
         self._sequence_id = None
 
@@ -78,6 +168,11 @@ class MQChannel(object):
         self._latest_confirmed = None
         self._first_confirmed = None
 
+        # messages sent asynchronously but not flushed yet, and whether any of them failed
+        self._pending = []
+        self._send_failed = False
+        self._publish_batch_size = max(int(self._extra_args.get("publish_batch_size", DEFAULT_PUBLISH_BATCH_SIZE)), 1)
+
         self._subscription_config = {}
         if self._extra_args.get("subscription") is not None:
             self._subscription_config.update(self._extra_args["subscription"])
@@ -91,18 +186,57 @@ class MQChannel(object):
             self._consumer_config.update(self._extra_args["consumer"])
 
     # splitting the creation of producer and producer to avoid resource wasted
-    @nretry
     def produce(self, body, properties):
-        self._get_or_create_producer()
-        LOGGER.debug("send queue: {}".format(self._producer_send.topic()))
-        LOGGER.debug("send data size: {}".format(len(body)))
+        """
+        messages are sent asynchronously, receipts are waited every publish_batch_size messages,
+        call flush to wait for the rest
+        """
+        self._pending.append((body, properties))
+        if not self._send_failed:
+            try:
+                self._get_or_create_producer()
+                LOGGER.debug("send queue: {}".format(self._producer_send.topic()))
+                LOGGER.debug("send data size: {}".format(len(body)))
+                self._producer_send.send_async(content=body, callback=self._send_callback, properties=properties)
+            except Exception as e:
+                LOGGER.warning("send to {} failed: {}, {} messages will be sent again when flush".format(
+                    self._send_topic, e, len(self._pending)))
+                self._send_failed = True
 
-        message_id = self._producer_send.send(
-            content=body, properties=properties)
-        if message_id is None:
-            raise Exception("publish failed")
+        if len(self._pending) >= self._publish_batch_size:
+            self.flush()
 
-        self._sequence_id = message_id
+    def _send_callback(self, result, message_id):
+        if result != pulsar.Result.Ok:
+            LOGGER.debug("async send to {} failed: {}".format(self._send_topic, result))
+            self._send_failed = True
+        else:
+            self._sequence_id = message_id
+
+    @nretry
+    def flush(self):
+        if not self._pending:
+            return
+        try:
+            self._get_or_create_producer()
+            if self._send_failed:
+                # resend all messages of the batch, duplicated messages are dropped by receivers
+                for body, properties in self._pending:
+                    message_id = self._producer_send.send(content=body, properties=properties)
+                    if message_id is None:
+                        raise Exception("publish failed")
+                    self._sequence_id = message_id
+                self._send_failed = False
+            else:
+                self._producer_send.flush()
+                if self._send_failed:
+                    raise Exception("publish failed")
+            self._pending = []
+        except Exception:
+            self._send_failed = True
+            _POOL.drop(self._host, self._port, self._producer_topic())
+            self._producer_send = None
+            raise
 
     @nretry
     def consume(self):
@@ -144,68 +278,27 @@ class MQChannel(object):
 
     @nretry
     def cancel(self):
-        if self._consumer_conn is not None:
+        # pooled client and producer are kept for other channels
+        if self._consumer_receive is not None:
             try:
                 self._consumer_receive.close()
-                self._consumer_conn.close()
             except Exception as e:
                 LOGGER.debug("meet {} when trying to close consumer".format(e))
 
             self._consumer_receive = None
-            self._consumer_conn = None
 
-        if self._producer_conn is not None:
-            try:
-                self._producer_send.close()
-                self._producer_conn.close()
-            except Exception as e:
-                LOGGER.debug("meet {} when trying to close producer".format(e))
-
-            self._producer_send = None
-            self._producer_conn = None
+    def _producer_topic(self):
+        return TOPIC_PREFIX.format(self._tenant, self._namespace, self._send_topic)
 
     def _get_or_create_producer(self):
-        if self._check_producer_alive() != True:
-            # if self._producer_conn is None:
-            try:
-                self._producer_conn = pulsar.Client(
-                    service_url="pulsar://{}:{}".format(
-                        self._host, self._port),
-                    operation_timeout_seconds=30,
-                )
-            except Exception as e:
-                self._producer_conn = None
-
-            # alway used current client to fetch producer
-            try:
-                self._producer_send = self._producer_conn.create_producer(
-                    TOPIC_PREFIX.format(
-                        self._tenant, self._namespace, self._send_topic
-                    ),
-                    producer_name=UNIQUE_PRODUCER_NAME,
-                    send_timeout_millis=60000,
-                    max_pending_messages=500,
-                    compression_type=pulsar.CompressionType.LZ4,
-                    **self._producer_config,
-                )
-            except Exception as e:
-                LOGGER.debug(
-                    f"catch exception {e} in creating pulsar producer")
-                self._producer_conn = None
+        if self._producer_send is None:
+            self._producer_send = _POOL.producer(self._host, self._port, self._producer_topic(),
+                                                 self._producer_config)
 
     def _get_or_create_consumer(self):
         if not self._check_consumer_alive():
             try:
-                self._consumer_conn = pulsar.Client(
-                    service_url="pulsar://{}:{}".format(
-                        self._host, self._port),
-                    operation_timeout_seconds=30,
-                )
-            except Exception:
-                self._consumer_conn = None
-
-            try:
-                self._consumer_receive = self._consumer_conn.subscribe(
+                self._consumer_receive = _POOL.client(self._host, self._port).subscribe(
                     TOPIC_PREFIX.format(
                         self._tenant, self._namespace, self._receive_topic
                     ),
@@ -223,37 +316,17 @@ class MQChannel(object):
             except Exception as e:
                 LOGGER.debug(
                     f"catch exception {e} in creating pulsar consumer")
-                self._consumer_conn.close()
-                self._consumer_conn = None
-
-    def _check_producer_alive(self):
-        if self._producer_conn is None or self._producer_send is None:
-            return False
-
-        try:
-            self._producer_conn.get_topic_partitions("test-alive")
-            self._producer_send.flush()
-            return True
-        except Exception as e:
-            LOGGER.debug("catch {}, closing producer client".format(e))
-            if self._producer_conn is not None:
-                try:
-                    self._producer_conn.close()
-                except Exception:
-                    pass
-
-            self._producer_conn = None
-            self._producer_send = None
-            return False
+                # the client may be broken, create a new one next time
+                _POOL.drop(self._host, self._port)
+                self._consumer_receive = None
 
     def _check_consumer_alive(self):
+        if self._consumer_receive is None:
+            return False
         try:
             if self._latest_confirmed is not None:
                 self._consumer_receive.acknowledge(self._latest_confirmed)
-                return True
-            else:
-                return False
-        except Exception as e:
-            self._consumer_conn = None
+            return True
+        except Exception:
             self._consumer_receive = None
             return False
@@ -19,8 +19,8 @@ import json
 from fate_arch.common import Party
 from fate_arch.common import file_utils
 from fate_arch.common.log import getLogger
-from fate_arch.federation._federation import FederationBase
-from fate_arch.federation.rabbitmq._mq_channel import MQChannel
+from fate_arch.federation._federation import FederationBase, DEFAULT_REMOTE_MAX_IN_FLIGHT
+from fate_arch.federation.rabbitmq._mq_channel import MQChannel, DEFAULT_PUBLISH_BATCH_SIZE, close_connections
 from fate_arch.federation.rabbitmq._rabbit_manager import RabbitManager
 
 LOGGER = getLogger()
@@ -86,6 +86,9 @@ class Federation(FederationBase):
 
         LOGGER.debug(f"set max message size to {max_message_size} Bytes")
 
+        remote_max_in_flight = int(rabbitmq_run.get("remote_max_in_flight", DEFAULT_REMOTE_MAX_IN_FLIGHT))
+        publish_batch_size = int(rabbitmq_run.get("publish_batch_size", DEFAULT_PUBLISH_BATCH_SIZE))
+
         rabbit_manager = RabbitManager(
             base_user, base_password, f"{host}:{mng_port}", rabbitmq_run
         )
@@ -98,13 +101,17 @@ class Federation(FederationBase):
         conf = rabbit_manager.runtime_config.get(
             "connection", {}
         )
+        # messages published on a channel are confirmed in batch of this size
+        conf = dict(conf, publish_batch_size=publish_batch_size)
 
         return Federation(
-            federation_session_id, party, mq, rabbit_manager, max_message_size, conf, mode
+            federation_session_id, party, mq, rabbit_manager, max_message_size, conf, mode, remote_max_in_flight
         )
 
-    def __init__(self, session_id, party: Party, mq: MQ, rabbit_manager: RabbitManager, max_message_size, conf, mode):
-        super().__init__(session_id=session_id, party=party, mq=mq, max_message_size=max_message_size, conf=conf)
+    def __init__(self, session_id, party: Party, mq: MQ, rabbit_manager: RabbitManager, max_message_size, conf, mode,
+                 remote_max_in_flight=DEFAULT_REMOTE_MAX_IN_FLIGHT):
+        super().__init__(session_id=session_id, party=party, mq=mq, max_message_size=max_message_size, conf=conf,
+                         remote_max_in_flight=remote_max_in_flight)
         self._rabbit_manager = rabbit_manager
         self._vhost_set = set()
         self._mode = mode
@@ -113,6 +120,8 @@ class Federation(FederationBase):
         pass
 
     def destroy(self, parties):
+        self.wait_remote_done()
+        close_connections()
         LOGGER.debug("[rabbitmq.cleanup]start to cleanup...")
         for party in parties:
             if self._party == party:
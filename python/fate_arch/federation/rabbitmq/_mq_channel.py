@@ -15,6 +15,10 @@
 #
 
 import json
+import os
+import threading
+from multiprocessing import util
+
 import pika
 
 from fate_arch.common import log
@@ -22,6 +26,140 @@ from fate_arch.federation._nretry import nretry
 
 LOGGER = log.getLogger()
 
+# number of published messages committed together
+DEFAULT_PUBLISH_BATCH_SIZE = 64
+
+
+class _PooledConnection(object):
+    """
+    a connection shared by all channels of a vhost in one thread, messages are published on a single channel in
+    transaction mode and committed in batch, instead of waiting for a publisher confirm per message.
+    uncommitted messages are kept, and published again if the connection is broken before commit
+    """
+
+    def __init__(self, parameters):
+        self._parameters = parameters
+        self._conn = None
+        self._publish_channel = None
+        self._pending = []
+        self._broken = False
+
+    @property
+    def pending_count(self):
+        return len(self._pending)
+
+    def is_open(self):
+        return self._conn is not None and self._conn.is_open
+
+    def connection(self):
+        if not self.is_open():
+            self.close()
+            self._conn = pika.BlockingConnection(self._parameters)
+        return self._conn
+
+    def _get_publish_channel(self):
+        if not self.is_open() or self._publish_channel is None or not self._publish_channel.is_open:
+            self._publish_channel = self.connection().channel()
+            self._publish_channel.tx_select()
+        return self._publish_channel
+
+    def publish(self, routing_key, body, properties):
+        self._pending.append((routing_key, body, properties))
+        if self._broken:
+            return
+        try:
+            self._get_publish_channel().basic_publish(exchange='', routing_key=routing_key, body=body,
+                                                      properties=properties)
+        except Exception as e:
+            LOGGER.warning(f"publish to {routing_key} failed: {e}, {len(self._pending)} messages will be published "
+                           f"again when commit")
+            self._broken = True
+            self.close()
+
+    def commit(self):
+        if not self._pending:
+            return
+        try:
+            channel = self._get_publish_channel()
+            if self._broken:
+                for routing_key, body, properties in self._pending:
+                    channel.basic_publish(exchange='', routing_key=routing_key, body=body, properties=properties)
+                self._broken = False
+            channel.tx_commit()
+            self._pending = []
+        except Exception:
+            self._broken = True
+            self.close()
+            raise
+
+    def close(self):
+        try:
+            if self._conn is not None and self._conn.is_open:
+                self._conn.close()
+        except Exception as e:
+            LOGGER.exception(e)
+        self._conn = None
+        self._publish_channel = None
+
+
+class _ConnectionPool(object):
+    """
+    pika connections are not thread safe, connections are shared by channels of the same thread,
+    and not inherited by forked processes. connections of exited threads are closed when a new connection
+    is opened, the rest are closed when the process exits, in computing workers as well as in the driver
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._local = None
+        self._all = []
+
+    def get(self, key, parameters) -> _PooledConnection:
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._local = threading.local()
+                self._all = []
+                # finalizers run at exit of processes started by multiprocessing, while atexit does not
+                util.Finalize(None, self.close_all, exitpriority=0)
+            conns = getattr(self._local, "conns", None)
+            if conns is None:
+                conns = self._local.conns = {}
+            if key not in conns:
+                self._close_exited()
+                conns[key] = _PooledConnection(parameters)
+                self._all.append((threading.current_thread(), conns[key]))
+            return conns[key]
+
+    def _close_exited(self):
+        alive = []
+        for thread, conn in self._all:
+            if thread.is_alive():
+                alive.append((thread, conn))
+            else:
+                conn.close()
+        self._all = alive
+
+    def close_all(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                return
+            for _, conn in self._all:
+                conn.close()
+            self._all = []
+            self._local = threading.local()
+
+
+_POOL = _ConnectionPool()
+
+
+def close_connections():
+    """
+    close connections opened by this process, channels created later open new connections
+    """
+    _POOL.close_all()
+
 
 class MQChannel(object):
 
@@ -41,6 +179,7 @@ class MQChannel(object):
                  extra_args: dict):
         self._host = host
         self._port = port
+        self._user = user
         self._credentials = pika.PlainCredentials(user, password)
         self._namespace = namespace
         self._vhost = vhost
@@ -52,7 +191,9 @@ class MQChannel(object):
         self._dst_role = dst_role
         self._conn = None
         self._channel = None
-        self._extra_args = extra_args
+        # extra args are passed to pika connection, except publish_batch_size
+        self._extra_args = dict(extra_args) if extra_args else {}
+        self._publish_batch_size = max(int(self._extra_args.pop("publish_batch_size", DEFAULT_PUBLISH_BATCH_SIZE)), 1)
 
         if "heartbeat" not in self._extra_args:
             self._extra_args["heartbeat"] = 3600
@@ -68,9 +209,10 @@ class MQChannel(object):
     def __repr__(self):
         return self.__str__()
 
-    @nretry
     def produce(self, body, properties: dict):
-        self._get_channel()
+        """
+        messages are committed every publish_batch_size messages, call flush to commit the rest
+        """
         LOGGER.debug(f"send queue: {self._send_queue_name}")
 
         if "headers" in properties:
@@ -87,8 +229,14 @@ class MQChannel(object):
             delivery_mode=1,
         )
 
-        return self._channel.basic_publish(exchange='', routing_key=self._send_queue_name, body=body,
-                                           properties=properties)
+        conn = self._get_conn()
+        conn.publish(self._send_queue_name, body, properties)
+        if conn.pending_count >= self._publish_batch_size:
+            self.flush()
+
+    @nretry
+    def flush(self):
+        self._get_conn().commit()
 
     @nretry
     def consume(self):
@@ -104,7 +252,17 @@ class MQChannel(object):
     @nretry
     def cancel(self):
         self._get_channel()
-        return self._channel.cancel()
+        rtn = self._channel.cancel()
+        # channel is closed so that channels of finished receives do not pile up on the shared connection
+        self._clear()
+        return rtn
+
+    def _get_conn(self):
+        if self._conn is None:
+            parameters = pika.ConnectionParameters(host=self._host, port=self._port, virtual_host=self._vhost,
+                                                   credentials=self._credentials, **self._extra_args)
+            self._conn = _POOL.get((self._host, self._port, self._vhost, self._user), parameters)
+        return self._conn
 
     def _get_channel(self):
         if self._check_alive():
@@ -112,29 +270,16 @@ class MQChannel(object):
         else:
             self._clear()
 
-        if not self._conn:
-            self._conn = pika.BlockingConnection(pika.ConnectionParameters(host=self._host, port=self._port,
-                                                                           virtual_host=self._vhost,
-                                                                           credentials=self._credentials,
-                                                                           **self._extra_args))
-
         if not self._channel:
-            self._channel = self._conn.channel()
-            self._channel.confirm_delivery()
+            self._channel = self._get_conn().connection().channel()
 
     def _clear(self):
         try:
-            if self._conn and self._conn.is_open:
-                self._conn.close()
-            self._conn = None
-
             if self._channel and self._channel.is_open:
                 self._channel.close()
-            self._channel = None
         except Exception as e:
             LOGGER.exception(e)
-            self._conn = None
-            self._channel = None
+        self._channel = None
 
     def _check_alive(self):
-        return self._channel and self._channel.is_open and self._conn and self._conn.is_open
+        return self._channel and self._channel.is_open and self._conn and self._conn.is_open()
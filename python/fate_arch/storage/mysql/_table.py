@@ -14,9 +14,20 @@
 #  limitations under the License.
 #
 
+import itertools
+import queue
+import threading
+
+import pymysql
+
 from fate_arch.storage import StorageEngine, MySQLStoreType
 from fate_arch.storage import StorageTableBase
 
+# rows written by one batch of REPLACE statements, every batch is committed
+DEFAULT_INSERT_BATCH_SIZE = 10000
+# rows fetched from server side cursor at once
+DEFAULT_FETCH_SIZE = 10000
+
 
 class StorageTable(StorageTableBase):
     def __init__(
@@ -80,17 +91,125 @@ class StorageTable(StorageTableBase):
             count = 0
         return count
 
-    def _collect(self, **kwargs) -> list:
+    def _collect(self, fetch_size=DEFAULT_FETCH_SIZE, parallel_reads=1, **kwargs) -> list:
+        """
+        rows are streamed with server side cursors, if parallel_reads > 1, table is split into primary key ranges
+        which are read by concurrent connections, and rows are not in primary key order
+        """
         id_name, feature_name_list, _ = self._get_id_feature_name()
         id_feature_name = [id_name]
         id_feature_name.extend(feature_name_list)
-        sql = "select {} from {}".format(",".join(id_feature_name), self._address.name)
-        data = self.execute(sql)
-        for line in data:
-            feature_list = [str(feature) for feature in list(line[1:])]
-            yield line[0], self.meta.get_id_delimiter().join(feature_list)
+        if parallel_reads > 1:
+            batches = self._read_ranges_parallel(id_feature_name, self.get_key_ranges(parallel_reads), fetch_size)
+        else:
+            batches = self._read_range_with_connection(id_feature_name, (None, None), fetch_size)
+        id_delimiter = self.meta.get_id_delimiter()
+        for lines in batches:
+            for line in lines:
+                feature_list = [str(feature) for feature in list(line[1:])]
+                yield line[0], id_delimiter.join(feature_list)
+
+    def get_key_ranges(self, n):
+        """
+        split primary keys into at most n ranges of nearly the same row count
 
-    def _put_all(self, kv_list, **kwargs):
+        Returns
+        ----------
+        list of (start, end), start is inclusive and end is exclusive, None means unbounded
+        """
+        id_name, _, _ = self._get_id_feature_name()
+        count = self._count()
+        bounds = []
+        for i in range(1, n):
+            sql = "select {} from {} order by {} limit 1 offset {}".format(
+                id_name, self._address.name, id_name, count * i // n)
+            self._cur.execute(sql)
+            ret = self._cur.fetchone()
+            if ret and (not bounds or ret[0] != bounds[-1]):
+                bounds.append(ret[0])
+        edges = [None] + bounds + [None]
+        return list(zip(edges[:-1], edges[1:]))
+
+    def _connect(self):
+        return pymysql.connect(host=self._address.host,
+                               user=self._address.user,
+                               passwd=self._address.passwd,
+                               port=self._address.port,
+                               db=self._address.db)
+
+    def _read_range(self, con, columns, key_range, fetch_size):
+        id_name = columns[0]
+        sql = "select {} from {}".format(",".join(columns), self._address.name)
+        conditions, args = [], []
+        start, end = key_range
+        if start is not None:
+            conditions.append("{} >= %s".format(id_name))
+            args.append(start)
+        if end is not None:
+            conditions.append("{} < %s".format(id_name))
+            args.append(end)
+        if conditions:
+            sql += " where " + " and ".join(conditions)
+        cur = con.cursor(pymysql.cursors.SSCursor)
+        try:
+            cur.execute(sql, args if args else None)
+            while True:
+                lines = cur.fetchmany(fetch_size)
+                if not lines:
+                    break
+                yield lines
+        finally:
+            cur.close()
+
+    def _read_range_with_connection(self, columns, key_range, fetch_size):
+        # a dedicated connection, so that shared cursor of this table is usable while rows are streaming
+        con = self._connect()
+        try:
+            yield from self._read_range(con, columns, key_range, fetch_size)
+        finally:
+            con.close()
+
+    def _read_ranges_parallel(self, columns, key_ranges, fetch_size):
+        batches = queue.Queue(maxsize=2 * len(key_ranges))
+        stop = threading.Event()
+
+        def _put(item):
+            while not stop.is_set():
+                try:
+                    batches.put(item, timeout=1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def _read(key_range):
+            try:
+                for lines in self._read_range_with_connection(columns, key_range, fetch_size):
+                    if not _put(lines):
+                        return
+                _put(None)
+            except BaseException as e:
+                _put(e)
+
+        threads = [threading.Thread(target=_read, args=(key_range,), daemon=True) for key_range in key_ranges]
+        for thread in threads:
+            thread.start()
+        try:
+            running = len(threads)
+            while running:
+                item = batches.get()
+                if item is None:
+                    running -= 1
+                elif isinstance(item, BaseException):
+                    raise item
+                else:
+                    yield item
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+    def _put_all(self, kv_list, batch_size=DEFAULT_INSERT_BATCH_SIZE, **kwargs):
         id_name, feature_name_list, id_delimiter = self._get_id_feature_name()
         feature_sql, feature_list = StorageTable.get_meta_header(feature_name_list)
         id_size = "varchar(100)"
@@ -100,14 +219,18 @@ class StorageTable(StorageTableBase):
             )
         )
         self._cur.execute(create_table)
-        sql = "REPLACE INTO {}({}, {})  VALUES".format(
-            self._address.name, id_name, ",".join(feature_list)
+        columns = [id_name] + feature_list
+        sql = "REPLACE INTO {}({}) VALUES ({})".format(
+            self._address.name, ",".join(columns), ", ".join(["%s"] * len(columns))
         )
-        for kv in kv_list:
-            sql += '("{}", "{}"),'.format(kv[0], '", "'.join(kv[1].split(id_delimiter)))
-        sql = ",".join(sql.split(",")[:-1]) + ";"
-        self._cur.execute(sql)
-        self._con.commit()
+        # executemany packs rows into multi-row statements no longer than max statement length of client
+        kv_iter = iter(kv_list)
+        while True:
+            rows = [[k] + v.split(id_delimiter) for k, v in itertools.islice(kv_iter, batch_size)]
+            if not rows:
+                break
+            self._cur.executemany(sql, rows)
+            self._con.commit()
 
     def _destroy(self):
         sql = "drop table {}".format(self._address.name)
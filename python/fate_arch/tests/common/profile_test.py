@@ -0,0 +1,96 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+
+import json
+import os
+import tempfile
+import unittest
+
+from fate_arch.common import profile
+
+
+class TestTraceSpan(unittest.TestCase):
+    def setUp(self):
+        self.trace_dir = tempfile.TemporaryDirectory()
+        profile.enable_trace_export(os.path.join(self.trace_dir.name, "trace.json"), party="guest:9999")
+        profile.profile_start()
+
+    def tearDown(self):
+        profile._PROFILE_LOG_ENABLED = False
+        profile._TRACE_EXPORT_PATH = None
+        profile._TRACE_PARTY = None
+        profile._SpanRecorder.clear(profile.DEFAULT_MAX_SPANS)
+        self.trace_dir.cleanup()
+
+    def _spans(self):
+        return [e for e in profile.get_trace_events(party="guest:9999") if e["ph"] == "X"]
+
+    def test_span_with_name_and_tag(self):
+        with profile.trace_span("receive_table", "federation.transfer", name="data", tag="data.0",
+                                partitions=4) as span:
+            span.set_args(rows=10)
+        events = self._spans()
+        self.assertEqual(len(events), 1)
+        event = events[0]
+        self.assertEqual(event["name"], "receive_table")
+        self.assertEqual(event["cat"], "federation.transfer")
+        self.assertEqual(event["args"], {"name": "data", "tag": "data.0", "partitions": 4, "rows": 10})
+        self.assertGreaterEqual(event["dur"], 0)
+
+    def test_start_span_with_name_and_tag(self):
+        span = profile.start_span("wait", "federation.wait", name="data", tag="data.0", party_id=10000)
+        span.done()
+        event = self._spans()[0]
+        self.assertEqual(event["name"], "wait")
+        self.assertEqual(event["args"], {"name": "data", "tag": "data.0", "party_id": 10000})
+
+    def test_span_not_recorded_without_profile(self):
+        profile._PROFILE_LOG_ENABLED = False
+        with profile.trace_span("send", "federation.transfer", name="data", tag="data.0"):
+            pass
+        self.assertEqual(self._spans(), [])
+
+    def test_span_not_recorded_without_trace_export(self):
+        profile._TRACE_EXPORT_PATH = None
+        with profile.trace_span("send", "federation.transfer", name="data", tag="data.0"):
+            pass
+        self.assertEqual(self._spans(), [])
+
+    def test_max_spans(self):
+        profile.enable_trace_export(os.path.join(self.trace_dir.name, "trace.json"), max_spans=3)
+        for i in range(5):
+            with profile.trace_span("send", "federation.transfer", name="data", tag=f"data.{i}"):
+                pass
+        self.assertListEqual([e["args"]["tag"] for e in self._spans()], ["data.2", "data.3", "data.4"])
+        self.assertEqual(profile._SpanRecorder._dropped, 2)
+
+    def test_export_chrome_trace(self):
+        with profile.trace_span("serialize", "federation.serialize", name="data", tag="data.0", bytes=8):
+            pass
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "trace.json")
+            profile.export_chrome_trace(path, party="guest:9999")
+            with open(path) as f:
+                trace = json.load(f)
+        process = [e for e in trace["traceEvents"] if e["name"] == "process_name"]
+        self.assertEqual(process[0]["args"]["name"], "guest:9999")
+        spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+        self.assertEqual(spans[0]["args"], {"name": "data", "tag": "data.0", "bytes": 8})
+
+
+if __name__ == '__main__':
+    unittest.main()
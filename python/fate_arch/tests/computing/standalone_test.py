@@ -0,0 +1,45 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import random
+import unittest
+
+from fate_arch._standalone import _hash_key_to_partition, _hash_keys_to_partitions, serialize
+
+
+class TestHashKeysToPartitions(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.keys = [serialize(i) for i in range(1000)]
+        self.keys += [serialize("id_{}".format(i)) for i in range(1000)]
+        self.keys += [bytes(rng.getrandbits(8) for _ in range(rng.randint(0, 64))) for _ in range(1000)]
+
+    def test_same_as_single_key(self):
+        for partitions in list(range(1, 33)) + [64, 100, 127, 1000, 4096, 1 << 16]:
+            self.assertListEqual(_hash_keys_to_partitions(self.keys, partitions).tolist(),
+                                 [_hash_key_to_partition(key, partitions) for key in self.keys], partitions)
+
+    def test_empty_keys(self):
+        self.assertEqual(len(_hash_keys_to_partitions([], 1)), 0)
+        self.assertEqual(len(_hash_keys_to_partitions([], 16)), 0)
+
+    def test_invalid_partitions(self):
+        with self.assertRaises(ValueError):
+            _hash_keys_to_partitions(self.keys, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+
+import unittest
+import uuid
+
+import numpy as np
+
+from fate_arch.common import Party
+from fate_arch.federation._gc import IterationGC
+from fate_arch.federation.inprocess import Broker, Federation
+from fate_arch.federation.inprocess._federation import MQ
+from fate_arch.session import computing_session as session
+
+
+class TestInprocessFederation(unittest.TestCase):
+    def setUp(self):
+        self.session_id = uuid.uuid1().hex
+        session.init(self.session_id)
+        self.broker = Broker()
+        config = self.broker.config
+        mq = MQ(config["host"], config["port"], bytes.fromhex(config["authkey"]))
+        self.guest = Party("guest", "9999")
+        self.host = Party("host", "10000")
+        # small max message size, so that large objects are split into a table of slices
+        self.guest_federation = Federation(self.session_id, self.guest, mq, max_message_size=1024)
+        self.host_federation = Federation(self.session_id, self.host, mq, max_message_size=1024)
+
+    def test_remote_get_object(self):
+        obj = {"weights": np.arange(10), "tag": "round_0"}
+        self.guest_federation.remote(obj, name="obj", tag="0", parties=[self.host], gc=IterationGC())
+        received = self.host_federation.get(name="obj", tag="0", parties=[self.guest], gc=IterationGC())
+        self.assertEqual(len(received), 1)
+        self.assertEqual(received[0]["tag"], "round_0")
+        np.testing.assert_array_equal(received[0]["weights"], obj["weights"])
+
+    def test_remote_get_split_object(self):
+        obj = np.random.RandomState(0).rand(1000)
+        self.host_federation.remote(obj, name="split_obj", tag="0", parties=[self.guest], gc=IterationGC())
+        received = self.guest_federation.get(name="split_obj", tag="0", parties=[self.host], gc=IterationGC())
+        np.testing.assert_array_equal(received[0], obj)
+
+    def test_remote_get_table(self):
+        data = [(str(i), np.ones(3) * i) for i in range(100)]
+        table = session.parallelize(data, include_key=True, partition=4)
+        self.guest_federation.remote(table, name="table", tag="0", parties=[self.host], gc=IterationGC())
+        received = self.host_federation.get(name="table", tag="0", parties=[self.guest], gc=IterationGC())
+        self.assertEqual(received[0].partitions, 4)
+        received_data = sorted(received[0].collect(), key=lambda kv: int(kv[0]))
+        self.assertListEqual([k for k, _ in received_data], [k for k, _ in data])
+        for (_, v), (_, expect) in zip(received_data, data):
+            np.testing.assert_array_equal(v, expect)
+
+    def test_remote_get_in_order(self):
+        for i in range(3):
+            self.guest_federation.remote(i, name="step", tag=str(i), parties=[self.host], gc=IterationGC())
+        # tags are got out of order, messages arrived earlier are cached
+        for i in [2, 0, 1]:
+            self.assertEqual(self.host_federation.get(name="step", tag=str(i), parties=[self.guest],
+                                                      gc=IterationGC()), [i])
+
+    def test_broker_shutdown_after_start(self):
+        broker = Broker()
+        self.assertEqual(broker.stats()["queues"], 0)
+        broker.shutdown()
+
+    def tearDown(self):
+        self.guest_federation.destroy([self.host])
+        self.host_federation.destroy([self.guest])
+        self.assertEqual(self.broker.stats()["queued_messages"], 0)
+        self.broker.shutdown()
+        session.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from fate_arch.common.address import MysqlAddress
+from fate_arch.storage.mysql._table import StorageTable
+
+
+class _SQLiteCursor(object):
+    """
+    sqlite3 stand-in of pymysql cursor, server side cursor class is ignored
+    """
+
+    def __init__(self, cur, calls):
+        self._cur = cur
+        self._calls = calls
+
+    def execute(self, sql, args=None):
+        self._cur.execute(sql.replace("%s", "?"), args or ())
+
+    def executemany(self, sql, args):
+        self._calls.append(len(args))
+        self._cur.executemany(sql.replace("%s", "?"), args)
+
+    def fetchone(self):
+        return self._cur.fetchone()
+
+    def fetchall(self):
+        return self._cur.fetchall()
+
+    def fetchmany(self, size):
+        return self._cur.fetchmany(size)
+
+    def close(self):
+        self._cur.close()
+
+
+class _SQLiteConnection(object):
+    def __init__(self, path, calls):
+        self._con = sqlite3.connect(path, check_same_thread=False)
+        self._calls = calls
+
+    def cursor(self, cursor_class=None):
+        return _SQLiteCursor(self._con.cursor(), self._calls)
+
+    def commit(self):
+        self._calls.append("commit")
+        self._con.commit()
+
+    def close(self):
+        self._con.close()
+
+
+class _Meta(object):
+    def get_schema(self):
+        return {"sid": "id", "header": ["x0", "x1"]}
+
+    def get_id_delimiter(self):
+        return ","
+
+    def get_extend_sid(self):
+        return False
+
+
+class _SQLiteTable(StorageTable):
+    def _connect(self):
+        return _SQLiteConnection(self.path, [])
+
+
+class TestMysqlTable(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), "test.db")
+        self.calls = []
+        con = _SQLiteConnection(self.path, self.calls)
+        self.table = _SQLiteTable(cur=con.cursor(), con=con, address=MysqlAddress(name="test_table"))
+        self.table.path = self.path
+        self.table.meta = _Meta()
+        self.data = [("id_{:05d}".format(i), '{},"v{}"'.format(i, i % 7)) for i in range(1000)]
+
+    def test_put_all(self):
+        self.table._put_all(iter(self.data), batch_size=128)
+        self.assertEqual(self.calls, [128, "commit"] * 7 + [104, "commit"])
+        self.assertEqual(self.table._count(), 1000)
+
+        self.table._put_all([("id_00001", "a,b")])
+        self.assertEqual(self.table._count(), 1000)
+        self.assertEqual(dict(self.table._collect())["id_00001"], "a,b")
+
+    def test_collect(self):
+        self.table._put_all(self.data)
+        self.assertListEqual(list(self.table._collect(fetch_size=33)), self.data)
+        for parallel_reads in [1, 3, 8, 2000]:
+            self.assertListEqual(sorted(self.table._collect(fetch_size=33, parallel_reads=parallel_reads)), self.data)
+
+        key_ranges = self.table.get_key_ranges(4)
+        self.assertListEqual(key_ranges, [(None, "id_00250"), ("id_00250", "id_00500"), ("id_00500", "id_00750"),
+                                          ("id_00750", None)])
+
+
+if __name__ == '__main__':
+    unittest.main()
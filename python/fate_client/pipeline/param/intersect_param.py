@@ -144,12 +144,20 @@ class RSAParam(BaseParam):
 
     random_bit: positive int
         it will define the size of blinding factor in rsa algorithm, default 128
+    blinding_pool_size: positive int
+        if not None, precompute blinding_pool_size pairs of (r, r^e mod n) once and blind every id with product of
+        two randomly drawn pairs, which saves one modular exponentiation per id, while only
+        blinding_pool_size^2 distinct blinding factors are used; ignored when random_base_fraction is set,
+        default None
+    powmod_thread_num: positive int
+        number of threads used for batched modular exponentiation within a partition,
+        takes effect with gmpy2 >= 2.1, default 1
 
     """
 
     def __init__(self, salt='', hash_method='sha256', final_hash_method='sha256',
                  split_calculation=False, random_base_fraction=None, key_length=consts.DEFAULT_KEY_LENGTH,
-                 random_bit=DEFAULT_RANDOM_BIT):
+                 random_bit=DEFAULT_RANDOM_BIT, blinding_pool_size=None, powmod_thread_num=1):
         super().__init__()
         self.salt = salt
         self.hash_method = hash_method
@@ -158,6 +166,8 @@ class RSAParam(BaseParam):
         self.random_base_fraction = random_base_fraction
         self.key_length = key_length
         self.random_bit = random_bit
+        self.blinding_pool_size = blinding_pool_size
+        self.powmod_thread_num = powmod_thread_num
 
     def check(self):
         descr = "rsa param's "
@@ -183,6 +193,9 @@ class RSAParam(BaseParam):
         if self.key_length < 1024:
             raise ValueError(f"key length must be >= 1024")
         self.check_positive_integer(self.random_bit, f"{descr}random_bit")
+        if self.blinding_pool_size is not None:
+            self.check_positive_integer(self.blinding_pool_size, f"{descr}blinding_pool_size")
+        self.check_positive_integer(self.powmod_thread_num, f"{descr}powmod_thread_num")
 
         return True
 
@@ -447,6 +460,11 @@ class IntersectParam(BaseParam):
     run_cache: bool
         whether to store Host's encrypted ids, only valid when intersect method is 'rsa', 'dh', or 'ecdh', default False
 
+    incremental_cache: bool
+        effective only when intersect with cache, only valid when intersect method is 'rsa', default False;
+        if True, only ids added or removed since the cache was generated are encrypted,
+        delta is merged into cached encrypted ids and the updated ids are output as a new cache for later jobs
+
     cardinality_only: bool
         whether to output intersection count(cardinality);
         if sync_cardinality is True, then sync cardinality count with host(s)
@@ -489,7 +507,7 @@ class IntersectParam(BaseParam):
                  with_encode=False, encode_params=EncodeParam(),
                  raw_params=RAWParam(), rsa_params=RSAParam(), dh_params=DHParam(), ecdh_params=ECDHParam(),
                  join_method=consts.INNER_JOIN, new_sample_id: bool = False, sample_id_generator=consts.GUEST,
-                 intersect_cache_param=IntersectCache(), run_cache: bool = False,
+                 intersect_cache_param=IntersectCache(), run_cache: bool = False, incremental_cache: bool = False,
                  cardinality_only: bool = False, sync_cardinality: bool = False, cardinality_method=consts.ECDH,
                  run_preprocess: bool = False,
                  intersect_preprocess_params=IntersectPreProcessParam(),
@@ -508,6 +526,7 @@ class IntersectParam(BaseParam):
         self.sample_id_generator = sample_id_generator
         self.intersect_cache_param = copy.deepcopy(intersect_cache_param)
         self.run_cache = run_cache
+        self.incremental_cache = incremental_cache
         self.repeated_id_process = repeated_id_process
         self.repeated_id_owner = repeated_id_owner
         self.allow_info_share = allow_info_share
@@ -550,6 +569,7 @@ class IntersectParam(BaseParam):
                 raise ValueError(f"Cannot perform left join without sync intersect ids")
 
         self.check_boolean(self.run_cache, f"{descr} run_cache")
+        self.check_boolean(self.incremental_cache, f"{descr} incremental_cache")
         self.encode_params.check()
         self.raw_params.check()
         self.rsa_params.check()
@@ -579,4 +599,10 @@ class IntersectParam(BaseParam):
                 raise ValueError(f"Cache is not available for cardinality_only mode.")
             if self.run_preprocess:
                 raise ValueError(f"Preprocessing does not support cache.")
+        if self.incremental_cache:
+            if self.intersect_method != consts.RSA:
+                raise ValueError("Only rsa method supports incremental cache.")
+            if self.run_cache:
+                raise ValueError("incremental cache takes effect when intersect with cache, "
+                                 "it should not be set with run_cache.")
         return True
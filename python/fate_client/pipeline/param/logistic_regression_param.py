@@ -167,6 +167,11 @@ class HomoLogisticParam(LogisticParam):
     ----------
     aggregate_iters : int, default: 1
         Indicate how many iterations are aggregated once.
+    aggregate_chunk_size : None or int, default: None
+        If int, model weights are sent to arbiter in chunks of this many parameters and aggregated chunk by chunk.
+    compress_type : {None, 'fp16', 'int8'}, default: None
+        If not None, model updates are stochastically quantized onto a 16-bit or 8-bit fixed-point ring before
+        secure aggregation, bytes sent every round are reported as metric 'sent_bytes'.
     """
 
     def __init__(self, penalty='L2',
@@ -177,7 +182,7 @@ class HomoLogisticParam(LogisticParam):
                  decay=1, decay_sqrt=True,
                  aggregate_iters=1, multi_class='ovr', validation_freqs=None,
                  metrics=['auc', 'ks'],
-                 callback_param=CallbackParam()
+                 callback_param=CallbackParam(), aggregate_chunk_size=None, compress_type=None
                  ):
 
         super(HomoLogisticParam, self).__init__(penalty=penalty, tol=tol, alpha=alpha, optimizer=optimizer,
@@ -191,6 +196,8 @@ class HomoLogisticParam(LogisticParam):
                                                 metrics=metrics,
                                                 callback_param=callback_param)
         self.aggregate_iters = aggregate_iters
+        self.aggregate_chunk_size = aggregate_chunk_size
+        self.compress_type = compress_type
 
     def check(self):
 
@@ -199,6 +206,13 @@ class HomoLogisticParam(LogisticParam):
             raise ValueError(
                 "logistic_param's aggregate_iters {} not supported, should be int type".format(
                     self.aggregate_iters))
+        if self.aggregate_chunk_size is not None:
+            self.check_positive_integer(self.aggregate_chunk_size, "logistic_param's aggregate_chunk_size")
+        if self.compress_type is not None:
+            self.compress_type = self.check_and_change_lower(self.compress_type, ['fp16', 'int8'],
+                                                             "logistic_param's compress_type")
+            if self.aggregate_chunk_size is not None:
+                raise ValueError("logistic_param's compress_type can not be used with aggregate_chunk_size")
 
         return True
 
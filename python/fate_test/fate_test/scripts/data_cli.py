@@ -156,7 +156,9 @@ def delete(ctx, include, exclude, glob, yes, suite_type, **kwargs):
 @click.option('--remove-data', is_flag=True, default=False,
               help="The generated data will be deleted")
 @click.option('--parallelize', is_flag=True, default=False,
-              help="It is directly used to upload data, and will not generate data")
+              help="Generate data directly into tables of computing session, instead of csv files to upload")
+@click.option('--processes', type=int,
+              help="Number of processes generating csv data, the default is cpu count, at most 8")
 @click.option('--use-local-data', is_flag=True, default=False,
               help="The existing data of the server will be uploaded, This parameter is not recommended for "
                    "distributed applications")
@@ -164,7 +166,7 @@ def delete(ctx, include, exclude, glob, yes, suite_type, **kwargs):
 @click.pass_context
 def generate(ctx, include, host_data_type, encryption_type, match_rate, sparsity, guest_data_size,
              host_data_size, guest_feature_num, host_feature_num, output_path, force, split_host, upload_data,
-             remove_data, use_local_data, parallelize, **kwargs):
+             remove_data, use_local_data, parallelize, processes, **kwargs):
     """
     create data defined in suite config files
     """
@@ -196,7 +198,8 @@ def generate(ctx, include, host_data_type, encryption_type, match_rate, sparsity
         return
 
     _big_data_task(include, guest_data_size, host_data_size, guest_feature_num, host_feature_num, host_data_type,
-                   config_inst, encryption_type, match_rate, sparsity, force, split_host, output_path, parallelize)
+                   config_inst, encryption_type, match_rate, sparsity, force, split_host, output_path, parallelize,
+                   processes)
     if upload_data:
         if use_local_data:
             _config.use_local_data = 0
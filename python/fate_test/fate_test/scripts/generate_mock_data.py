@@ -1,13 +1,11 @@
 import hashlib
 import json
+import multiprocessing
 import os
-import random
-import threading
 import sys
 import time
 import uuid
 import functools
-import pandas as pd
 import numpy as np
 
 from fate_test._config import Config
@@ -34,20 +32,6 @@ class data_progress:
     def __init__(self, down_load, time_start):
         self.time_start = time_start
         self.down_load = down_load
-        self.time_percent = 0
-        self.switch = True
-
-    def set_switch(self, switch):
-        self.switch = switch
-
-    def get_switch(self):
-        return self.switch
-
-    def set_time_percent(self, time_percent):
-        self.time_percent = time_percent
-
-    def get_time_percent(self):
-        return self.time_percent
 
     def progress(self, percent):
         if percent > 100:
@@ -71,6 +55,12 @@ def remove_file(path):
     os.remove(path)
 
 
+# cells generated and encoded at once, a block is generated by one process
+BLOCK_CELLS = 10 ** 6
+# default number of generating processes, each holds one block in memory
+DEFAULT_MAX_PROCESSES = 8
+
+
 def id_encryption(encryption_type, start_num, end_num):
     if encryption_type == 'md5':
         return [hashlib.md5(bytes(str(value), encoding='utf-8')).hexdigest() for value in range(start_num, end_num)]
@@ -80,125 +70,161 @@ def id_encryption(encryption_type, start_num, end_num):
         return [str(value) for value in range(start_num, end_num)]
 
 
-def get_big_data(guest_data_size, host_data_size, guest_feature_num, host_feature_num, include_path, host_data_type,
-                 conf: Config, encryption_type, match_rate, sparsity, force, split_host, output_path, parallelize):
-    global big_data_dir
+def token_table(tokens):
+    """
+    bytes of tokens in a zero padded uint8 matrix, and length of each token
+    """
+    encoded = [token.encode() for token in tokens]
+    lengths = np.array([len(token) for token in encoded], dtype=int)
+    width = max(lengths.max(initial=0), 1)
+    return np.array(encoded, dtype=f"S{width}").view(np.uint8).reshape(len(encoded), width), lengths
+
+
+def encode_lines(heads, columns):
+    """
+    encode lines as bytes without formatting every value, line i is heads[i] followed by tokens of all columns,
+    every token should end with its separator, and the last separator of a line is replaced by new line
+
+    Parameters
+    ----------
+    heads: list of str, beginning of every line
+    columns: list of (codes, table), codes is a (n, m) int array of token indexes of table made by token_table,
+             tokens of columns are interleaved, i.e. j-th value of a line is made of tokens of j-th codes
+    """
+    head_table, head_lengths = token_table(heads)
+    mats = [head_table]
+    masks = [np.arange(head_table.shape[1]) < head_lengths[:, None]]
+    n = len(heads)
+    value_mats, value_masks = [], []
+    for codes, (table, lengths) in columns:
+        value_mats.append(table[codes])
+        value_masks.append(np.arange(table.shape[1]) < lengths[codes][..., None])
+    if columns:
+        mats.append(np.concatenate(value_mats, axis=2).reshape(n, -1))
+        masks.append(np.concatenate(value_masks, axis=2).reshape(n, -1))
+    mask = np.concatenate(masks, axis=1)
+    data = np.concatenate(mats, axis=1)[mask]
+    data[np.cumsum(mask.sum(axis=1)) - 1] = ord("\n")
+    return data.tobytes()
+
+
+@functools.lru_cache(maxsize=None)
+def _value_table(bound, sep):
+    """
+    token of k / 10000 for k in [-bound, bound]
+    """
+    return token_table([repr(k / 10000) + sep for k in range(-bound, bound + 1)])
+
+
+@functools.lru_cache(maxsize=None)
+def _tag_table(feature_nums, sparsity):
+    return token_table([str(x) + ";" for x in range(2019120799, 2019120799 + round(feature_nums / sparsity))])
+
+
+@functools.lru_cache(maxsize=None)
+def _tag_value_header_table(feature_nums):
+    return token_table([f"x{k}:" for k in range(feature_nums)])
+
+
+def encode_block(rng, heads, feature_nums, data_type, label_flag, sparsity):
+    """
+    generate a line of features for every head, returns bytes of lines, for dense data with label_flag,
+    label is the first value after head
+    """
+    n = len(heads)
+    if data_type == 'dense':
+        if label_flag:
+            heads = [f"{head}{y}," for head, y in zip(heads, rng.randint(0, 2, size=n))]
+        codes = rng.randint(-10000, 10000, size=(n, feature_nums)) + 10000
+        columns = [(codes, _value_table(10000, ","))]
+    elif data_type == 'tag_value':
+        # 4 decimals of standard normal values, clipped at 6 sigma
+        codes = np.clip(np.round(rng.randn(n, feature_nums) * 10000), -60000, 60000).astype(int) + 60000
+        header_codes = np.broadcast_to(np.arange(feature_nums), (n, feature_nums))
+        columns = [(header_codes, _tag_value_header_table(feature_nums)), (codes, _value_table(60000, ";"))]
+    elif data_type == 'tag':
+        table = _tag_table(feature_nums, sparsity)
+        columns = [(rng.randint(0, len(table[1]), size=(n, feature_nums)), table)]
+    else:
+        raise ValueError(f"Unknown data type: {data_type}")
+    return encode_lines(heads, columns)
 
-    def list_tag_value(feature_nums, head):
-        # data = ''
-        # for f in range(feature_nums):
-        #     data += head[f] + ':' + str(round(np.random.randn(), 4)) + ";"
-        # return data[:-1]
-        return ";".join([head[k] + ':' + str(round(v, 4)) for k, v in enumerate(np.random.randn(feature_nums))])
 
-    def list_tag(feature_nums, data_list):
-        data = ''
-        for f in range(feature_nums):
-            data += random.choice(data_list) + ";"
-        return data[:-1]
+def generate_block(start_num, end_num, seed, encryption_type, with_id=True, **kwargs):
+    """
+    generate lines of ids in [start_num, end_num), which only depend on seed and start_num,
+    returns ids and bytes of lines, lines start with "id," if with_id
+    """
+    rng = np.random.RandomState([seed, start_num])
+    ids = id_encryption(encryption_type, start_num, end_num)
+    heads = [f"{i}," for i in ids] if with_id else [""] * len(ids)
+    return ids, encode_block(rng, heads, **kwargs)
 
-    def _generate_tag_value_data(data_path, start_num, end_num, feature_nums, progress):
-        data_num = end_num - start_num
-        section_data_size = round(data_num / 100)
-        iteration = round(data_num / section_data_size)
-        head = ['x' + str(i) for i in range(feature_nums)]
-        for batch in range(iteration + 1):
-            progress.set_time_percent(batch)
-            output_data = pd.DataFrame(columns=["id"])
-            if section_data_size * (batch + 1) <= data_num:
-                output_data["id"] = id_encryption(encryption_type, section_data_size * batch + start_num,
-                                                  section_data_size * (batch + 1) + start_num)
-                slicing_data_size = section_data_size
-            elif section_data_size * batch < data_num:
-                output_data['id'] = id_encryption(encryption_type, section_data_size * batch + start_num, end_num)
-                slicing_data_size = data_num - section_data_size * batch
-            else:
-                break
-            feature = [list_tag_value(feature_nums, head) for i in range(slicing_data_size)]
-            output_data['feature'] = feature
-            output_data.to_csv(data_path, mode='a+', index=False, header=False)
 
-    def _generate_dens_data(data_path, start_num, end_num, feature_nums, label_flag, progress):
-        if label_flag:
-            head_1 = ['id', 'y']
+def split_blocks(start_num, end_num, feature_nums):
+    block_rows = max(1, BLOCK_CELLS // max(feature_nums, 1))
+    return [(start, min(start + block_rows, end_num)) for start in range(start_num, end_num, block_rows)]
+
+
+def _csv_block(args):
+    start_num, end_num, seed, kwargs = args
+    return generate_block(start_num, end_num, seed, **kwargs)[1]
+
+
+def _table_block_rows(_, block, seed, kwargs):
+    start_num, end_num = block
+    ids, lines = generate_block(start_num, end_num, seed, with_id=False, **kwargs)
+    return list(zip(ids, lines.decode().split("\n")))
+
+
+def generate_csv(data_path, start_num, end_num, header, processes, progress=None, **kwargs):
+    """
+    blocks are generated by processes, and written to data_path in order as soon as they are ready
+    """
+    processes = processes if processes else min(os.cpu_count(), DEFAULT_MAX_PROCESSES)
+    seed = np.random.randint(2 ** 31)
+    blocks = split_blocks(start_num, end_num, kwargs.get("feature_nums", 1))
+    tasks = [(start, end, seed, kwargs) for start, end in blocks]
+    data_num = max(end_num - start_num, 1)
+    pool = multiprocessing.Pool(min(processes, len(tasks))) if processes > 1 and len(tasks) > 1 else None
+    try:
+        results = pool.imap(_csv_block, tasks) if pool is not None else map(_csv_block, tasks)
+        with open(data_path, 'wb') as f:
+            if header:
+                f.write((",".join(header) + "\n").encode())
+            for (start, end), lines in zip(blocks, results):
+                f.write(lines)
+                if progress is not None:
+                    progress.progress((end - start_num) / data_num * 100)
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+
+def get_big_data(guest_data_size, host_data_size, guest_feature_num, host_feature_num, include_path, host_data_type,
+                 conf: Config, encryption_type, match_rate, sparsity, force, split_host, output_path, parallelize,
+                 processes=None):
+    global big_data_dir
+
+    def _generate_data(data_path, start_num, end_num, feature_nums, label_flag, data_type, progress):
+        if data_type == 'dense':
+            header = ['id', 'y'] if label_flag else ['id']
+            header += ['x' + str(i) for i in range(feature_nums)]
         else:
-            head_1 = ['id']
-        data_num = end_num - start_num
-        head_2 = ['x' + str(i) for i in range(feature_nums)]
-        df_data_1 = pd.DataFrame(columns=head_1)
-        head_data = pd.DataFrame(columns=head_1 + head_2)
-        head_data.to_csv(data_path, mode='a+', index=False)
-        section_data_size = round(data_num / 100)
-        iteration = round(data_num / section_data_size)
-        for batch in range(iteration + 1):
-            progress.set_time_percent(batch)
-            if section_data_size * (batch + 1) <= data_num:
-                df_data_1["id"] = id_encryption(encryption_type, section_data_size * batch + start_num,
-                                                section_data_size * (batch + 1) + start_num)
-                slicing_data_size = section_data_size
-            elif section_data_size * batch < data_num:
-                df_data_1 = pd.DataFrame(columns=head_1)
-                df_data_1["id"] = id_encryption(encryption_type, section_data_size * batch + start_num, end_num)
-                slicing_data_size = data_num - section_data_size * batch
-            else:
-                break
-            if label_flag:
-                df_data_1["y"] = [round(np.random.random()) for x in range(slicing_data_size)]
-            feature = np.random.randint(-10000, 10000, size=[slicing_data_size, feature_nums]) / 10000
-            df_data_2 = pd.DataFrame(feature, columns=head_2)
-            output_data = pd.concat([df_data_1, df_data_2], axis=1)
-            output_data.to_csv(data_path, mode='a+', index=False, header=False)
-
-    def _generate_tag_data(data_path, start_num, end_num, feature_nums, sparsity, progress):
-        data_num = end_num - start_num
-        section_data_size = round(data_num / 100)
-        iteration = round(data_num / section_data_size)
-        valid_set = [x for x in range(2019120799, 2019120799 + round(feature_nums / sparsity))]
-        data = list(map(str, valid_set))
-        for batch in range(iteration + 1):
-            progress.set_time_percent(batch)
-            output_data = pd.DataFrame(columns=["id"])
-            if section_data_size * (batch + 1) <= data_num:
-                output_data["id"] = id_encryption(encryption_type, section_data_size * batch + start_num,
-                                                  section_data_size * (batch + 1) + start_num)
-                slicing_data_size = section_data_size
-            elif section_data_size * batch < data_num:
-                output_data["id"] = id_encryption(encryption_type, section_data_size * batch + start_num, end_num)
-                slicing_data_size = data_num - section_data_size * batch
-            else:
-                break
-            feature = [list_tag(feature_nums, data_list=data) for i in range(slicing_data_size)]
-            output_data['feature'] = feature
-            output_data.to_csv(data_path, mode='a+', index=False, header=False)
+            header = None
+        generate_csv(data_path, start_num, end_num, header, processes, progress,
+                     encryption_type=encryption_type, feature_nums=feature_nums, data_type=data_type,
+                     label_flag=label_flag, sparsity=sparsity)
 
     def _generate_parallelize_data(start_num, end_num, feature_nums, table_name, namespace, label_flag, data_type,
                                    partition, progress):
-        def expand_id_range(k, v):
-            if label_flag:
-                return [(id_encryption(encryption_type, ids, ids + 1)[0],
-                         ",".join([str(round(np.random.random()))] + [str(round(i, 4)) for i in np.random.randn(v)]))
-                        for ids in range(int(k), min(step + int(k), end_num))]
-            else:
-                if data_type == 'tag':
-                    valid_set = [x for x in range(2019120799, 2019120799 + round(feature_nums / sparsity))]
-                    data = list(map(str, valid_set))
-                    return [(id_encryption(encryption_type, ids, ids + 1)[0],
-                             ";".join([random.choice(data) for i in range(int(v))]))
-                            for ids in range(int(k), min(step + int(k), data_num))]
-
-                elif data_type == 'tag_value':
-                    return [(id_encryption(encryption_type, ids, ids + 1)[0],
-                             ";".join([f"x{i}" + ':' + str(round(i, 4)) for i in np.random.randn(v)]))
-                            for ids in range(int(k), min(step + int(k), data_num))]
-                elif data_type == 'dense':
-                    return [(id_encryption(encryption_type, ids, ids + 1)[0],
-                             ",".join([str(round(i, 4)) for i in np.random.randn(v)]))
-                            for ids in range(int(k), min(step + int(k), data_num))]
         data_num = end_num - start_num
-        step = 10000 if data_num > 10000 else int(data_num / 10)
-        table_list = [(f"{i * step}", f"{feature_nums}") for i in range(int(data_num / step) + start_num)]
-        table = sess.computing.parallelize(table_list, partition=partition, include_key=True)
-        table = table.flatMap(functools.partial(expand_id_range))
+        # rows are generated by computing workers block by block and saved to table, without csv file
+        kwargs = dict(encryption_type=encryption_type, feature_nums=feature_nums, data_type=data_type,
+                      label_flag=label_flag, sparsity=sparsity)
+        table = sess.computing.parallelize(split_blocks(start_num, end_num, feature_nums), partition=partition,
+                                           include_key=False)
+        table = table.flatMap(functools.partial(_table_block_rows, seed=np.random.randint(2 ** 31), kwargs=kwargs))
         if label_flag:
             schema = {"sid": "id", "header": ",".join(["y"] + [f"x{i}" for i in range(feature_nums)])}
         else:
@@ -215,7 +241,7 @@ def get_big_data(guest_data_size, host_data_size, guest_feature_num, host_featur
         storage_session = sess.storage()
         s_table = storage_session.get_table(namespace=table_meta.get_namespace(), name=table_meta.get_name())
         if s_table.count() == data_num:
-            progress.set_time_percent(100)
+            progress.progress(100)
         from fate_flow.manager.data_manager import DataTableTracker
         DataTableTracker.create_table_tracker(
             table_name=table_name,
@@ -247,59 +273,24 @@ def get_big_data(guest_data_size, host_data_size, guest_feature_num, host_featur
             downLoad = f'dataget  [{"#" * int(24 * data_i)}{"-" * (24 - int(24 * data_i))}]  {idx + 1}/{len(data_info)}'
             start = time.time()
             progress = data_progress(downLoad, start)
-            thread = threading.Thread(target=run, args=[progress])
-            thread.start()
 
             try:
                 if 'guest' in data_info[data_name]:
-                    if not parallelize:
-                        _generate_dens_data(out_path, guest_start_num, guest_end_num,
-                                            guest_feature_num, label_flag, progress)
-                    else:
-                        _generate_parallelize_data(
-                            guest_start_num,
-                            guest_end_num,
-                            guest_feature_num,
-                            table_names[idx],
-                            namespaces[idx],
-                            label_flag,
-                            data_type,
-                            partition_list[idx],
-                            progress)
+                    start_num, end_num, feature_num = guest_start_num, guest_end_num, guest_feature_num
                 else:
-                    if data_type == 'tag' and not parallelize:
-                        _generate_tag_data(out_path, host_start_num, host_end_num, host_feature_num, sparsity, progress)
-                    elif data_type == 'tag_value' and not parallelize:
-                        _generate_tag_value_data(out_path, host_start_num, host_end_num, host_feature_num, progress)
-                    elif data_type == 'dense' and not parallelize:
-                        _generate_dens_data(out_path, host_start_num, host_end_num,
-                                            host_feature_num, label_flag, progress)
-                    elif parallelize:
-                        _generate_parallelize_data(
-                            host_start_num,
-                            host_end_num,
-                            host_feature_num,
-                            table_names[idx],
-                            namespaces[idx],
-                            label_flag,
-                            data_type,
-                            partition_list[idx],
-                            progress)
-                progress.set_switch(False)
-                time.sleep(1)
+                    start_num, end_num, feature_num = host_start_num, host_end_num, host_feature_num
+                if parallelize:
+                    _generate_parallelize_data(start_num, end_num, feature_num, table_names[idx], namespaces[idx],
+                                               label_flag, data_type, partition_list[idx], progress)
+                else:
+                    _generate_data(out_path, start_num, end_num, feature_num, label_flag, data_type, progress)
             except Exception:
                 exception_id = uuid.uuid1()
                 echo.echo(f"exception_id={exception_id}")
                 LOGGER.exception(f"exception id: {exception_id}")
             finally:
-                progress.set_switch(False)
                 echo.stdout_newline()
 
-    def run(p):
-        while p.get_switch():
-            time.sleep(1)
-            p.progress(p.get_time_percent())
-
     if not match_rate > 0 or not match_rate <= 1:
         raise Exception(f"The value is between (0-1), Please check match_rate:{match_rate}")
     guest_start_num = host_data_size - int(guest_data_size * match_rate)
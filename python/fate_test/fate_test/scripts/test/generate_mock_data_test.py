@@ -0,0 +1,93 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from fate_test.scripts import generate_mock_data
+
+
+class TestGenerateMockData(unittest.TestCase):
+    def test_encode_lines(self):
+        heads = ["a,", "bb,", "ccc,"]
+        codes = np.array([[0, 1], [1, 1], [2, 0]])
+        table = generate_mock_data.token_table(["x,", "yy,", "zzz,"])
+        lines = generate_mock_data.encode_lines(heads, [(codes, table)])
+        self.assertEqual(lines, b"a,x,yy\nbb,yy,yy\nccc,zzz,x\n")
+        self.assertEqual(generate_mock_data.encode_lines(["a,", "b,"], []), b"a\nb\n")
+
+    def test_generate_block_fields(self):
+        feature_nums = 5
+        for data_type, label_flag, fields in [("dense", True, feature_nums + 2),
+                                              ("dense", False, feature_nums + 1),
+                                              ("tag_value", False, 2),
+                                              ("tag", False, 2)]:
+            ids, lines = generate_mock_data.generate_block(10, 30, 7, None, feature_nums=feature_nums,
+                                                           data_type=data_type, label_flag=label_flag,
+                                                           sparsity=0.2)
+            self.assertListEqual(ids, [str(i) for i in range(10, 30)])
+            lines = lines.decode().split("\n")
+            self.assertEqual(lines[-1], "")
+            lines = lines[:-1]
+            self.assertListEqual([line.split(",")[0] for line in lines], ids)
+            for line in lines:
+                self.assertEqual(len(line.split(",")), fields)
+                if data_type != "dense":
+                    self.assertEqual(len(line.split(",")[1].split(";")), feature_nums)
+
+    def test_generate_block_without_id(self):
+        ids, lines = generate_mock_data.generate_block(0, 20, 7, "md5", feature_nums=3, data_type="dense",
+                                                       label_flag=False, sparsity=0.2)
+        rows = generate_mock_data._table_block_rows(None, (0, 20), 7, dict(encryption_type="md5", feature_nums=3,
+                                                                           data_type="dense", label_flag=False,
+                                                                           sparsity=0.2))
+        self.assertEqual(len(rows), len(ids))
+        self.assertListEqual([k for k, _ in rows], ids)
+        # lines without id are the lines with id with their heads removed
+        self.assertListEqual([v for _, v in rows], [line.split(",", 1)[1] for line in lines.decode().split("\n")[:-1]])
+
+    def test_split_blocks(self):
+        self.assertListEqual(generate_mock_data.split_blocks(0, 10 ** 6, 1000),
+                             [(start, start + 1000) for start in range(0, 10 ** 6, 1000)])
+        self.assertListEqual(generate_mock_data.split_blocks(5, 8, 10 ** 7), [(5, 6), (6, 7), (7, 8)])
+
+    def test_generate_csv_processes(self):
+        block_cells = generate_mock_data.BLOCK_CELLS
+        generate_mock_data.BLOCK_CELLS = 14
+        try:
+            outputs = []
+            with tempfile.TemporaryDirectory() as d:
+                for processes in [1, 3]:
+                    path = os.path.join(d, f"data_{processes}.csv")
+                    np.random.seed(0)
+                    generate_mock_data.generate_csv(path, 0, 50, ["id", "y", "x0", "x1"], processes,
+                                                    encryption_type=None, feature_nums=2, data_type="dense",
+                                                    label_flag=True, sparsity=0.2)
+                    with open(path) as f:
+                        outputs.append(f.read())
+        finally:
+            generate_mock_data.BLOCK_CELLS = block_cells
+        self.assertEqual(outputs[0], outputs[1])
+        lines = outputs[0].split("\n")[:-1]
+        self.assertEqual(lines[0], "id,y,x0,x1")
+        self.assertListEqual([line.split(",")[0] for line in lines[1:]], [str(i) for i in range(50)])
+
+
+if __name__ == '__main__':
+    unittest.main()
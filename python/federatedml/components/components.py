@@ -15,18 +15,29 @@
 #  limitations under the License.
 #
 
+import ast
 import importlib
 import inspect
 import typing
 from pathlib import Path
 
-from federatedml.model_base import ModelBase
-from federatedml.param.base_param import BaseParam
 from federatedml.util import LOGGER
 
 _ml_base = Path(__file__).resolve().parent.parent.parent
 
 
+def _model_base_cls():
+    from federatedml.model_base import ModelBase
+
+    return ModelBase
+
+
+def _base_param_cls():
+    from federatedml.param.base_param import BaseParam
+
+    return BaseParam
+
+
 class _RunnerDecorator:
     def __init__(self, meta: "ComponentMeta") -> None:
         self._roles = set()
@@ -53,12 +64,13 @@ class _RunnerDecorator:
         return self
 
     def __call__(self, cls):
-        if inspect.isclass(cls) and issubclass(cls, ModelBase):
-            for role in self._roles:
-                self._meta._role_to_runner_cls[role] = cls
-        elif inspect.isfunction(cls):
+        # component modules bind lazy getters, ModelBase is only imported when a class is bound directly
+        if inspect.isfunction(cls):
             for role in self._roles:
                 self._meta._role_to_runner_cls_getter[role] = cls
+        elif inspect.isclass(cls) and issubclass(cls, _model_base_cls()):
+            for role in self._roles:
+                self._meta._role_to_runner_cls[role] = cls
         else:
             raise NotImplementedError(f"type of {cls} not supported")
 
@@ -102,10 +114,10 @@ class ComponentMeta:
     @property
     def bind_param(self):
         def _wrap(cls):
-            if inspect.isclass(cls) and issubclass(cls, BaseParam):
-                self._param_cls = cls
-            elif inspect.isfunction(cls):
+            if inspect.isfunction(cls):
                 self._param_cls_getter = cls
+            elif inspect.isclass(cls) and issubclass(cls, _base_param_cls()):
+                self._param_cls = cls
             else:
                 raise NotImplementedError(f"type of {cls} not supported")
             return cls
@@ -149,6 +161,20 @@ def _get_module_name_by_path(path, base):
     return '.'.join(path.resolve().relative_to(base.resolve()).with_suffix('').parts)
 
 
+def _parse_components(path):
+    """
+    find names and aliases of `ComponentMeta("name", "alias", ...)` declared in module without importing it
+    """
+    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    metas = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call) and \
+                getattr(node.func, "id", getattr(node.func, "attr", None)) == ComponentMeta.__name__:
+            if node.args and all(isinstance(arg, ast.Constant) and isinstance(arg.value, str) for arg in node.args):
+                metas.append([arg.value for arg in node.args])
+    return metas
+
+
 def _search_components(path, base):
     try:
         module_name = _get_module_name_by_path(path, base)
@@ -173,26 +199,41 @@ class Components:
     def _components_base(cls):
         return Path(cls.provider_path, 'components').resolve()
 
+    _static_index: typing.Dict[str, typing.Dict[str, dict]] = {}
+
+    @classmethod
+    def _get_static_index(cls) -> typing.Dict[str, dict]:
+        """
+        map component names and aliases to modules by parsing sources of components, the index is built once per
+        process, so that resolving a component only imports the module declaring it
+        """
+        components_base = str(cls._components_base())
+        if components_base not in cls._static_index:
+            names = {}
+            for p in sorted(cls._components_base().glob("**/*.py")):
+                module_name = _get_module_name_by_path(p, cls._module_base())
+                for alias in _parse_components(p):
+                    for name in alias:
+                        names[name] = {"module": module_name}
+                    LOGGER.info(
+                        f"component register {'|'.join(alias)} with cache info {module_name}"
+                    )
+            cls._static_index[components_base] = names
+        return cls._static_index[components_base]
+
     @classmethod
     def get_names(cls) -> typing.Dict[str, dict]:
-        names = {}
-        for p in cls._components_base().glob("**/*.py"):
-            obj_pairs, module_name = _search_components(p, cls._module_base())
-            for name, obj in obj_pairs:
-                for alias in obj.alias:
-                    names[alias] = {"module": module_name}
-                LOGGER.info(
-                    f"component register {obj.name} with cache info {module_name}"
-                )
-        return names
+        return dict(cls._get_static_index())
 
     @classmethod
     def get(cls, name: str, cache) -> ComponentMeta:
-        if cache:
+        if cache and name in cache:
             importlib.import_module(cache[name]["module"])
+        elif name in cls._get_static_index():
+            importlib.import_module(cls._get_static_index()[name]["module"])
         else:
+            # component declared dynamically, fallback to import all modules
             for p in cls._components_base().glob("**/*.py"):
-                module_name = _get_module_name_by_path(p, cls._module_base())
-                importlib.import_module(module_name)
+                _search_components(p, cls._module_base())
 
         return ComponentMeta.get_meta(name)
@@ -1,22 +1,75 @@
+import numpy as np
 from typing import List, Dict
 from federatedml.util import LOGGER
-from federatedml.framework.weights import DictWeights
+from federatedml.framework.weights import DictWeights, FlatWeights
 from federatedml.framework.homo.aggregator.secure_aggregator import SecureAggregatorClient, SecureAggregatorServer
 from federatedml.ensemble.basic_algorithms.decision_tree.tree_core.feature_histogram import HistogramBag, \
     FeatureHistogramWeights
 
 
+def flatten_histograms(hists: List[HistogramBag]):
+    """
+    put g and h of all bins into one float64 buffer, sample counts are kept in a separate array so that they are not
+    compressed, layout records (hid, p_hid, bin numbers of components, shape of g) of every histogram
+    """
+    layout, gh, count = [], [], []
+    for hist in hists:
+        g_shape = ()
+        for component in hist.bag:
+            if len(component) > 0:
+                g_shape = np.shape(component[0][0])
+                break
+        layout.append((hist.hid, hist.p_hid, [len(component) for component in hist.bag], g_shape))
+        for component in hist.bag:
+            for bin_ in component:
+                gh.append(np.ravel(bin_[0]))
+                gh.append(np.ravel(bin_[1]))
+                count.append(bin_[2])
+    gh = np.concatenate(gh).astype(np.float64) if len(gh) > 0 else np.zeros(0, dtype=np.float64)
+    return gh, np.array(count, dtype=np.float64), layout
+
+
+def restore_histograms(gh, count, layout) -> List[HistogramBag]:
+    hists = []
+    gh_offset, count_offset = 0, 0
+    for hid, p_hid, bin_nums, g_shape in layout:
+        g_size = int(np.prod(g_shape, dtype=np.int64))
+        bag = []
+        for bin_num in bin_nums:
+            block = gh[gh_offset: gh_offset + bin_num * 2 * g_size].reshape((bin_num, 2, g_size))
+            component = []
+            for bin_idx in range(bin_num):
+                if g_shape == ():
+                    g, h = float(block[bin_idx, 0, 0]), float(block[bin_idx, 1, 0])
+                else:
+                    g, h = block[bin_idx, 0].reshape(g_shape), block[bin_idx, 1].reshape(g_shape)
+                component.append([g, h, count[count_offset + bin_idx]])
+            bag.append(component)
+            gh_offset += bin_num * 2 * g_size
+            count_offset += bin_num
+        hists.append(HistogramBag(bag, hid=hid, p_hid=p_hid))
+    return hists
+
+
 class DecisionTreeArbiterAggregator(object):
     """
      secure aggregator for secureboosting Arbiter, gather histogram and numbers
     """
 
-    def __init__(self, verbose=False):
-        self.aggregator = SecureAggregatorServer(secure_aggregate=True, communicate_match_suffix='tree_agg')
+    def __init__(self, verbose=False, compress_type=None):
+        self.aggregator = SecureAggregatorServer(secure_aggregate=True, communicate_match_suffix='tree_agg',
+                                                 compress_type=compress_type)
         self.verbose = verbose
+        self.compress_type = compress_type
 
     def aggregate_histogram(self, suffix) -> List[HistogramBag]:
 
+        if self.compress_type is not None:
+            self.aggregator.negotiate_quantize_scale(suffix=suffix + ('gh', ))
+            agg_gh = self.aggregator.aggregate_model(suffix=suffix + ('gh', ))
+            agg_count = self.aggregator.aggregate_model(suffix=suffix + ('count', ))
+            return restore_histograms(agg_gh.decode(), agg_count._weights['count'], agg_gh.layout)
+
         agg_histogram = self.aggregator.aggregate_model(suffix=suffix)
 
         if self.verbose:
@@ -43,17 +96,24 @@ class DecisionTreeClientAggregator(object):
     secure aggregator for secureboosting Client, send histogram and numbers
     """
 
-    def __init__(self, verbose=False):
+    def __init__(self, verbose=False, compress_type=None):
         self.aggregator = SecureAggregatorClient(
             secure_aggregate=True,
             aggregate_type='sum',
-            communicate_match_suffix='tree_agg')
+            communicate_match_suffix='tree_agg',
+            compress_type=compress_type)
         self.verbose = verbose
+        self.compress_type = compress_type
 
     def send_histogram(self, hist: List[HistogramBag], suffix):
         if self.verbose:
             for idx, histbag in enumerate(hist):
                 LOGGER.debug('showing client hist {}'.format(histbag))
+        if self.compress_type is not None:
+            gh, count, layout = flatten_histograms(hist)
+            self.aggregator.send_model(FlatWeights(gh, layout), suffix=suffix + ('gh', ))
+            self.aggregator.send_model(DictWeights(d={'count': count}), suffix=suffix + ('count', ))
+            return
         weights = FeatureHistogramWeights(list_of_histogram_bags=hist)
         self.aggregator.send_model(weights, suffix=suffix)
 
@@ -14,7 +14,7 @@ from federatedml.ensemble import DecisionTreeArbiterAggregator
 class HomoDecisionTreeArbiter(DecisionTree):
 
     def __init__(self, tree_param: DecisionTreeModelParam, valid_feature: dict, epoch_idx: int,
-                 tree_idx: int, flow_id: int):
+                 tree_idx: int, flow_id: int, histogram_compress_type=None):
 
         super(HomoDecisionTreeArbiter, self).__init__(tree_param)
         self.splitter = Splitter(self.criterion_method, self.criterion_params, self.min_impurity_split,
@@ -37,7 +37,7 @@ class HomoDecisionTreeArbiter(DecisionTree):
 
         # secure aggregator
         self.set_flowid(flow_id)
-        self.aggregator = DecisionTreeArbiterAggregator(verbose=False)
+        self.aggregator = DecisionTreeArbiterAggregator(verbose=False, compress_type=histogram_compress_type)
 
         # stored histogram for faster computation {node_id:histogram_bag}
         self.stored_histograms = {}
@@ -26,7 +26,8 @@ class HomoDecisionTreeClient(DecisionTree):
 
     def __init__(self, tree_param: DecisionTreeParam, data_bin=None, bin_split_points: np.array = None,
                  bin_sparse_point=None, g_h=None, valid_feature: dict = None, epoch_idx: int = None,
-                 role: str = None, tree_idx: int = None, flow_id: int = None, mode='train'):
+                 role: str = None, tree_idx: int = None, flow_id: int = None, mode='train',
+                 histogram_compress_type=None):
         """
         Parameters
         ----------
@@ -40,6 +41,7 @@ class HomoDecisionTreeClient(DecisionTree):
         role: host or guest
         flow_id: flow id
         mode: train / predict
+        histogram_compress_type: None, 'fp16' or 'int8', compress g and h of histograms before secure aggregation
         """
 
         super(HomoDecisionTreeClient, self).__init__(tree_param)
@@ -73,7 +75,7 @@ class HomoDecisionTreeClient(DecisionTree):
         if mode == 'train':
             self.role = role
             self.set_flowid(flow_id)
-            self.aggregator = DecisionTreeClientAggregator(verbose=False)
+            self.aggregator = DecisionTreeClientAggregator(verbose=False, compress_type=histogram_compress_type)
 
         elif mode == 'predict':
             self.role, self.aggregator = None, None
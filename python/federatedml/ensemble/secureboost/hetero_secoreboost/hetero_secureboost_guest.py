@@ -19,7 +19,7 @@ from federatedml.protobuf.generated.boosting_tree_model_param_pb2 import Feature
 from federatedml.ensemble.secureboost.secureboost_util.tree_model_io import load_hetero_tree_learner, \
     produce_hetero_tree_learner
 from federatedml.ensemble.secureboost.secureboost_util.boosting_tree_predict import sbt_guest_predict, \
-    mix_sbt_guest_predict, EINI_guest_predict
+    mix_sbt_guest_predict, EINI_guest_predict, leaf_mask_sbt_guest_predict
 from federatedml.ensemble.secureboost.secureboost_util.subsample import goss_sampling
 
 
@@ -65,6 +65,9 @@ class HeteroSecureBoostingTreeGuest(HeteroBoostingGuest):
         self.EINI_inference = False
         self.EINI_random_mask = False
 
+        # leaf mask predict param
+        self.leaf_mask_inference = False
+
     def _init_model(self, param: HeteroSecureBoostParam):
 
         super(HeteroSecureBoostingTreeGuest, self)._init_model(param)
@@ -79,6 +82,7 @@ class HeteroSecureBoostingTreeGuest(HeteroBoostingGuest):
         self.new_ver = param.new_ver
         self.EINI_inference = param.EINI_inference
         self.EINI_random_mask = param.EINI_random_mask
+        self.leaf_mask_inference = param.leaf_mask_inference
 
         # fast sbt param
         self.tree_num_per_party = param.tree_num_per_party
@@ -368,6 +372,17 @@ class HeteroSecureBoostingTreeGuest(HeteroBoostingGuest):
                     self.component_properties.host_party_idlist,
                     predict_cache,
                     False)
+            elif self.leaf_mask_inference:
+                predict_rs = leaf_mask_sbt_guest_predict(
+                    processed_data,
+                    self.hetero_sbt_transfer_variable,
+                    trees,
+                    self.learning_rate,
+                    self.init_score,
+                    self.booster_dim,
+                    predict_cache,
+                    pred_leaf=(
+                        ret_format == 'leaf'))
             else:
                 predict_rs = sbt_guest_predict(
                     processed_data,
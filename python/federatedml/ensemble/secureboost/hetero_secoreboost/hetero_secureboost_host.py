@@ -11,7 +11,7 @@ from federatedml.transfer_variable.transfer_class.hetero_secure_boosting_predict
 from federatedml.ensemble.secureboost.secureboost_util.tree_model_io import produce_hetero_tree_learner, \
     load_hetero_tree_learner
 from federatedml.ensemble.secureboost.secureboost_util.boosting_tree_predict import sbt_host_predict, \
-    mix_sbt_host_predict, EINI_host_predict
+    mix_sbt_host_predict, EINI_host_predict, leaf_mask_sbt_host_predict
 from federatedml.protobuf.generated.boosting_tree_model_meta_pb2 import BoostingTreeModelMeta
 from federatedml.protobuf.generated.boosting_tree_model_meta_pb2 import QuantileMeta
 from federatedml.protobuf.generated.boosting_tree_model_param_pb2 import BoostingTreeModelParam
@@ -52,6 +52,9 @@ class HeteroSecureBoostingTreeHost(HeteroBoostingHost):
         self.EINI_random_mask = False
         self.EINI_complexity_check = False
 
+        # leaf mask predict param
+        self.leaf_mask_inference = False
+
         self.multi_mode = consts.SINGLE_OUTPUT
 
         self.hetero_sbt_transfer_variable = HeteroSecureBoostTransferVariable()
@@ -75,6 +78,7 @@ class HeteroSecureBoostingTreeHost(HeteroBoostingHost):
         self.EINI_inference = param.EINI_inference
         self.EINI_random_mask = param.EINI_random_mask
         self.EINI_complexity_check = param.EINI_complexity_check
+        self.leaf_mask_inference = param.leaf_mask_inference
 
         if self.use_missing:
             self.tree_param.use_missing = self.use_missing
@@ -221,6 +225,8 @@ class HeteroSecureBoostingTreeHost(HeteroBoostingHost):
                 EINI_host_predict(processed_data, trees, sitename, self.component_properties.local_partyid,
                                   self.component_properties.host_party_idlist, self.booster_dim,
                                   self.hetero_sbt_transfer_variable, self.EINI_complexity_check, self.EINI_random_mask,)
+            elif self.leaf_mask_inference:
+                leaf_mask_sbt_host_predict(processed_data, self.hetero_sbt_transfer_variable, trees)
             else:
                 sbt_host_predict(processed_data, self.hetero_sbt_transfer_variable, trees)
 
@@ -21,6 +21,7 @@ class HomoSecureBoostingTreeArbiter(HomoBoostingArbiter):
         self.model_param = HomoSecureBoostParam()
 
         self.multi_mode = consts.SINGLE_OUTPUT
+        self.histogram_compress_type = None
 
     def _init_model(self, boosting_param: HomoSecureBoostParam):
         super(HomoSecureBoostingTreeArbiter, self)._init_model(boosting_param)
@@ -28,6 +29,7 @@ class HomoSecureBoostingTreeArbiter(HomoBoostingArbiter):
         self.zero_as_missing = boosting_param.zero_as_missing
         self.tree_param = boosting_param.tree_param
         self.multi_mode = boosting_param.multi_mode
+        self.histogram_compress_type = boosting_param.histogram_compress_type
         if self.use_missing:
             self.tree_param.use_missing = self.use_missing
             self.tree_param.zero_as_missing = self.zero_as_missing
@@ -56,7 +58,8 @@ class HomoSecureBoostingTreeArbiter(HomoBoostingArbiter):
         self.send_valid_features(valid_feature, epoch_idx, booster_dim)
         flow_id = self.generate_flowid(epoch_idx, booster_dim)
         new_tree = HomoDecisionTreeArbiter(self.tree_param, valid_feature=valid_feature, epoch_idx=epoch_idx,
-                                           flow_id=flow_id, tree_idx=booster_dim)
+                                           flow_id=flow_id, tree_idx=booster_dim,
+                                           histogram_compress_type=self.histogram_compress_type)
         new_tree.fit()
 
         return new_tree
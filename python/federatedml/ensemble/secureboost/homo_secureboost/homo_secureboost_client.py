@@ -1,7 +1,6 @@
 import copy
 import functools
 import numpy as np
-from typing import List
 from operator import itemgetter
 from federatedml.util import LOGGER
 from federatedml.util import consts
@@ -19,6 +18,8 @@ from federatedml.protobuf.generated.boosting_tree_model_param_pb2 import Feature
 from federatedml.protobuf.generated.boosting_tree_model_param_pb2 import BoostingTreeModelParam
 from federatedml.ensemble.basic_algorithms.decision_tree.tree_core.feature_importance import FeatureImportance
 from federatedml.ensemble.basic_algorithms.decision_tree.homo.homo_decision_tree_client import HomoDecisionTreeClient
+from federatedml.ensemble.secureboost.secureboost_util.compiled_ensemble import CompiledTreeEnsemble, \
+    predict_partition
 
 make_readable_feature_importance = HeteroSecureBoostingTreeGuest.make_readable_feature_importance
 
@@ -43,6 +44,9 @@ class HomoSecureBoostingTreeClient(HomoBoostingClient):
         # mo tree
         self.multi_mode = consts.SINGLE_OUTPUT
 
+        # histogram compression
+        self.histogram_compress_type = None
+
     def _init_model(self, boosting_param: HomoSecureBoostParam):
 
         super(HomoSecureBoostingTreeClient, self)._init_model(boosting_param)
@@ -51,6 +55,7 @@ class HomoSecureBoostingTreeClient(HomoBoostingClient):
         self.tree_param = boosting_param.tree_param
         self.backend = boosting_param.backend
         self.multi_mode = boosting_param.multi_mode
+        self.histogram_compress_type = boosting_param.histogram_compress_type
 
         if self.use_missing:
             self.tree_param.use_missing = self.use_missing
@@ -143,8 +148,8 @@ class HomoSecureBoostingTreeClient(HomoBoostingClient):
     def _sparse_recover(inst, feat_num):
 
         arr = np.zeros(feat_num)
-        for k, v in inst.features.sparse_vec.items():
-            arr[k] = v
+        indices, data = inst.features.get_arrays()
+        arr[indices] = data
         inst.features = arr
         return inst
 
@@ -229,7 +234,8 @@ class HomoSecureBoostingTreeClient(HomoBoostingClient):
             role=self.role,
             flow_id=flow_id,
             tree_idx=booster_dim,
-            mode='train')
+            mode='train',
+            histogram_compress_type=self.histogram_compress_type)
 
         if self.backend == consts.DISTRIBUTED_BACKEND:
             new_tree.fit()
@@ -245,23 +251,6 @@ class HomoSecureBoostingTreeClient(HomoBoostingClient):
 
         return new_tree
 
-    @staticmethod
-    def predict_helper(data, tree_list: List[HomoDecisionTreeClient], init_score, zero_as_missing, use_missing,
-                       learning_rate, class_num=1):
-
-        weight_list = []
-        for tree in tree_list:
-            weight = tree.traverse_tree(data, tree.tree_node, use_missing=use_missing, zero_as_missing=zero_as_missing)
-            weight_list.append(weight)
-
-        weights = np.array(weight_list)
-
-        if class_num > 2:
-            weights = weights.reshape((-1, class_num))
-            return np.sum(weights * learning_rate, axis=0) + init_score
-        else:
-            return np.sum(weights * learning_rate, axis=0) + init_score
-
     def fast_homo_tree_predict(self, data_inst, ret_format='std'):
 
         assert ret_format in ['std', 'raw'], 'illegal ret format'
@@ -277,10 +266,11 @@ class HomoSecureBoostingTreeClient(HomoBoostingClient):
                                           idx, booster_idx)
                 tree_list.append(model)
 
-        func = functools.partial(self.predict_helper, tree_list=tree_list, init_score=self.init_score,
-                                 zero_as_missing=self.zero_as_missing, use_missing=self.use_missing,
-                                 learning_rate=self.learning_rate, class_num=self.booster_dim)
-        predict_rs = to_predict_data.mapValues(func)
+        compiled = CompiledTreeEnsemble(tree_list, use_missing=self.use_missing,
+                                        zero_as_missing=self.zero_as_missing)
+        func = functools.partial(predict_partition, compiled=compiled, learning_rate=self.learning_rate,
+                                 init_score=self.init_score, class_num=self.booster_dim)
+        predict_rs = to_predict_data.mapPartitions(func, use_previous_behavior=False, preserves_partitioning=True)
 
         if ret_format == 'std':
             return self.score_to_predict_result(data_inst, predict_rs)
@@ -5,8 +5,9 @@ from typing import List
 from federatedml.util import consts
 from federatedml.secureprotol import PaillierEncrypt
 from federatedml.ensemble.basic_algorithms import HeteroDecisionTreeGuest, HeteroDecisionTreeHost, \
-    HeteroFastDecisionTreeGuest, HeteroFastDecisionTreeHost
-from federatedml.ensemble.basic_algorithms.decision_tree.tree_core.decision_tree import DecisionTree, Node
+    HeteroFastDecisionTreeHost
+from federatedml.ensemble.secureboost.secureboost_util.compiled_ensemble import CompiledTreeEnsemble, \
+    scores_partition
 from federatedml.util import LOGGER
 from federatedml.transfer_variable.transfer_class.hetero_secure_boosting_predict_transfer_variable import \
     HeteroSecureBoostTransferVariable
@@ -27,43 +28,35 @@ def generate_leaf_pos_dict(x, tree_num, np_int_type=np.int8):
     return {'node_pos': node_pos, 'reach_leaf_node': reach_leaf_node}
 
 
-def guest_traverse_a_tree(tree: HeteroDecisionTreeGuest, sample, cur_node_idx):
-    reach_leaf = False
-    # only need nid here, predict state is not needed
-    rs = tree.traverse_tree(tree_=tree.tree_node, data_inst=sample, predict_state=(cur_node_idx, -1),
-                            decoder=tree.decode, sitename=tree.sitename, use_missing=tree.use_missing,
-                            split_maskdict=tree.split_maskdict, missing_dir_maskdict=tree.missing_dir_maskdict,
-                            zero_as_missing=tree.zero_as_missing, return_leaf_id=True)
-
-    if not isinstance(rs, tuple):
-        reach_leaf = True
-        leaf_id = rs
-        return leaf_id, reach_leaf
-    else:
-        cur_node_idx = rs[0]
-        return cur_node_idx, reach_leaf
-
-
-def guest_traverse_trees(node_pos, sample, trees: List[HeteroDecisionTreeGuest]):
-    if node_pos['reach_leaf_node'].all():
-        return node_pos
-
-    for t_idx, tree in enumerate(trees):
-
-        cur_node_idx = node_pos['node_pos'][t_idx]
-
-        # reach leaf
-        if cur_node_idx == -1:
-            continue
-
-        rs, reach_leaf = guest_traverse_a_tree(tree, sample, cur_node_idx)
-
-        if reach_leaf:
-            node_pos['reach_leaf_node'][t_idx] = True
-
-        node_pos['node_pos'][t_idx] = rs
-
-    return node_pos
+def guest_traverse_partition(kvs, compiled: CompiledTreeEnsemble):
+    """
+    kvs: iterator of (key, (node_pos_dict, sample))
+    move samples of a partition down guest nodes of all trees at once
+    """
+    keys, node_pos_list, samples = [], [], []
+    for k, (node_pos, sample) in kvs:
+        keys.append(k)
+        node_pos_list.append(node_pos)
+        samples.append(sample)
+    if len(keys) == 0:
+        return []
+
+    pos = np.stack([v['node_pos'] for v in node_pos_list])
+    reach_leaf = np.stack([v['reach_leaf_node'] for v in node_pos_list])
+    # idx is set as -1 when leaf pos of a tree is recorded
+    active = ~reach_leaf & (pos != -1)
+    values, missing = compiled.to_feature_matrix(samples)
+    new_pos = compiled.traverse(values, missing, node_pos=np.where(active, pos, 0), active=active)
+    new_reach_leaf = reach_leaf | (active & compiled.reach_leaf(np.where(active, new_pos, 0)))
+    new_pos = np.where(active, new_pos, pos).astype(pos.dtype)
+
+    rs = []
+    for idx, k in enumerate(keys):
+        node_pos = node_pos_list[idx]
+        node_pos['node_pos'] = new_pos[idx]
+        node_pos['reach_leaf_node'] = new_reach_leaf[idx]
+        rs.append((k, node_pos))
+    return rs
 
 
 def merge_predict_pos(node_pos1, node_pos2):
@@ -74,31 +67,22 @@ def merge_predict_pos(node_pos1, node_pos2):
     return node_pos1
 
 
-def add_y_hat(leaf_pos, init_score, learning_rate, trees: List[HeteroDecisionTreeGuest], multi_class_num=None):
-    # finally node pos will hold weights
-    weights = []
-    for leaf_idx, tree in zip(leaf_pos, trees):
-        weights.append(tree.tree_node[int(leaf_idx)].weight)
-    weights = np.array(weights)
-    if multi_class_num > 2:
-        weights = weights.reshape((-1, multi_class_num))
-    return np.sum(weights * learning_rate, axis=0) + init_score
-
-
 def get_predict_scores(
         leaf_pos,
         learning_rate,
         init_score,
         trees: List[HeteroDecisionTreeGuest],
         multi_class_num=-1,
-        predict_cache=None):
+        predict_cache=None,
+        compiled: CompiledTreeEnsemble = None):
     if predict_cache:
         init_score = 0  # prevent init_score re-add
 
-    predict_func = functools.partial(add_y_hat,
-                                     learning_rate=learning_rate, init_score=init_score, trees=trees,
-                                     multi_class_num=multi_class_num)
-    predict_result = leaf_pos.mapValues(predict_func)
+    if compiled is None:
+        compiled = CompiledTreeEnsemble(trees, local_sitename=trees[0].sitename)
+    predict_func = functools.partial(scores_partition, compiled=compiled,
+                                     learning_rate=learning_rate, init_score=init_score, class_num=multi_class_num)
+    predict_result = leaf_pos.mapPartitions(predict_func, use_previous_behavior=False, preserves_partitioning=True)
 
     if predict_cache:
         predict_result = predict_result.join(predict_cache, lambda v1, v2: v1 + v2)
@@ -134,22 +118,22 @@ def merge_leaf_pos(pos1, pos2):
     return pos1 + pos2
 
 
-def traverse_guest_local_trees(node_pos, sample, trees: List[HeteroFastDecisionTreeGuest]):
+def traverse_guest_local_partition(kvs, compiled: CompiledTreeEnsemble):
     """
     in mix mode, a sample can reach leaf directly
+    kvs: iterator of (key, (node_pos, sample))
     """
+    keys, node_pos_list, samples = [], [], []
+    for k, (node_pos, sample) in kvs:
+        keys.append(k)
+        node_pos_list.append(node_pos)
+        samples.append(sample)
+    if len(keys) == 0:
+        return []
 
-    for t_idx, tree in enumerate(trees):
-
-        cur_node_idx = node_pos[t_idx]
-
-        if not tree.use_guest_feat_only_predict_mode:
-            continue
-
-        rs, reach_leaf = guest_traverse_a_tree(tree, sample, cur_node_idx)
-        node_pos[t_idx] = rs
-
-    return node_pos
+    values, missing = compiled.to_feature_matrix(samples)
+    new_pos = compiled.traverse(values, missing, node_pos=np.stack(node_pos_list))
+    return list(zip(keys, new_pos))
 
 
 """
@@ -177,13 +161,16 @@ def sbt_guest_predict(data_inst, transfer_var: HeteroSecureBoostTransferVariable
     generate_func = functools.partial(generate_leaf_pos_dict, tree_num=tree_num, np_int_type=dtype)
     node_pos_tb = data_inst.mapValues(generate_func)  # record node pos
     final_leaf_pos = data_inst.mapValues(lambda x: np.zeros(tree_num, dtype=dtype) + np.nan)  # record final leaf pos
-    traverse_func = functools.partial(guest_traverse_trees, trees=trees)
+    compiled = CompiledTreeEnsemble(trees, local_sitename=trees[0].sitename, use_missing=trees[0].use_missing,
+                                    zero_as_missing=trees[0].zero_as_missing)
+    traverse_func = functools.partial(guest_traverse_partition, compiled=compiled)
     comm_round = 0
 
     while True:
 
         # LOGGER.info('cur predict round is {}'.format(comm_round))
-        node_pos_tb = node_pos_tb.join(data_inst, traverse_func)
+        node_pos_tb = node_pos_tb.join(data_inst, lambda pos, sample: (pos, sample)). \
+            mapPartitions(traverse_func, use_previous_behavior=False, preserves_partitioning=True)
         node_pos_tb, final_leaf_pos = save_leaf_pos_and_mask_leaf_pos(node_pos_tb, final_leaf_pos)
 
         # remove sample that reaches leaves of all trees
@@ -209,7 +196,8 @@ def sbt_guest_predict(data_inst, transfer_var: HeteroSecureBoostTransferVariable
     else:  # get final predict scores from leaf pos
         predict_result = get_predict_scores(leaf_pos=final_leaf_pos, learning_rate=learning_rate,
                                             init_score=init_score, trees=trees,
-                                            multi_class_num=booster_dim, predict_cache=predict_cache)
+                                            multi_class_num=booster_dim, predict_cache=predict_cache,
+                                            compiled=compiled)
         return predict_result
 
 
@@ -222,8 +210,12 @@ def mix_sbt_guest_predict(data_inst, transfer_var: HeteroSecureBoostTransferVari
     node_pos = data_inst.mapValues(lambda x: np.zeros(tree_num, dtype=np.int64))
 
     # traverse local trees
-    traverse_func = functools.partial(traverse_guest_local_trees, trees=trees)
-    guest_leaf_pos = node_pos.join(data_inst, traverse_func)
+    # trees built by host features stay at root since their nodes belong to hosts
+    compiled = CompiledTreeEnsemble(trees, local_sitename=trees[0].sitename, use_missing=trees[0].use_missing,
+                                    zero_as_missing=trees[0].zero_as_missing)
+    traverse_func = functools.partial(traverse_guest_local_partition, compiled=compiled)
+    guest_leaf_pos = node_pos.join(data_inst, lambda pos, sample: (pos, sample)). \
+        mapPartitions(traverse_func, use_previous_behavior=False, preserves_partitioning=True)
 
     # get leaf node from other host parties
     host_leaf_pos_list = transfer_var.host_predict_data.get(idx=-1)
@@ -236,7 +228,8 @@ def mix_sbt_guest_predict(data_inst, transfer_var: HeteroSecureBoostTransferVari
     else:
         predict_result = get_predict_scores(leaf_pos=guest_leaf_pos, learning_rate=learning_rate,
                                             init_score=init_score, trees=trees,
-                                            multi_class_num=booster_dim, predict_cache=predict_cache)
+                                            multi_class_num=booster_dim, predict_cache=predict_cache,
+                                            compiled=compiled)
         return predict_result
 
 
@@ -324,6 +317,91 @@ def mix_sbt_host_predict(data_inst, transfer_var: HeteroSecureBoostTransferVaria
     transfer_var.host_predict_data.remote(leaf_pos, idx=0, role=consts.GUEST)
 
 
+"""
+Leaf mask predict func
+"""
+
+
+def get_leaf_mask_layout(trees):
+    """
+    return: leaf idx maps of trees, leaf node id arrays of trees and uint64 word offsets of trees in a packed mask
+    """
+    id_pos_map_list = get_leaf_idx_map(trees)
+    leaf_id_list = [np.array(sorted(id_pos_map, key=id_pos_map.get), dtype=np.int64) for id_pos_map in id_pos_map_list]
+    word_num = [(len(id_pos_map) + 63) // 64 for id_pos_map in id_pos_map_list]
+    word_offsets = np.concatenate([[0], np.cumsum(word_num)]).astype(np.int64)
+    return id_pos_map_list, leaf_id_list, word_offsets
+
+
+def generate_leaf_mask(data_inst, trees, node_pos_map_list, word_offsets):
+    """
+    mark leaves that are consistent with local splits, a sample goes into both branches of nodes
+    belonging to other parties. Bits of a tree are stored in uint64 words starting at word_offsets[tree_idx]
+    """
+    bits = np.zeros(word_offsets[-1] * 64, dtype=np.bool_)
+    for tree, node_pos_map, offset in zip(trees, node_pos_map_list, word_offsets):
+        candidate_list = []
+        go_to_children_branches(data_inst, tree.tree_node[0], tree, tree.sitename, candidate_list)
+        for node in candidate_list:
+            bits[offset * 64 + node_pos_map[node.id]] = True
+
+    return np.packbits(bits, bitorder='little').view('<u8')
+
+
+def merge_leaf_mask(mask1, mask2):
+    return mask1 & mask2
+
+
+def leaf_mask_to_leaf_pos(leaf_mask, leaf_id_list, word_offsets):
+    bits = np.unpackbits(leaf_mask.view(np.uint8), bitorder='little')
+    leaf_pos = np.zeros(len(leaf_id_list), dtype=np.int64)
+    for t_idx, leaf_ids in enumerate(leaf_id_list):
+        tree_bits = bits[word_offsets[t_idx] * 64: word_offsets[t_idx] * 64 + len(leaf_ids)]
+        hit = np.flatnonzero(tree_bits)
+        if len(hit) != 1:
+            raise ValueError('leaf mask of tree {} hits {} leaves, expect exactly 1'.format(t_idx, len(hit)))
+        leaf_pos[t_idx] = leaf_ids[hit[0]]
+    return leaf_pos
+
+
+def leaf_mask_sbt_guest_predict(data_inst, transfer_var: HeteroSecureBoostTransferVariable,
+                                trees: List[HeteroDecisionTreeGuest], learning_rate, init_score, booster_dim,
+                                predict_cache=None, pred_leaf=False):
+    LOGGER.info('running leaf mask predict')
+
+    node_pos_map_list, leaf_id_list, word_offsets = get_leaf_mask_layout(trees)
+    mask_func = functools.partial(generate_leaf_mask, trees=trees, node_pos_map_list=node_pos_map_list,
+                                  word_offsets=word_offsets)
+    leaf_mask = data_inst.mapValues(mask_func)
+
+    # every host sends its leaf masks only once
+    host_leaf_mask_list = transfer_var.host_predict_data.get(idx=-1, suffix='leaf_mask')
+    for host_leaf_mask in host_leaf_mask_list:
+        leaf_mask = leaf_mask.join(host_leaf_mask, merge_leaf_mask)
+
+    leaf_pos = leaf_mask.mapValues(functools.partial(leaf_mask_to_leaf_pos, leaf_id_list=leaf_id_list,
+                                                     word_offsets=word_offsets))
+
+    if pred_leaf:  # return leaf position only
+        return leaf_pos
+    else:
+        predict_result = get_predict_scores(leaf_pos=leaf_pos, learning_rate=learning_rate,
+                                            init_score=init_score, trees=trees,
+                                            multi_class_num=booster_dim, predict_cache=predict_cache)
+        return predict_result
+
+
+def leaf_mask_sbt_host_predict(data_inst, transfer_var: HeteroSecureBoostTransferVariable,
+                               trees: List[HeteroDecisionTreeHost]):
+    LOGGER.info('running leaf mask predict')
+
+    node_pos_map_list, _, word_offsets = get_leaf_mask_layout(trees)
+    mask_func = functools.partial(generate_leaf_mask, trees=trees, node_pos_map_list=node_pos_map_list,
+                                  word_offsets=word_offsets)
+    leaf_mask = data_inst.mapValues(mask_func)
+    transfer_var.host_predict_data.remote(leaf_mask, idx=0, role=consts.GUEST, suffix='leaf_mask')
+
+
 """
 Fed-EINI predict func
 """
@@ -0,0 +1,258 @@
+import numpy as np
+from federatedml.feature.fate_element_type import NoneType
+from federatedml.feature.sparse_vector import SparseVector
+from federatedml.util import consts
+
+_NUMBA_VALID = False
+try:
+    import numba
+
+    _NUMBA_VALID = True
+except ImportError:
+    pass
+
+
+"""
+Compiled tree ensemble: trees are flattened into node arrays, and a partition of samples
+is traversed over all trees at once
+"""
+
+
+class CompiledTreeEnsemble(object):
+    """
+    Flat-array representation of a list of decision trees
+
+    Nodes of all trees are concatenated, node i of tree t is stored at tree_offsets[t] + i.
+
+    Parameters
+    ----------
+    trees: list of decision trees, tree.tree_node is a list of Node
+    local_sitename: None or str, if None, every node is evaluated locally(homo tree), else only nodes whose
+                    sitename equal to local_sitename can be evaluated, traversal stops at nodes of other parties.
+                    Split info of local nodes are decoded by tree.decode, tree.split_maskdict and
+                    tree.missing_dir_maskdict
+    use_missing: bool
+    zero_as_missing: bool
+    """
+
+    def __init__(self, trees, local_sitename=None, use_missing=False, zero_as_missing=False):
+
+        self.tree_num = len(trees)
+        self.use_missing = use_missing
+        self.zero_as_missing = zero_as_missing
+
+        node_num = [len(tree.tree_node) for tree in trees]
+        self.tree_offsets = np.concatenate([[0], np.cumsum(node_num)]).astype(np.int64)
+        total = int(self.tree_offsets[-1])
+
+        self.fid = np.zeros(total, dtype=np.int64)
+        self.threshold = np.zeros(total, dtype=np.float64)
+        self.left = np.zeros(total, dtype=np.int64)
+        self.right = np.zeros(total, dtype=np.int64)
+        self.missing_left = np.zeros(total, dtype=np.bool_)
+        self.is_leaf = np.zeros(total, dtype=np.bool_)
+        self.is_local = np.zeros(total, dtype=np.bool_)
+
+        weights = []
+        for t_idx, tree in enumerate(trees):
+            offset = self.tree_offsets[t_idx]
+            for node in tree.tree_node:
+                idx = offset + node.id
+                weights.append(node.weight)
+                if node.is_leaf:
+                    self.is_leaf[idx] = True
+                    self.is_local[idx] = True
+                    self.left[idx] = self.right[idx] = idx
+                    continue
+
+                self.left[idx] = offset + node.left_nodeid
+                self.right[idx] = offset + node.right_nodeid
+                if local_sitename is not None and node.sitename != local_sitename:
+                    continue
+
+                self.is_local[idx] = True
+                if local_sitename is not None:
+                    fid = tree.decode("feature_idx", node.fid, split_maskdict=tree.split_maskdict)
+                    bid = tree.decode("feature_val", node.bid, node.id, split_maskdict=tree.split_maskdict)
+                    missing_dir = tree.decode("missing_dir", node.missing_dir, node.id,
+                                              missing_dir_maskdict=tree.missing_dir_maskdict)
+                else:
+                    fid, bid, missing_dir = node.fid, node.bid, node.missing_dir
+                self.fid[idx] = fid
+                self.threshold[idx] = bid + consts.FLOAT_ZERO
+                self.missing_left[idx] = (missing_dir == -1)
+
+        # leaf weights, a row for every node, multi-output trees have multi-dimension weights
+        self.weight_dim = 1
+        for w in weights:
+            if isinstance(w, np.ndarray) and w.size > 1:
+                self.weight_dim = w.size
+                break
+        self.weights = np.zeros((total, self.weight_dim), dtype=np.float64)
+        for idx, w in enumerate(weights):
+            if w is not None:
+                self.weights[idx] = w
+
+        local_fid = self.fid[self.is_local & ~self.is_leaf]
+        self.feature_num = int(local_fid.max()) + 1 if len(local_fid) > 0 else 0
+
+    """
+    Feature matrix
+    """
+
+    def to_feature_matrix(self, inst_list):
+        """
+        stack features of instances into a dense value matrix and a missing mask, only features used
+        in splits are kept. Missing values are recorded as NoneType in features, and zeros of sparse vectors
+        are treated as missing when use_missing and zero_as_missing are both True
+        """
+        n = len(inst_list)
+        absent_missing = self.use_missing and self.zero_as_missing
+        values = np.zeros((n, self.feature_num), dtype=np.float64)
+        missing = np.full((n, self.feature_num), absent_missing, dtype=np.bool_)
+        if self.feature_num == 0:
+            return values, missing
+
+        rows, cols, data = [], [], []
+        for row_idx, inst in enumerate(inst_list):
+            features = inst.features
+            if isinstance(features, SparseVector):
+                for col_idx, val in features.get_all_data():
+                    if col_idx < self.feature_num:
+                        rows.append(row_idx)
+                        cols.append(col_idx)
+                        data.append(val)
+            else:
+                row_val = features[:self.feature_num]
+                rows.extend([row_idx] * len(row_val))
+                cols.extend(range(len(row_val)))
+                data.extend(row_val)
+
+        rows = np.array(rows, dtype=np.int64)
+        cols = np.array(cols, dtype=np.int64)
+        is_none = np.array([isinstance(v, NoneType) for v in data], dtype=np.bool_)
+        if len(is_none) > 0:
+            values[rows[~is_none], cols[~is_none]] = [v for v, none in zip(data, is_none) if not none]
+        missing[rows, cols] = is_none
+
+        return values, missing
+
+    """
+    Traverse
+    """
+
+    def traverse(self, values, missing, node_pos=None, active=None):
+        """
+        move samples down from node_pos until reaching leaves or nodes that can not be evaluated locally
+
+        values, missing: feature matrix and missing mask, shape (n, feature_num)
+        node_pos: None or int array of shape (n, tree_num), tree-local node ids to start with, default is root
+        active: None or bool array of shape (n, tree_num), positions marked False are not moved
+        return: tree-local node ids, shape (n, tree_num)
+        """
+        n = values.shape[0]
+        if node_pos is None:
+            node_pos = np.zeros((n, self.tree_num), dtype=np.int64)
+        cur = node_pos.astype(np.int64) + self.tree_offsets[:-1]
+        movable = self.is_local[cur] & ~self.is_leaf[cur]
+        if active is not None:
+            movable &= active
+
+        if _NUMBA_VALID:
+            _numba_traverse(cur, movable, values, missing, self.fid, self.threshold, self.left, self.right,
+                            self.missing_left, self.is_leaf, self.is_local)
+        else:
+            self._numpy_traverse(cur, movable, values, missing)
+
+        return cur - self.tree_offsets[:-1]
+
+    def _numpy_traverse(self, cur, movable, values, missing):
+        rows, cols = np.nonzero(movable)
+        while len(rows) > 0:
+            nodes = cur[rows, cols]
+            fid = self.fid[nodes]
+            go_left = np.where(missing[rows, fid], self.missing_left[nodes],
+                               values[rows, fid] <= self.threshold[nodes])
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+            cur[rows, cols] = nodes
+            keep = self.is_local[nodes] & ~self.is_leaf[nodes]
+            rows, cols = rows[keep], cols[keep]
+
+    def reach_leaf(self, node_pos):
+        return self.is_leaf[node_pos.astype(np.int64) + self.tree_offsets[:-1]]
+
+    """
+    Scores
+    """
+
+    def leaf_weights(self, leaf_pos):
+        """
+        leaf_pos: tree-local leaf ids, shape (n, tree_num)
+        return: weights of shape (n, tree_num) or (n, tree_num, weight_dim) for multi-output trees
+        """
+        weights = self.weights[leaf_pos.astype(np.int64) + self.tree_offsets[:-1]]
+        if self.weight_dim == 1:
+            return weights[:, :, 0]
+        return weights
+
+    def predict_scores(self, leaf_pos, learning_rate, init_score, class_num=1):
+        """
+        sum up leaf weights of all trees, trees are arranged as [round_0_class_0, round_0_class_1, ...]
+        when class_num > 2
+        return: a list of scores, one for each sample
+        """
+        weights = self.leaf_weights(leaf_pos) * learning_rate
+        if class_num > 2 and self.weight_dim == 1:
+            weights = weights.reshape((weights.shape[0], -1, class_num))
+        scores = np.sum(weights, axis=1)
+        return [score + init_score for score in scores]
+
+
+if _NUMBA_VALID:
+
+    @numba.njit(cache=True)
+    def _numba_traverse(cur, movable, values, missing, fid, threshold, left, right, missing_left, is_leaf,
+                        is_local):
+        n, tree_num = cur.shape
+        for i in range(n):
+            for t in range(tree_num):
+                if not movable[i, t]:
+                    continue
+                node = cur[i, t]
+                while is_local[node] and not is_leaf[node]:
+                    f = fid[node]
+                    if missing[i, f]:
+                        go_left = missing_left[node]
+                    else:
+                        go_left = values[i, f] <= threshold[node]
+                    node = left[node] if go_left else right[node]
+                cur[i, t] = node
+
+
+"""
+Partition funcs
+"""
+
+
+def predict_partition(kvs, compiled: CompiledTreeEnsemble, learning_rate, init_score, class_num=1):
+    keys, inst_list = [], []
+    for k, inst in kvs:
+        keys.append(k)
+        inst_list.append(inst)
+    if len(keys) == 0:
+        return []
+    values, missing = compiled.to_feature_matrix(inst_list)
+    leaf_pos = compiled.traverse(values, missing)
+    scores = compiled.predict_scores(leaf_pos, learning_rate, init_score, class_num)
+    return list(zip(keys, scores))
+
+
+def scores_partition(kvs, compiled: CompiledTreeEnsemble, learning_rate, init_score, class_num=1):
+    keys, leaf_pos = [], []
+    for k, pos in kvs:
+        keys.append(k)
+        leaf_pos.append(pos)
+    if len(keys) == 0:
+        return []
+    scores = compiled.predict_scores(np.stack(leaf_pos), learning_rate, init_score, class_num)
+    return list(zip(keys, scores))
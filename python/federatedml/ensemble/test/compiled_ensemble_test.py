@@ -0,0 +1,121 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import unittest
+
+import numpy as np
+
+from federatedml.ensemble import Node
+from federatedml.ensemble.basic_algorithms.decision_tree.tree_core.decision_tree import DecisionTree
+from federatedml.ensemble.secureboost.secureboost_util import compiled_ensemble
+from federatedml.ensemble.secureboost.secureboost_util.compiled_ensemble import CompiledTreeEnsemble, \
+    predict_partition
+from federatedml.feature.fate_element_type import NoneType
+from federatedml.feature.instance import Instance
+from federatedml.feature.sparse_vector import SparseVector
+
+
+class _PlainTree(object):
+
+    def __init__(self, tree_node):
+        self.tree_node = tree_node
+
+
+class TestCompiledEnsemble(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.RandomState(42)
+        self.feature_num = 8
+        self.trees = [_PlainTree(self._random_tree(depth=4)) for _ in range(6)]
+        self.insts = [self._random_inst() for _ in range(200)]
+
+    def _random_tree(self, depth):
+        nodes = []
+
+        def build(cur_depth):
+            nid = len(nodes)
+            node = Node(id=nid)
+            nodes.append(node)
+            if cur_depth == depth or self.rng.rand() < 0.2:
+                node.is_leaf = True
+                node.weight = self.rng.randn()
+                return nid
+            node.fid = self.rng.randint(self.feature_num)
+            node.bid = self.rng.randn()
+            node.missing_dir = self.rng.choice([-1, 1])
+            node.left_nodeid = build(cur_depth + 1)
+            node.right_nodeid = build(cur_depth + 1)
+            return nid
+
+        build(0)
+        return nodes
+
+    def _random_inst(self):
+        indices, data = [], []
+        for fid in range(self.feature_num):
+            r = self.rng.rand()
+            if r < 0.2:
+                continue  # sparse zero
+            indices.append(fid)
+            data.append(NoneType() if r < 0.3 else self.rng.randn())
+        return Instance(features=SparseVector(indices, data, shape=self.feature_num))
+
+    @staticmethod
+    def _traverse(inst, tree, use_missing, zero_as_missing):
+        nid = 0
+        while not tree[nid].is_leaf:
+            nid = DecisionTree.go_next_layer(tree[nid], inst, use_missing, zero_as_missing)
+        return nid
+
+    def _check_leaf_pos(self, use_missing, zero_as_missing):
+        compiled = CompiledTreeEnsemble(self.trees, use_missing=use_missing, zero_as_missing=zero_as_missing)
+        values, missing = compiled.to_feature_matrix(self.insts)
+        leaf_pos = compiled.traverse(values, missing)
+        for i, inst in enumerate(self.insts):
+            for t, tree in enumerate(self.trees):
+                self.assertEqual(leaf_pos[i, t], self._traverse(inst, tree.tree_node, use_missing, zero_as_missing))
+
+    def test_leaf_pos(self):
+        for use_missing, zero_as_missing in [(False, False), (True, False), (True, True)]:
+            self._check_leaf_pos(use_missing, zero_as_missing)
+
+    def test_numpy_traverse(self):
+        numba_valid = compiled_ensemble._NUMBA_VALID
+        compiled_ensemble._NUMBA_VALID = False
+        try:
+            self._check_leaf_pos(True, True)
+        finally:
+            compiled_ensemble._NUMBA_VALID = numba_valid
+
+    def test_predict_scores(self):
+        compiled = CompiledTreeEnsemble(self.trees)
+        learning_rate, init_score = 0.3, 0.5
+        rs = dict(predict_partition(enumerate(self.insts), compiled, learning_rate, init_score))
+        for i, inst in enumerate(self.insts):
+            weights = np.array([tree.tree_node[self._traverse(inst, tree.tree_node, False, False)].weight
+                                for tree in self.trees])
+            self.assertAlmostEqual(rs[i], np.sum(weights * learning_rate, axis=0) + init_score)
+
+    def test_multi_class_scores(self):
+        class_num = 3
+        compiled = CompiledTreeEnsemble(self.trees)
+        leaf_pos = compiled.traverse(*compiled.to_feature_matrix(self.insts))
+        scores = compiled.predict_scores(leaf_pos, 0.1, np.zeros(class_num), class_num=class_num)
+        self.assertEqual(scores[0].shape, (class_num,))
+
+
+if __name__ == '__main__':
+    unittest.main()
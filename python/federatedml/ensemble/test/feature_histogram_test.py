@@ -17,7 +17,9 @@
 import unittest
 
 from fate_arch.session import computing_session as session
-from federatedml.ensemble import FeatureHistogram
+from federatedml.ensemble import FeatureHistogram, HistogramBag
+from federatedml.ensemble.basic_algorithms.decision_tree.homo.homo_decision_tree_aggregator import \
+    flatten_histograms, restore_histograms
 from federatedml.feature.instance import Instance
 from federatedml.feature.sparse_vector import SparseVector
 from federatedml.util import consts
@@ -108,6 +110,25 @@ class TestFeatureHistogram(unittest.TestCase):
                 data1[i][j] += data2[i][j]
                 self.assertTrue(data1[i][j] == agg_histograms[i][j])
 
+    def test_flatten_histograms(self):
+
+        hists = [HistogramBag([[[random.random(), random.random(), random.randint(0, 10)] for _ in range(4)]
+                               for _ in range(3)], hid=1, p_hid=0),
+                 HistogramBag([[[np.random.rand(3), np.random.rand(3), random.randint(0, 10)] for _ in range(2)],
+                               []], hid=2, p_hid=0)]
+        gh, count, layout = flatten_histograms(hists)
+        self.assertEqual(len(gh), 3 * 4 * 2 + 2 * 3 * 2)
+        self.assertEqual(len(count), 3 * 4 + 2)
+
+        restored = restore_histograms(gh, count, layout)
+        for hist, restored_hist in zip(hists, restored):
+            self.assertEqual((hist.hid, hist.p_hid), (restored_hist.hid, restored_hist.p_hid))
+            self.assertEqual([len(c) for c in hist.bag], [len(c) for c in restored_hist.bag])
+            for component, restored_component in zip(hist.bag, restored_hist.bag):
+                for bin_, restored_bin in zip(component, restored_component):
+                    for v, restored_v in zip(bin_, restored_bin):
+                        self.assertTrue(np.array_equal(v, restored_v))
+
     def tearDown(self):
         session.stop()
 
@@ -0,0 +1,69 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import unittest
+
+import numpy as np
+
+from federatedml.ensemble import Node
+from federatedml.ensemble.basic_algorithms.decision_tree.tree_core.decision_tree import DecisionTree
+from federatedml.ensemble.secureboost.secureboost_util.boosting_tree_predict import get_leaf_mask_layout, \
+    generate_leaf_mask, merge_leaf_mask, leaf_mask_to_leaf_pos
+from federatedml.feature.instance import Instance
+from federatedml.feature.sparse_vector import SparseVector
+
+
+class _PlainTree(object):
+
+    def __init__(self, tree_node, sitename):
+        self.tree_node = tree_node
+        self.sitename = sitename
+        self.use_missing = False
+        self.zero_as_missing = False
+        self.decode = None
+        self.split_maskdict = None
+        self.missing_dir_maskdict = None
+        self.go_next_layer = DecisionTree.go_next_layer
+
+
+class TestLeafMaskPredict(unittest.TestCase):
+
+    def setUp(self):
+        # root split by guest feature 0, second layer split by host feature 1
+        self.nodes = [Node(id=0, sitename='guest:9999', fid=0, bid=0, left_nodeid=1, right_nodeid=2),
+                      Node(id=1, sitename='host:10000', fid=1, bid=0, left_nodeid=3, right_nodeid=4),
+                      Node(id=2, sitename='host:10000', fid=1, bid=0, left_nodeid=5, right_nodeid=6)] + \
+                     [Node(id=i, is_leaf=True, weight=i) for i in range(3, 7)]
+
+    def test_leaf_mask_intersection(self):
+        tree_num = 70
+        guest_trees = [_PlainTree(self.nodes, 'guest:9999')] * tree_num
+        host_trees = [_PlainTree(self.nodes, 'host:10000')] * tree_num
+        node_pos_map_list, leaf_id_list, word_offsets = get_leaf_mask_layout(guest_trees)
+
+        expect = {(-1, -1): 3, (-1, 1): 4, (1, -1): 5, (1, 1): 6}
+        for (f0, f1), leaf_id in expect.items():
+            inst = Instance(features=SparseVector([0, 1], [f0, f1], shape=2))
+            guest_mask = generate_leaf_mask(inst, guest_trees, node_pos_map_list, word_offsets)
+            host_mask = generate_leaf_mask(inst, host_trees, node_pos_map_list, word_offsets)
+            self.assertEqual(guest_mask.dtype, np.uint64)
+            self.assertEqual(len(guest_mask), tree_num)
+            leaf_pos = leaf_mask_to_leaf_pos(merge_leaf_mask(guest_mask, host_mask), leaf_id_list, word_offsets)
+            self.assertTrue((leaf_pos == leaf_id).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
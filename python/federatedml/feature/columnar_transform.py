@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+"""
+A shared runner of columnar transforms: rows of a partition are stacked into 2-D feature arrays block by block,
+transformed by array operations, and emitted as instances again.
+"""
+
+import functools
+import itertools
+
+import numpy as np
+
+from federatedml.feature.instance import Instance
+
+# max number of rows stacked into one array
+DEFAULT_BLOCK_SIZE = 4096
+
+
+def stack_features(instances):
+    """
+    stack features of instances into a 2-D array, None if they are not dense numeric arrays of the same dtype and shape
+    """
+    first = instances[0]
+    if not isinstance(first, Instance) or not isinstance(first.features, np.ndarray):
+        return None
+    dtype, shape = first.features.dtype, first.features.shape
+    if dtype.kind not in "biuf" or len(shape) != 1:
+        return None
+    for inst in instances:
+        if not isinstance(inst, Instance) or not isinstance(inst.features, np.ndarray) \
+                or inst.features.dtype != dtype or inst.features.shape != shape:
+            return None
+    return np.stack([inst.features for inst in instances])
+
+
+def _iter_blocks(kv_iterator, block_size):
+    while True:
+        block = list(itertools.islice(kv_iterator, block_size))
+        if not block:
+            return
+        yield block
+
+
+def _transform_partition(kv_iterator, array_func, row_func, block_size):
+    result = []
+    for block in _iter_blocks(iter(kv_iterator), block_size):
+        instances = [inst for _, inst in block]
+        features = stack_features(instances)
+        new_features = array_func(features) if features is not None else None
+        if new_features is None:
+            result.extend((key, row_func(inst)) for key, inst in block)
+            continue
+        for (key, inst), row in zip(block, new_features):
+            new_inst = inst.copy(exclusive_attr={"features"})
+            new_inst.features = row
+            result.append((key, new_inst))
+    return result
+
+
+def columnar_transform(data, array_func, row_func, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    transform features of data instances by partitions, keys and other attributes of instances are kept
+    Parameters
+    ----------
+    data: Table of Instance
+    array_func: function of a (n, m) features array, returns a (n, m') array, or None to transform this block by
+                row_func, it may modify the input array in place
+    row_func: function of an instance, applied on rows which could not be stacked, i.e. sparse or non-numeric features
+    block_size: max number of rows stacked at once
+
+    Returns
+    ----------
+    Table of Instance, schema is not set
+    """
+    f = functools.partial(_transform_partition, array_func=array_func, row_func=row_func, block_size=block_size)
+    return data.mapPartitions(f, use_previous_behavior=False, preserves_partitioning=True)
+
+
+def columnar_statistics(data, array_func, row_func, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    statistics of data instances by partitions, array_func or row_func is called on every block of a partition
+    Parameters
+    ----------
+    data: Table of Instance
+    array_func: function of a (n, m) features array, returns statistics of the block, or None to use row_func
+    row_func: function of a list of instances, returns statistics of them
+
+    Returns
+    ----------
+    Table of list of statistics, one list for each partition
+    """
+    def _apply(kv_iterator):
+        result = []
+        for block in _iter_blocks(iter(kv_iterator), block_size):
+            instances = [inst for _, inst in block]
+            features = stack_features(instances)
+            stats = array_func(features) if features is not None else None
+            result.append(row_func(instances) if stats is None else stats)
+        return result
+
+    return data.applyPartitions(_apply)
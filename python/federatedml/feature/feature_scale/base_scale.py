@@ -18,6 +18,9 @@ import copy
 import functools
 from collections import Iterable
 
+import numpy as np
+
+from federatedml.feature.columnar_transform import columnar_transform
 from federatedml.statistic import data_overview
 from federatedml.statistic.data_overview import get_header
 from federatedml.statistic.statics import MultivariateStatisticalSummary
@@ -209,6 +212,14 @@ class BaseScale(object):
 
         return _data
 
+    @staticmethod
+    def reset_feature_range_array(features, column_max_value, column_min_value, scale_column_idx):
+        if scale_column_idx:
+            cols = np.array(scale_column_idx)
+            features[:, cols] = np.clip(features[:, cols], np.array(column_min_value)[cols],
+                                        np.array(column_max_value)[cols])
+        return features
+
     def fit_feature_range(self, data):
         if self.feat_lower is not None or self.feat_upper is not None:
             LOGGER.info("Need fit feature range")
@@ -225,9 +236,10 @@ class BaseScale(object):
                 LOGGER.info("scale_column_idx is None, start to get new one, new scale_column_idx:{}".format(
                     self.scale_column_idx))
 
-            f = functools.partial(self.reset_feature_range, column_max_value=self.column_max_value,
-                                  column_min_value=self.column_min_value, scale_column_idx=self.scale_column_idx)
-            fit_data = data.mapValues(f)
+            kwargs = dict(column_max_value=self.column_max_value, column_min_value=self.column_min_value,
+                          scale_column_idx=self.scale_column_idx)
+            fit_data = columnar_transform(data, functools.partial(self.reset_feature_range_array, **kwargs),
+                                          functools.partial(self.reset_feature_range, **kwargs))
             fit_data.schema = data.schema
 
             return fit_data
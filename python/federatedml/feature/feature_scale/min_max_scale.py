@@ -18,6 +18,7 @@ import copy
 import functools
 import numpy as np
 
+from federatedml.feature.columnar_transform import columnar_transform
 from federatedml.protobuf.generated.feature_scale_meta_pb2 import ScaleMeta
 from federatedml.protobuf.generated.feature_scale_param_pb2 import ScaleParam
 from federatedml.protobuf.generated.feature_scale_param_pb2 import ColumnScaleParam
@@ -53,6 +54,26 @@ class MinMaxScale(BaseScale):
         _data.features = features
         return _data
 
+    @staticmethod
+    def __scale_array(features, max_value_list, min_value_list, scale_value_list, process_cols_list):
+        """
+        Scale operator for stacked features of a partition, the same as __scale
+        """
+        features = features.astype(float)
+        if process_cols_list:
+            cols = np.array(process_cols_list)
+            values = np.clip(features[:, cols], np.array(min_value_list, dtype=float)[cols],
+                             np.array(max_value_list, dtype=float)[cols])
+            features[:, cols] = (values - np.array(min_value_list, dtype=float)[cols]) / \
+                np.array(scale_value_list, dtype=float)[cols]
+        return features
+
+    def _scale_data(self, data):
+        kwargs = dict(max_value_list=self.column_max_value, min_value_list=self.column_min_value,
+                      scale_value_list=self.column_range, process_cols_list=self.scale_column_idx)
+        return columnar_transform(data, functools.partial(MinMaxScale.__scale_array, **kwargs),
+                                  functools.partial(MinMaxScale.__scale, **kwargs))
+
     def fit(self, data):
         """
         Apply min-max scale for input data
@@ -77,10 +98,7 @@ class MinMaxScale(BaseScale):
                 scale = 1
             self.column_range.append(scale)
 
-        f = functools.partial(MinMaxScale.__scale, max_value_list=self.column_max_value,
-                              min_value_list=self.column_min_value, scale_value_list=self.column_range,
-                              process_cols_list=self.scale_column_idx)
-        fit_data = data.mapValues(f)
+        fit_data = self._scale_data(data)
 
         return fit_data
 
@@ -104,11 +122,7 @@ class MinMaxScale(BaseScale):
                 scale = 1
             self.column_range.append(scale)
 
-        f = functools.partial(MinMaxScale.__scale, max_value_list=self.column_max_value,
-                              min_value_list=self.column_min_value, scale_value_list=self.column_range,
-                              process_cols_list=self.scale_column_idx)
-
-        transform_data = data.mapValues(f)
+        transform_data = self._scale_data(data)
 
         return transform_data
 
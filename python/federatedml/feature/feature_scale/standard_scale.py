@@ -19,6 +19,7 @@ import functools
 
 import numpy as np
 
+from federatedml.feature.columnar_transform import columnar_transform
 from federatedml.protobuf.generated.feature_scale_meta_pb2 import ScaleMeta
 from federatedml.protobuf.generated.feature_scale_param_pb2 import ScaleParam
 from federatedml.protobuf.generated.feature_scale_param_pb2 import ColumnScaleParam
@@ -72,6 +73,21 @@ class StandardScale(BaseScale):
         _data.features = features
         return _data
 
+    @staticmethod
+    def __scale_array(features, mean, std, process_cols_list, column_upper=None, column_lower=None):
+        """
+        Scale operator for stacked features of a partition, features are clipped first if column range is given
+        """
+        features = features.astype(float)
+        if process_cols_list:
+            cols = np.array(process_cols_list)
+            values = features[:, cols]
+            if column_upper is not None:
+                values = np.clip(values, np.array(column_lower, dtype=float)[cols],
+                                 np.array(column_upper, dtype=float)[cols])
+            features[:, cols] = (values - np.array(mean, dtype=float)[cols]) / np.array(std, dtype=float)[cols]
+        return features
+
     def fit(self, data):
         """
          Apply standard scale for input data
@@ -115,8 +131,9 @@ class StandardScale(BaseScale):
             else:
                 self.std = [1 for _ in range(self.data_shape)]
 
-        f = functools.partial(self.__scale, mean=self.mean, std=self.std, process_cols_list=self.scale_column_idx)
-        fit_data = data.mapValues(f)
+        kwargs = dict(mean=self.mean, std=self.std, process_cols_list=self.scale_column_idx)
+        fit_data = columnar_transform(data, functools.partial(self.__scale_array, **kwargs),
+                                      functools.partial(self.__scale, **kwargs))
 
         return fit_data
 
@@ -131,10 +148,10 @@ class StandardScale(BaseScale):
         ----------
         transform_data:data_instance, data after transform
         """
-        f = functools.partial(self.__scale_with_column_range, column_upper=self.column_max_value,
-                              column_lower=self.column_min_value,
-                              mean=self.mean, std=self.std, process_cols_list=self.scale_column_idx)
-        transform_data = data.mapValues(f)
+        kwargs = dict(column_upper=self.column_max_value, column_lower=self.column_min_value,
+                      mean=self.mean, std=self.std, process_cols_list=self.scale_column_idx)
+        transform_data = columnar_transform(data, functools.partial(self.__scale_array, **kwargs),
+                                            functools.partial(self.__scale_with_column_range, **kwargs))
 
         return transform_data
 
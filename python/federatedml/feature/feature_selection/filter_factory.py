@@ -39,6 +39,27 @@ def _obtain_single_param(input_param, idx):
     return this_param
 
 
+def _outlier_metric(outlier_param):
+    return str(int(outlier_param.percentile * 100)) + "%"
+
+
+def get_statistic_metrics(filter_methods, model_param: FeatureSelectionParam):
+    """
+    Metrics of statistic model used by filter_methods, without duplicates
+    """
+    metrics = []
+    for filter_name in filter_methods:
+        if filter_name == consts.UNIQUE_VALUE:
+            metrics.append(consts.STANDARD_DEVIATION)
+        elif filter_name == consts.COEFFICIENT_OF_VARIATION_VALUE_THRES:
+            metrics.append(consts.COEFFICIENT_OF_VARIATION)
+        elif filter_name == consts.OUTLIER_COLS:
+            metrics.append(_outlier_metric(model_param.outlier_param))
+        elif filter_name == consts.STATISTIC_FILTER:
+            metrics.extend(model_param.statistic_param.metrics)
+    return list(dict.fromkeys(metrics))
+
+
 def get_filter(filter_name, model_param: FeatureSelectionParam, role=consts.GUEST, model=None, idx=0):
     LOGGER.debug(f"Getting filter name: {filter_name}")
 
@@ -116,7 +137,7 @@ def get_filter(filter_name, model_param: FeatureSelectionParam, role=consts.GUES
     elif filter_name == consts.OUTLIER_COLS:
         outlier_param = model_param.outlier_param
         new_param = feature_selection_param.CommonFilterParam(
-            metrics=str(int(outlier_param.percentile * 100)) + "%",
+            metrics=_outlier_metric(outlier_param),
             filter_type='threshold',
             take_high=False,
             threshold=outlier_param.upper_threshold
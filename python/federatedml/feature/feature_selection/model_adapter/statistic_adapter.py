@@ -36,3 +36,20 @@ class StatisticAdapter(BaseAdapter):
 
             result.add_metric_value(metric_name, metric_info)
         return result
+
+    @staticmethod
+    def convert_statistic_obj(statistic_obj, metrics, iso_model=None):
+        """
+        Convert metrics of a MultivariateStatisticalSummary to isometric model, or add them to iso_model.
+        Numeric metrics are computed in one pass and quantile metrics are queried from one quantile summary.
+        """
+        result = isometric_model.IsometricModel() if iso_model is None else iso_model
+        col_names = [statistic_obj.header[idx] for idx in statistic_obj.cols_index]
+        for metric_name in metrics:
+            if metric_name.endswith("%"):
+                stat_res = statistic_obj.get_quantile_point(float(metric_name[:-1]) / 100)
+            else:
+                stat_res = statistic_obj.get_statics(metric_name)
+            values = [stat_res[col_name] for col_name in col_names]
+            result.add_metric_value(metric_name, isometric_model.SingleMetricInfo(values, col_names))
+        return result
@@ -26,7 +26,7 @@ from federatedml.feature.feature_selection.filter_factory import get_filter
 from federatedml.feature.feature_selection.model_adapter.adapter_factory import adapter_factory
 from federatedml.feature.feature_selection.selection_properties import SelectionProperties
 from federatedml.feature.hetero_feature_selection.base_feature_selection import BaseHeteroFeatureSelection
-from federatedml.param.feature_selection_param import FeatureSelectionParam
+from federatedml.param.feature_selection_param import FeatureSelectionParam, OutlierColsSelectionParam
 from federatedml.param.statistics_param import StatisticsParam
 from federatedml.statistic.data_statistics import DataStatistics
 from federatedml.util import consts
@@ -67,8 +67,33 @@ class TestUniqueValueFilter(unittest.TestCase):
         res_select_properties = filter_obj.fit(data_table, suffix='').selection_properties
         self.assertEqual(res_select_properties.all_left_col_names, [self.header[1]])
 
+    def test_fit_statistic_model(self):
+        data_table = self.gen_data(1000, 8)
+        expect_model = self._make_selection_obj(data_table).isometric_models[consts.STATISTIC_MODEL]
+
+        select_param = FeatureSelectionParam(filter_methods=[consts.UNIQUE_VALUE,
+                                                             consts.COEFFICIENT_OF_VARIATION_VALUE_THRES,
+                                                             consts.OUTLIER_COLS],
+                                             outlier_param=OutlierColsSelectionParam(percentile=0.99,
+                                                                                     upper_threshold=1))
+        selection_obj = BaseHeteroFeatureSelection()
+        selection_obj._init_model(select_param)
+        selection_obj._init_select_params(data_table)
+        selection_obj._fit_statistic_model(data_table)
+        iso_model = selection_obj.isometric_models[consts.STATISTIC_MODEL]
+        self.assertEqual(iso_model.valid_value_name, [consts.STANDARD_DEVIATION, consts.COEFFICIENT_OF_VARIATION,
+                                                      "99%"])
+        for metric_name in [consts.STANDARD_DEVIATION, consts.COEFFICIENT_OF_VARIATION, "99%"]:
+            self.assertTrue(np.allclose(iso_model.get_metric_info(metric_name).get_partial_values(self.header),
+                                        expect_model.get_metric_info(metric_name).get_partial_values(self.header)))
+
+        # metrics of loaded statistic model are reused
+        selection_obj.isometric_models = {consts.STATISTIC_MODEL: expect_model}
+        selection_obj._fit_statistic_model(data_table)
+        self.assertIs(selection_obj.isometric_models[consts.STATISTIC_MODEL], expect_model)
+
     def _make_selection_obj(self, data_table):
-        statistics_param = StatisticsParam(statistics="summary")
+        statistics_param = StatisticsParam(statistics="99%")
         statistics_param.check()
         print(statistics_param.statistics)
         test_obj = DataStatistics()
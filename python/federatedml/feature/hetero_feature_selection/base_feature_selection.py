@@ -22,12 +22,15 @@ import random
 
 from federatedml.feature.feature_selection import filter_factory
 from federatedml.feature.feature_selection.model_adapter.adapter_factory import adapter_factory
+from federatedml.feature.feature_selection.model_adapter.statistic_adapter import StatisticAdapter
 from federatedml.feature.feature_selection.selection_properties import SelectionProperties, CompletedSelectionResults
 from federatedml.model_base import ModelBase
 from federatedml.param.feature_selection_param import FeatureSelectionParam
 from federatedml.protobuf.generated import feature_selection_param_pb2, feature_selection_meta_pb2
 from federatedml.statistic.data_overview import get_header, \
     get_anonymous_header, look_up_names_from_header, header_alignment
+from federatedml.statistic.data_statistics import SYSTEM_ABNORMAL_VALUES
+from federatedml.statistic.statics import MultivariateStatisticalSummary
 from federatedml.transfer_variable.transfer_class.hetero_feature_selection_transfer_variable import \
     HeteroFeatureSelectionTransferVariable
 from federatedml.util import LOGGER
@@ -364,6 +367,33 @@ class BaseHeteroFeatureSelection(ModelBase):
         new_select_properties.add_select_col_names(self.curt_select_properties.left_col_names)
         self.curt_select_properties = new_select_properties
 
+    def _fit_statistic_model(self, data_instances):
+        """
+        Statistic metrics used by filters but not provided by a loaded statistic model are computed on select cols
+        by one shared statistic object, so that filters do not scan data instances respectively
+        """
+        metrics = filter_factory.get_statistic_metrics(self.filter_methods, self.model_param)
+        iso_model = self.isometric_models.get(consts.STATISTIC_MODEL)
+        if iso_model is not None:
+            metrics = [m for m in metrics if m not in iso_model.valid_value_name]
+        if not metrics:
+            return
+
+        if consts.KURTOSIS in metrics:
+            stat_order = 4
+        elif consts.SKEWNESS in metrics:
+            stat_order = 3
+        else:
+            stat_order = 2
+        LOGGER.info(f"Compute statistic metrics {metrics} for filters")
+        self.static_obj = MultivariateStatisticalSummary(data_instances,
+                                                         cols_index=self.curt_select_properties.select_col_indexes,
+                                                         abnormal_list=SYSTEM_ABNORMAL_VALUES,
+                                                         stat_order=stat_order)
+        self.isometric_models[consts.STATISTIC_MODEL] = StatisticAdapter.convert_statistic_obj(self.static_obj,
+                                                                                               metrics,
+                                                                                               iso_model)
+
     def _filter(self, data_instances, method, suffix, idx=0):
         this_filter = filter_factory.get_filter(filter_name=method, model_param=self.model_param,
                                                 role=self.role, model=self, idx=idx)
@@ -436,6 +466,7 @@ class BaseHeteroFeatureSelection(ModelBase):
                                    f"column to participate in fitting filter(s). "
                                    f"All columns from this host will be kept, "
                                    f"but be aware that this may lead to unexpected behavior.")
+        self._fit_statistic_model(data_instances)
         for filter_idx, method in enumerate(self.filter_methods):
             if method in [consts.STATISTIC_FILTER, consts.IV_FILTER, consts.PSI_FILTER,
                           consts.HETERO_SBT_FILTER, consts.HOMO_SBT_FILTER, consts.HETERO_FAST_SBT_FILTER,
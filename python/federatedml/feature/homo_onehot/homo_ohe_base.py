@@ -20,8 +20,6 @@
 #  added by jsweng
 #  base class for OHE alignment
 
-import functools
-
 from federatedml.feature import one_hot_encoder
 from federatedml.param.homo_onehot_encoder_param import HomoOneHotParam
 from federatedml.transfer_variable.transfer_class.homo_onehot_transfer_variable import HomoOneHotTransferVariable
@@ -69,9 +67,7 @@ class HomoOneHotBase(one_hot_encoder.OneHotEncoder):
         ori_header = self.inner_param.header.copy()
 
         # obtain the individual column headers with their values
-        f1 = functools.partial(self.record_new_header,
-                               inner_param=self.inner_param)
-        self.col_maps = data_instances.applyPartitions(f1).reduce(self.merge_col_maps)
+        self.col_maps = self._fit_col_maps(data_instances)
         col_maps = {}
         for col_name, pair_obj in self.col_maps.items():
             values = [x for x in pair_obj.values]
@@ -3,6 +3,7 @@ import functools
 
 import numpy as np
 
+from federatedml.feature.columnar_transform import columnar_statistics, columnar_transform
 from federatedml.feature.fate_element_type import NoneType
 from federatedml.feature.instance import Instance
 from federatedml.statistic import data_overview
@@ -165,6 +166,83 @@ class Imputer(object):
 
         return _data, replace_cols_index_list
 
+    @staticmethod
+    def _missing_value_mask(features, missing_value_list, skip_cols):
+        """
+        mask of values to be replaced in stacked float features, None if some NaN would be left unreplaced,
+        which is kept as NoneType by the row operators
+        """
+        missing_values = [v for v in missing_value_list if isinstance(v, (int, float, np.number))]
+        if missing_values:
+            mask = np.isin(features, missing_values)
+        else:
+            mask = np.zeros(features.shape, dtype=bool)
+        nan_mask = np.isnan(features)
+        if NoneType() in missing_value_list:
+            mask |= nan_mask
+        if skip_cols:
+            mask[:, list(skip_cols)] = False
+        if (nan_mask & ~mask).any():
+            return None
+        return mask
+
+    @staticmethod
+    def _is_numeric_array_input(features, transform_list):
+        return features.dtype == np.float64 and \
+            all(isinstance(v, (int, float, np.number)) for v in transform_list)
+
+    @staticmethod
+    def replace_missing_value_array(features, transform_list, missing_value_list, skip_cols):
+        """
+        array version of replace_missing_value_with_cols_transform_value for stacked float64 features,
+        None if the block should be replaced row by row
+        """
+        if not Imputer._is_numeric_array_input(features, transform_list):
+            return None
+        mask = Imputer._missing_value_mask(features, missing_value_list, skip_cols)
+        if mask is None:
+            return None
+        rows, cols = np.nonzero(mask)
+        features[rows, cols] = np.asarray(transform_list, dtype=float)[cols]
+        return features
+
+    @staticmethod
+    def count_missing_value_array(features, transform_list, missing_value_list, skip_cols):
+        if not Imputer._is_numeric_array_input(features, transform_list):
+            return None
+        mask = Imputer._missing_value_mask(features, missing_value_list, skip_cols)
+        if mask is None:
+            return None
+        return np.append(mask.sum(axis=0), features.shape[0])
+
+    @staticmethod
+    def replace_missing_value_row(instance, transform_list, missing_value_list, skip_cols):
+        return Imputer.replace_missing_value_with_cols_transform_value(Imputer._transform_nan(instance),
+                                                                       transform_list, missing_value_list,
+                                                                       skip_cols)[0]
+
+    @staticmethod
+    def count_missing_value_rows(instances, transform_list, missing_value_list, skip_cols):
+        replaced = [Imputer.replace_missing_value_with_cols_transform_value(Imputer._transform_nan(inst),
+                                                                            transform_list, missing_value_list,
+                                                                            skip_cols)
+                    for inst in instances]
+        return Imputer.__get_impute_number(enumerate(replaced))
+
+    def __columnar_replace(self, data, transform_list, skip_cols):
+        """
+        replace missing values of Instance data block by block, returns replaced data and impute rate of each column
+        """
+        kwargs = dict(transform_list=transform_list, missing_value_list=self.abnormal_value_set,
+                      skip_cols=set(skip_cols))
+        transform_data = columnar_transform(data, functools.partial(Imputer.replace_missing_value_array, **kwargs),
+                                            functools.partial(Imputer.replace_missing_value_row, **kwargs))
+        transform_data.schema = data.schema
+        block_counts = columnar_statistics(data, functools.partial(Imputer.count_missing_value_array, **kwargs),
+                                           functools.partial(Imputer.count_missing_value_rows, **kwargs))
+        impute_number_statics = sum(block_counts.reduce(lambda x, y: x + y))
+        return transform_data, impute_number_statics[:-1] / impute_number_statics[-1]
+
     @staticmethod
     def __get_cols_transform_method(data, replace_method, col_replace_method):
         header = get_header(data)
@@ -242,13 +320,23 @@ class Imputer(object):
         replace_method_per_col, skip_cols = self.__get_cols_transform_method(data, replace_method, col_replace_method)
 
         schema = data.schema
-        if isinstance(data.first()[1], Instance):
+        origin_data = data
+        is_instance = isinstance(data.first()[1], Instance)
+        if is_instance:
             data = data.mapValues(lambda v: Imputer._transform_nan(v))
             data.schema = schema
         cols_transform_value = self.__get_cols_transform_value(data, replace_method_per_col,
                                                                replace_value=replace_value)
         self.skip_cols = skip_cols
         skip_cols = [get_header(data).index(v) for v in skip_cols]
+        self.cols_replace_method = replace_method_per_col
+        if is_instance and output_format is None:
+            transform_data, self.cols_fit_impute_rate = self.__columnar_replace(origin_data, cols_transform_value,
+                                                                                skip_cols)
+            LOGGER.info(
+                "finish replace missing value with cols transform value, replace method is {}".format(replace_method))
+            return transform_data, cols_transform_value
+
         if output_format is not None:
             f = functools.partial(Imputer.replace_missing_value_with_cols_transform_value_format,
                                   transform_list=cols_transform_value, missing_value_list=self.abnormal_value_set,
@@ -259,7 +347,9 @@ class Imputer(object):
                                   skip_cols=set(skip_cols))
 
         transform_data = data.mapValues(f)
-        self.cols_replace_method = replace_method_per_col
+        self.cols_fit_impute_rate = self.__get_impute_rate_from_replace_data(transform_data)
+        transform_data = transform_data.mapValues(lambda v: v[0])
+        transform_data.schema = schema
         LOGGER.info(
             "finish replace missing value with cols transform value, replace method is {}".format(replace_method))
         return transform_data, cols_transform_value
@@ -269,6 +359,11 @@ class Imputer(object):
 
         schema = data.schema
         if isinstance(data.first()[1], Instance):
+            if replace_area == 'col' and output_format is None:
+                transform_data, self.cols_transform_impute_rate = self.__columnar_replace(data, transform_value,
+                                                                                          skip_cols)
+                return transform_data
+
             data = data.mapValues(lambda v: Imputer._transform_nan(v))
             data.schema = schema
 
@@ -293,7 +388,11 @@ class Imputer(object):
         else:
             raise ValueError("Unknown replace area {} in Imputer".format(replace_area))
 
-        return data.mapValues(f)
+        process_data = data.mapValues(f)
+        self.cols_transform_impute_rate = self.__get_impute_rate_from_replace_data(process_data)
+        process_data = process_data.mapValues(lambda v: v[0])
+        process_data.schema = schema
+        return process_data
 
     @staticmethod
     def __get_impute_number(some_data):
@@ -368,8 +467,6 @@ class Imputer(object):
         process_data, cols_transform_value = self.__fit_replace(data, replace_method, replace_value, output_format,
                                                                 col_replace_method=col_replace_method)
 
-        self.cols_fit_impute_rate = self.__get_impute_rate_from_replace_data(process_data)
-        process_data = process_data.mapValues(lambda v: v[0])
         process_data.schema = data.schema
 
         return process_data, cols_transform_value
@@ -397,8 +494,6 @@ class Imputer(object):
         # replace_area = self.support_replace_area[replace_method]
         replace_area = "col"
         process_data = self.__transform_replace(data, transform_value, replace_area, output_format, skip_cols)
-        self.cols_transform_impute_rate = self.__get_impute_rate_from_replace_data(process_data)
-        process_data = process_data.mapValues(lambda v: v[0])
         process_data.schema = data.schema
 
         return process_data
@@ -37,8 +37,13 @@ class Instance(object):
 
     label: None of float, data label
 
+    Instances are stored per row by computing engines, fields are kept in slots and pickled as a tuple
+    to reduce per-row memory and serialized size.
+
     """
 
+    __slots__ = ("inst_id", "weight", "features", "label")
+
     def __init__(self, inst_id=None, weight=None, features=None, label=None):
         self.inst_id = inst_id
         self.weight = weight
@@ -55,18 +60,28 @@ class Instance(object):
         self.features = features
 
     def copy(self, exclusive_attr=None):
-        keywords = {"inst_id", "weight", "features", "label"}
+        keywords = set(self.__slots__)
         if exclusive_attr:
             keywords -= set(exclusive_attr)
         copy_obj = Instance()
         for key in keywords:
-            if key in exclusive_attr:
-                continue
             attr = getattr(self, key)
             setattr(copy_obj, key, attr)
 
         return copy_obj
 
+    def __getstate__(self):
+        return self.inst_id, self.weight, self.features, self.label
+
+    def __setstate__(self, state):
+        if isinstance(state, tuple) and len(state) == 2:
+            # default state of slotted objects, (None, slot dict)
+            state = state[1]
+        if isinstance(state, dict):
+            # pickled by the __dict__ based implementation
+            state = tuple(state.get(key) for key in self.__slots__)
+        self.inst_id, self.weight, self.features, self.label = state
+
     @property
     def with_inst_id(self):
         return self.inst_id is not None
@@ -19,6 +19,7 @@ import math
 
 import numpy as np
 
+from federatedml.feature.columnar_transform import columnar_statistics, columnar_transform
 from federatedml.model_base import ModelBase
 from federatedml.param.onehot_encoder_param import OneHotEncoderParam
 from federatedml.protobuf.generated import onehot_param_pb2, onehot_meta_pb2
@@ -119,6 +120,13 @@ class TransferPair(object):
     def query_name_by_value(self, value):
         return self._transformed_headers.get(value, None)
 
+    def numeric_value_headers(self):
+        """
+        (value, transformed header) pairs of numeric values, sorted by value
+        """
+        return sorted((value, header) for value, header in self._transformed_headers.items()
+                      if not isinstance(value, str))
+
     def encode_new_headers(self):
         for value in self._values:
             self._transformed_headers[value] = "_".join(map(str, [self.name, value]))
@@ -151,10 +159,7 @@ class OneHotEncoder(ModelBase):
     def fit(self, data_instances):
         self._init_params(data_instances)
         self._abnormal_detection(data_instances)
-        f1 = functools.partial(self.record_new_header,
-                               inner_param=self.inner_param)
-
-        self.col_maps = data_instances.applyPartitions(f1).reduce(self.merge_col_maps)
+        self.col_maps = self._fit_col_maps(data_instances)
         LOGGER.debug("Before set_schema in fit, schema is : {}, header: {}".format(self.schema,
                                                                                    self.inner_param.header))
 
@@ -178,14 +183,17 @@ class OneHotEncoder(ModelBase):
         # one_data = data_instances.first()[1].features
         # LOGGER.debug("Before transform, data is : {}".format(one_data))
 
+        result_header_index_mapping = dict(zip(self.inner_param.result_header,
+                                               range(len(self.inner_param.result_header))))
         f = functools.partial(self.transfer_one_instance,
                               col_maps=self.col_maps,
                               header=self.inner_param.header,
                               result_header=self.inner_param.result_header,
-                              result_header_index_mapping=dict(zip(self.inner_param.result_header,
-                                                                   range(len(self.inner_param.result_header)))))
+                              result_header_index_mapping=result_header_index_mapping)
+        array_f = functools.partial(self.transfer_array,
+                                    **self._get_array_transfer_plan(result_header_index_mapping))
 
-        new_data = data_instances.mapValues(f)
+        new_data = columnar_transform(data_instances, array_f, f)
         self.set_schema(new_data)
         self.add_summary('transferred_dimension', len(self.inner_param.result_header))
         LOGGER.debug(f"Final summary: {self.summary()}")
@@ -231,6 +239,35 @@ class OneHotEncoder(ModelBase):
             self.inner_param.add_transform_indexes(self.model_param.transform_col_indexes)
             self.inner_param.add_transform_names(self.model_param.transform_col_names)
 
+    def _fit_col_maps(self, data_instances):
+        f = functools.partial(self.record_new_header_array, inner_param=self.inner_param)
+        row_f = functools.partial(self.record_new_header_rows, inner_param=self.inner_param)
+        block_col_maps = columnar_statistics(data_instances, f, row_f).reduce(lambda x, y: x + y)
+        return functools.reduce(self.merge_col_maps, block_col_maps)
+
+    @staticmethod
+    def record_new_header_rows(instances, inner_param: OneHotInnerParam):
+        return OneHotEncoder.record_new_header(((None, instance) for instance in instances), inner_param)
+
+    @staticmethod
+    def record_new_header_array(features, inner_param: OneHotInnerParam):
+        """
+        Array version of record_new_header on stacked features, None if some value is not finite
+        """
+        if inner_param.transform_indexes and not np.isfinite(features[:, inner_param.transform_indexes]).all():
+            return None
+
+        col_maps = {}
+        for col_idx, col_name in zip(inner_param.transform_indexes, inner_param.transform_names):
+            pair_obj = TransferPair(col_name)
+            col_maps[col_name] = pair_obj
+            feature_values = features[:, col_idx]
+            if (np.ceil(feature_values) != feature_values).any():
+                raise ValueError("Onehot input data support integer or string only")
+            for feature_value in np.unique(feature_values):
+                pair_obj.add_value(int(feature_value))
+        return col_maps
+
     @staticmethod
     def record_new_header(data, inner_param: OneHotInnerParam):
         """
@@ -315,6 +352,42 @@ class OneHotEncoder(ModelBase):
         new_inst.features = feature_array
         return new_inst
 
+    def _get_array_transfer_plan(self, result_header_index_mapping):
+        """
+        Column mappings of transfer_array, which is equivalent to transfer_one_instance on numeric features
+        """
+        pass_src, pass_dst, transform_cols = [], [], []
+        for idx, col_name in enumerate(self.inner_param.header):
+            if col_name in result_header_index_mapping:
+                pass_src.append(idx)
+                pass_dst.append(result_header_index_mapping[col_name])
+                continue
+            pair_obj = self.col_maps.get(col_name, None)
+            if not pair_obj:
+                continue
+            value_headers = pair_obj.numeric_value_headers()
+            values = np.array([value for value, _ in value_headers], dtype=float)
+            dst = np.array([result_header_index_mapping[header] for _, header in value_headers], dtype=int)
+            transform_cols.append((idx, values, dst))
+
+        return dict(pass_src=np.array(pass_src, dtype=int), pass_dst=np.array(pass_dst, dtype=int),
+                    transform_cols=transform_cols, result_dim=len(self.inner_param.result_header))
+
+    @staticmethod
+    def transfer_array(features, pass_src, pass_dst, transform_cols, result_dim):
+        # not transformed values are kept, so result dtype is the same as np.array of a mixed list
+        dtype = np.result_type(features.dtype, int) if len(pass_src) else int
+        new_features = np.zeros((features.shape[0], result_dim), dtype=dtype)
+        new_features[:, pass_dst] = features[:, pass_src]
+        for col_idx, values, dst in transform_cols:
+            if not len(values):
+                continue
+            feature_values = features[:, col_idx]
+            pos = np.minimum(np.searchsorted(values, feature_values), len(values) - 1)
+            rows = np.flatnonzero(values[pos] == feature_values)
+            new_features[rows, dst[pos[rows]]] = 1
+        return new_features
+
     def set_schema(self, data_instance):
         derived_header = dict()
         for col_name, pair_obj in self.col_maps.items():
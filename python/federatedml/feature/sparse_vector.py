@@ -25,6 +25,8 @@
 # Sparse Feature
 # =============================================================================
 
+import numpy as np
+
 
 class SparseVector(object):
     """
@@ -32,24 +34,69 @@ class SparseVector(object):
 
     Parameters
     ----------
-    sparse_vec : dict, record (indice, data) kv tuples
+    indices : sorted ndarray of int32 (int64 if shape exceeds int32), indices of stored data
+
+    data : ndarray, stored data parallel to indices, numeric values are kept in a numeric array,
+           other values (e.g. NoneType) in an object array
 
     shape : the real feature shape of data
 
+    sparse_vec : dict, record (indice, data) kv tuples, built from indices and data on first access.
+                 Once built, the dict is authoritative and may be modified in place, it is folded back into arrays
+                 when the vector is pickled.
+
     """
 
+    __slots__ = ("indices", "data", "shape", "_sparse_vec")
+
     def __init__(self, indices=None, data=None, shape=0):
-        self.sparse_vec = dict(zip(indices, data))
         self.shape = shape
+        self._sparse_vec = None
+        self._set_arrays(indices if indices is not None else [], data if data is not None else [])
+
+    def _index_dtype(self):
+        return np.int32 if self.shape <= np.iinfo(np.int32).max else np.int64
+
+    def _set_arrays(self, indices, data):
+        self.indices, self.data = self._to_arrays(indices, data)
+
+    def _to_arrays(self, indices, data):
+        indices = np.asarray(indices, dtype=self._index_dtype())
+        if isinstance(data, np.ndarray) and data.dtype.kind in "biufO":
+            values = data
+        else:
+            values = np.asarray(data)
+            if values.dtype.kind not in "biuf":
+                values = np.empty(len(data), dtype=object)
+                values[:] = list(data)
+
+        if len(indices) > 1 and np.any(indices[1:] <= indices[:-1]):
+            # sort by index, keep the last value of duplicated indices as a dict does
+            order = np.argsort(indices, kind="stable")
+            indices, values = indices[order], values[order]
+            last = np.append(indices[1:] != indices[:-1], True)
+            indices, values = indices[last], values[last]
+
+        return indices, values
+
+    def _dict_to_arrays(self):
+        return self._to_arrays(list(self._sparse_vec.keys()), list(self._sparse_vec.values()))
 
     def get_data(self, pos, default_val=None):
-        return self.sparse_vec.get(pos, default_val)
+        if self._sparse_vec is not None:
+            return self._sparse_vec.get(pos, default_val)
+        loc = np.searchsorted(self.indices, pos)
+        if loc < len(self.indices) and self.indices[loc] == pos:
+            return self.data[loc].item() if self.data.dtype != object else self.data[loc]
+        return default_val
 
     def count_non_zeros(self):
-        return len(self.sparse_vec)
+        if self._sparse_vec is not None:
+            return len(self._sparse_vec)
+        return len(self.indices)
 
     def count_zeros(self):
-        return self.shape - len(self.sparse_vec)
+        return self.shape - self.count_non_zeros()
 
     def get_shape(self):
         return self.shape
@@ -58,14 +105,66 @@ class SparseVector(object):
         self.shape = shape
 
     def get_all_data(self):
-        for idx, data in self.sparse_vec.items():
-            yield idx, data
+        if self._sparse_vec is not None:
+            for idx, data in self._sparse_vec.items():
+                yield idx, data
+        else:
+            yield from zip(self.indices.tolist(), self.data.tolist())
+
+    def get_arrays(self):
+        """
+        return sorted indices and parallel data arrays
+        """
+        if self._sparse_vec is not None:
+            self.indices, self.data = self._dict_to_arrays()
+            self._sparse_vec = None
+        return self.indices, self.data
+
+    @property
+    def sparse_vec(self):
+        if self._sparse_vec is None:
+            self._sparse_vec = dict(zip(self.indices.tolist(), self.data.tolist()))
+            self.indices, self.data = None, None
+        return self._sparse_vec
+
+    @sparse_vec.setter
+    def sparse_vec(self, sparse_vec):
+        self.set_sparse_vector(sparse_vec)
 
     def get_sparse_vector(self):
         return self.sparse_vec
 
     def set_sparse_vector(self, sparse_vec):
-        self.sparse_vec = sparse_vec
+        self._sparse_vec = sparse_vec
+        self.indices, self.data = None, None
+
+    def __getstate__(self):
+        # state is built from a copy of arrays, a dict handed out by get_sparse_vector stays bound to this vector
+        indices, data = self._dict_to_arrays() if self._sparse_vec is not None else (self.indices, self.data)
+        if data.dtype == object:
+            return self.shape, indices.tobytes(), indices.dtype.str, data.tolist(), None
+        return self.shape, indices.tobytes(), indices.dtype.str, data.tobytes(), data.dtype.str
+
+    def __setstate__(self, state):
+        self._sparse_vec = None
+        if isinstance(state, tuple) and len(state) == 2:
+            # default state of slotted objects, (None, slot dict)
+            state = state[1]
+        if isinstance(state, dict):
+            # pickled by the dict backed implementation
+            self.shape = state.get("shape", 0)
+            sparse_vec = state.get("sparse_vec", {})
+            self._set_arrays(list(sparse_vec.keys()), list(sparse_vec.values()))
+            return
+
+        self.shape, indices, index_dtype, data, data_dtype = state
+        # arrays over pickled bytes are read-only, copy them so arrays from get_arrays stay writable
+        self.indices = np.frombuffer(indices, dtype=index_dtype).copy()
+        if data_dtype is None:
+            self.data = np.empty(len(data), dtype=object)
+            self.data[:] = data
+        else:
+            self.data = np.frombuffer(data, dtype=data_dtype).copy()
 
     @staticmethod
     def is_sparse_vector():
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import unittest
+import uuid
+
+import numpy as np
+
+from fate_arch.session import computing_session as session
+from federatedml.feature.columnar_transform import columnar_statistics, columnar_transform, stack_features
+from federatedml.feature.imputer import Imputer
+from federatedml.feature.instance import Instance
+from federatedml.feature.one_hot_encoder import OneHotEncoder, OneHotInnerParam, TransferPair
+from federatedml.feature.sparse_vector import SparseVector
+
+
+class TestColumnarTransform(unittest.TestCase):
+    def setUp(self):
+        session.init("test_columnar_transform_" + str(uuid.uuid1()))
+        rng = np.random.RandomState(0)
+        self.data = [(i, Instance(inst_id=i, features=rng.randint(0, 4, size=5).astype(float), label=i % 2))
+                     for i in range(100)]
+
+    def test_transform(self):
+        table = session.parallelize(self.data, include_key=True, partition=4)
+        result = dict(columnar_transform(table, lambda x: x * 2, None, block_size=7).collect())
+        self.assertEqual(len(result), len(self.data))
+        for key, inst in self.data:
+            self.assertTrue(np.array_equal(result[key].features, inst.features * 2))
+            self.assertEqual(result[key].label, inst.label)
+
+        # blocks which could not be stacked are transformed row by row
+        data = self.data + [(100, Instance(inst_id=100, features=SparseVector([1], [1.0], shape=5)))]
+        table = session.parallelize(data, include_key=True, partition=1)
+        result = dict(columnar_transform(table, lambda x: x * 2, lambda inst: inst.label, block_size=60).collect())
+        self.assertEqual(result[0].label, 0)
+        self.assertEqual(result[99], 1)
+
+        stats = columnar_statistics(table, lambda x: len(x), lambda instances: -len(instances), block_size=60)
+        self.assertEqual(sorted(stats.reduce(lambda x, y: x + y)), [-41, 60])
+
+    def test_stack_features(self):
+        self.assertIsNone(stack_features([Instance(features=np.array(["a", "b"]))]))
+        self.assertIsNone(stack_features([Instance(features=np.ones(2)), Instance(features=np.ones(3))]))
+        self.assertEqual(stack_features([inst for _, inst in self.data]).shape, (100, 5))
+
+    def test_imputer(self):
+        instances = [inst for _, inst in self.data]
+        features = stack_features(instances)
+        features[features == 3] = np.nan
+        for inst, row in zip(instances, features):
+            inst.features = row.copy()
+        missing_value_list = Imputer(missing_value_list=[0, np.nan]).abnormal_value_set
+        transform_list = [1.5, 2, -1, 0.5, 7]
+
+        result = Imputer.replace_missing_value_array(features.copy(), transform_list, missing_value_list, {2})
+        self.assertIsNone(result)
+        for skip_cols in [set(), {1, 4}]:
+            features[:, list(skip_cols)] = np.nan_to_num(features[:, list(skip_cols)])
+            for inst, row in zip(instances, features):
+                inst.features = row.copy()
+            result = Imputer.replace_missing_value_array(features.copy(), transform_list, missing_value_list,
+                                                         skip_cols)
+            expect = [Imputer.replace_missing_value_row(inst, transform_list, missing_value_list, skip_cols)
+                      for inst in instances]
+            self.assertTrue(np.array_equal(result, np.array([inst.features for inst in expect])))
+            self.assertTrue(np.array_equal(
+                Imputer.count_missing_value_array(features, transform_list, missing_value_list, skip_cols),
+                Imputer.count_missing_value_rows(instances, transform_list, missing_value_list, skip_cols)))
+
+    def test_one_hot(self):
+        encoder = OneHotEncoder()
+        encoder.inner_param = OneHotInnerParam()
+        encoder.inner_param.set_header(["x{}".format(i) for i in range(5)])
+        encoder.inner_param.add_transform_indexes([0, 2, 3])
+        instances = [inst for _, inst in self.data]
+        features = stack_features(instances)
+
+        col_maps = OneHotEncoder.record_new_header_array(features[:60], encoder.inner_param)
+        expect = OneHotEncoder.record_new_header_rows(instances[:60], encoder.inner_param)
+        self.assertEqual({k: sorted(v.values) for k, v in col_maps.items()},
+                         {k: sorted(v.values) for k, v in expect.items()})
+        features[0, 2] = 0.5
+        with self.assertRaises(ValueError):
+            OneHotEncoder.record_new_header_array(features, encoder.inner_param)
+
+        # value 3 of x3 is not seen in fit, and x2 has a string value
+        col_maps["x3"] = TransferPair("x3")
+        for value in [0, 1, 2]:
+            col_maps["x3"].add_value(value)
+        col_maps["x2"].add_value("a")
+        encoder.col_maps = col_maps
+        for pair_obj in col_maps.values():
+            pair_obj.encode_new_headers()
+        encoder._transform_schema()
+        mapping = dict(zip(encoder.inner_param.result_header, range(len(encoder.inner_param.result_header))))
+        plan = encoder._get_array_transfer_plan(mapping)
+        for dtype in [np.float64, np.float32, np.int64]:
+            for inst, row in zip(instances, features.astype(dtype)):
+                inst.features = row
+            result = OneHotEncoder.transfer_array(features.astype(dtype), **plan)
+            expect = np.array([OneHotEncoder.transfer_one_instance(inst, col_maps, encoder.inner_param.header,
+                                                                   encoder.inner_param.result_header,
+                                                                   mapping).features
+                               for inst in instances])
+            self.assertEqual(result.dtype, expect.dtype)
+            self.assertTrue(np.array_equal(result, expect))
+
+    def tearDown(self):
+        session.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
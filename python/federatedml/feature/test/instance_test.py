@@ -14,8 +14,11 @@
 #  limitations under the License.
 #
 
+import pickle
 import unittest
 
+import numpy as np
+
 from federatedml.feature.instance import Instance
 
 
@@ -33,6 +36,20 @@ class TestInstance(unittest.TestCase):
         inst.set_feature(["yes", "no"])
         self.assertTrue(inst.weight == 3 and inst.label == 5 and inst.features == ["yes", "no"])
 
+    def test_pickle(self):
+        inst = Instance(inst_id="a", weight=0.5, features=np.arange(5), label=1)
+        loaded = pickle.loads(pickle.dumps(inst))
+        self.assertTrue(loaded.inst_id == "a" and loaded.weight == 0.5 and loaded.label == 1)
+        self.assertTrue(np.array_equal(loaded.features, inst.features))
+
+        copy_inst = inst.copy(exclusive_attr={"features"})
+        self.assertTrue(copy_inst.features is None and copy_inst.inst_id == "a")
+
+        # state pickled by the __dict__ based implementation
+        loaded = Instance.__new__(Instance)
+        loaded.__setstate__({"inst_id": None, "weight": 1.0, "features": [1], "label": 0})
+        self.assertTrue(loaded.weight == 1.0 and loaded.features == [1] and loaded.label == 0)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -14,8 +14,12 @@
 #  limitations under the License.
 #
 
+import pickle
 import unittest
 
+import numpy as np
+
+from federatedml.feature.fate_element_type import NoneType
 from federatedml.feature.sparse_vector import SparseVector
 
 
@@ -46,6 +50,43 @@ class TestSparseVector(unittest.TestCase):
 
         self.assertTrue(dict(sparse_data.get_all_data()) == dict(zip(indices, data)))
 
+    def test_arrays(self):
+        sparse_data = SparseVector([7, 2, 5, 2], [1.5, NoneType(), 3, 4.0], 10)
+        indices, data = sparse_data.get_arrays()
+        self.assertListEqual(indices.tolist(), [2, 5, 7])
+        self.assertEqual(data.dtype, object)
+        self.assertEqual(sparse_data.get_data(2), 4.0)
+
+        sparse_data = SparseVector([3, 1], [0.5, 2], 10)
+        indices, data = sparse_data.get_arrays()
+        self.assertEqual(indices.dtype, np.int32)
+        self.assertListEqual(data.tolist(), [2.0, 0.5])
+
+        # dict handed out stays bound to the vector, and is folded back into arrays when pickled
+        sparse_data.get_sparse_vector()[1] = NoneType()
+        self.assertEqual(sparse_data.get_data(1), NoneType())
+        self.assertEqual(pickle.loads(pickle.dumps(sparse_data)).get_data(1), NoneType())
+        sparse_data.sparse_vec[4] = 1.0
+        self.assertEqual(sparse_data.count_non_zeros(), 3)
+        self.assertListEqual(sparse_data.get_arrays()[0].tolist(), [1, 3, 4])
+
+    def test_pickle(self):
+        for data in [np.random.randn(50).tolist(), list(range(50)), [NoneType()] * 25 + [1.0] * 25]:
+            sparse_data = SparseVector(np.arange(0, 100, 2), data, 100)
+            loaded = pickle.loads(pickle.dumps(sparse_data))
+            self.assertEqual(loaded.get_shape(), 100)
+            self.assertListEqual(list(loaded.get_all_data()), list(sparse_data.get_all_data()))
+            indices, data = loaded.get_arrays()
+            indices[0] = 1
+            data[0] = data[1]
+            self.assertEqual(loaded.get_data(1), data[1])
+
+        # state pickled by the dict backed implementation
+        loaded = SparseVector.__new__(SparseVector)
+        loaded.__setstate__({"sparse_vec": {3: 1.0, 1: 2.0}, "shape": 5})
+        self.assertListEqual(list(loaded.get_all_data()), [(1, 2.0), (3, 1.0)])
+        self.assertEqual(loaded.count_zeros(), 3)
+
 
 if __name__ == '__main__':
     unittest.main()
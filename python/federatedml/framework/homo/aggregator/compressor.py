@@ -0,0 +1,97 @@
+import math
+import numpy as np
+from federatedml.framework.weights import CompressedWeights
+
+
+COMPRESS_TYPE = ['fp16', 'int8', 'topk']
+
+
+class UpdateCompressor(object):
+    """
+    Compress 1-D float64 updates before sending them to the aggregation server
+
+    Parameters
+    ----------
+    compress_type: str, 'fp16', 'int8' or 'topk'
+        'fp16': cast to float16, when secure aggregation is enabled, values are stochastically quantized onto a
+                16-bit fixed-point ring instead, so that random pads can be added to the codes
+        'int8': stochastic 8-bit quantization, on an 8-bit fixed-point ring when secure aggregation is enabled
+        'topk': only send the topk_ratio fraction of values with the largest magnitudes, not supported with
+                secure aggregation, since pads only cancel out when all parties send the same positions
+    secure_aggregate: bool, quantize onto a fixed-point ring shared by all parties. On the ring, sum of codes of
+                      all parties must not overflow, so every party uses (2^(bits - 1) - 1) // party_num levels
+                      and a scale negotiated with other parties
+    topk_ratio: float in (0, 1]
+    error_feedback: bool, if True, compression error is kept and added to the next update
+    """
+
+    def __init__(self, compress_type, secure_aggregate=False, topk_ratio=0.01, error_feedback=False,
+                 random_state=None):
+        if compress_type not in COMPRESS_TYPE:
+            raise ValueError('compress type must in {}, but got {}'.format(COMPRESS_TYPE, compress_type))
+        if secure_aggregate and compress_type == 'topk':
+            raise ValueError('topk sparsification is not compatible with secure aggregation')
+        if not 0 < topk_ratio <= 1:
+            raise ValueError('topk ratio must in (0, 1], but got {}'.format(topk_ratio))
+
+        self.compress_type = compress_type
+        self.secure_aggregate = secure_aggregate
+        self.topk_ratio = topk_ratio
+        self.error_feedback = error_feedback
+        self.bits = 16 if compress_type == 'fp16' else 8
+        self._rand = np.random.RandomState(random_state)
+        self._residual = None
+
+    @property
+    def need_shared_scale(self):
+        return self.secure_aggregate
+
+    def ring_levels(self, party_num):
+        levels = (2 ** (self.bits - 1) - 1) // party_num
+        if levels < 1:
+            raise ValueError('{}-bit ring can not hold the sum of {} parties'.format(self.bits, party_num))
+        return levels
+
+    def compensate(self, buffer):
+        """
+        add compression error of last update
+        """
+        if self.error_feedback and self._residual is not None and len(self._residual) == len(buffer):
+            return buffer + self._residual
+        return buffer
+
+    def _stochastic_round(self, v):
+        return np.floor(v + self._rand.random_sample(v.shape))
+
+    def compress(self, buffer, scale=None, party_num=1) -> CompressedWeights:
+        """
+        buffer: 1-D float64 array, already compensated
+        scale: max magnitude shared by all parties, only used when quantizing onto a ring
+        """
+        size = len(buffer)
+        if self.secure_aggregate:
+            scale = scale if scale else 1.0
+            levels = self.ring_levels(party_num)
+            codes = self._stochastic_round(np.clip(buffer / scale, -1, 1) * levels)
+            signed_dtype = np.dtype('int{}'.format(self.bits))
+            codes = codes.astype(signed_dtype).view('uint{}'.format(self.bits))
+            compressed = CompressedWeights(codes, kind='ring', size=size, scale=scale, levels=levels)
+        elif self.compress_type == 'fp16':
+            f16_max = np.finfo(np.float16).max
+            compressed = CompressedWeights(np.clip(buffer, -f16_max, f16_max).astype(np.float16))
+        elif self.compress_type == 'int8':
+            scale = float(np.max(np.abs(buffer))) if size > 0 else 0.0
+            scale = scale if scale > 0 else 1.0
+            codes = self._stochastic_round(buffer / scale * 127).astype(np.int8)
+            compressed = CompressedWeights(codes, kind='quantized', size=size, scale=scale, levels=127)
+        else:
+            k = min(max(int(math.ceil(self.topk_ratio * size)), 1), size)
+            indices = np.argpartition(np.abs(buffer), size - k)[size - k:] if size > 0 else np.zeros(0, np.int64)
+            index_dtype = np.uint32 if size <= np.iinfo(np.uint32).max else np.int64
+            compressed = CompressedWeights(buffer[indices].astype(np.float32), kind='sparse', size=size,
+                                           indices=indices.astype(index_dtype))
+
+        if self.error_feedback:
+            self._residual = buffer - compressed.decode()
+
+        return compressed
@@ -1,7 +1,8 @@
 from federatedml.framework.homo.blocks import RandomPaddingCipherClient, RandomPaddingCipherServer, PadsCipher, RandomPaddingCipherTransVar
 from federatedml.framework.homo.aggregator.aggregator_base import AggregatorBaseClient, AutoSuffix, AggregatorBaseServer
+from federatedml.framework.homo.aggregator.compressor import UpdateCompressor
 import numpy as np
-from federatedml.framework.weights import Weights, NumpyWeights
+from federatedml.framework.weights import Weights, NumpyWeights, FlatWeights, CompressedWeights
 from federatedml.util import LOGGER
 import torch as t
 from typing import Union, List
@@ -12,22 +13,80 @@ from federatedml.util import consts
 AGG_TYPE = ['weighted_mean', 'sum', 'mean']
 
 
+def flatten_torch_params(param_groups) -> FlatWeights:
+    """
+    copy parameters into one contiguous float64 buffer, layout records parameter shapes group by group
+    """
+    layout = [[tuple(p.shape) for p in params] for params in param_groups]
+    all_params = [p for params in param_groups for p in params]
+    if len(all_params) == 0:
+        return FlatWeights(np.zeros(0, dtype=np.float64), layout)
+    buffer = t.nn.utils.parameters_to_vector(all_params).detach().cpu().double().numpy()
+    return FlatWeights(buffer, layout)
+
+
+def load_torch_params(flat_weights: FlatWeights, param_groups):
+    """
+    copy aggregated buffer back into parameters, values are cast to torch default dtype first, the same as
+    converting every array by torch.Tensor
+    """
+    vec = t.from_numpy(flat_weights.unboxed).to(t.get_default_dtype())
+    offset = 0
+    for params in param_groups:
+        for p in params:
+            numel = p.numel()
+            p.data.copy_(vec[offset: offset + numel].view_as(p))
+            offset += numel
+
+
+def chunk_suffix(suffix, chunk_idx):
+    if not isinstance(suffix, tuple):
+        suffix = (suffix, )
+    return suffix + ('chunk', chunk_idx)
+
+
 class SecureAggregatorClient(AggregatorBaseClient):
 
     def __init__(self, secure_aggregate=True, aggregate_type='weighted_mean', aggregate_weight=1.0,
-                 communicate_match_suffix=None):
-
+                 communicate_match_suffix=None, stream_chunk_size=None, compress_type=None, topk_ratio=0.01):
+        """
+        stream_chunk_size: None or int, if int, flattened models are sent to server in chunks of this many
+                           parameters and aggregated chunk by chunk, server must enable streaming as well.
+                           Only pytorch models, optimizers and FlatWeights can be sent in this mode
+        compress_type: None, 'fp16', 'int8' or 'topk', compress numpy arrays, NumpyWeights, FlatWeights and pytorch
+                       models before sending, see UpdateCompressor. With secure aggregation, server must be created
+                       with the same compress_type to negotiate quantization scale. Unless aggregate type is 'sum',
+                       model deltas to the last aggregated model are sent, and compression error is fed back to
+                       the next round
+        topk_ratio: float, fraction of values to send when compress_type is 'topk'
+        """
         super(SecureAggregatorClient, self).__init__(
             communicate_match_suffix=communicate_match_suffix)
         self.secure_aggregate = secure_aggregate
+        if stream_chunk_size is not None:
+            assert isinstance(stream_chunk_size, int) and stream_chunk_size > 0, \
+                'stream chunk size must be a positive int, but got {}'.format(stream_chunk_size)
+        self.stream_chunk_size = stream_chunk_size
         self.suffix = {
             "local_loss": AutoSuffix("local_loss"),
             "agg_loss": AutoSuffix("agg_loss"),
             "local_model": AutoSuffix("local_model"),
             "agg_model": AutoSuffix("agg_model"),
-            "converge_status": AutoSuffix("converge_status")
+            "converge_status": AutoSuffix("converge_status"),
+            "quantize_scale": AutoSuffix("quantize_scale")
         }
 
+        # init update compression
+        self._compressor = None
+        if compress_type is not None:
+            if stream_chunk_size is not None:
+                raise ValueError('compression is not supported in streaming aggregation')
+            self._compressor = UpdateCompressor(compress_type, secure_aggregate=secure_aggregate,
+                                                topk_ratio=topk_ratio, error_feedback=aggregate_type != 'sum')
+        self._compress_delta = aggregate_type != 'sum'
+        self._compress_reference = None
+        self.sent_bytes = []
+
         # init secure aggregate random padding:
         if self.secure_aggregate:
             self._random_padding_cipher: PadsCipher = RandomPaddingCipherClient(
@@ -81,11 +140,12 @@ class SecureAggregatorClient(AggregatorBaseClient):
 
         if isinstance(model, t.nn.Module):
             parameters = list(model.parameters())
-            tmp_list = [[np.array(p.cpu().detach().tolist()) for p in parameters if p.requires_grad]]
-            LOGGER.debug('Aggregate trainable parameters: {}/{}'.format(len(tmp_list[0]), len(parameters)))
+            param_groups = [[p for p in parameters if p.requires_grad]]
+            LOGGER.debug('Aggregate trainable parameters: {}/{}'.format(len(param_groups[0]), len(parameters)))
+            return self._process_torch_params(param_groups)
         elif isinstance(model, t.optim.Optimizer):
-            tmp_list = [[np.array(p.cpu().detach().tolist()) for p in group["params"]]
-                        for group in model.param_groups]
+            param_groups = [group["params"] for group in model.param_groups]
+            return self._process_torch_params(param_groups)
         elif isinstance(model, list):
             for p in model:
                 assert isinstance(
@@ -105,6 +165,72 @@ class SecureAggregatorClient(AggregatorBaseClient):
 
         return to_agg
 
+    def _process_torch_params(self, param_groups):
+        """
+        flatten torch parameters into one float64 buffer, weighting and random padding are applied to the
+        whole buffer, the buffer is sent as one object
+        """
+        to_agg = flatten_torch_params(param_groups)
+        buffer = to_agg.unboxed
+        np.multiply(buffer, self._weight, out=buffer)
+        if self.secure_aggregate:
+            to_agg = to_agg.encrypted(self._random_padding_cipher)
+        return to_agg
+
+    def _is_compressible(self, model):
+        return self._compressor is not None and \
+            isinstance(model, (np.ndarray, NumpyWeights, FlatWeights, t.nn.Module, t.optim.Optimizer))
+
+    @staticmethod
+    def _flatten_model(model) -> FlatWeights:
+        if isinstance(model, t.nn.Module):
+            return flatten_torch_params([[p for p in model.parameters() if p.requires_grad]])
+        if isinstance(model, t.optim.Optimizer):
+            return flatten_torch_params([group["params"] for group in model.param_groups])
+        if isinstance(model, FlatWeights):
+            return FlatWeights(model.unboxed.astype(np.float64), model.layout)
+        arr = model.unboxed if isinstance(model, NumpyWeights) else model
+        return FlatWeights(np.array(arr, dtype=np.float64).ravel(), [[np.shape(arr)]])
+
+    def _compress_model(self, model, suffix=tuple()) -> CompressedWeights:
+        """
+        weighting, compression and random padding of a flattened model, quantized codes are padded on the ring
+        """
+        flat = self._flatten_model(model)
+        buffer = flat.unboxed
+        if self._compress_delta:
+            if self._compress_reference is None or len(self._compress_reference) != len(buffer):
+                self._compress_reference = np.zeros_like(buffer)
+            buffer = buffer - self._compress_reference
+        buffer = self._compressor.compensate(buffer * self._weight)
+
+        scale, party_num = None, 1
+        if self._compressor.need_shared_scale:
+            scale_suffix = self._get_suffix('quantize_scale', suffix)
+            self.send(float(np.max(np.abs(buffer))) if len(buffer) > 0 else 0., suffix=scale_suffix)
+            scale, party_num = self.get(suffix=scale_suffix)[0]
+
+        to_agg = self._compressor.compress(buffer, scale=scale, party_num=party_num)
+        to_agg.layout = flat.layout
+        if self.secure_aggregate:
+            to_agg = to_agg.encrypted(self._random_padding_cipher)
+
+        self.sent_bytes.append(to_agg.nbytes)
+        LOGGER.info('send {} compressed update, {} bytes, uncompressed {} bytes'.format(
+            self._compressor.compress_type, to_agg.nbytes, buffer.nbytes))
+        return to_agg
+
+    def _recover_compressed_model(self, model, agg_model: CompressedWeights):
+        buffer = agg_model.decode()
+        if self._compress_delta:
+            buffer += self._compress_reference
+            self._compress_reference = buffer.copy()
+        if isinstance(model, np.ndarray):
+            return buffer.reshape(model.shape)
+        if isinstance(model, NumpyWeights):
+            return NumpyWeights(buffer.reshape(np.shape(model.unboxed)))
+        return self._recover_model(model, FlatWeights(buffer, agg_model.layout))
+
     def _recover_model(self, model, agg_model):
 
         if isinstance(model, np.ndarray):
@@ -113,23 +239,18 @@ class SecureAggregatorClient(AggregatorBaseClient):
             return agg_model
         elif is_table(agg_model):
             return agg_model
+        elif isinstance(model, t.nn.Module):
+            load_torch_params(agg_model, [[p for p in model.parameters() if p.requires_grad]])
+            return model
+        elif isinstance(model, t.optim.Optimizer):
+            load_torch_params(agg_model, [group["params"] for group in model.param_groups])
+            return model
         else:
             if self.secure_aggregate:
                 agg_model = [[np_weight.unboxed for np_weight in arr_list]
                              for arr_list in agg_model]
 
-            if isinstance(model, t.nn.Module):
-                for agg_p, p in zip(agg_model[0], [p for p in model.parameters() if p.requires_grad]):
-                    p.data.copy_(t.Tensor(agg_p))
-
-                return model
-            elif isinstance(model, t.optim.Optimizer):
-                for agg_group, group in zip(agg_model, model.param_groups):
-                    for agg_p, p in zip(agg_group, group["params"]):
-                        p.data.copy_(t.Tensor(agg_p))
-                return model
-            else:
-                return agg_model
+            return agg_model
 
     def send_loss(self, loss, suffix=tuple()):
         suffix = self._get_suffix('local_loss', suffix)
@@ -156,15 +277,48 @@ class SecureAggregatorClient(AggregatorBaseClient):
                 A pytorch optimizer, will extract param group from this optimizer as weights to aggregate
         suffix : sending suffix, by default tuple(), can be None or tuple contains str&number. If None, will automatically generate suffix
         """
-        suffix = self._get_suffix('local_model', suffix)
+        local_suffix = self._get_suffix('local_model', suffix)
         # judge model type
-        to_agg_model = self._process_model(model)
-        self.send(to_agg_model, suffix)
+        if self._is_compressible(model):
+            to_agg_model = self._compress_model(model, suffix=suffix)
+        else:
+            to_agg_model = self._process_model(model)
+        self.send(to_agg_model, local_suffix)
 
     def get_aggregated_model(self, suffix=tuple()):
         suffix = self._get_suffix("agg_model", suffix)
         return self.get(suffix)[0]
 
+    def send_model_chunks(self, model, suffix=tuple()):
+        """
+        Sending flattened model to arbiter chunk by chunk, every chunk is sent with a chunk-indexed suffix as
+        (chunk_num, total_size, chunk_buffer)
+
+        Returns
+        -------
+        the processed FlatWeights, aggregated chunks are written back into its buffer
+        """
+        suffix = self._get_suffix('local_model', suffix)
+        to_agg_model = self._process_model(model)
+        if not isinstance(to_agg_model, FlatWeights):
+            raise ValueError('streaming aggregation only supports flattened models, got {}'.format(type(model)))
+
+        buffer = to_agg_model.unboxed
+        chunk_starts = list(range(0, max(len(buffer), 1), self.stream_chunk_size))
+        for chunk_idx, start in enumerate(chunk_starts):
+            chunk = buffer[start: start + self.stream_chunk_size]
+            self.send((len(chunk_starts), len(buffer), chunk), chunk_suffix(suffix, chunk_idx))
+        return to_agg_model
+
+    def get_aggregated_model_chunks(self, flat_model: FlatWeights, suffix=tuple()):
+        suffix = self._get_suffix("agg_model", suffix)
+        buffer = flat_model.unboxed
+        chunk_num = max((len(buffer) + self.stream_chunk_size - 1) // self.stream_chunk_size, 1)
+        for chunk_idx in range(chunk_num):
+            start = chunk_idx * self.stream_chunk_size
+            buffer[start: start + self.stream_chunk_size] = self.get(chunk_suffix(suffix, chunk_idx))[0]
+        return flat_model
+
     def get_aggregated_loss(self, suffix=tuple()):
         suffix = self._get_suffix("agg_loss", suffix)
         return self.get(suffix)[0]
@@ -174,8 +328,14 @@ class SecureAggregatorClient(AggregatorBaseClient):
         return self.get(suffix)[0]
 
     def model_aggregation(self, model, suffix=tuple()):
+        if self.stream_chunk_size is not None:
+            flat_model = self.send_model_chunks(model, suffix=suffix)
+            agg_model = self.get_aggregated_model_chunks(flat_model, suffix=suffix)
+            return self._recover_model(model, agg_model)
         self.send_model(model, suffix=suffix)
         agg_model = self.get_aggregated_model(suffix=suffix)
+        if self._is_compressible(model):
+            return self._recover_compressed_model(model, agg_model)
         return self._recover_model(model, agg_model)
 
     def loss_aggregation(self, loss, suffix=tuple()):
@@ -186,15 +346,26 @@ class SecureAggregatorClient(AggregatorBaseClient):
 
 class SecureAggregatorServer(AggregatorBaseServer):
 
-    def __init__(self, secure_aggregate=True, communicate_match_suffix=None):
+    def __init__(self, secure_aggregate=True, communicate_match_suffix=None, stream_aggregate=False,
+                 compress_type=None):
+        """
+        stream_aggregate: bool, if True, receive client models chunk by chunk, chunks of all clients are
+                          folded into a running sum and broadcast as soon as they are aggregated, clients must set
+                          stream_chunk_size
+        compress_type: None or str, the compress type of clients, with secure aggregation, quantization scale is
+                       negotiated before every model aggregation
+        """
         super(SecureAggregatorServer, self).__init__(
             communicate_match_suffix=communicate_match_suffix)
+        self.stream_aggregate = stream_aggregate
+        self.compress_type = compress_type
         self.suffix = {
             "local_loss": AutoSuffix("local_loss"),
             "agg_loss": AutoSuffix("agg_loss"),
             "local_model": AutoSuffix("local_model"),
             "agg_model": AutoSuffix("agg_model"),
-            "converge_status": AutoSuffix("converge_status")
+            "converge_status": AutoSuffix("converge_status"),
+            "quantize_scale": AutoSuffix("quantize_scale")
         }
         self.secure_aggregate = secure_aggregate
         if self.secure_aggregate:
@@ -247,6 +418,44 @@ class SecureAggregatorServer(AggregatorBaseServer):
 
         return agg_result
 
+    def stream_aggregate_model(self, suffix=tuple(), party_idx=-1):
+        """
+        Aggregate models sent by send_model_chunks. For every chunk index, chunks are received party by party
+        and added to a running sum, the aggregated chunk is broadcast before receiving the next chunk, so at
+        most one chunk of one client is held besides the aggregated model
+
+        Returns
+        -------
+        aggregated model as FlatWeights, without layout
+        """
+        local_suffix = self._get_suffix('local_model', suffix)
+        agg_suffix = self._get_suffix('agg_model', suffix)
+        if party_idx == -1:
+            party_idx_list = list(range(len(self.communicator.get_parties(-1))))
+        elif isinstance(party_idx, list):
+            party_idx_list = sorted(set(party_idx))
+        else:
+            party_idx_list = [party_idx]
+
+        agg_buffer = None
+        chunk_idx, chunk_num, offset = 0, 1, 0
+        while chunk_idx < chunk_num:
+            agg_chunk = None
+            for idx in party_idx_list:
+                chunk_num, total_size, chunk = self.collect(chunk_suffix(local_suffix, chunk_idx), party_idx=idx)[0]
+                if agg_chunk is None:
+                    agg_chunk = chunk
+                else:
+                    np.add(agg_chunk, chunk, out=agg_chunk)
+            if agg_buffer is None:
+                agg_buffer = np.empty(total_size, dtype=agg_chunk.dtype)
+            agg_buffer[offset: offset + len(agg_chunk)] = agg_chunk
+            offset += len(agg_chunk)
+            self.broadcast(agg_chunk, suffix=chunk_suffix(agg_suffix, chunk_idx), party_idx=party_idx)
+            chunk_idx += 1
+
+        return FlatWeights(agg_buffer)
+
     def broadcast_model(self, model, suffix=tuple(), party_idx=-1):
         suffix = self._get_suffix('agg_model', suffix)
         self.broadcast(model, suffix=suffix, party_idx=party_idx)
@@ -267,7 +476,20 @@ class SecureAggregatorServer(AggregatorBaseServer):
         suffix = self._get_suffix('agg_loss', suffix)
         self.broadcast(loss_sum, suffix=suffix, party_idx=party_idx)
 
+    def negotiate_quantize_scale(self, suffix=tuple(), party_idx=-1):
+        """
+        collect max magnitudes of client updates, broadcast the largest one with the number of clients, clients
+        quantize updates onto a shared fixed-point ring with them
+        """
+        suffix = self._get_suffix('quantize_scale', suffix)
+        scales = self.collect(suffix=suffix, party_idx=party_idx)
+        self.broadcast((max(scales), len(scales)), suffix=suffix, party_idx=party_idx)
+
     def model_aggregation(self, suffix=tuple(), party_idx=-1):
+        if self.stream_aggregate:
+            return self.stream_aggregate_model(suffix=suffix, party_idx=party_idx)
+        if self.secure_aggregate and self.compress_type in ['fp16', 'int8']:
+            self.negotiate_quantize_scale(suffix=suffix, party_idx=party_idx)
         agg_model = self.aggregate_model(suffix=suffix, party_idx=party_idx)
         self.broadcast_model(agg_model, suffix=suffix, party_idx=party_idx)
         return agg_model
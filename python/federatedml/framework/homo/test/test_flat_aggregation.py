@@ -0,0 +1,131 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import copy
+import unittest
+
+import numpy as np
+import torch as t
+
+from federatedml.framework.homo.aggregator.aggregator_base import AutoSuffix
+from federatedml.framework.homo.aggregator.secure_aggregator import flatten_torch_params, load_torch_params, \
+    SecureAggregatorClient, SecureAggregatorServer
+from federatedml.framework.weights import NumpyWeights
+from federatedml.secureprotol.encrypt import PadsCipher
+
+
+class TestFlatAggregation(unittest.TestCase):
+
+    def setUp(self):
+        t.manual_seed(0)
+        self.party_num = 3
+        self.models = [t.nn.Sequential(t.nn.Linear(7, 5), t.nn.ReLU(), t.nn.Linear(5, 2))
+                       for _ in range(self.party_num)]
+        self.agg_weights = [0.2, 0.3, 0.5]
+
+    def _cipher(self, uid):
+        cipher = PadsCipher()
+        cipher.set_self_uuid(uid)
+        # every pair of parties shares a seed
+        cipher.set_exchanged_keys({peer: 1234 + min(uid, peer) * 7 + max(uid, peer) for peer in range(self.party_num)})
+        return cipher
+
+    def _legacy_aggregate(self):
+        agg = None
+        for uid, (model, weight) in enumerate(zip(self.models, self.agg_weights)):
+            cipher = self._cipher(uid)
+            arrs = [NumpyWeights(np.array(p.cpu().detach().tolist()) * weight).encrypted(cipher)
+                    for p in model.parameters()]
+            if agg is None:
+                agg = arrs
+            else:
+                for agg_p, p in zip(agg, arrs):
+                    agg_p += p
+        return [w.unboxed for w in agg]
+
+    def _flat_aggregate(self):
+        agg = None
+        for uid, (model, weight) in enumerate(zip(self.models, self.agg_weights)):
+            flat = flatten_torch_params([list(model.parameters())])
+            np.multiply(flat.unboxed, weight, out=flat.unboxed)
+            flat = flat.encrypted(self._cipher(uid))
+            if agg is None:
+                agg = flat
+            else:
+                agg += flat
+        return agg
+
+    def test_bitwise_identical(self):
+        legacy = self._legacy_aggregate()
+        flat = self._flat_aggregate()
+        for legacy_arr, flat_arr in zip(legacy, flat.split()[0]):
+            self.assertEqual(legacy_arr.shape, flat_arr.shape)
+            self.assertTrue(np.array_equal(legacy_arr, flat_arr))
+
+        legacy_model = copy.deepcopy(self.models[0])
+        for agg_p, p in zip(legacy, legacy_model.parameters()):
+            p.data.copy_(t.Tensor(agg_p))
+        load_torch_params(flat, [list(self.models[0].parameters())])
+        for p1, p2 in zip(legacy_model.parameters(), self.models[0].parameters()):
+            self.assertTrue(t.equal(p1, p2))
+
+    def test_pads_cancel(self):
+        flat = self._flat_aggregate()
+        expect = sum(flatten_torch_params([list(model.parameters())]).unboxed * weight
+                     for model, weight in zip(self.models, self.agg_weights))
+        self.assertTrue(np.allclose(flat.unboxed, expect))
+
+    def _stream_aggregators(self, chunk_size):
+        """
+        aggregators connected by in-memory channels, clients send all chunks before the server runs
+        """
+        to_server, to_client = {}, {}
+        suffix = {name: AutoSuffix(name) for name in ["local_model", "agg_model"]}
+
+        clients = []
+        for uid, weight in enumerate(self.agg_weights):
+            client = SecureAggregatorClient.__new__(SecureAggregatorClient)
+            client.suffix = {name: AutoSuffix(name) for name in suffix}
+            client.secure_aggregate = True
+            client.stream_chunk_size = chunk_size
+            client._weight = weight
+            client._random_padding_cipher = self._cipher(uid)
+            client.send = lambda obj, suffix, uid=uid: to_server.__setitem__((uid, suffix), obj)
+            client.get = lambda suffix: [to_client[suffix]]
+            clients.append(client)
+
+        server = SecureAggregatorServer.__new__(SecureAggregatorServer)
+        server.suffix = suffix
+        server.stream_aggregate = True
+        server.communicator = type('Communicator', (), {'get_parties': lambda _, idx: list(range(self.party_num))})()
+        server.collect = lambda suffix, party_idx: [to_server.pop((party_idx, suffix))]
+        server.broadcast = lambda obj, suffix, party_idx: to_client.__setitem__(suffix, obj)
+        return clients, server, to_server
+
+    def test_stream_aggregation(self):
+        expect = self._flat_aggregate().unboxed
+        for chunk_size in [1, 7, 10, 1000]:
+            clients, server, to_server = self._stream_aggregators(chunk_size)
+            flat_models = [client.send_model_chunks(model) for client, model in zip(clients, self.models)]
+            agg_model = server.model_aggregation()
+            self.assertEqual(len(to_server), 0)
+            self.assertTrue(np.array_equal(agg_model.unboxed, expect))
+            for client, flat_model in zip(clients, flat_models):
+                self.assertTrue(np.array_equal(client.get_aggregated_model_chunks(flat_model).unboxed, expect))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import collections
+import queue
+import threading
+import unittest
+
+import numpy as np
+
+from federatedml.framework.homo.aggregator.aggregator_base import AutoSuffix
+from federatedml.framework.homo.aggregator.compressor import UpdateCompressor
+from federatedml.framework.homo.aggregator.secure_aggregator import SecureAggregatorClient, SecureAggregatorServer
+from federatedml.secureprotol.encrypt import PadsCipher
+
+SUFFIX_NAMES = ["local_model", "agg_model", "quantize_scale"]
+
+
+class _Channels(object):
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queues = collections.defaultdict(queue.Queue)
+
+    def __getitem__(self, key):
+        with self._lock:
+            return self._queues[key]
+
+
+class TestUpdateCompression(unittest.TestCase):
+
+    def setUp(self):
+        self.party_num = 3
+        self.agg_weights = [0.2, 0.3, 0.5]
+        rng = np.random.RandomState(0)
+        self.models = [rng.randn(1000) for _ in range(self.party_num)]
+
+    def _cipher(self, uid):
+        cipher = PadsCipher()
+        cipher.set_self_uuid(uid)
+        cipher.set_exchanged_keys({peer: 1234 + min(uid, peer) * 7 + max(uid, peer) for peer in range(self.party_num)})
+        return cipher
+
+    def _aggregators(self, compress_type, secure_aggregate, aggregate_type='weighted_mean'):
+        to_server, to_client = _Channels(), _Channels()
+        clients = []
+        for uid, weight in enumerate(self.agg_weights):
+            client = SecureAggregatorClient.__new__(SecureAggregatorClient)
+            client.suffix = {name: AutoSuffix(name) for name in SUFFIX_NAMES}
+            client.secure_aggregate = secure_aggregate
+            client.stream_chunk_size = None
+            client._weight = weight if aggregate_type != 'sum' else 1
+            client._random_padding_cipher = self._cipher(uid)
+            client._compressor = UpdateCompressor(compress_type, secure_aggregate=secure_aggregate,
+                                                  error_feedback=aggregate_type != 'sum', random_state=uid)
+            client._compress_delta = aggregate_type != 'sum'
+            client._compress_reference = None
+            client.sent_bytes = []
+            client.send = lambda obj, suffix, uid=uid: to_server[(uid, suffix)].put(obj)
+            client.get = lambda suffix, uid=uid: [to_client[(uid, suffix)].get(timeout=10)]
+            clients.append(client)
+
+        server = SecureAggregatorServer.__new__(SecureAggregatorServer)
+        server.suffix = {name: AutoSuffix(name) for name in SUFFIX_NAMES}
+        server.secure_aggregate = secure_aggregate
+        server.stream_aggregate = False
+        server.compress_type = compress_type
+        server.collect = lambda suffix, party_idx: [to_server[(uid, suffix)].get(timeout=10)
+                                                    for uid in range(self.party_num)]
+
+        def broadcast(obj, suffix, party_idx):
+            for uid in range(self.party_num):
+                to_client[(uid, suffix)].put(obj)
+
+        server.broadcast = broadcast
+        return clients, server
+
+    def _run_round(self, clients, server, models):
+        results = [None] * len(clients)
+
+        def run(idx):
+            results[idx] = clients[idx].model_aggregation(models[idx])
+
+        threads = [threading.Thread(target=run, args=(idx, )) for idx in range(len(clients))]
+        for thread in threads:
+            thread.start()
+        server.model_aggregation()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_ring_quantization(self):
+        expect = sum(model * weight for model, weight in zip(self.models, self.agg_weights))
+        for compress_type, bits in [('fp16', 16), ('int8', 8)]:
+            clients, server = self._aggregators(compress_type, secure_aggregate=True)
+            results = self._run_round(clients, server, self.models)
+            for rs in results:
+                self.assertTrue(np.array_equal(rs, results[0]))
+            step = max(np.max(np.abs(model * weight)) for model, weight in zip(self.models, self.agg_weights)) / \
+                ((2 ** (bits - 1) - 1) // self.party_num)
+            self.assertTrue(np.max(np.abs(results[0] - expect)) <= self.party_num * step)
+            self.assertEqual(clients[0].sent_bytes, [1000 * bits // 8])
+
+    def test_ring_pads_cancel(self):
+        compressor = UpdateCompressor('fp16', secure_aggregate=True)
+        codes = [compressor.compress(model * 0.1, scale=1.0, party_num=self.party_num)
+                 for model in self.models]
+        plain, masked = codes[0] + codes[1] + codes[2], None
+        for uid, c in enumerate(codes):
+            c = c.encrypted(self._cipher(uid), inplace=False)
+            self.assertFalse(np.array_equal(c.unboxed, codes[uid].unboxed))
+            masked = c if masked is None else masked + c
+        self.assertTrue(np.array_equal(plain.unboxed, masked.unboxed))
+        self.assertTrue(np.allclose(masked.decode(), sum(model * 0.1 for model in self.models), atol=1e-3))
+
+    def _train(self, compress_type, error_feedback, rounds=20):
+        """
+        every round, clients start from the aggregated model and add a fixed local update
+        """
+        clients, server = self._aggregators(compress_type, secure_aggregate=False)
+        for client in clients:
+            client._compressor.error_feedback = error_feedback
+        updates = [np.random.RandomState(uid + 10).randn(1000) * 0.01 for uid in range(self.party_num)]
+        models = self.models
+        expect = sum(model * weight for model, weight in zip(self.models, self.agg_weights))
+        for _ in range(rounds):
+            results = self._run_round(clients, server, models)
+            models = [rs + update for rs, update in zip(results, updates)]
+            expect_rs = expect
+            expect = expect + sum(update * weight for update, weight in zip(updates, self.agg_weights))
+        return np.max(np.abs(results[0] - expect_rs))
+
+    def test_error_feedback(self):
+        for compress_type in ['topk', 'int8']:
+            self.assertLess(self._train(compress_type, True), self._train(compress_type, False))
+        self.assertLess(self._train('fp16', True), 1e-2)
+
+    def test_histogram_sum(self):
+        clients, server = self._aggregators('int8', secure_aggregate=True, aggregate_type='sum')
+        results = self._run_round(clients, server, self.models)
+        self.assertTrue(np.allclose(results[0], sum(self.models), atol=np.max(np.abs(self.models)) * 0.2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -280,3 +280,161 @@ class NumpyWeights(Weights):
 
     def __repr__(self):
         return self._weights.__repr__()
+
+
+class FlatWeights(Weights):
+    """
+    Weights stored in one contiguous 1-D numpy buffer.
+
+    `layout` describes how the buffer is split back into the original arrays: a list of groups, each group is a
+    list of array shapes, arrays are laid out group by group in C order. Functions passed to `map_values` and
+    `binary_op` are applied to the whole buffer at once, so they should accept numpy arrays.
+    """
+
+    def __init__(self, buffer, layout=None):
+        super().__init__(buffer)
+        self.layout = layout
+
+    def for_remote(self):
+        return TransferableWeights(self._weights, self.__class__, self.layout)
+
+    def map_values(self, func, inplace):
+        v = func(self._weights)
+        if inplace:
+            self._weights = v
+            return self
+        else:
+            return FlatWeights(v, self.layout)
+
+    def binary_op(self, other: 'FlatWeights', func, inplace):
+        if inplace:
+            if func is operator.add:
+                np.add(self._weights, other._weights, out=self._weights)
+            elif func is operator.sub:
+                np.subtract(self._weights, other._weights, out=self._weights)
+            else:
+                self._weights = func(self._weights, other._weights)
+            return self
+        else:
+            return FlatWeights(func(self._weights, other._weights), self.layout)
+
+    def axpy(self, a, y: 'FlatWeights'):
+        self._weights += a * y._weights
+        return self
+
+    def split(self):
+        """
+        split buffer into groups of arrays according to layout, arrays are views of the buffer
+        """
+        groups = []
+        offset = 0
+        for shapes in self.layout:
+            arrs = []
+            for shape in shapes:
+                size = int(np.prod(shape, dtype=np.int64))
+                arrs.append(self._weights[offset: offset + size].reshape(shape))
+                offset += size
+            groups.append(arrs)
+        return groups
+
+    @staticmethod
+    def from_arrays(groups, dtype=np.float64):
+        """
+        groups: list of list of numpy arrays
+        """
+        layout = [[arr.shape for arr in arrs] for arrs in groups]
+        flat = [arr.ravel() for arrs in groups for arr in arrs]
+        buffer = np.concatenate(flat).astype(dtype, copy=False) if flat else np.zeros(0, dtype=dtype)
+        return FlatWeights(buffer, layout)
+
+    def __repr__(self):
+        return self._weights.__repr__()
+
+
+class CompressedWeights(Weights):
+    """
+    A compressed 1-D update, `kind` decides how `_weights` is decoded back to a float64 buffer of length `size`:
+
+        'dense': float buffer of a lower precision(e.g. float16), decoded by casting
+        'quantized': integer codes, decoded as codes * scale / levels
+        'ring': unsigned integer codes on the fixed-point ring of its dtype, codes of different parties are summed
+                modulo 2^bits, decoded as signed codes * scale / levels
+        'sparse': values at `indices`, other positions are zero
+
+    Adding two ring weights stays on the ring, so random pads can be applied to the codes and still cancel
+    out; any other operation decodes both operands and gives 'dense' float64 weights.
+    """
+
+    def __init__(self, data, kind='dense', size=None, scale=1.0, levels=1, indices=None, layout=None):
+        super().__init__(data)
+        self.kind = kind
+        self.size = len(data) if size is None else size
+        self.scale = scale
+        self.levels = levels
+        self.indices = indices
+        self.layout = layout
+
+    def for_remote(self):
+        return TransferableWeights(self._weights, self.__class__, kind=self.kind, size=self.size, scale=self.scale,
+                                   levels=self.levels, indices=self.indices, layout=self.layout)
+
+    @property
+    def nbytes(self):
+        nbytes = self._weights.nbytes
+        if self.indices is not None:
+            nbytes += self.indices.nbytes
+        return nbytes
+
+    def encrypted(self, cipher: Encrypt, inplace=True):
+        if self.kind != 'ring':
+            return super().encrypted(cipher, inplace=inplace)
+        codes = cipher.encrypt_ring(self._weights)
+        if inplace:
+            self._weights = codes
+            return self
+        return CompressedWeights(codes, kind='ring', size=self.size, scale=self.scale, levels=self.levels,
+                                 layout=self.layout)
+
+    def decode(self):
+        if self.kind == 'dense':
+            return self._weights.astype(np.float64)
+        if self.kind == 'quantized':
+            return self._weights.astype(np.float64) * (self.scale / self.levels)
+        if self.kind == 'ring':
+            signed_dtype = np.dtype('int{}'.format(self._weights.dtype.itemsize * 8))
+            return self._weights.view(signed_dtype).astype(np.float64) * (self.scale / self.levels)
+        if self.kind == 'sparse':
+            buffer = np.zeros(self.size, dtype=np.float64)
+            np.add.at(buffer, self.indices, self._weights.astype(np.float64))
+            return buffer
+        raise ValueError('unknown compressed weights kind {}'.format(self.kind))
+
+    def _to_dense(self, buffer):
+        self._weights = buffer
+        self.kind, self.scale, self.levels, self.indices = 'dense', 1.0, 1, None
+        return self
+
+    def map_values(self, func, inplace):
+        v = func(self.decode())
+        if inplace:
+            return self._to_dense(v)
+        return CompressedWeights(v, size=self.size, layout=self.layout)
+
+    def binary_op(self, other: 'CompressedWeights', func, inplace):
+        if self.kind == 'ring' and other.kind == 'ring' and func in (operator.add, operator.sub):
+            ring_func = np.add if func is operator.add else np.subtract
+            if inplace:
+                ring_func(self._weights, other._weights, out=self._weights)
+                return self
+            return CompressedWeights(ring_func(self._weights, other._weights), kind='ring', size=self.size,
+                                     scale=self.scale, levels=self.levels, layout=self.layout)
+        v = func(self.decode(), other.decode())
+        if inplace:
+            return self._to_dense(v)
+        return CompressedWeights(v, size=self.size, layout=self.layout)
+
+    def axpy(self, a, y: 'CompressedWeights'):
+        return self._to_dense(self.decode() + a * y.decode())
+
+    def __repr__(self):
+        return 'CompressedWeights(kind={}, size={}, nbytes={})'.format(self.kind, self.size, self.nbytes)
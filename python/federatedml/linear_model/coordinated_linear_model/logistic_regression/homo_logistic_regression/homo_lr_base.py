@@ -92,6 +92,8 @@ class HomoLRBase(BaseLogisticRegression):
         # self.aggregator.register_aggregator(self.transfer_variable)
         self.param = params
         self.aggregate_iters = params.aggregate_iters
+        self.aggregate_chunk_size = params.aggregate_chunk_size
+        self.compress_type = params.compress_type
 
     @property
     def use_loss(self):
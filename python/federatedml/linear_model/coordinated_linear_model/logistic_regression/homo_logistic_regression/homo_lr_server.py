@@ -76,6 +76,8 @@ class HomoLRServer(HomoLRBase):
             epochs=self.max_iter,
             secure_aggregate=True,
             aggregate_every_n_epoch=self.aggregate_iters,
+            aggregate_chunk_size=self.aggregate_chunk_size,
+            compress_type=self.compress_type,
             validation_freqs=self.validation_freqs,
             task_type='binary',
             checkpoint_save_freqs=self.save_freq,
@@ -16,20 +16,33 @@
 
 import copy
 import functools
+import hashlib
+import os
 
-import numpy as np
-from sklearn.model_selection import KFold as sk_KFold
-
-from fate_arch.session import computing_session as session
 from federatedml.evaluation.evaluation import Evaluation
 from federatedml.model_selection.cross_validate import BaseCrossValidator
-from federatedml.model_selection.indices import collect_index
 from federatedml.transfer_variable.transfer_class.cross_validation_transfer_variable import \
     CrossValidationTransferVariable
 from federatedml.util import LOGGER
 from federatedml.util import consts
 
 
+def fold_of(key, fold_key, n_splits):
+    """
+    fold number of a sample id, given by a keyed hash so that parties with the same fold key agree on every fold
+    """
+    digest = hashlib.blake2b(str(key).encode(), digest_size=8, key=fold_key).digest()
+    return int.from_bytes(digest, "big") % n_splits
+
+
+def _in_fold(key, value, fold_key, n_splits, fold_num):
+    return fold_of(key, fold_key, n_splits) == fold_num
+
+
+def _not_in_fold(key, value, fold_key, n_splits, fold_num):
+    return fold_of(key, fold_key, n_splits) != fold_num
+
+
 class KFold(BaseCrossValidator):
     def __init__(self):
         super(KFold, self).__init__()
@@ -51,41 +64,28 @@ class KFold(BaseCrossValidator):
         # self.evaluate_param = param.evaluate_param
         # np.random.seed(self.random_seed)
 
-    def split(self, data_inst):
-        # header = data_inst.schema.get('header')
+    def _get_fold_key(self):
+        if not self.shuffle:
+            return b""
+        if self.random_seed is None:
+            return os.urandom(16)
+        return str(self.random_seed).encode()
+
+    def split(self, data_inst, fold_key=None):
+        """
+        every sample is assigned to a fold by a keyed hash of its id, folds are filtered from data_inst partition by
+        partition, so that no ids are collected, and parties using the same fold key get the same folds.
+        fold sizes are balanced in expectation
+        """
+        if fold_key is None:
+            fold_key = self._get_fold_key()
         schema = data_inst.schema
 
-        data_sids_iter, data_size = collect_index(data_inst)
-        data_sids = []
-        key_type = None
-        for sid, _ in data_sids_iter:
-            if key_type is None:
-                key_type = type(sid)
-            data_sids.append(sid)
-        data_sids = np.array(data_sids)
-        # if self.shuffle:
-        #     np.random.shuffle(data_sids)
-        random_state = self.random_seed if self.shuffle else None
-        kf = sk_KFold(n_splits=self.n_splits, shuffle=self.shuffle, random_state=random_state)
-
-        n = 0
-        for train, test in kf.split(data_sids):
-            train_sids = data_sids[train]
-            test_sids = data_sids[test]
-
-            n += 1
-
-            train_sids_table = [(key_type(x), 1) for x in train_sids]
-            test_sids_table = [(key_type(x), 1) for x in test_sids]
-            train_table = session.parallelize(train_sids_table,
-                                              include_key=True,
-                                              partition=data_inst.partitions)
-            train_data = data_inst.join(train_table, lambda x, y: x)
-
-            test_table = session.parallelize(test_sids_table,
-                                             include_key=True,
-                                             partition=data_inst.partitions)
-            test_data = data_inst.join(test_table, lambda x, y: x)
+        for fold_num in range(self.n_splits):
+            train_data = data_inst.filter(functools.partial(_not_in_fold, fold_key=fold_key,
+                                                            n_splits=self.n_splits, fold_num=fold_num))
+            test_data = data_inst.filter(functools.partial(_in_fold, fold_key=fold_key,
+                                                           n_splits=self.n_splits, fold_num=fold_num))
             train_data.schema = schema
             test_data.schema = schema
             yield train_data, test_data
@@ -130,81 +130,23 @@ class KFold(BaseCrossValidator):
             if total_data_count * self.n_splits > consts.MAX_SAMPLE_OUTPUT_LIMIT:
                 LOGGER.warning(
                     f"max sample output limit {consts.MAX_SAMPLE_OUTPUT_LIMIT} exceeded with n_splits ({self.n_splits}) * instance_count ({total_data_count})")
-        if self.mode == consts.HOMO or self.role == consts.GUEST:
-            data_generator = self.split(data_inst)
-        else:
-            data_generator = [(data_inst, data_inst)] * self.n_splits
-        fold_num = 0
+        fold_key = self._sync_fold_key() if self.mode == consts.HETERO else None
+        data_generator = self.split(data_inst, fold_key)
 
+        # folds run one after another, federation tag namespace and variables are shared by the whole process
         summary_res = {}
+        fold_num = 0
         for train_data, test_data in data_generator:
-            model = copy.deepcopy(original_model)
-            LOGGER.debug("In CV, set_flowid flowid is : {}".format(fold_num))
-            model.set_flowid(fold_num)
-            model.set_cv_fold(fold_num)
-
-            LOGGER.info("KFold fold_num is: {}".format(fold_num))
-            if self.mode == consts.HETERO:
-                train_data = self._align_data_index(train_data, model.flowid, consts.TRAIN_DATA)
-                LOGGER.info("Train data Synchronized")
-                test_data = self._align_data_index(test_data, model.flowid, consts.TEST_DATA)
-                LOGGER.info("Test data Synchronized")
-            train_data_count = train_data.count()
-            test_data_count = test_data.count()
-            LOGGER.debug(f"train_data count: {train_data_count}")
-            if train_data_count + test_data_count != total_data_count:
-                raise EnvironmentError("In cv fold: {}, train count: {}, test count: {}, original data count: {}."
-                                       "Thus, 'train count + test count = total count' condition is not satisfied"
-                                       .format(fold_num, train_data_count, test_data_count, total_data_count))
-            this_flowid = 'train.' + str(fold_num)
-            LOGGER.debug("In CV, set_flowid flowid is : {}".format(this_flowid))
-            model.set_flowid(this_flowid)
-            model.fit(train_data, test_data)
-
-            this_flowid = 'predict_train.' + str(fold_num)
-            LOGGER.debug("In CV, set_flowid flowid is : {}".format(this_flowid))
-            model.set_flowid(this_flowid)
-            train_pred_res = model.predict(train_data)
-
-            # if train_pred_res is not None:
-            if self.role == consts.GUEST or host_do_evaluate:
-                fold_name = "_".join(['train', 'fold', str(fold_num)])
-                f = functools.partial(self._append_name, name='train')
-                train_pred_res = train_pred_res.mapValues(f)
-                train_pred_res = model.set_predict_data_schema(train_pred_res, train_data.schema)
-                # LOGGER.debug(f"train_pred_res schema: {train_pred_res.schema}")
-                self.evaluate(train_pred_res, fold_name, model)
-
-            this_flowid = 'predict_validate.' + str(fold_num)
-            LOGGER.debug("In CV, set_flowid flowid is : {}".format(this_flowid))
-            model.set_flowid(this_flowid)
-            test_pred_res = model.predict(test_data)
-
-            # if pred_res is not None:
-            if self.role == consts.GUEST or host_do_evaluate:
-                fold_name = "_".join(['validate', 'fold', str(fold_num)])
-                f = functools.partial(self._append_name, name='validate')
-                test_pred_res = test_pred_res.mapValues(f)
-                test_pred_res = model.set_predict_data_schema(test_pred_res, test_data.schema)
-                # LOGGER.debug(f"train_pred_res schema: {test_pred_res.schema}")
-                self.evaluate(test_pred_res, fold_name, model)
-            LOGGER.debug("Finish fold: {}".format(fold_num))
-
-            if self.output_fold_history:
-                LOGGER.debug(f"generating fold history for fold {fold_num}")
-                fold_train_data = self.transform_history_data(train_data, train_pred_res, fold_num, "train")
-                fold_validate_data = self.transform_history_data(test_data, test_pred_res, fold_num, "validate")
-
-                fold_history_data = fold_train_data.union(fold_validate_data)
-                fold_history_data.schema = fold_train_data.schema
+            summary, fold_history_data = self._run_fold(fold_num, train_data, test_data, original_model,
+                                                        total_data_count, host_do_evaluate)
+            if fold_history_data is not None:
                 if self.fold_history is None:
                     self.fold_history = fold_history_data
                 else:
                     new_fold_history = self.fold_history.union(fold_history_data)
                     new_fold_history.schema = fold_history_data.schema
                     self.fold_history = new_fold_history
-
-            summary_res[f"fold_{fold_num}"] = model.summary()
+            summary_res[f"fold_{fold_num}"] = summary
             fold_num += 1
         summary_res['fold_num'] = fold_num
         LOGGER.debug("Finish all fold running")
@@ -217,55 +159,102 @@ class KFold(BaseCrossValidator):
         else:
             return data_inst
 
-    def _arbiter_run(self, original_model):
-        for fold_num in range(self.n_splits):
-            LOGGER.info("KFold flowid is: {}".format(fold_num))
-            model = copy.deepcopy(original_model)
-            this_flowid = 'train.' + str(fold_num)
-            model.set_flowid(this_flowid)
-            model.set_cv_fold(fold_num)
-            model.fit(None)
-
-            this_flowid = 'predict_train.' + str(fold_num)
-            model.set_flowid(this_flowid)
-            model.predict(None)
+    def _run_fold(self, fold_num, train_data, test_data, original_model, total_data_count, host_do_evaluate):
+        model = copy.deepcopy(original_model)
+        LOGGER.debug("In CV, set_flowid flowid is : {}".format(fold_num))
+        model.set_flowid(fold_num)
+        model.set_cv_fold(fold_num)
+
+        LOGGER.info("KFold fold_num is: {}".format(fold_num))
+        train_data_count = train_data.count()
+        test_data_count = test_data.count()
+        LOGGER.debug(f"train_data count: {train_data_count}")
+        if train_data_count + test_data_count != total_data_count:
+            raise EnvironmentError("In cv fold: {}, train count: {}, test count: {}, original data count: {}."
+                                   "Thus, 'train count + test count = total count' condition is not satisfied"
+                                   .format(fold_num, train_data_count, test_data_count, total_data_count))
+        this_flowid = 'train.' + str(fold_num)
+        LOGGER.debug("In CV, set_flowid flowid is : {}".format(this_flowid))
+        model.set_flowid(this_flowid)
+        model.fit(train_data, test_data)
+
+        this_flowid = 'predict_train.' + str(fold_num)
+        LOGGER.debug("In CV, set_flowid flowid is : {}".format(this_flowid))
+        model.set_flowid(this_flowid)
+        train_pred_res = model.predict(train_data)
+
+        # if train_pred_res is not None:
+        if self.role == consts.GUEST or host_do_evaluate:
+            fold_name = "_".join(['train', 'fold', str(fold_num)])
+            f = functools.partial(self._append_name, name='train')
+            train_pred_res = train_pred_res.mapValues(f)
+            train_pred_res = model.set_predict_data_schema(train_pred_res, train_data.schema)
+            # LOGGER.debug(f"train_pred_res schema: {train_pred_res.schema}")
+            self.evaluate(train_pred_res, fold_name, model)
+
+        this_flowid = 'predict_validate.' + str(fold_num)
+        LOGGER.debug("In CV, set_flowid flowid is : {}".format(this_flowid))
+        model.set_flowid(this_flowid)
+        test_pred_res = model.predict(test_data)
+
+        # if pred_res is not None:
+        if self.role == consts.GUEST or host_do_evaluate:
+            fold_name = "_".join(['validate', 'fold', str(fold_num)])
+            f = functools.partial(self._append_name, name='validate')
+            test_pred_res = test_pred_res.mapValues(f)
+            test_pred_res = model.set_predict_data_schema(test_pred_res, test_data.schema)
+            # LOGGER.debug(f"train_pred_res schema: {test_pred_res.schema}")
+            self.evaluate(test_pred_res, fold_name, model)
+        LOGGER.debug("Finish fold: {}".format(fold_num))
+
+        fold_history_data = None
+        if self.output_fold_history:
+            LOGGER.debug(f"generating fold history for fold {fold_num}")
+            fold_train_data = self.transform_history_data(train_data, train_pred_res, fold_num, "train")
+            fold_validate_data = self.transform_history_data(test_data, test_pred_res, fold_num, "validate")
 
-            this_flowid = 'predict_validate.' + str(fold_num)
-            model.set_flowid(this_flowid)
-            model.predict(None)
+            fold_history_data = fold_train_data.union(fold_validate_data)
+            fold_history_data.schema = fold_train_data.schema
 
-    def _align_data_index(self, data_instance, flowid, data_application=None):
-        schema = data_instance.schema
+        return model.summary(), fold_history_data
 
-        if data_application is None:
-            # LOGGER.warning("not data_application!")
-            # return
-            raise ValueError("In _align_data_index, data_application should be provided.")
+    def _arbiter_run(self, original_model):
+        for fold_num in range(self.n_splits):
+            self._arbiter_run_fold(fold_num, original_model)
 
+    @staticmethod
+    def _arbiter_run_fold(fold_num, original_model):
+        LOGGER.info("KFold flowid is: {}".format(fold_num))
+        model = copy.deepcopy(original_model)
+        this_flowid = 'train.' + str(fold_num)
+        model.set_flowid(this_flowid)
+        model.set_cv_fold(fold_num)
+        model.fit(None)
+
+        this_flowid = 'predict_train.' + str(fold_num)
+        model.set_flowid(this_flowid)
+        model.predict(None)
+
+        this_flowid = 'predict_validate.' + str(fold_num)
+        model.set_flowid(this_flowid)
+        model.predict(None)
+
+    def _sync_fold_key(self):
+        """
+        hosts split with the fold key of guest, so that folds of hetero parties are the same without sending ids
+        """
         transfer_variable = CrossValidationTransferVariable()
-        if data_application == consts.TRAIN_DATA:
-            transfer_id = transfer_variable.train_sid
-        elif data_application == consts.TEST_DATA:
-            transfer_id = transfer_variable.test_sid
-        else:
-            raise ValueError("In _align_data_index, data_application should be provided.")
-
         if self.role == consts.GUEST:
-            data_sid = data_instance.mapValues(lambda v: 1)
-            transfer_id.remote(data_sid,
-                               role=consts.HOST,
-                               idx=-1,
-                               suffix=(flowid,))
-            LOGGER.info("remote {} to host".format(data_application))
-            return data_instance
+            fold_key = self._get_fold_key()
+            transfer_variable.fold_key.remote(fold_key, role=consts.HOST, idx=-1)
+            LOGGER.info("remote fold key to host")
+            return fold_key
         elif self.role == consts.HOST:
-            data_sid = transfer_id.get(idx=0,
-                                       suffix=(flowid,))
-
-            LOGGER.info("get {} from guest".format(data_application))
-            join_data_insts = data_sid.join(data_instance, lambda s, d: d)
-            join_data_insts.schema = schema
-            return join_data_insts
+            fold_key = transfer_variable.fold_key.get(idx=0)
+            LOGGER.info("get fold key from guest")
+            return fold_key
+        else:
+            raise ValueError(f"fold key is not synchronized with role {self.role}")
 
     def evaluate(self, validate_data, fold_name, model):
 
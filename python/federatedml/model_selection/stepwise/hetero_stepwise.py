@@ -14,6 +14,7 @@
 #  limitations under the License.
 #
 
+import collections
 import itertools
 import uuid
 
@@ -31,6 +32,31 @@ from federatedml.util import consts
 from federatedml.util import LOGGER
 
 
+def _label_counts(kv_iterator):
+    return collections.Counter(inst.label for _, inst in kv_iterator)
+
+
+def _label_moments(kv_iterator):
+    labels = np.array([inst.label for _, inst in kv_iterator], dtype=np.float64)
+    if len(labels) == 0:
+        return 0, 0.0, 0.0
+    mean = labels.mean()
+    return len(labels), mean, np.sum((labels - mean) ** 2)
+
+
+def _merge_moments(a, b):
+    """
+    merge (count, mean, sum of squared deviations) of two parts, see Chan, Tony F., et al. 1979
+    """
+    n_a, mean_a, m2_a = a
+    n_b, mean_b, m2_b = b
+    n = n_a + n_b
+    if n == 0:
+        return a
+    delta = mean_b - mean_a
+    return n, mean_a + delta * n_b / n, m2_a + m2_b + delta ** 2 * n_a * n_b / n
+
+
 class ModelInfo(object):
     def __init__(self, n_step, n_model, score, loss, direction):
         self.score = score
@@ -66,10 +92,14 @@ class HeteroStepwise(object):
         self.intercept = None
         self.models = {}
         self.models_trained = {}
+        # weights of trained models on this party, used to warm start models of next step
+        self.models_weights = {}
         self.IC_computer = None
         self.step_direction = None
         self.anonymous_header_guest = None
         self.anonymous_header_host = None
+        self.j_host = None
+        self.j_guest = None
 
     def _init_model(self, param):
         self.model_param = param
@@ -186,23 +216,90 @@ class HeteroStepwise(object):
         return False
 
     def get_intercept_loss(self, model, data):
-        y = np.array([x[1] for x in data.mapValues(lambda v: v.label).collect()])
-        X = np.ones((len(y), 1))
-        if model.model_name == 'HeteroLinearRegression' or model.model_name == 'HeteroPoissonRegression':
+        """
+        fit intercept only model on label statistics summarized by partitions instead of collected labels:
+        counts of every label for classification, a weighted pair of points with the same count, mean and
+        variance for regression, both give the same fit and loss as all labels do.
+        poisson intercept is log of label mean, with loss exp(b) - mean * b as poisson regression computes
+        """
+        X = np.ones((2, 1))
+        if model.model_name == 'HeteroLinearRegression':
+            count, mean, m2 = data.applyPartitions(_label_moments).reduce(_merge_moments)
+            std = np.sqrt(m2 / count)
+            y, sample_weight = np.array([mean - std, mean + std]), np.array([count / 2, count / 2])
             intercept_model = LinearRegression(fit_intercept=False)
-            trained_model = intercept_model.fit(X, y)
+            trained_model = intercept_model.fit(X, y, sample_weight=sample_weight)
             pred = trained_model.predict(X)
-            loss = metrics.mean_squared_error(y, pred) / 2
+            loss = metrics.mean_squared_error(y, pred, sample_weight=sample_weight) / 2
+            self._set_intercept_weights(mean)
+            self.intercept = intercept_model.intercept_
+        elif model.model_name == 'HeteroPoissonRegression':
+            _, mean, _ = data.applyPartitions(_label_moments).reduce(_merge_moments)
+            if mean <= 0:
+                raise ValueError(f"Poisson regression needs labels of positive mean, got {mean}. Stepwise stopped.")
+            intercept = np.log(mean)
+            loss = mean - mean * intercept
+            self._set_intercept_weights(intercept)
+            self.intercept = intercept
         elif model.model_name == 'HeteroLogisticRegression':
+            label_counts = data.applyPartitions(_label_counts).reduce(lambda a, b: a + b)
+            y = np.array(sorted(label_counts))
+            sample_weight = np.array([label_counts[label] for label in y])
+            X = np.ones((len(y), 1))
             intercept_model = LogisticRegression(penalty='l1', C=1e8, fit_intercept=False, solver='liblinear')
-            trained_model = intercept_model.fit(X, y)
+            trained_model = intercept_model.fit(X, y, sample_weight=sample_weight)
             pred = trained_model.predict(X)
-            loss = metrics.log_loss(y, pred)
+            loss = metrics.log_loss(y, pred, sample_weight=sample_weight, labels=y)
+            if len(y) == 2:
+                pos_rate = sample_weight[1] / sample_weight.sum()
+                self._set_intercept_weights(np.log(pos_rate / (1 - pos_rate)))
+            self.intercept = intercept_model.intercept_
         else:
             raise ValueError("Unknown model received. Stepwise stopped.")
-        self.intercept = intercept_model.intercept_
         return loss
 
+    def _set_intercept_weights(self, intercept):
+        """
+        intercept only model starts the first forward step
+        """
+        model_mask = HeteroStepwise.mask2string(np.zeros(self.j_host, dtype=bool), np.zeros(self.j_guest, dtype=bool))
+        self.models_weights[model_mask] = (np.array([intercept]), True)
+
+    def get_init_weights(self, base_mask, feature_mask):
+        """
+        warm start weights of a candidate model from the model of base mask, candidates differ from the best model
+        of previous step by one feature, weights of shared features are kept and weights of added features are 0
+        Parameters
+        ----------
+        base_mask: model mask of previous step best
+        feature_mask: local feature mask of candidate model
+        """
+        if self.role == consts.ARBITER:
+            return None
+        mask = HeteroStepwise.string2mask(base_mask)
+        base_feature_mask = mask[:self.j_host] if self.role == consts.HOST else mask[self.j_host:]
+        if base_mask not in self.models_weights:
+            # host has no intercept, and no weights if previous best is intercept only model
+            if self.role == consts.HOST and not base_feature_mask.any():
+                return np.zeros(int(np.sum(feature_mask))), False
+            return None
+        weights, fit_intercept = self.models_weights[base_mask]
+        base_weights = np.zeros(len(feature_mask))
+        base_weights[base_feature_mask] = weights[:int(np.sum(base_feature_mask))]
+        init_weights = base_weights[feature_mask]
+        if fit_intercept:
+            init_weights = np.append(init_weights, weights[-1])
+        return init_weights, fit_intercept
+
+    def _record_weights(self, trained_model, model_mask):
+        if self.role == consts.ARBITER or getattr(trained_model, "need_one_vs_rest", False):
+            return
+        model_weights = getattr(trained_model, "model_weights", None)
+        if model_weights is None:
+            return
+        self.models_weights[model_mask] = (np.array(model_weights.unboxed, dtype=np.float64),
+                                           model_weights.fit_intercept)
+
     def get_ic_val(self, model, model_mask):
         if self.role != consts.ARBITER:
             return None, None
@@ -225,7 +322,7 @@ class HeteroStepwise(object):
         ic_val = self.IC_computer.compute(self.k, self.n_count, dfe, loss)
         return loss, ic_val
 
-    def _run_step(self, model, train_data, validate_data, feature_mask, n_model, model_mask):
+    def _run_step(self, model, train_data, validate_data, feature_mask, n_model, model_mask, base_mask=None):
         if self.direction == 'forward' and self.n_step == 0:
             if self.role == consts.GUEST:
                 loss, ic_val = self.get_ic_val_guest(model, train_data)
@@ -242,7 +339,9 @@ class HeteroStepwise(object):
             return
         curr_step = Step()
         curr_step.set_step_info((self.n_step, n_model))
-        trained_model = curr_step.run(model, train_data, validate_data, feature_mask)
+        init_weights = self.get_init_weights(base_mask, feature_mask) if base_mask is not None else None
+        trained_model = curr_step.run(model, train_data, validate_data, feature_mask, init_weights)
+        self._record_weights(trained_model, model_mask)
         loss, ic_val = self.get_ic_val(trained_model, model_mask)
         LOGGER.info("step {} n_model {}: ic_val {}".format(self.n_step, n_model, ic_val))
         model_info = ModelInfo(self.n_step, n_model, ic_val, loss, self.step_direction)
@@ -413,6 +512,7 @@ class HeteroStepwise(object):
         LOGGER.info("Enter stepwise")
         self._init_model(component_parameters)
         j_host, j_guest = self.sync_data_info(train_data)
+        self.j_host, self.j_guest = j_host, j_guest
         if train_data is not None:
             self.anonymous_header = data_overview.get_anonymous_header(train_data)
         if self.backward:
@@ -424,7 +524,8 @@ class HeteroStepwise(object):
         while self.n_step <= self.max_step:
             LOGGER.info("Enter step {}".format(self.n_step))
             step_models = set()
-            step_models.add(HeteroStepwise.mask2string(host_mask, guest_mask))
+            base_mask = HeteroStepwise.mask2string(host_mask, guest_mask)
+            step_models.add(base_mask)
             n_model = 0
             if self.backward:
                 self.step_direction = "backward"
@@ -446,7 +547,8 @@ class HeteroStepwise(object):
                             feature_mask = curr_host_mask
                         else:
                             feature_mask = curr_guest_mask
-                        self._run_step(model, train_data, validate_data, feature_mask, n_model, model_mask)
+                        self._run_step(model, train_data, validate_data, feature_mask, n_model, model_mask,
+                                       base_mask=base_mask)
                         n_model += 1
 
             if self.forward:
@@ -472,7 +574,8 @@ class HeteroStepwise(object):
                             feature_mask = curr_host_mask
                         else:
                             feature_mask = curr_guest_mask
-                        self._run_step(model, train_data, validate_data, feature_mask, n_model, model_mask)
+                        self._run_step(model, train_data, validate_data, feature_mask, n_model, model_mask,
+                                       base_mask=base_mask)
                         n_model += 1
             # forward step 0
             if sum(host_mask) + sum(guest_mask) == 0 and self.n_step == 0:
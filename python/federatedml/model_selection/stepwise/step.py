@@ -18,6 +18,7 @@ import copy
 
 import numpy as np
 
+from federatedml.linear_model.linear_model_weight import LinearModelWeights
 from federatedml.statistic.data_overview import get_header, get_anonymous_header
 from federatedml.util import consts
 from federatedml.util import LOGGER
@@ -68,10 +69,26 @@ class Step(object):
 
         return schema
 
-    def run(self, original_model, train_data, validate_data, feature_mask):
+    @staticmethod
+    def warm_start(model, init_weights):
+        """
+        start training from given weights instead of initializer, the same way as a warm started component
+        Parameters
+        ----------
+        model: linear model to be trained
+        init_weights: (weights, fit_intercept), weights of features selected by feature mask, followed by intercept
+        """
+        weights, fit_intercept = init_weights
+        model.model_weights = LinearModelWeights(weights, fit_intercept=fit_intercept, raise_overflow_error=False)
+        model.n_iter_ = 0
+        model.component_properties.is_warm_start = True
+
+    def run(self, original_model, train_data, validate_data, feature_mask, init_weights=None):
         model = copy.deepcopy(original_model)
         current_flowid = self.get_flowid()
         model.set_flowid(current_flowid)
+        if init_weights is not None:
+            Step.warm_start(model, init_weights)
         if original_model.role != consts.ARBITER:
             curr_train_data = train_data.mapValues(lambda v: Step.slice_data_instance(v, feature_mask))
             new_schema = Step.get_new_schema(train_data, feature_mask)
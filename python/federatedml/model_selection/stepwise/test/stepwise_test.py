@@ -15,11 +15,16 @@
 #
 
 import numpy as np
+import types
 import unittest
 import uuid
 
+from sklearn import metrics
+from sklearn.linear_model import LogisticRegression, LinearRegression
+
 from fate_arch.common import profile
 from fate_arch.session import computing_session as session
+from federatedml.feature.instance import Instance
 from federatedml.model_selection.stepwise.hetero_stepwise import HeteroStepwise
 from federatedml.util import consts
 
@@ -87,6 +92,67 @@ class TestStepwise(unittest.TestCase):
         to_enter = self.model.get_to_enter(self.mask, self.mask, self.header)
         self.assertListEqual(to_enter, real_to_enter)
 
+    def test_get_intercept_loss(self):
+        rng = np.random.RandomState(0)
+        self.model.j_host, self.model.j_guest = 3, 5
+        X = np.ones((200, 1))
+        for model_name, labels in [('HeteroLinearRegression', rng.normal(3, 2, 200)),
+                                   ('HeteroLogisticRegression', (rng.rand(200) < 0.3).astype(int))]:
+            data = session.parallelize([(str(i), Instance(label=y)) for i, y in enumerate(labels)],
+                                       include_key=True, partition=4)
+            loss = self.model.get_intercept_loss(types.SimpleNamespace(model_name=model_name), data)
+            if model_name == 'HeteroLinearRegression':
+                pred = LinearRegression(fit_intercept=False).fit(X, labels).predict(X)
+                expect = metrics.mean_squared_error(labels, pred) / 2
+                intercept = np.mean(labels)
+            else:
+                pred = LogisticRegression(penalty='l1', C=1e8, fit_intercept=False,
+                                          solver='liblinear').fit(X, labels).predict(X)
+                expect = metrics.log_loss(labels, pred)
+                intercept = np.log(np.mean(labels) / (1 - np.mean(labels)))
+            self.assertAlmostEqual(loss, expect, places=8)
+            weights, fit_intercept = self.model.models_weights["0" * 8]
+            self.assertTrue(fit_intercept)
+            self.assertAlmostEqual(weights[0], intercept, places=8)
+
+    def test_get_poisson_intercept_loss(self):
+        rng = np.random.RandomState(0)
+        self.model.j_host, self.model.j_guest = 3, 5
+        model = types.SimpleNamespace(model_name='HeteroPoissonRegression')
+        labels = rng.poisson(2.5, 200)
+        data = session.parallelize([(str(i), Instance(label=y)) for i, y in enumerate(labels)],
+                                   include_key=True, partition=4)
+        loss = self.model.get_intercept_loss(model, data)
+        intercept = np.log(np.mean(labels))
+        self.assertAlmostEqual(loss, np.mean(np.exp(intercept) - labels * intercept), places=8)
+        weights, fit_intercept = self.model.models_weights["0" * 8]
+        self.assertTrue(fit_intercept)
+        self.assertAlmostEqual(weights[0], intercept, places=8)
+        self.assertAlmostEqual(self.model.intercept, intercept, places=8)
+
+        data = session.parallelize([(str(i), Instance(label=0)) for i in range(10)], include_key=True, partition=2)
+        with self.assertRaises(ValueError):
+            self.model.get_intercept_loss(model, data)
+
+    def test_get_init_weights(self):
+        self.model.j_host, self.model.j_guest = 3, 5
+        base_mask = "010" + self.str_mask
+        self.model.models_weights[base_mask] = (np.array([0.1, 0.3, 0.4, -1.0]), True)
+        init_weights, fit_intercept = self.model.get_init_weights(base_mask, np.array([1, 1, 1, 1, 0], dtype=bool))
+        np.testing.assert_array_equal(init_weights, [0.1, 0, 0.3, 0.4, -1.0])
+        self.assertTrue(fit_intercept)
+        init_weights, _ = self.model.get_init_weights(base_mask, np.array([1, 0, 0, 1, 0], dtype=bool))
+        np.testing.assert_array_equal(init_weights, [0.1, 0.4, -1.0])
+        self.assertIsNone(self.model.get_init_weights("011" + self.str_mask, self.mask))
+
+        self.model.role = consts.HOST
+        self.model.models_weights[base_mask] = (np.array([0.2]), False)
+        init_weights, fit_intercept = self.model.get_init_weights(base_mask, np.array([1, 1, 0], dtype=bool))
+        np.testing.assert_array_equal(init_weights, [0, 0.2])
+        self.assertFalse(fit_intercept)
+        init_weights, _ = self.model.get_init_weights("000" + self.str_mask, np.array([0, 1, 0], dtype=bool))
+        np.testing.assert_array_equal(init_weights, [0])
+
     def tearDown(self):
         session.stop()
 
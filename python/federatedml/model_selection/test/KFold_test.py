@@ -18,10 +18,12 @@ import unittest
 
 import numpy as np
 
+from fate_arch.federation.transfer_variable import BaseTransferVariables, FederationTagNamespace
 from fate_arch.session import computing_session as session
 from federatedml.feature.instance import Instance
 from federatedml.model_selection import KFold
 from federatedml.param.cross_validation_param import CrossValidationParam
+from federatedml.util import consts
 
 
 class TestKFlod(unittest.TestCase):
@@ -50,28 +52,93 @@ class TestKFlod(unittest.TestCase):
         expect_test_data_num = self.data_num / 10
         expect_train_data_num = self.data_num - expect_test_data_num
 
-        key_list = []
+        # folds are assigned by hash of sample ids, sizes are binomial with std about 9.5
+        test_keys = []
         for train_data, test_data in data_generator:
             train_num = train_data.count()
             test_num = test_data.count()
             # print("train_num: {}, test_num: {}".format(train_num, test_num))
-            self.assertTrue(0.9 * expect_train_data_num < train_num < 1.1 * expect_train_data_num)
-            self.assertTrue(0.9 * expect_test_data_num < test_num < 1.1 * expect_test_data_num)
-            first_key = train_data.first()[0]
-            key_list.append(first_key)
+            self.assertTrue(0.7 * expect_train_data_num < train_num < 1.3 * expect_train_data_num)
+            self.assertTrue(0.7 * expect_test_data_num < test_num < 1.3 * expect_test_data_num)
+            self.assertEqual(train_num + test_num, self.data_num)
+            test_keys.append(sorted(k for k, _ in test_data.collect()))
+        self.assertEqual(sorted(k for keys in test_keys for k in keys), sorted(str(i) for i in range(self.data_num)))
 
-        # Test random seed work
+        # Test random seed work, folds do not depend on partitions, so that parties get the same folds
         kfold_obj2 = KFold()
         kfold_obj2.n_splits = 10
         kfold_obj2.random_seed = 32
+        table = session.parallelize(list(self.table.collect()), include_key=True, partition=5)
 
-        data_generator = kfold_obj.split(self.table)
-        n = 0
-        for train_data, test_data in data_generator:
-            second_key = train_data.first()[0]
-            first_key = key_list[n]
-            self.assertTrue(first_key == second_key)
-            n += 1
+        data_generator = kfold_obj2.split(table)
+        for n, (train_data, test_data) in enumerate(data_generator):
+            self.assertListEqual(sorted(k for k, _ in test_data.collect()), test_keys[n])
+
+        kfold_obj2.random_seed = 33
+        train_data, test_data = next(kfold_obj2.split(table))
+        self.assertNotEqual(sorted(k for k, _ in test_data.collect()), test_keys[0])
+
+    def test_host_split_with_guest_fold_key(self):
+        guest_kfold = KFold()
+        guest_kfold.n_splits = 5
+        guest_kfold.random_seed = None
+        fold_key = guest_kfold._get_fold_key()
+
+        # host has the same ids with its own features and partitions, and splits with the fold key got from guest
+        host_data = [(str(i), Instance(inst_id=i, features=np.ones(3))) for i in range(self.data_num)]
+        host_table = session.parallelize(host_data,
+                                         include_key=True,
+                                         partition=7)
+        host_kfold = KFold()
+        host_kfold.n_splits = 5
+        host_kfold.random_seed = 1
+        guest_folds = list(guest_kfold.split(self.table, fold_key))
+        host_folds = list(host_kfold.split(host_table, fold_key))
+        self.assertEqual(len(guest_folds), len(host_folds))
+        for (guest_train, guest_test), (host_train, host_test) in zip(guest_folds, host_folds):
+            self.assertListEqual(sorted(k for k, _ in guest_train.collect()),
+                                 sorted(k for k, _ in host_train.collect()))
+            self.assertListEqual(sorted(k for k, _ in guest_test.collect()),
+                                 sorted(k for k, _ in host_test.collect()))
+
+    def test_fold_tags(self):
+        kfold_obj = KFold()
+        param = CrossValidationParam(n_splits=3, mode=consts.HOMO, role=consts.HOST, output_fold_history=False)
+        _TagRecordModel.tags = []
+        kfold_obj.run(param, self.table, _TagRecordModel(), host_do_evaluate=False)
+
+        expect_tags = [f"{stage}.{fold_num}.x" for fold_num in range(3)
+                       for stage in ["train", "predict_train", "predict_validate"]]
+        self.assertListEqual(_TagRecordModel.tags, expect_tags)
+
+
+class _TagRecordModel(object):
+    """
+    model recording the federation tag of every fit and predict
+    """
+    tags = []
+
+    def __init__(self):
+        self.flowid = None
+
+    def set_flowid(self, flowid):
+        self.flowid = flowid
+        BaseTransferVariables.set_flowid(flowid)
+
+    def set_cv_fold(self, cv_fold):
+        pass
+
+    def fit(self, train_data, validate_data=None):
+        _TagRecordModel.tags.append(FederationTagNamespace.generate_tag("x"))
+
+    def predict(self, data_inst):
+        _TagRecordModel.tags.append(FederationTagNamespace.generate_tag("x"))
+
+    def summary(self):
+        return {}
+
+    def set_summary(self, summary):
+        pass
 
 
 if __name__ == '__main__':
@@ -4,6 +4,7 @@ from federatedml.util import LOGGER
 from federatedml.nn.dataset.base import Dataset, get_dataset_class
 from federatedml.nn.dataset.image import ImageDataset
 from federatedml.nn.dataset.table import TableDataset
+from federatedml.nn.dataset.stream_table import StreamTableDataset
 from federatedml.nn.dataset.graph import GraphDataset
 
 
@@ -65,6 +66,8 @@ def get_ret_predict_table(id_table, pred_table, classes, partitions, computing_s
 
 
 def add_match_id(id_table: list, dataset_inst: TableDataset):
-    assert isinstance(dataset_inst, TableDataset), 'when using match id your dataset must be a Table Dataset'
+    assert isinstance(dataset_inst, (TableDataset, StreamTableDataset)), \
+        'when using match id your dataset must be a Table Dataset'
+    match_ids = dataset_inst.get_match_ids()
     for id_inst in id_table:
-        id_inst[1].inst_id = dataset_inst.match_ids[id_inst[0]]
+        id_inst[1].inst_id = match_ids[id_inst[0]]
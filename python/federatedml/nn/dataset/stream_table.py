@@ -0,0 +1,247 @@
+import numpy as np
+import torch as t
+from torch.utils.data import IterableDataset, get_worker_info
+from federatedml.feature.sparse_vector import SparseVector
+from federatedml.nn.dataset.base import Dataset
+from federatedml.nn.dataset.table import TableDataset
+from federatedml.statistic.data_overview import with_weight
+from federatedml.util import LOGGER
+
+
+def _to_dense(features):
+    if isinstance(features, SparseVector):
+        row = np.zeros(features.get_shape())
+        for idx, val in features.get_all_data():
+            row[idx] = val
+        return row
+    return features
+
+
+def _block_key(first_key, block_idx):
+    return '{}_{:010d}'.format(first_key, block_idx)
+
+
+def to_blocks(kv_iterator, block_size, with_label, with_sample_weight, f_dtype, l_dtype):
+    """
+    convert rows of a partition to blocks of (keys, inst ids, features, labels, sample weights), at most block_size
+    rows per block, block key is made of the first key of partition so that keys of blocks are unique
+    """
+    blocks = []
+    first_key = None
+    keys, inst_ids, x_, y_, w_ = [], [], [], [], []
+
+    def _make_block():
+        features = np.asarray(x_)
+        if f_dtype:
+            features = features.astype(f_dtype)
+        label = np.asarray(y_, dtype=l_dtype) if with_label else None
+        weights = np.asarray(w_, dtype=np.float64) if with_sample_weight else None
+        return _block_key(first_key, len(blocks)), (keys, inst_ids, features, label, weights)
+
+    for key, inst in kv_iterator:
+        if first_key is None:
+            first_key = key
+        keys.append(key)
+        inst_ids.append(inst.inst_id)
+        x_.append(_to_dense(inst.features))
+        if with_label:
+            y_.append(inst.label)
+        if with_sample_weight:
+            w_.append(inst.weight)
+        if len(keys) >= block_size:
+            blocks.append(_make_block())
+            keys, inst_ids, x_, y_, w_ = [], [], [], [], []
+
+    if keys:
+        blocks.append(_make_block())
+
+    return blocks
+
+
+class StreamTableDataset(Dataset, IterableDataset):
+
+    """
+     A Table Dataset which iterates FATE DTable block by block instead of collecting the whole table into memory.
+     Rows of every partition are converted into numpy blocks by the computing engine, blocks are read one at a time
+     and sliced into batched tensors directly, so that this dataset yields batches rather than samples, use it with
+     DataLoader(dataset, batch_size=None)
+
+     Parameters
+     ----------
+     feature_dtype dtype of feature, supports int, long, float, double
+     label_dtype: dtype of label, supports int, long, float, double
+     label_shape: list or tuple, the shape of label of one sample, default is (1, )
+     flatten_label: bool, flatten label of a batch or not, default is False
+     block_size: int, max row number of a block
+     shuffle_buffer_size: int, rows are shuffled within a buffer of this size in training mode, 0 means no shuffle
+     shuffle_seed: int, random seed of shuffling, shuffle order changes with the epoch given by set_epoch
+     """
+
+    def __init__(
+            self,
+            feature_dtype='float',
+            label_dtype='float',
+            label_shape=None,
+            flatten_label=False,
+            block_size=4096,
+            shuffle_buffer_size=0,
+            shuffle_seed=None):
+
+        super(StreamTableDataset, self).__init__()
+        self.with_label = True
+        self.with_sample_weight = False
+        self.f_dtype = TableDataset.check_dtype(feature_dtype)
+        self.l_dtype = TableDataset.check_dtype(label_dtype)
+        if label_shape is not None:
+            assert isinstance(label_shape, tuple) or isinstance(
+                label_shape, list), 'label shape is {}'.format(label_shape)
+        self.label_shape = label_shape
+        self.flatten_label = flatten_label
+        assert isinstance(block_size, int) and block_size > 0, 'block size must be a positive int'
+        self.block_size = block_size
+        assert isinstance(shuffle_buffer_size, int) and shuffle_buffer_size >= 0, \
+            'shuffle buffer size must be a non-negative int'
+        self.shuffle_buffer_size = shuffle_buffer_size
+        self.shuffle_seed = shuffle_seed
+        self.batch_size = 1
+
+        self.blocks = None
+        self.block_num = 0
+        self.count = 0
+        self._epoch = 0
+        self._sample_ids = None
+        self._match_ids = None
+        self._classes = None
+
+    def load(self, data_inst):
+
+        if isinstance(data_inst, str):
+            raise ValueError('stream table dataset only supports FATE DTable, use TableDataset to load csv files')
+
+        # first() of an empty table returns None or raises, depending on computing engine
+        first = data_inst.take(1)
+        if not first:
+            LOGGER.warning('input table is empty')
+            self.with_sample_weight = False
+        else:
+            self.with_sample_weight = with_weight(data_inst)
+            self.with_label = first[0][1].label is not None
+        LOGGER.info('streaming FATE DTable, with label is {}, with sample weight is {}'.format(
+            self.with_label, self.with_sample_weight))
+
+        block_size, with_label, with_sample_weight = self.block_size, self.with_label, self.with_sample_weight
+        f_dtype, l_dtype = self.f_dtype, self.l_dtype
+        self.blocks = data_inst.mapPartitions(
+            lambda kv_iterator: to_blocks(kv_iterator, block_size, with_label, with_sample_weight, f_dtype, l_dtype),
+            use_previous_behavior=False,
+            preserves_partitioning=False)
+        block_sizes = [size for _, size in self.blocks.mapValues(lambda block: len(block[0])).collect()]
+        self.block_num = len(block_sizes)
+        self.count = sum(block_sizes)
+        self._sample_ids, self._match_ids, self._classes = None, None, None
+        LOGGER.debug('{} rows are split into {} blocks'.format(self.count, self.block_num))
+
+    def set_batch_size(self, batch_size):
+        self.batch_size = batch_size
+
+    def set_epoch(self, epoch):
+        """
+        shuffle seed is derived from epoch, which is set by trainer before every epoch, for data loader workers
+        iterate copies of dataset and can not keep an epoch count of their own
+        """
+        self._epoch = epoch
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, item):
+        raise NotImplementedError('stream table dataset does not support random access, iterate it instead')
+
+    def _iter_blocks(self, worker_id=0, num_workers=1):
+        # blocks are read one by one, every data loader worker takes its share of blocks
+        for idx, (_, block) in enumerate(self.blocks.collect()):
+            if idx % num_workers == worker_id:
+                yield block
+
+    def _make_batch(self, features, label, weights):
+        features = t.from_numpy(features)
+        if not self.with_label:
+            return features
+        if self.label_shape:
+            label = label.reshape([len(label)] + list(self.label_shape))
+        else:
+            label = label.reshape((len(label), -1))
+        if self.flatten_label:
+            label = label.flatten()
+        label = t.from_numpy(label)
+        if self.with_sample_weight and self.training:
+            return [features, [label, t.from_numpy(weights)]]
+        return [features, label]
+
+    def __iter__(self):
+
+        worker_info = get_worker_info()
+        worker_id, num_workers = (0, 1) if worker_info is None else (worker_info.id, worker_info.num_workers)
+        blocks = self._iter_blocks(worker_id, num_workers)
+
+        shuffle = self.training and self.shuffle_buffer_size > 0
+        if shuffle:
+            seed = None if self.shuffle_seed is None else [self.shuffle_seed, self._epoch, worker_id]
+            rng = np.random.RandomState(seed)
+
+        # rows in buffer, every entry is (features, label, weights)
+        buffer = None
+        buffer_limit = self.shuffle_buffer_size if shuffle else 0
+        for _, _, features, label, weights in blocks:
+            block = (features, label, weights)
+            buffer = block if buffer is None else \
+                tuple(np.concatenate([b, a]) if a is not None else None for b, a in zip(buffer, block))
+            buffer_len = len(buffer[0])
+            if buffer_len < buffer_limit + self.batch_size:
+                continue
+            if shuffle:
+                perm = rng.permutation(buffer_len)
+                buffer = tuple(b[perm] if b is not None else None for b in buffer)
+
+            # keep at least buffer_limit rows to mix with following blocks
+            emit_len = (buffer_len - buffer_limit) // self.batch_size * self.batch_size
+            for start in range(0, emit_len, self.batch_size):
+                yield self._make_batch(*[b[start: start + self.batch_size] if b is not None else None
+                                         for b in buffer])
+            buffer = tuple(b[emit_len:] if b is not None else None for b in buffer)
+
+        if buffer is not None and len(buffer[0]) > 0:
+            if shuffle:
+                perm = rng.permutation(len(buffer[0]))
+                buffer = tuple(b[perm] if b is not None else None for b in buffer)
+            for start in range(0, len(buffer[0]), self.batch_size):
+                yield self._make_batch(*[b[start: start + self.batch_size] if b is not None else None
+                                         for b in buffer])
+
+    def _collect_ids(self):
+        sample_ids, match_ids = [], {}
+        for keys, inst_ids, _, _, _ in self._iter_blocks():
+            sample_ids.extend(keys)
+            match_ids.update(zip(keys, inst_ids))
+        self._sample_ids, self._match_ids = sample_ids, match_ids
+
+    def get_classes(self):
+        if not self.with_label:
+            raise ValueError('no label found, please check if input table has label')
+        if self._classes is None:
+            classes = set()
+            for _, _, _, label, _ in self._iter_blocks():
+                classes.update(np.unique(label).tolist())
+            self._classes = sorted(classes)
+        return self._classes
+
+    def get_sample_ids(self):
+        # ids are in the same order as batches in eval mode
+        if self._sample_ids is None:
+            self._collect_ids()
+        return self._sample_ids
+
+    def get_match_ids(self):
+        if self._match_ids is None:
+            self._collect_ids()
+        return self._match_ids
@@ -0,0 +1,122 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import unittest
+import uuid
+
+import numpy as np
+import torch as t
+from fate_arch.session import computing_session as session
+from torch.utils.data import DataLoader
+
+from federatedml.feature.instance import Instance
+from federatedml.feature.sparse_vector import SparseVector
+from federatedml.nn.dataset.stream_table import StreamTableDataset
+from federatedml.nn.dataset.table import TableDataset
+
+
+class TestStreamTableDataset(unittest.TestCase):
+    def setUp(self):
+        session.init("test_stream_table_" + str(uuid.uuid1()))
+        rng = np.random.RandomState(0)
+        self.data = [("id_{:04d}".format(i), Instance(inst_id="m_{}".format(i), features=rng.random(4),
+                                                      label=i % 3, weight=i / 10))
+                     for i in range(257)]
+        self.table = session.parallelize(self.data, include_key=True, partition=4)
+        self.table.schema = {"header": ["x0", "x1", "x2", "x3"], "sid": "id"}
+
+    def _load(self, **kwargs):
+        dataset = StreamTableDataset(**kwargs)
+        dataset.load(self.table)
+        dataset.set_batch_size(16)
+        return dataset
+
+    def test_iterate(self):
+        dataset = self._load(block_size=10)
+        self.assertEqual(len(dataset), len(self.data))
+        self.assertEqual(dataset.get_classes(), [0, 1, 2])
+        self.assertEqual(dataset.get_match_ids()["id_0003"], "m_3")
+
+        batches = list(DataLoader(dataset, batch_size=None))
+        self.assertTrue(all(len(batch[0]) == 16 for batch in batches[:-1]))
+        features = t.cat([x for x, (y, w) in batches]).numpy()
+        label = t.cat([y for x, (y, w) in batches]).numpy()
+        self.assertEqual(label.shape, (len(self.data), 1))
+
+        data = dict(self.data)
+        expect = np.array([data[key].features for key in dataset.get_sample_ids()], dtype=np.float32)
+        self.assertTrue(np.array_equal(features, expect))
+
+        # eval mode yields samples in the order of sample ids, and no sample weights
+        dataset.eval()
+        eval_features = t.cat([x for x, y in DataLoader(dataset, batch_size=None)]).numpy()
+        self.assertTrue(np.array_equal(eval_features, expect))
+
+    def test_shuffle(self):
+        dataset = self._load(block_size=10, shuffle_buffer_size=50, shuffle_seed=1)
+        epochs = []
+        for epoch in [0, 1, 0]:
+            dataset.set_epoch(epoch)
+            epochs.append(t.cat([x for x, _ in DataLoader(dataset, batch_size=None)]).numpy())
+        dataset.eval()
+        expect = t.cat([x for x, _ in DataLoader(dataset, batch_size=None)]).numpy()
+        for features in epochs:
+            self.assertFalse(np.array_equal(features, expect))
+            self.assertTrue(np.array_equal(np.sort(features, axis=0), np.sort(expect, axis=0)))
+        self.assertFalse(np.array_equal(epochs[0], epochs[1]))
+        self.assertTrue(np.array_equal(epochs[0], epochs[2]))
+
+    def test_shuffle_with_workers(self):
+        # workers iterate copies of dataset, shuffle order still changes with epoch set on dataset
+        dataset = self._load(block_size=10, shuffle_buffer_size=50, shuffle_seed=1)
+        epochs = []
+        for epoch in range(2):
+            dataset.set_epoch(epoch)
+            epochs.append(t.cat([x for x, _ in DataLoader(dataset, batch_size=None, num_workers=2)]).numpy())
+        self.assertFalse(np.array_equal(epochs[0], epochs[1]))
+        self.assertTrue(np.array_equal(np.sort(epochs[0], axis=0), np.sort(epochs[1], axis=0)))
+
+    def test_empty_table(self):
+        dataset = StreamTableDataset()
+        dataset.load(session.parallelize([], include_key=True, partition=2))
+        self.assertEqual(len(dataset), 0)
+        self.assertEqual(list(DataLoader(dataset, batch_size=None)), [])
+
+    def test_same_as_table_dataset(self):
+        dense_table = self.table.mapValues(lambda inst: Instance(inst_id=inst.inst_id, label=inst.label,
+                                                                 features=inst.features * [0, 1, 0, 1]))
+        dense_table.schema = self.table.schema
+        self.table = self.table.mapValues(lambda inst: Instance(
+            inst_id=inst.inst_id, label=inst.label,
+            features=SparseVector([1, 3], [inst.features[1], inst.features[3]], shape=4)))
+        self.table.schema = dense_table.schema
+        table_dataset = TableDataset()
+        table_dataset.load(dense_table)
+
+        dataset = self._load(block_size=100)
+        batches = list(DataLoader(dataset, batch_size=None))
+        # table dataset sorts samples by id
+        order = np.argsort(dataset.get_sample_ids())
+        self.assertTrue(np.array_equal(t.cat([x for x, _ in batches]).numpy()[order], table_dataset.features))
+        self.assertTrue(np.array_equal(t.cat([y for _, y in batches]).numpy()[order], table_dataset.label))
+        self.assertEqual(sorted(dataset.get_sample_ids()), table_dataset.get_sample_ids())
+
+    def tearDown(self):
+        session.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,6 +12,7 @@ from federatedml.framework.homo.aggregator.secure_aggregator import SecureAggreg
 from federatedml.nn.backend.utils import deepspeed_util
 from federatedml.nn.backend.utils import distributed_util
 from federatedml.nn.dataset.base import Dataset
+from federatedml.nn.dataset.stream_table import StreamTableDataset
 from federatedml.nn.homo.trainer.trainer_base import TrainerBase
 from federatedml.util import LOGGER, consts
 from federatedml.optim.convergence import converge_func_factory
@@ -38,6 +39,15 @@ class FedAVGTrainer(TrainerBase):
 
     aggregate_every_n_epoch: None or int. if None, aggregate model on the end of every epoch, if int, aggregate
                              every n epochs.
+    aggregate_chunk_size: None or int. if int, models are flattened and sent to the arbiter in chunks of this many
+                          parameters, the arbiter sums chunks of all clients one by one and sends back every
+                          aggregated chunk immediately, which keeps arbiter memory at the size of one model.
+    compress_type: None, 'fp16', 'int8' or 'topk'. if not None, model deltas are compressed before sending to the
+                   arbiter, 'fp16' and 'int8' are stochastic quantization, they are quantized onto a fixed-point
+                   ring when secure_aggregate is True; 'topk' only sends values with largest magnitudes, and is not
+                   compatible with secure_aggregate. Compression errors are fed back to the next round. Bytes sent
+                   every round are reported as metric 'sent_bytes'
+    compress_topk_ratio: float in (0, 1], fraction of values to send when compress_type is 'topk'
 
     cuda: None, int or list of int. if None, use cpu; if int, use the the {int} device, if list of int, use the
           This trainier will automatically detect use DataParallel for multi GPU training, the first index will be
@@ -62,6 +72,7 @@ class FedAVGTrainer(TrainerBase):
     def __init__(self, epochs=10, batch_size=512,  # training parameter
                  early_stop=None, tol=0.0001,  # early stop parameters
                  secure_aggregate=True, weighted_aggregation=True, aggregate_every_n_epoch=None,  # federation
+                 aggregate_chunk_size=None, compress_type=None, compress_topk_ratio=0.01,
                  cuda=None,
                  pin_memory=True, shuffle=True, data_loader_worker=0,  # GPU & dataloader
                  validation_freqs=None,  # validation configuration
@@ -96,6 +107,13 @@ class FedAVGTrainer(TrainerBase):
         self.secure_aggregate = secure_aggregate
         self.weighted_aggregation = weighted_aggregation
         self.aggregate_every_n_epoch = aggregate_every_n_epoch
+        self.aggregate_chunk_size = aggregate_chunk_size
+        self.compress_type = compress_type
+        self.compress_topk_ratio = compress_topk_ratio
+        compress_type_allow = [None, 'fp16', 'int8', 'topk']
+        assert self.compress_type in compress_type_allow, 'compress type must in {}'.format(compress_type_allow)
+        if self.compress_type == 'topk' and self.secure_aggregate:
+            raise ValueError('topk compression is not compatible with secure aggregation')
 
         # GPU, check cuda setting
         self.cuda = cuda
@@ -138,17 +156,20 @@ class FedAVGTrainer(TrainerBase):
         self.check_trainer_param([self.epochs,
                                   self.validation_freq,
                                   self.save_freq,
-                                  self.aggregate_every_n_epoch],
+                                  self.aggregate_every_n_epoch,
+                                  self.aggregate_chunk_size],
                                  ['epochs',
                                   'validation_freq',
                                   'save_freq',
-                                  'aggregate_every_n_epoch'],
+                                  'aggregate_every_n_epoch',
+                                  'aggregate_chunk_size'],
                                  self.is_pos_int,
                                  '{} is not a positive int')
         self.check_trainer_param([self.secure_aggregate, self.weighted_aggregation, self.pin_memory, self.save_to_local_dir], [
                                  'secure_aggregate', 'weighted_aggregation', 'pin_memory', 'save_to_local_dir'], self.is_bool, '{} is not a bool')
-        self.check_trainer_param(
-            [self.tol], ['tol'], self.is_float, '{} is not a float')
+        self.check_trainer_param([self.tol], ['tol'], self.is_float, '{} is not a float')
+        self.check_trainer_param([self.compress_topk_ratio], ['compress_topk_ratio'], self.is_ratio,
+                                 '{} is not a number in (0, 1]')
 
     def _init_aggregator(self, train_set):
         # compute round to aggregate
@@ -167,7 +188,9 @@ class FedAVGTrainer(TrainerBase):
 
             if not distributed_util.is_distributed() or distributed_util.is_rank_0():
                 client_agg = SecureAggClient(
-                    self.secure_aggregate, aggregate_weight=sample_num, communicate_match_suffix=self.comm_suffix)
+                    self.secure_aggregate, aggregate_weight=sample_num, communicate_match_suffix=self.comm_suffix,
+                    stream_chunk_size=self.aggregate_chunk_size, compress_type=self.compress_type,
+                    topk_ratio=self.compress_topk_ratio)
             else:
                 client_agg = None
         else:
@@ -199,6 +222,8 @@ class FedAVGTrainer(TrainerBase):
 
         if isinstance(self.data_loader.sampler, DistributedSampler):
             self.data_loader.sampler.set_epoch(epoch_idx)
+        if isinstance(train_set, StreamTableDataset):
+            train_set.set_epoch(epoch_idx)
 
         dl = self.data_loader
 
@@ -332,6 +357,8 @@ class FedAVGTrainer(TrainerBase):
 
                     if not distributed_util.is_distributed() or distributed_util.is_rank_0():
                         self.model = client_agg.model_aggregation(self.model)
+                        if self.compress_type is not None:
+                            self.callback_metric('sent_bytes', client_agg.sent_bytes[-1], epoch_idx=i)
                         if distributed_util.is_distributed() and distributed_util.get_num_workers() > 1:
                             self._share_model()
                     else:
@@ -429,11 +456,15 @@ class FedAVGTrainer(TrainerBase):
         if not dataset.has_sample_ids():
             dataset.init_sid_and_getfunc(prefix=dataset.get_type())
 
+        if isinstance(dataset, StreamTableDataset):
+            dataset.set_batch_size(self.batch_size)
+            data_loader = DataLoader(dataset, batch_size=None)
+        else:
+            data_loader = DataLoader(dataset, self.batch_size)
+
         labels = []
         with torch.no_grad():
-            for _batch_iter in DataLoader(
-                dataset, self.batch_size
-            ):
+            for _batch_iter in data_loader:
                 if isinstance(_batch_iter, list):
                     batch_data, batch_label = _batch_iter
                 else:
@@ -490,7 +521,9 @@ class FedAVGTrainer(TrainerBase):
                 'check early stop, converge func is {}'.format(converge_func))
 
         LOGGER.info('server running aggregate procedure')
-        server_agg = SecureAggServer(self.secure_aggregate, communicate_match_suffix=self.comm_suffix)
+        server_agg = SecureAggServer(self.secure_aggregate, communicate_match_suffix=self.comm_suffix,
+                                     stream_aggregate=self.aggregate_chunk_size is not None,
+                                     compress_type=self.compress_type)
 
         # aggregate and broadcast models
         for i in range(self.epochs):
@@ -549,7 +582,20 @@ class FedAVGTrainer(TrainerBase):
     def _get_train_data_loader(self, train_set):
         collate_fn = self._get_collate_fn(train_set)
 
-        if not distributed_util.is_distributed() or distributed_util.get_num_workers() <= 1:
+        if isinstance(train_set, StreamTableDataset):
+            # blocks of stream dataset can not be split into equal shares of batches, which ranks need to stay
+            # in step, so it is not sharded by rank
+            if distributed_util.is_distributed() and distributed_util.get_num_workers() > 1:
+                raise ValueError('stream table dataset does not support distributed training, use table dataset')
+            # stream dataset yields batches and shuffles rows within its own buffer
+            train_set.set_batch_size(self.batch_size)
+            self.data_loader = DataLoader(
+                train_set,
+                batch_size=None,
+                pin_memory=self.pin_memory,
+                num_workers=self.data_loader_worker
+            )
+        elif not distributed_util.is_distributed() or distributed_util.get_num_workers() <= 1:
             self.data_loader = DataLoader(
                 train_set,
                 batch_size=self.batch_size,
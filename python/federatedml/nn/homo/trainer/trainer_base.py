@@ -78,6 +78,10 @@ class TrainerBase(object):
     def is_bool(val):
         return isinstance(val, bool)
 
+    @staticmethod
+    def is_ratio(val):
+        return isinstance(val, (int, float)) and not isinstance(val, bool) and 0 < val <= 1
+
     @staticmethod
     def check_trainer_param(
             var_list,
@@ -482,6 +482,12 @@ class HeteroSecureBoostParam(HeteroBoostingParam):
         check the complexity of tree models when running EINI algorithms. Complexity models are easy to hide their
         decision path, while simple tree models are not, therefore if a tree model is too simple, it is not allowed
         to run EINI predict algorithms.
+    leaf_mask_inference: bool
+        default is False, when enabled, hetero prediction finishes in one communication round: every host computes,
+        for each sample and tree, a bitmask of leaves that are consistent with its own splits and sends it to guest
+        once, guest intersects host masks with its own to find the final leaves. Note that leaf masks reveal host
+        split results of all host nodes rather than those on the decision path only. Not used in mix mode and
+        EINI inference.
     """
 
     def __init__(self, tree_param: DecisionTreeParam = DecisionTreeParam(), task_type=consts.CLASSIFICATION,
@@ -498,7 +504,7 @@ class HeteroSecureBoostParam(HeteroBoostingParam):
                  cipher_compress_error=None, cipher_compress=True, new_ver=True, boosting_strategy=consts.STD_TREE,
                  work_mode=None, tree_num_per_party=1, guest_depth=2, host_depth=3, callback_param=CallbackParam(),
                  multi_mode=consts.SINGLE_OUTPUT, EINI_inference=False, EINI_random_mask=False,
-                 EINI_complexity_check=False):
+                 EINI_complexity_check=False, leaf_mask_inference=False):
 
         super(HeteroSecureBoostParam, self).__init__(task_type, objective_param, learning_rate, num_trees,
                                                      subsample_feature_rate, n_iter_no_change, tol, encrypt_param,
@@ -522,6 +528,7 @@ class HeteroSecureBoostParam(HeteroBoostingParam):
         self.EINI_inference = EINI_inference
         self.EINI_random_mask = EINI_random_mask
         self.EINI_complexity_check = EINI_complexity_check
+        self.leaf_mask_inference = leaf_mask_inference
         self.boosting_strategy = boosting_strategy
         self.work_mode = work_mode
         self.tree_num_per_party = tree_num_per_party
@@ -548,6 +555,7 @@ class HeteroSecureBoostParam(HeteroBoostingParam):
         self.check_boolean(self.EINI_inference, 'eini inference')
         self.check_boolean(self.EINI_random_mask, 'eini random mask')
         self.check_boolean(self.EINI_complexity_check, 'eini complexity check')
+        self.check_boolean(self.leaf_mask_inference, 'leaf mask inference')
 
         assert isinstance(self.complete_secure,
                           int) and self.complete_secure >= 0, "complete secure should be an int >= 0"
@@ -560,6 +568,10 @@ class HeteroSecureBoostParam(HeteroBoostingParam):
         if self.work_mode == consts.MIX_TREE and self.EINI_inference:
             LOGGER.warning('Mix tree mode does not support EINI, use default predict setting')
 
+        if self.leaf_mask_inference and self.EINI_inference:
+            LOGGER.warning('EINI inference and leaf mask inference are both enabled, leaf mask inference will only be '
+                           'used in training validation')
+
         if self.work_mode is not None:
             self.boosting_strategy = self.work_mode
 
@@ -612,6 +624,9 @@ class HomoSecureBoostParam(BoostingParam):
     ----------
     backend: {'distributed', 'memory'}
         decides which backend to use when computing histograms for homo-sbt
+    histogram_compress_type: {None, 'fp16', 'int8'}, default is None
+        if not None, g and h of local histograms are stochastically quantized onto a 16-bit or 8-bit fixed-point
+        ring before secure aggregation, sample counts are not compressed
     """
 
     def __init__(self, tree_param: DecisionTreeParam = DecisionTreeParam(), task_type=consts.CLASSIFICATION,
@@ -620,7 +635,8 @@ class HomoSecureBoostParam(BoostingParam):
                  tol=0.0001, bin_num=32, predict_param=PredictParam(), cv_param=CrossValidationParam(),
                  validation_freqs=None, use_missing=False, zero_as_missing=False, random_seed=100,
                  binning_error=consts.DEFAULT_RELATIVE_ERROR, backend=consts.DISTRIBUTED_BACKEND,
-                 callback_param=CallbackParam(), multi_mode=consts.SINGLE_OUTPUT):
+                 callback_param=CallbackParam(), multi_mode=consts.SINGLE_OUTPUT,
+                 histogram_compress_type=None):
 
         super(HomoSecureBoostParam, self).__init__(task_type=task_type,
                                                    objective_param=objective_param,
@@ -642,6 +658,7 @@ class HomoSecureBoostParam(BoostingParam):
         self.backend = backend
         self.callback_param = copy.deepcopy(callback_param)
         self.multi_mode = multi_mode
+        self.histogram_compress_type = histogram_compress_type
 
     def check(self):
 
@@ -681,4 +698,9 @@ class HomoSecureBoostParam(BoostingParam):
             if self.task_type == consts.REGRESSION:
                 raise ValueError('regression tasks not support multi-output trees')
 
+        if self.histogram_compress_type is not None:
+            self.histogram_compress_type = self.check_and_change_lower(self.histogram_compress_type,
+                                                                       ['fp16', 'int8'],
+                                                                       "boosting_param's histogram_compress_type")
+
         return True
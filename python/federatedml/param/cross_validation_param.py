@@ -35,7 +35,8 @@ class CrossValidationParam(BaseParam):
     role: {'Guest', 'Host', 'Arbiter'}, default: 'Guest'
         Indicate what role is current party
     shuffle: bool, default: True
-        Define whether do shuffle before KFold or not.
+        Define whether do shuffle before KFold or not. Samples are assigned to folds by a hash of their ids,
+        keyed by random_seed if shuffle, otherwise by a fixed key
     random_seed: int, default: 1
         Specify the random seed for numpy shuffle
     need_cv: bool, default False
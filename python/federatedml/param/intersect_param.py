@@ -123,12 +123,20 @@ class RSAParam(BaseParam):
         value >= 1024, bit count of rsa key, default 1024
     random_bit: positive int
         it will define the size of blinding factor in rsa algorithm, default 128
+    blinding_pool_size: positive int
+        if not None, precompute blinding_pool_size pairs of (r, r^e mod n) once and blind every id with product of
+        two randomly drawn pairs, which saves one modular exponentiation per id, while only
+        blinding_pool_size^2 distinct blinding factors are used; ignored when random_base_fraction is set,
+        default None
+    powmod_thread_num: positive int
+        number of threads used for batched modular exponentiation within a partition,
+        takes effect with gmpy2 >= 2.1, default 1
 
     """
 
     def __init__(self, salt='', hash_method='sha256', final_hash_method='sha256',
                  split_calculation=False, random_base_fraction=None, key_length=consts.DEFAULT_KEY_LENGTH,
-                 random_bit=DEFAULT_RANDOM_BIT):
+                 random_bit=DEFAULT_RANDOM_BIT, blinding_pool_size=None, powmod_thread_num=1):
         super().__init__()
         self.salt = salt
         self.hash_method = hash_method
@@ -137,6 +145,8 @@ class RSAParam(BaseParam):
         self.random_base_fraction = random_base_fraction
         self.key_length = key_length
         self.random_bit = random_bit
+        self.blinding_pool_size = blinding_pool_size
+        self.powmod_thread_num = powmod_thread_num
 
     def check(self):
         descr = "rsa param's "
@@ -162,6 +172,9 @@ class RSAParam(BaseParam):
         if self.key_length < 1024:
             raise ValueError(f"key length must be >= 1024")
         self.check_positive_integer(self.random_bit, f"{descr}random_bit")
+        if self.blinding_pool_size is not None:
+            self.check_positive_integer(self.blinding_pool_size, f"{descr}blinding_pool_size")
+        self.check_positive_integer(self.powmod_thread_num, f"{descr}powmod_thread_num")
 
         LOGGER.debug("Finish RSAParam parameter check!")
         return True
@@ -410,6 +423,10 @@ class IntersectParam(BaseParam):
         with ver1.7 and above, this param is ignored.
     run_cache: bool
         whether to store Host's encrypted ids, only valid when intersect method is 'rsa', 'dh', 'ecdh', default False
+    incremental_cache: bool
+        effective only when intersect with cache, only valid when intersect method is 'rsa', default False;
+        if True, only ids added or removed since the cache was generated are encrypted,
+        delta is merged into cached encrypted ids and the updated ids are output as a new cache for later jobs
     cardinality_only: bool
         whether to output estimated intersection count(cardinality);
         if sync_cardinality is True, then sync cardinality count with host(s)
@@ -443,7 +460,7 @@ class IntersectParam(BaseParam):
                  with_encode=False, encode_params=EncodeParam(),
                  raw_params=RAWParam(), rsa_params=RSAParam(), dh_params=DHParam(), ecdh_params=ECDHParam(),
                  join_method=consts.INNER_JOIN, new_sample_id: bool = False, sample_id_generator=consts.GUEST,
-                 intersect_cache_param=IntersectCache(), run_cache: bool = False,
+                 intersect_cache_param=IntersectCache(), run_cache: bool = False, incremental_cache: bool = False,
                  cardinality_only: bool = False, sync_cardinality: bool = False, cardinality_method=consts.ECDH,
                  run_preprocess: bool = False,
                  intersect_preprocess_params=IntersectPreProcessParam(),
@@ -462,6 +479,7 @@ class IntersectParam(BaseParam):
         self.sample_id_generator = sample_id_generator
         self.intersect_cache_param = copy.deepcopy(intersect_cache_param)
         self.run_cache = run_cache
+        self.incremental_cache = incremental_cache
         self.repeated_id_process = repeated_id_process
         self.repeated_id_owner = repeated_id_owner
         self.allow_info_share = allow_info_share
@@ -520,6 +538,7 @@ class IntersectParam(BaseParam):
                 raise ValueError(f"Cannot perform left join without sync intersect ids")
 
         self.check_boolean(self.run_cache, f"{descr} run_cache")
+        self.check_boolean(self.incremental_cache, f"{descr} incremental_cache")
 
         if self._warn_to_deprecate_param("encode_params", descr, "raw_params") or \
                 self._warn_to_deprecate_param("with_encode", descr, "raw_params' 'use_hash'"):
@@ -561,6 +580,12 @@ class IntersectParam(BaseParam):
                 raise ValueError(f"cache is not available for cardinality_only mode.")
             if self.run_preprocess:
                 raise ValueError(f"Preprocessing does not support cache.")
+        if self.incremental_cache:
+            if self.intersect_method != consts.RSA:
+                raise ValueError("Only rsa method supports incremental cache.")
+            if self.run_cache:
+                raise ValueError("incremental cache takes effect when intersect with cache, "
+                                 "it should not be set with run_cache.")
 
         deprecated_param_list = ["repeated_id_process", "repeated_id_owner", "intersect_cache_param",
                                  "allow_info_share", "info_owner", "with_sample_id"]
@@ -360,6 +360,16 @@ class PadsCipher(Encrypt):
                 ret -= rand.rand(1)[0] * self._amplify_factor
         return ret
 
+    def encrypt_ring(self, value):
+        """
+        mask an unsigned integer array on the ring of its dtype, pads cancel out when arrays of all parties are
+        summed with wraparound
+        """
+        ret = value
+        for uid, rand in self._rands.items():
+            ret = rand.add_ring_pads(ret, 1 if uid > self._uuid else -1)
+        return ret
+
     def encrypt_table(self, table):
         def _pad(key, value, seeds, amplify_factor):
             has_key = int(hashlib.md5(f"{key}".encode("ascii")).hexdigest(), 16)
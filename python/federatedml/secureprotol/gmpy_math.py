@@ -14,12 +14,21 @@
 #  limitations under the License.
 #
 
+import math
 import os
 import random
+from concurrent.futures import ThreadPoolExecutor
+
 import gmpy2
 
 POWMOD_GMP_SIZE = pow(2, 64)
 
+# gmpy2 >= 2.1 computes a list of powmod without holding the GIL
+_POWMOD_LIST_VALID = hasattr(gmpy2, "powmod_base_list")
+
+# bits of exponent covered by one row of a fixed base table
+FIXED_BASE_WINDOW = 8
+
 
 def powmod(a, b, c):
     """
@@ -55,6 +64,83 @@ def powmod_crt(x, d, n, p, q, cp, cq):
     return int((rp * cp + rq * cq) % n)
 
 
+def _powmod_base_list(bases, e, n, thread_num=1):
+    """
+    return list of mpz: [(b ** e) % n for b in bases]
+    """
+    e, n = gmpy2.mpz(e), gmpy2.mpz(n)
+    if not _POWMOD_LIST_VALID:
+        return [gmpy2.powmod(b, e, n) for b in bases]
+
+    if thread_num <= 1 or len(bases) < 2 * thread_num:
+        return gmpy2.powmod_base_list(bases, e, n)
+
+    chunk_size = int(math.ceil(len(bases) / thread_num))
+    with ThreadPoolExecutor(max_workers=thread_num) as executor:
+        chunks = executor.map(lambda start: gmpy2.powmod_base_list(bases[start: start + chunk_size], e, n),
+                              range(0, len(bases), chunk_size))
+    return [r for chunk in chunks for r in chunk]
+
+
+def powmod_base_list(bases, e, n, thread_num=1):
+    """
+    return list of int: [(b ** e) % n for b in bases],
+    bases are split into thread_num chunks computed in parallel when gmpy2 releases GIL
+    """
+    return [int(r) for r in _powmod_base_list(bases, e, n, thread_num)]
+
+
+def powmod_crt_list(xs, d, n, p, q, cp, cq, thread_num=1):
+    """
+    return list of int: [(x ** d) % n for x in xs], exponents modulo p - 1 and q - 1 are computed once
+    """
+    rp = _powmod_base_list([x % p for x in xs], d % (p - 1), p, thread_num)
+    rq = _powmod_base_list([x % q for x in xs], d % (q - 1), q, thread_num)
+    return [int((a * cp + b * cq) % n) for a, b in zip(rp, rq)]
+
+
+def fixed_base_table(g, n, exp_bits, window=FIXED_BASE_WINDOW):
+    """
+    return list of list of mpz: table[i][j] = (g ** (j << (window * i))) % n, for exponents of at most exp_bits bits
+    """
+    g, n = gmpy2.mpz(g), gmpy2.mpz(n)
+    table = []
+    for _ in range((exp_bits + window - 1) // window):
+        row = [gmpy2.mpz(1)]
+        for _ in range((1 << window) - 1):
+            row.append(row[-1] * g % n)
+        table.append(row)
+        g = gmpy2.powmod(g, 1 << window, n)
+    return table
+
+
+def powmod_fixed_base_list(table, es, n, window=FIXED_BASE_WINDOW):
+    """
+    return list of int: [(g ** e) % n for e in es], where table = fixed_base_table(g, n, exp_bits, window),
+    every exponent costs one multiplication per window instead of a full square-and-multiply,
+    exponents should be non-negative, exponents longer than the table fall back to powmod
+    """
+    n = gmpy2.mpz(n)
+    mask = (1 << window) - 1
+    max_bits = len(table) * window
+    res = []
+    for e in es:
+        e = int(e)
+        if e.bit_length() > max_bits:
+            res.append(int(gmpy2.powmod(table[0][1], e, n)))
+            continue
+        acc = gmpy2.mpz(1)
+        for row in table:
+            if not e:
+                break
+            digit = e & mask
+            if digit:
+                acc = acc * row[digit] % n
+            e >>= window
+        res.append(int(acc))
+    return res
+
+
 def invert(a, b):
     """return int: x, where a * x == 1 mod b"""
     x = int(gmpy2.invert(a, b))
@@ -1,5 +1,7 @@
 import base64
 import hashlib
+
+import numpy as np
 from fate_crypto.hash import sm3_hash
 
 from federatedml.util import consts
@@ -138,6 +140,15 @@ HASH_BASE64_FUNCTION = {
     "none": compute_no_hash_base64
 }
 
+HASH_CONSTRUCTOR = {
+    consts.MD5: hashlib.md5,
+    consts.SHA1: hashlib.sha1,
+    consts.SHA224: hashlib.sha224,
+    consts.SHA256: hashlib.sha256,
+    consts.SHA384: hashlib.sha384,
+    consts.SHA512: hashlib.sha512
+}
+
 
 class Hash:
     def __init__(self, method, base64=0, hex_output=True):
@@ -163,3 +174,47 @@ class Hash:
         if suffix_salt:
             value = value + suffix_salt
         return self.hash_operator(value)
+
+    def compute_batch(self, values, prefix_salt=None, suffix_salt=None):
+        """
+        hash a batch of values with the same salt,
+        return list, same as [self.compute(v, prefix_salt, suffix_salt) for v in values]
+        """
+        hash_operator = self.hash_operator
+        prefix_salt = prefix_salt if prefix_salt else ''
+        suffix_salt = suffix_salt if suffix_salt else ''
+        return [hash_operator(prefix_salt + str(v) + suffix_salt) for v in values]
+
+    def compute_digest_batch(self, values, prefix_salt=None, suffix_salt=None):
+        """
+        hash a batch of values, return raw digests regardless of output format
+        Parameters
+        ----------
+        values: list of values
+        prefix_salt: str
+        suffix_salt: str or list of str, values are encoded once and hashed with every suffix salt in list
+
+        Returns
+        -------
+        2-D uint8 array, each row is the digest of one value,
+        or 3-D uint8 array of shape (len(suffix_salt), len(values), digest_size) if suffix_salt is a list
+        """
+        if self.method == "none":
+            raise ValueError("raw digest of method none has no fixed length")
+        prefix = bytes(prefix_salt, encoding='utf-8') if prefix_salt else b''
+        encoded_values = [prefix + bytes(str(v), encoding='utf-8') for v in values]
+        suffix_salts = suffix_salt if isinstance(suffix_salt, (list, tuple)) else [suffix_salt]
+        constructor = HASH_CONSTRUCTOR.get(self.method)
+        digest_size = constructor().digest_size if constructor else len(compute_sm3_bytes(''))
+
+        rs = np.zeros((len(suffix_salts), len(values), digest_size), dtype=np.uint8)
+        for i, salt in enumerate(suffix_salts):
+            if not encoded_values:
+                break
+            suffix = bytes(salt, encoding='utf-8') if salt else b''
+            if constructor:
+                digests = [constructor(value + suffix).digest() for value in encoded_values]
+            else:
+                digests = [bytes(sm3_hash(value + suffix)) for value in encoded_values]
+            rs[i] = np.frombuffer(b''.join(digests), dtype=np.uint8).reshape(len(values), digest_size)
+        return rs if isinstance(suffix_salt, (list, tuple)) else rs[0]
@@ -16,10 +16,11 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 #
+from federatedml.secureprotol.gmpy_math import invert
 from federatedml.secureprotol.number_theory.field.integers_modulo_prime_field import IntegersModuloPrimeArithmetic, \
     IntegersModuloPrimeElement
 from federatedml.secureprotol.number_theory.group.cyclc_group import CyclicGroupArithmetic, CyclicGroupElement
-from federatedml.util.conversion import int_to_bytes, bytes_to_int, int_to_binary_representation
+from federatedml.util.conversion import int_to_bytes, bytes_to_int
 
 
 class TwistedEdwardsCurveElement(CyclicGroupElement):
@@ -144,7 +145,7 @@ class TwistedEdwardsCurveArithmetic(CyclicGroupArithmetic):
 
     def mul(self, scalar, a):
         """
-
+        double-and-add in projective coordinates, only one inversion is needed to get the affine result
         :param scalar: int
         :param a: TwistedEdwardsCurveElement
         :return:
@@ -156,11 +157,78 @@ class TwistedEdwardsCurveArithmetic(CyclicGroupArithmetic):
         elif scalar < 0:
             raise TypeError("Multiplication only supports non-negative scalars")
         else:
-            binary_representation = int_to_binary_representation(scalar)
-            res = self.identity
-            for exponent in binary_representation:
-                res = self.add(res, self._multiple_twice(exponent, a))
-            return res
+            base = self._to_projective(a)
+            res = None
+            for bit in bin(scalar)[2:]:
+                if res is not None:
+                    res = self._projective_add(res, res)
+                if bit == '1':
+                    res = base if res is None else self._projective_add(res, base)
+            return self._from_projective([res])[0]
+
+    def multiples_sub(self, a, b, n):
+        """
+        [a - i * b for i in range(n)], multiples are derived incrementally by adding -b, and converted
+        to affine coordinates with a single batched inversion
+        :param a: TwistedEdwardsCurveElement
+        :param b: TwistedEdwardsCurveElement
+        :param n: int
+        :return: List[TwistedEdwardsCurveElement]
+        """
+        if not isinstance(a, TwistedEdwardsCurveElement) or not isinstance(b, TwistedEdwardsCurveElement):
+            raise TypeError("Multiples only supports two objects")
+        neg_b = self._to_projective(self.neg(b))
+        points = []
+        point = self._to_projective(a)
+        for i in range(n):
+            points.append(point)
+            point = self._projective_add(point, neg_b)
+        return self._from_projective(points)
+
+    def _to_projective(self, a):
+        return a.x.val % self.FA.mod, a.y.val % self.FA.mod, 1
+
+    def _projective_add(self, p1, p2):
+        """
+        unified addition in projective coordinates (X : Y : Z) = (X/Z, Y/Z), same as the affine add above,
+        see Bernstein, Daniel J., et al. "Twisted edwards curves." 2008, section 6
+        """
+        mod = self.FA.mod
+        x1, y1, z1 = p1
+        x2, y2, z2 = p2
+        a_ = z1 * z2 % mod
+        b_ = a_ * a_ % mod
+        c_ = x1 * x2 % mod
+        d_ = y1 * y2 % mod
+        e_ = self.d.val * c_ % mod * d_ % mod
+        f_ = (b_ - e_) % mod
+        g_ = (b_ + e_) % mod
+        x3 = a_ * f_ % mod * (((x1 + y1) * (x2 + y2) - c_ - d_) % mod) % mod
+        y3 = a_ * g_ % mod * ((d_ - self.a.val * c_) % mod) % mod
+        z3 = f_ * g_ % mod
+        return x3, y3, z3
+
+    def _from_projective(self, points):
+        """
+        convert to affine coordinates, Z's are inverted all at once by Montgomery's trick
+        """
+        if not points:
+            return []
+        mod = self.FA.mod
+        prefix = [1] * len(points)
+        acc = 1
+        for i, (_, _, z) in enumerate(points):
+            prefix[i] = acc
+            acc = acc * z % mod
+        inv = invert(acc, mod)
+        res = [None] * len(points)
+        for i in range(len(points) - 1, -1, -1):
+            x, y, z = points[i]
+            z_inv = inv * prefix[i] % mod
+            inv = inv * z % mod
+            res[i] = TwistedEdwardsCurveElement(IntegersModuloPrimeElement(x * z_inv % mod),
+                                                IntegersModuloPrimeElement(y * z_inv % mod))
+        return res
 
     def _twice(self, a):
         """
@@ -82,3 +82,13 @@ class HauckObliviousTransfer(ObliviousTransfer):
             return self.tec_arithmetic.decode(element_digest)
         else:
             return element_digest
+
+    def _mac_tec_elements(self, elements):
+        """
+        MAC a list of Twisted Edwards Curve elements, output 32-byte bytes for each
+        :param elements: List[TwistedEdwardsCurveElement]
+        :return: List[bytes]
+        """
+        if self.mac is None:
+            raise ValueError("MAC not initialized")
+        return self.mac.digest_batch([self.tec_arithmetic.encode(element) for element in elements])
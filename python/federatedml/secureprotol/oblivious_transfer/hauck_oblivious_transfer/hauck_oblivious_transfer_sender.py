@@ -79,18 +79,12 @@ class HauckObliviousTransferSender(HauckObliviousTransfer):
         LOGGER.info("got from guest R = " + r.output())
         self._init_mac(s, r)
 
-        # 5. MAC and output the key list
-        key_list = []
+        # 5. MAC and output the key list, yR - iyT are derived incrementally for all i, and MACed in batch
         yt = self.tec_arithmetic.mul(scalar=y, a=t)    # yT
         yr = self.tec_arithmetic.mul(scalar=y, a=r)    # yR
-        for i in range(target_num):
-            iyt = self.tec_arithmetic.mul(scalar=i, a=yt)    # iyT
-            diff = self.tec_arithmetic.sub(a=yr, b=iyt)    # yR - iyT
-            key = self._mac_tec_element(diff)
-            # LOGGER.info("{}-th key generated".format(i))
-            # LOGGER.info("key before MAC = " + diff.output())
-            # LOGGER.info("key = {}".format(key))
-            key_list.append(ObliviousTransferKey(i, key))
+        diffs = self.tec_arithmetic.multiples_sub(a=yr, b=yt, n=target_num)    # yR - iyT
+        keys = self._mac_tec_elements(diffs)
+        key_list = [ObliviousTransferKey(i, key) for i, key in enumerate(keys)]
 
         LOGGER.info("all keys successfully generated")
 
@@ -14,6 +14,7 @@
 #  limitations under the License.
 #
 
+import numpy as np
 from numpy.random import RandomState
 
 
@@ -43,3 +44,12 @@ class RandomPads(object):
         where r is random array with uniform distribution U[0,1) and r.shape == a.shape
         """
         return a + self._rand.rand(*a.shape) * w
+
+    def add_ring_pads(self, a, sign):
+        """a + r * sign modulo 2^bits,
+        where a is an unsigned integer array and r is uniformly drawn from all values of its dtype
+        """
+        r = self._rand.randint(0, int(np.iinfo(a.dtype).max) + 1, size=a.shape, dtype=a.dtype)
+        if sign > 0:
+            return np.add(a, r, dtype=a.dtype)
+        return np.subtract(a, r, dtype=a.dtype)
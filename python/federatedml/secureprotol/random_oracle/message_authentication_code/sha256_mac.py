@@ -36,3 +36,15 @@ class Sha256MAC(HashBasedMessageAuthenticationCode):
         self.function = hmac.new(self.key, digestmod=self.mode)
         self.function.update(message)
         return self.function.digest()
+
+    def digest_batch(self, messages):
+        """
+        MAC a list of messages, the keyed inner/outer states are derived once and copied per message
+        """
+        keyed = hmac.new(self.key, digestmod=self.mode)
+        res = []
+        for message in messages:
+            function = keyed.copy()
+            function.update(message)
+            res.append(function.digest())
+        return res
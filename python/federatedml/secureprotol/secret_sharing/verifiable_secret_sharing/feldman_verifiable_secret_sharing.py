@@ -1,7 +1,13 @@
+import os
 import random
+
+import numpy as np
 from federatedml.secureprotol import gmpy_math
 from gmpy2 import mpz
 
+# fixed base tables of generators, built once per process, keyed by (g, p)
+_FIXED_BASE_TABLES = {}
+
 
 class FeldmanVerifiableSecretSharing(object):
     def __init__(self):
@@ -34,6 +40,43 @@ class FeldmanVerifiableSecretSharing(object):
 
         return f_x, commitment
 
+    def encrypt_batch(self, secrets):
+        """
+        share a vector of secrets at once, random coefficients of all polynomials are drawn together,
+        shares are evaluated by Horner's method over arrays and commitments use a fixed base table of g
+        :param secrets: 1-D array like
+        :return: f_x, object array of shape (len(secrets), share_amount, 2), each row is [x, f(x)];
+                 commitments, object array of shape (len(secrets), share_amount)
+        """
+        n, k = len(secrets), self.share_amount
+        coefficient = np.empty((n, k), dtype=object)
+        coefficient[:, 0] = [self.encode(s) % self.q for s in secrets]
+        coefficient[:, 1:] = np.array(self._random_coefficients(n * (k - 1)), dtype=object).reshape((n, k - 1))
+
+        x = np.arange(1, k + 1).astype(object)
+        y = np.zeros((n, k), dtype=object)
+        for i in range(k - 1, -1, -1):
+            y = (y * x + coefficient[:, i: i + 1]) % self.q
+
+        f_x = np.empty((n, k, 2), dtype=object)
+        f_x[:, :, 0] = x
+        f_x[:, :, 1] = y
+        commitment = np.array(self._powmod_g_list(coefficient.ravel()), dtype=object).reshape((n, k))
+
+        return f_x, commitment
+
+    def _random_coefficients(self, count):
+        # 64 extra random bits keep the bias of reduction modulo q negligible
+        byte_len = (self.q.bit_length() + 64 + 7) // 8
+        random_bytes = os.urandom(count * byte_len)
+        return [int.from_bytes(random_bytes[i * byte_len: (i + 1) * byte_len], "big") % self.q for i in range(count)]
+
+    def _powmod_g_list(self, exponents):
+        key = (self.g, self.p)
+        if key not in _FIXED_BASE_TABLES:
+            _FIXED_BASE_TABLES[key] = gmpy_math.fixed_base_table(self.g, self.p, self.q.bit_length())
+        return gmpy_math.powmod_fixed_base_list(_FIXED_BASE_TABLES[key], [int(e) % self.q for e in exponents], self.p)
+
     def decrypt(self, x_values, y_values):
         k = len(x_values)
         assert k == len(set(x_values)), 'x_values points must be distinct'
@@ -66,6 +109,25 @@ class FeldmanVerifiableSecretSharing(object):
             return False
         return True
 
+    def verify_batch(self, f_x, commitment):
+        """
+        verify many shares at once, g^f(x) are computed with a fixed base table, and the products of commitments
+        raised to x^i are evaluated by Horner's method in the exponent, only small powers of x are needed
+        :param f_x: array like of shape (n, 2), each row is [x, f(x)]
+        :param commitment: array like of shape (n, share_amount)
+        :return: bool array of shape (n, )
+        """
+        f_x = np.asarray(f_x, dtype=object).reshape((-1, 2))
+        commitment = np.asarray(commitment, dtype=object).reshape((len(f_x), -1))
+        v1 = self._powmod_g_list(f_x[:, 1])
+        res = np.empty(len(f_x), dtype=bool)
+        for idx, (x, row) in enumerate(zip(f_x[:, 0], commitment)):
+            x, v2 = int(x), 1
+            for c in reversed(row):
+                v2 = gmpy_math.powmod(v2, x, self.p) * int(c) % self.p
+            res[idx] = v1[idx] == v2
+        return res
+
     def encode(self, x):
         upscaled = int(x * (10 ** self.Q_n))
         if isinstance(x, int):
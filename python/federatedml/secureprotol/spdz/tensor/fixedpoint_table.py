@@ -46,35 +46,104 @@ def _table_scalar_mod_op(x, d, q_field, op):
     return x.mapValues(lambda a: op(a, d) % q_field)
 
 
-def _table_dot_mod_func(it, q_field):
-    ret = None
+# rows of a partition are stacked into blocks of this size before multiplied
+DOT_BLOCK_SIZE = 4096
+
+
+def _iter_blocks(it, block_size=DOT_BLOCK_SIZE):
+    """
+    stack rows of a partition of joined table into blocks (X, Y), so that the sum of outer products of rows
+    is computed by one tensordot per block
+    """
+    xs, ys = [], []
     for _, (x, y) in it:
+        xs.append(x)
+        ys.append(y)
+        if len(xs) >= block_size:
+            yield np.asarray(xs), np.asarray(ys)
+            xs, ys = [], []
+    if xs:
+        yield np.asarray(xs), np.asarray(ys)
+
+
+def _iter_gram_blocks(it, block_size=DOT_BLOCK_SIZE):
+    xs = []
+    for _, x in it:
+        xs.append(x)
+        if len(xs) >= block_size:
+            x = np.asarray(xs)
+            yield x, x
+            xs = []
+    if xs:
+        x = np.asarray(xs)
+        yield x, x
+
+
+def _block_dot(x, y):
+    return np.tensordot(x, y, [[0], [0]])
+
+
+def _block_dot_mod(x, y, q_field):
+    """
+    overflow safe X^T Y mod q_field, fixed size integers are multiplied in sub-blocks of rows small enough
+    that sums of products do not overflow int64, otherwise python ints are used
+    """
+    if x.dtype.kind in "iu" and y.dtype.kind in "iu" and 0 < q_field <= 2 ** 31:
+        x, y = x.astype(np.int64) % q_field, y.astype(np.int64) % q_field
+        rows = max((2 ** 63 - 1) // ((q_field - 1) ** 2 or 1), 1)
+        ret = None
+        for start in range(0, len(x), rows):
+            r = np.tensordot(x[start: start + rows], y[start: start + rows], [[0], [0]]) % q_field
+            ret = r if ret is None else (ret + r) % q_field
+        return ret
+    if x.dtype.kind in "iu":
+        x = x.astype(object)
+    if y.dtype.kind in "iu":
+        y = y.astype(object)
+    return np.tensordot(x, y, [[0], [0]]) % q_field
+
+
+def _table_dot_mod_func(blocks, q_field):
+    ret = None
+    for x, y in blocks:
         if ret is None:
-            ret = np.tensordot(x, y, [[], []]) % q_field
+            ret = _block_dot_mod(x, y, q_field)
         else:
-            ret = (ret + np.tensordot(x, y, [[], []])) % q_field
+            ret = (ret + _block_dot_mod(x, y, q_field)) % q_field
     return ret
 
 
-def _table_dot_func(it):
+def _table_dot_func(blocks):
     ret = None
-    for _, (x, y) in it:
+    for x, y in blocks:
         if ret is None:
-            ret = np.tensordot(x, y, [[], []])
+            ret = _block_dot(x, y)
         else:
-            ret += np.tensordot(x, y, [[], []])
+            ret += _block_dot(x, y)
     return ret
 
 
 def table_dot(a_table, b_table):
+    """
+    sum of outer products of rows with the same key, a_table^T b_table if rows are vectors
+    """
+    if a_table is b_table:
+        # gram matrix, no need to join
+        return a_table.applyPartitions(lambda it: _table_dot_func(_iter_gram_blocks(it))) \
+            .reduce(lambda x, y: x + y)
     return a_table.join(b_table, lambda x, y: [x, y]) \
-        .applyPartitions(lambda it: _table_dot_func(it)) \
+        .applyPartitions(lambda it: _table_dot_func(_iter_blocks(it))) \
         .reduce(lambda x, y: x + y)
 
 
 def table_dot_mod(a_table, b_table, q_field):
-    return a_table.join(b_table, lambda x, y: [x, y]) \
-        .applyPartitions(lambda it: _table_dot_mod_func(it, q_field)) \
+    if a_table is b_table:
+        blocks_func = _iter_gram_blocks
+        table = a_table
+    else:
+        blocks_func = _iter_blocks
+        table = a_table.join(b_table, lambda x, y: [x, y])
+    return table.applyPartitions(lambda it: _table_dot_mod_func(blocks_func(it), q_field)) \
         .reduce(lambda x, y: x if y is None else y if x is None else x + y)
 
 
@@ -0,0 +1,70 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import random
+import unittest
+import uuid
+
+import numpy as np
+from fate_arch.session import computing_session as session
+
+from federatedml.secureprotol.spdz.tensor import fixedpoint_table
+from federatedml.secureprotol.spdz.tensor.fixedpoint_table import table_dot, table_dot_mod
+
+
+class TestTableDot(unittest.TestCase):
+    def setUp(self):
+        session.init("test_table_dot_" + str(uuid.uuid1()))
+        self.q_field = 2 ** 1024 + 643
+        rng = random.Random(0)
+        self.x = [(i, np.array([rng.randrange(self.q_field) for _ in range(3)], dtype=object)) for i in range(100)]
+        self.y = [(i, np.array([rng.randrange(self.q_field) for _ in range(2)], dtype=object)) for i in range(100)]
+        self.x_table = session.parallelize(self.x, include_key=True, partition=3)
+        self.y_table = session.parallelize(self.y, include_key=True, partition=3)
+
+    @staticmethod
+    def _expect(x, y):
+        return sum(np.tensordot(a, b, [[], []]) for (_, a), (_, b) in zip(x, y))
+
+    def test_table_dot(self):
+        ret = table_dot(self.x_table, self.y_table)
+        self.assertEqual(ret.shape, (3, 2))
+        self.assertTrue((ret == self._expect(self.x, self.y)).all())
+        self.assertTrue((table_dot(self.x_table, self.x_table) == self._expect(self.x, self.x)).all())
+
+        # partition is multiplied block by block
+        pairs = [(k, (a, b)) for (k, a), (_, b) in zip(self.x, self.y)]
+        ret = fixedpoint_table._table_dot_func(fixedpoint_table._iter_blocks(iter(pairs), block_size=7))
+        self.assertTrue((ret == self._expect(self.x, self.y)).all())
+
+    def test_table_dot_mod(self):
+        ret = table_dot_mod(self.x_table, self.y_table, self.q_field) % self.q_field
+        self.assertTrue((ret == self._expect(self.x, self.y) % self.q_field).all())
+
+        # fixed size integers must not overflow
+        q_field = 2 ** 31 - 1
+        x = [(k, np.array([q_field - 1 - i, i], dtype=np.int64)) for k, i in enumerate(range(50))]
+        x_table = session.parallelize(x, include_key=True, partition=2)
+        expect = self._expect([(k, v.astype(object)) for k, v in x], [(k, v.astype(object)) for k, v in x])
+        ret = table_dot_mod(x_table, x_table, q_field) % q_field
+        self.assertTrue((ret == expect % q_field).all())
+
+    def tearDown(self):
+        session.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -118,6 +118,8 @@ class CryptoExecutor(object):
         :return:
         """
         if mode == 0:
+            if hasattr(self.cipher_core, "encrypt_batch"):
+                return self._map_values_batch(plaintable, self.cipher_core.encrypt_batch)
             return plaintable.mapValues(lambda v: self.cipher_core.encrypt(v))
         else:
             raise ValueError("Unsupported mode for crypto_executor map_values encryption")
@@ -158,6 +160,8 @@ class CryptoExecutor(object):
         :return:
         """
         if mode == 0:
+            if hasattr(self.cipher_core, "decrypt_batch"):
+                return self._map_values_batch(ciphertable, self.cipher_core.decrypt_batch)
             return ciphertable.mapValues(lambda v: self.cipher_core.decrypt(v))
         elif mode == 1:
             f = functools.partial(self.cipher_core.decrypt, decode_output=True)
@@ -165,5 +169,19 @@ class CryptoExecutor(object):
         else:
             raise ValueError("Unsupported mode for crypto_executor map_values encryption")
 
+    @staticmethod
+    def _map_values_batch(table, batch_func):
+        """
+        apply batch_func on all values of a partition at once, keys are kept
+        """
+        def _batch(kvs):
+            keys, values = [], []
+            for k, v in kvs:
+                keys.append(k)
+                values.append(v)
+            return list(zip(keys, batch_func(values)))
+
+        return table.mapPartitions(_batch, use_previous_behavior=False, preserves_partitioning=True)
+
     def get_nonce(self):
         return self.cipher_core.get_nonce()
@@ -23,10 +23,26 @@ from federatedml.secureprotol.symmetric_encryption.py_aes_core import AESModeOfO
 from federatedml.secureprotol.symmetric_encryption.symmetric_encryption import SymmetricKey
 from federatedml.util import conversion
 
+try:
+    from Cryptodome.Cipher import AES
+except ImportError:
+    AES = None
+
+
+def _ofb_keystream(key, nonce, length):
+    """
+    first length bytes of AES-OFB keystream, generated by the compiled AES core if available
+    """
+    if AES is not None:
+        return AES.new(key, AES.MODE_OFB, iv=nonce).encrypt(bytes(length))
+    return AESModeOfOperationOFB(key=key, iv=nonce).encrypt(bytes(length))
+
 
 class AESKey(SymmetricKey):
     """
     Note that a key cannot used for both encryption and decryption scenarios
+    Every value is encrypted from the initial state of AES-OFB, so all values share the same keystream,
+    which is generated once and xor-ed with values
     """
 
     def __init__(self, key, nonce=None):
@@ -36,21 +52,30 @@ class AESKey(SymmetricKey):
         :param nonce: bytes, must be 16 bytes long
         """
         super(AESKey, self).__init__()
+        if len(key) not in (16, 24, 32):
+            raise ValueError('Invalid key size')
         if nonce is None:
             self.nonce = os.urandom(16)
-            self.key = key
-            self.cipher_core = AESModeOfOperationOFB(key=self.key, iv=self.nonce)
+        elif len(nonce) != 16:
+            raise ValueError('initialization vector must be 16 bytes')
         else:
             self.nonce = nonce
-            self.key = key
-            self.cipher_core = AESModeOfOperationOFB(key=self.key, iv=self.nonce)
+        self.key = key
+        self._keystream = b''
+        # keystream prefix of each value length, as int
+        self._keystream_ints = {}
 
-    def _renew(self):
-        """
-        Self renew cipher_core after encryption and decryption
-        :return:
-        """
-        self.cipher_core = AESModeOfOperationOFB(key=self.key, iv=self.nonce)
+    def _keystream_int(self, length):
+        ks = self._keystream_ints.get(length)
+        if ks is None:
+            if len(self._keystream) < length:
+                self._keystream = _ofb_keystream(self.key, self.nonce, max(length, 2 * len(self._keystream), 256))
+            ks = self._keystream_ints[length] = int.from_bytes(self._keystream[:length], 'big')
+        return ks
+
+    def _xor_keystream(self, data):
+        length = len(data)
+        return (int.from_bytes(data, 'big') ^ self._keystream_int(length)).to_bytes(length, 'big')
 
 
 class AESEncryptKey(AESKey):
@@ -75,9 +100,13 @@ class AESEncryptKey(AESKey):
             pass
         else:
             raise TypeError("AES encryptor supports bytes/int/float/str")
-        ciphertext = self.cipher_core.encrypt(plaintext)
-        self._renew()
-        return ciphertext
+        return self._xor_keystream(plaintext)
+
+    def encrypt_batch(self, plaintexts):
+        """
+        encrypt values of a partition, same as encrypt on each value
+        """
+        return [self.encrypt(p) for p in plaintexts]
 
     @staticmethod
     def _all_to_bytes(message):
@@ -119,6 +148,10 @@ class AESDecryptKey(AESKey):
         """
         if not isinstance(ciphertext, bytes):
             raise TypeError("AES decryptor supports bytes only")
-        plaintext = conversion.bytes_to_str(self.cipher_core.decrypt(ciphertext))
-        self._renew()
-        return plaintext
+        return conversion.bytes_to_str(self._xor_keystream(ciphertext))
+
+    def decrypt_batch(self, ciphertexts):
+        """
+        decrypt values of a partition, same as decrypt on each value
+        """
+        return [self.decrypt(c) for c in ciphertexts]
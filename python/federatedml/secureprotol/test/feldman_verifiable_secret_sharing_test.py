@@ -0,0 +1,68 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+
+import random
+import unittest
+
+import numpy as np
+
+from federatedml.secureprotol import gmpy_math
+from federatedml.secureprotol.secret_sharing.verifiable_secret_sharing.feldman_verifiable_secret_sharing import \
+    FeldmanVerifiableSecretSharing
+
+
+class TestFeldmanVerifiableSecretSharing(unittest.TestCase):
+    def setUp(self):
+        self.vss = FeldmanVerifiableSecretSharing()
+        self.vss.key_pair()
+        self.vss.set_share_amount(3)
+        self.secrets = np.random.RandomState(0).uniform(-100, 100, 50)
+
+    def test_fixed_base(self):
+        table = gmpy_math.fixed_base_table(self.vss.g, self.vss.p, 160)
+        es = [0, 1, 255, 256] + [random.randint(0, 2 ** 160 - 1) for _ in range(20)] + [2 ** 200 + 3]
+        self.assertListEqual(gmpy_math.powmod_fixed_base_list(table, es, self.vss.p),
+                             [gmpy_math.powmod(self.vss.g, e, self.vss.p) for e in es])
+
+    def test_encrypt_batch(self):
+        f_x, commitment = self.vss.encrypt_batch(self.secrets)
+        self.assertEqual(f_x.shape, (50, 4, 2))
+        self.assertEqual(commitment.shape, (50, 4))
+        for s, shares, c in zip(self.secrets, f_x, commitment):
+            self.assertAlmostEqual(self.vss.decrypt(list(shares[:, 0]), list(shares[:, 1])), s, places=5)
+            self.assertEqual(c[0], self.vss.calculate_commitment(self.vss.encode(s)))
+            for share in shares:
+                self.assertTrue(self.vss.verify(share, c))
+
+    def test_verify_batch(self):
+        f_x, commitment = self.vss.encrypt_batch(self.secrets)
+        for i in range(self.vss.share_amount):
+            self.assertTrue(self.vss.verify_batch(f_x[:, i], commitment).all())
+        wrong = f_x[:, 1].copy()
+        wrong[7, 1] += 1
+        res = self.vss.verify_batch(wrong, commitment)
+        self.assertFalse(res[7])
+        self.assertEqual(res.sum(), len(self.secrets) - 1)
+
+        # sum of shares is verified by product of commitments
+        other_f_x, other_commitment = self.vss.encrypt_batch(self.secrets[::-1])
+        sum_key = np.column_stack((f_x[:, 2, 0], f_x[:, 2, 1] + other_f_x[:, 2, 1]))
+        self.assertTrue(self.vss.verify_batch(sum_key, commitment * other_commitment % self.vss.p).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+
+import hmac
+import random
+import unittest
+
+from federatedml.secureprotol.number_theory.group.twisted_edwards_curve_group import TwistedEdwardsCurveArithmetic
+from federatedml.secureprotol.oblivious_transfer.hauck_oblivious_transfer.hauck_oblivious_transfer import \
+    HauckObliviousTransfer
+
+
+class TestHauckObliviousTransfer(unittest.TestCase):
+    def setUp(self):
+        self.tec = TwistedEdwardsCurveArithmetic()
+        random.seed(0)
+        self.g = self.tec.get_generator()
+
+    def _affine_mul(self, scalar, a):
+        res = self.tec.get_identity()
+        for bit in bin(scalar)[2:]:
+            res = self.tec.add(res, res)
+            if bit == '1':
+                res = self.tec.add(res, a)
+        return res
+
+    def _equal(self, a, b):
+        return self.tec.encode(a) == self.tec.encode(b)
+
+    def test_mul(self):
+        for scalar in [1, 2, 3, 255, random.randint(0, 2 ** 252)]:
+            self.assertTrue(self._equal(self.tec.mul(scalar, self.g), self._affine_mul(scalar, self.g)))
+        self.assertTrue(self.tec.is_in_group(self.tec.mul(random.randint(0, 2 ** 252), self.g)))
+
+    def test_keys(self):
+        ot = HauckObliviousTransfer()
+        yr = self.tec.mul(random.randint(0, 2 ** 252), self.g)
+        yt = self.tec.mul(random.randint(0, 2 ** 252), self.g)
+        ot._init_mac(yr, yt)
+
+        target_num = 20
+        diffs = self.tec.multiples_sub(yr, yt, target_num)
+        keys = ot._mac_tec_elements(diffs)
+        self.assertEqual(len(keys), target_num)
+        for i in range(target_num):
+            expect = self.tec.sub(yr, self._affine_mul(i, yt))
+            self.assertTrue(self._equal(diffs[i], expect))
+            self.assertEqual(keys[i], ot._mac_tec_element(expect))
+            self.assertEqual(keys[i], hmac.new(ot.mac.key, self.tec.encode(expect), digestmod='sha256').digest())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+#
+#  Copyright 2019 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import os
+import unittest
+import uuid
+
+from fate_arch.session import computing_session as session
+
+from federatedml.secureprotol.symmetric_encryption import py_aes_encryption
+from federatedml.secureprotol.symmetric_encryption.cryptor_executor import CryptoExecutor
+from federatedml.secureprotol.symmetric_encryption.py_aes_core import AESModeOfOperationOFB
+from federatedml.secureprotol.symmetric_encryption.py_aes_encryption import AESDecryptKey, AESEncryptKey
+
+
+class TestPyAESEncryption(unittest.TestCase):
+    def setUp(self):
+        session.init("test_py_aes_" + str(uuid.uuid1()))
+        self.key = os.urandom(16)
+        self.values = ["id_{}".format(i) * (i % 50) for i in range(200)] + [12345, 1.65, b"raw", ""]
+
+    def _expect(self, key, nonce, value):
+        if not isinstance(value, bytes):
+            value = str(value).encode("utf-8")
+        return AESModeOfOperationOFB(key=key, iv=nonce).encrypt(value)
+
+    def test_same_as_pure_python_core(self):
+        encrypt_key = AESEncryptKey(self.key)
+        nonce = encrypt_key.get_nonce()
+        for value in self.values:
+            self.assertEqual(encrypt_key.encrypt(value), self._expect(self.key, nonce, value))
+        self.assertEqual(encrypt_key.encrypt(["a", "bc"]), [self._expect(self.key, nonce, v) for v in ["a", "bc"]])
+
+        keystream = py_aes_encryption._ofb_keystream(self.key, nonce, 100)
+        self.assertEqual(keystream, self._expect(self.key, nonce, bytes(100)))
+
+    def test_decrypt(self):
+        encrypt_key = AESEncryptKey(self.key)
+        decrypt_key = AESDecryptKey(self.key, encrypt_key.get_nonce())
+        ciphertexts = encrypt_key.encrypt_batch(self.values)
+        self.assertListEqual(decrypt_key.decrypt_batch(ciphertexts), [str(v) if not isinstance(v, bytes)
+                                                                      else v.decode() for v in self.values])
+        self.assertListEqual(decrypt_key.decrypt(encrypt_key.encrypt(["a", "bc"])).tolist(), ["a", "bc"])
+
+    def test_executor(self):
+        encrypt_key = AESEncryptKey(self.key)
+        table = session.parallelize(list(enumerate(self.values[:200])), include_key=True, partition=4)
+        encrypted = CryptoExecutor(encrypt_key).map_values_encrypt(table, mode=0)
+        nonce = encrypt_key.get_nonce()
+        self.assertDictEqual(dict(encrypted.collect()),
+                             {k: self._expect(self.key, nonce, v) for k, v in enumerate(self.values[:200])})
+        decrypted = CryptoExecutor(AESDecryptKey(self.key, nonce)).map_values_decrypt(encrypted, mode=0)
+        self.assertDictEqual(dict(decrypted.collect()), dict(enumerate(self.values[:200])))
+
+    def tearDown(self):
+        session.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -240,13 +240,33 @@ class PearsonModelSaver:
             anonymous.anonymous = anonymous_name
 
 
+def _partition_moments(kv_iterator, block_size=4096):
+    """
+    count, sum and sum of squares of rows of a partition, rows are stacked into blocks
+    """
+    n, sum_x, sum_square_x = 0, 0, 0
+    rows = []
+
+    def _add_block():
+        block = np.asarray(rows, dtype=np.float64)
+        return n + len(block), sum_x + block.sum(axis=0), sum_square_x + np.square(block).sum(axis=0)
+
+    for _, x in kv_iterator:
+        rows.append(x)
+        if len(rows) >= block_size:
+            n, sum_x, sum_square_x = _add_block()
+            rows = []
+    if rows:
+        n, sum_x, sum_square_x = _add_block()
+    return n, sum_x, sum_square_x
+
+
 def standardize(data):
     """
     x -> (x - mu) / sigma
     """
-    n = data.count()
-    sum_x, sum_square_x = data.mapValues(lambda x: (x, x ** 2)).reduce(
-        lambda pair1, pair2: (pair1[0] + pair2[0], pair1[1] + pair2[1])
+    n, sum_x, sum_square_x = data.applyPartitions(_partition_moments).reduce(
+        lambda a, b: (a[0] + b[0], a[1] + b[1], a[2] + b[2])
     )
     mu = sum_x / n
     sigma = np.sqrt(sum_square_x / n - mu ** 2)
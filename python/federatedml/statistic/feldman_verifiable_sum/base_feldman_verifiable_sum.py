@@ -48,14 +48,7 @@ class BaseFeldmanVerifiableSum(ModelBase):
             self.sub_key.append(sub_key)
 
     def generate_shares(self, values):
-        keys = []
-        commitments = []
-        for s in values:
-            sub_key, commitment = self.vss.encrypt(s)
-            keys.append(sub_key)
-            commitments.append(commitment)
-        res = (np.array(keys), np.array(commitments))
-        return res
+        return self.vss.encrypt_batch(values)
 
     def sub_key_sum(self):
         for recv in self.y_recv:
@@ -83,8 +76,6 @@ class BaseFeldmanVerifiableSum(ModelBase):
         sub_key.join(commitment, lambda x, y: self.verify(x, y, party_id, "sub_key"))
 
     def verify(self, key, commitment, party_id, key_type):
-        for idx, key in enumerate(key):
-            res = self.vss.verify(key, commitment[idx])
-            if not res:
-                raise ValueError(f"Get wrong {key_type} from {party_id}")
+        if not self.vss.verify_batch(key, commitment).all():
+            raise ValueError(f"Get wrong {key_type} from {party_id}")
         return True
@@ -22,6 +22,8 @@ from federatedml.transfer_variable.transfer_class.intersection_func_transfer_var
     import IntersectionFuncTransferVariable
 from federatedml.util import LOGGER
 
+OWN_IDS_CACHE_SUFFIX = "_own_ids"
+
 
 class Intersect(object):
     def __init__(self):
@@ -33,6 +35,7 @@ class Intersect(object):
         self.filter = None
         self.intersect_num = None
         self.cache = None
+        self.cache_output = None
         self.model_param_name = "IntersectModelParam"
         self.model_meta_name = "IntersectModelMeta"
         self.intersect_method = None
@@ -51,6 +54,7 @@ class Intersect(object):
         self.run_preprocess = param.run_preprocess
         self.intersect_preprocess_params = param.intersect_preprocess_params
         self.run_cache = param.run_cache
+        self.incremental_cache = param.incremental_cache
 
     @property
     def guest_party_id(self):
@@ -106,11 +110,40 @@ class Intersect(object):
         if not isinstance(party_list, list):
             party_list = [party_list]
         cache_list = [cache_data.get(str(party_id)) for party_id in party_list]
-        if (cache_len := len(cache_list)) != (data_len := len(cache_data.items())):
+        data_len = len([k for k in cache_data.keys() if not str(k).endswith(OWN_IDS_CACHE_SUFFIX)])
+        if (cache_len := len(cache_list)) != data_len:
             LOGGER.warning(f"{cache_len} cache sets are given,"
                            f"but only {data_len} hosts participate in current intersection task.")
         return cache_list
 
+    @staticmethod
+    def own_ids_cache_key(party_id):
+        """
+        key of cached encrypted ids of local party, which are encrypted with keys from party_id
+        """
+        return f"{party_id}{OWN_IDS_CACHE_SUFFIX}"
+
+    @staticmethod
+    def split_id_delta(data_instances, cache_ids):
+        """
+        Parameters
+        ----------
+        data_instances: table(id, v)
+        cache_ids: table(id, encrypt_id) of ids in cache
+
+        Returns
+        -------
+        table(id, v) of ids added since cache generated, table(id, encrypt_id) of ids removed
+        """
+        return data_instances.subtractByKey(cache_ids), cache_ids.subtractByKey(data_instances)
+
+    @staticmethod
+    def merge_id_delta(cache, added_ids, removed_ids):
+        """
+        cache, added_ids & removed_ids are all keyed by encrypt id
+        """
+        return cache.subtractByKey(removed_ids).union(added_ids)
+
     def run_cache_intersect(self, data_instances, cache_data):
         raise NotImplementedError("method should not be called here")
 
@@ -208,20 +241,31 @@ class Intersect(object):
 
     @staticmethod
     def insert_key(kv_iterator, filter, hash_operator=None, salt=None):
-        res_filter = None
-        for k, _ in kv_iterator:
-            if hash_operator:
-                res_filter = filter.insert(hash_operator.compute(k, suffix_salt=salt))
-            else:
-                res_filter = filter.insert(k)
-        return res_filter
+        keys = [k for k, _ in kv_iterator]
+        if hash_operator:
+            keys = hash_operator.compute_batch(keys, suffix_salt=salt)
+        return filter.insert_batch(keys)
 
     @staticmethod
     def count_key_in_filter(kv_iterator, filter):
-        count = 0
-        for k, _ in kv_iterator:
-            count += filter.check(k)
-        return count
+        return int(filter.check_batch([k for k, _ in kv_iterator]).sum())
+
+    @staticmethod
+    def filter_key_in_filter(kv_iterator, filter, hash_operator=None, salt=None, value_idx=None):
+        """
+        keep pairs whose key, or value[value_idx] if value_idx is given, exists in filter
+        """
+        kvs = list(kv_iterator)
+        xs = [k if value_idx is None else v[value_idx] for k, v in kvs]
+        if hash_operator:
+            xs = hash_operator.compute_batch(xs, suffix_salt=salt)
+        return [kv for kv, exist in zip(kvs, filter.check_batch(xs)) if exist]
+
+    @staticmethod
+    def filter_by_filter(data, filter, hash_operator=None, salt=None, value_idx=None):
+        f = functools.partial(Intersect.filter_key_in_filter, filter=filter, hash_operator=hash_operator, salt=salt,
+                              value_idx=value_idx)
+        return data.mapPartitions(f, use_previous_behavior=False, preserves_partitioning=True)
 
     @staticmethod
     def construct_filter(data, false_positive_rate, hash_method, random_state, hash_operator=None, salt=None):
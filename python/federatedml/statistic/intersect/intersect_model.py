@@ -419,6 +419,9 @@ class IntersectModelBase(ModelBase):
             raise ValueError(f"Role {self.role} cannot run intersection transform.")
 
         self.intersect_ids = self.intersection_obj.run_cache_intersect(intersect_data, cache_data)
+        if self.intersection_obj.cache_output is not None:
+            self.cache_output = self.intersection_obj.cache_output
+            LOGGER.info("output updated cache")
         self.match_id_intersect_num = self.intersect_ids.count()
         if self.use_match_id_process:
             if not self.model_param.sync_intersect_ids:
@@ -515,8 +518,8 @@ class IntersectHost(IntersectModelBase):
     def get_filter_process(self, data_instances, hash_operator):
         filter = self.transfer_variable.intersect_filter_from_guest.get(idx=0)
         LOGGER.debug(f"got filter from guest")
-        filtered_data = data_instances.filter(lambda k, v: filter.check(
-            hash_operator.compute(k, suffix_salt=self.intersect_preprocess_params.preprocess_salt)))
+        filtered_data = self.intersection_obj.filter_by_filter(data_instances, filter, hash_operator,
+                                                               self.intersect_preprocess_params.preprocess_salt)
         return filtered_data
 
 
@@ -572,12 +575,9 @@ class IntersectGuest(IntersectModelBase):
         LOGGER.debug(f"got filter from all host")
 
         filtered_data_list = [
-            data_instances.filter(
-                lambda k,
-                v: filter.check(
-                    hash_operator.compute(
-                        k,
-                        suffix_salt=self.intersect_preprocess_params.preprocess_salt))) for filter in filter_list]
+            self.intersection_obj.filter_by_filter(data_instances, filter, hash_operator,
+                                                   self.intersect_preprocess_params.preprocess_salt)
+            for filter in filter_list]
         filtered_data = self.intersection_obj.get_common_intersection(filtered_data_list, False)
 
         return filtered_data
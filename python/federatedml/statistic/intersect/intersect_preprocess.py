@@ -14,7 +14,6 @@
 #  limitations under the License.
 #
 
-import gmpy2
 import math
 import uuid
 import numpy as np
@@ -23,6 +22,9 @@ from federatedml.secureprotol.hash.hash_factory import Hash
 from federatedml.util import consts, LOGGER
 
 SALT_LENGTH = 8
+# bit count limit of computing indices on uint64 arrays, larger filters fall back to python int
+MAX_VECTORIZED_BIT_COUNT = 1 << 48
+POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
 
 
 class BitArray(object):
@@ -48,7 +50,7 @@ class BitArray(object):
 
     @property
     def sparsity(self):
-        set_bit_count = sum(map(gmpy2.popcount, map(int, self._array)))
+        set_bit_count = int(POPCOUNT_TABLE[self._array.view(np.uint8)].sum(dtype=np.int64))
         return 1 - set_bit_count / self.bit_count
 
     def set_array(self, new_array):
@@ -62,11 +64,44 @@ class BitArray(object):
             raise ValueError(f"cannot merge filters with different bit count")
         self._array |= other._array
 
+    def _digest_mod(self, digests):
+        """
+        int(digest) % bit_count of every row, computed over 16-bit limbs of digests,
+        partial remainder r < bit_count < 2^48 so that (r << 16) never overflows uint64
+        """
+        bit_count = np.uint64(self.bit_count)
+        limbs = digests.view('>u2').astype(np.uint64)
+        r = np.zeros(limbs.shape[0], dtype=np.uint64)
+        for j in range(limbs.shape[1]):
+            r = ((r << np.uint64(16)) | limbs[:, j]) % bit_count
+        return r.astype(np.int64)
+
+    def get_ind_array(self, xs):
+        """
+        bit indices of a batch of instances
+        Parameters
+        ----------
+        xs: list of instances
+
+        Returns
+        -------
+        2-D int64 array, row i holds hash_func_count bit indices of xs[i]
+        """
+        ind_array = np.zeros((len(xs), self.hash_func_count), dtype=np.int64)
+        if self.hash_method != "none" and self.bit_count < MAX_VECTORIZED_BIT_COUNT:
+            hash_encoder = Hash(self.hash_method, False, hex_output=False)
+            digests = hash_encoder.compute_digest_batch(xs, suffix_salt=list(self.salt[:self.hash_func_count]))
+            for i in range(self.hash_func_count):
+                ind_array[:, i] = self._digest_mod(digests[i])
+        else:
+            hash_encoder = Hash(self.hash_method, False)
+            for i in range(self.hash_func_count):
+                ind_array[:, i] = [int(h, 16) % self.bit_count
+                                   for h in hash_encoder.compute_batch(xs, suffix_salt=self.salt[i])]
+        return ind_array
+
     def get_ind_set(self, x):
-        hash_encoder = Hash(self.hash_method, False)
-        return set(int(hash_encoder.compute(x,
-                                            suffix_salt=self.salt[i]),
-                       16) % self.bit_count for i in range(self.hash_func_count))
+        return set(self.get_ind_array([x])[0].tolist())
 
     def insert(self, x):
         """
@@ -79,9 +114,20 @@ class BitArray(object):
         -------
 
         """
-        ind_set = self.get_ind_set(x)
-        for ind in ind_set:
-            self.set_bit(ind)
+        return self.insert_batch([x])
+
+    def insert_batch(self, xs):
+        """
+        insert a batch of instances to bit array with hash functions
+        Parameters
+        ----------
+        xs: list of instances
+
+        Returns
+        -------
+
+        """
+        self.insert_ind_set(self.get_ind_array(xs))
         return self._array
 
     def insert_ind_set(self, ind_set):
@@ -95,8 +141,7 @@ class BitArray(object):
         -------
 
         """
-        for ind in ind_set:
-            self.set_bit(ind)
+        self.set_bits(np.fromiter(ind_set, dtype=np.int64) if isinstance(ind_set, set) else ind_set)
 
     def check(self, x):
         """
@@ -109,12 +154,20 @@ class BitArray(object):
         -------
 
         """
-        hash_encoder = Hash(self.hash_method, False)
-        for i in range(self.hash_func_count):
-            ind = int(hash_encoder.compute(x, suffix_salt=self.salt[i]), 16) % self.bit_count
-            if not self.query_bit(ind):
-                return False
-        return True
+        return bool(self.check_batch([x])[0])
+
+    def check_batch(self, xs):
+        """
+        check whether each of given instances exists in bit array
+        Parameters
+        ----------
+        xs: list of instances
+
+        Returns
+        -------
+        1-D bool array
+        """
+        return self.query_bits(self.get_ind_array(xs)).all(axis=1)
 
     def check_ind_set(self, ind_set):
         """
@@ -127,10 +180,8 @@ class BitArray(object):
         -------
 
         """
-        for ind in ind_set:
-            if not self.query_bit(ind):
-                return False
-        return True
+        ind_set = np.fromiter(ind_set, dtype=np.int64) if isinstance(ind_set, set) else ind_set
+        return bool(self.query_bits(ind_set).all())
 
     def set_bit(self, ind):
         """
@@ -148,6 +199,25 @@ class BitArray(object):
         bit_pos = ind & 63
         self._array[pos] |= np.uint64(1 << bit_pos)
 
+    def set_bits(self, inds):
+        """
+        set bits at given bit indices, bits of the same word are merged before written into bit array
+        Parameters
+        ----------
+        inds: array-like of bit indices
+
+        Returns
+        -------
+
+        """
+        inds = np.unique(np.asarray(inds, dtype=np.int64))
+        if inds.size == 0:
+            return
+        pos = inds >> 6
+        bits = np.left_shift(np.uint64(1), (inds & 63).astype(np.uint64))
+        starts = np.flatnonzero(np.r_[True, pos[1:] != pos[:-1]])
+        self._array[pos[starts]] |= np.bitwise_or.reduceat(bits, starts)
+
     def query_bit(self, ind):
         """
         query bit != 0
@@ -163,6 +233,21 @@ class BitArray(object):
         bit_pos = ind & 63
         return (self._array[pos] & np.uint64(1 << bit_pos)) != 0
 
+    def query_bits(self, inds):
+        """
+        query bits != 0
+        Parameters
+        ----------
+        inds: array-like of bit indices
+
+        Returns
+        -------
+        bool array of the same shape as inds
+        """
+        inds = np.asarray(inds, dtype=np.int64)
+        bit_pos = (inds & 63).astype(np.uint64)
+        return ((self._array[inds >> 6] >> bit_pos) & np.uint64(1)) != 0
+
     @staticmethod
     def get_filter_param(n, p):
         """
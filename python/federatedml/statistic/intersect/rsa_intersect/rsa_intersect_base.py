@@ -14,6 +14,7 @@
 #  limitations under the License.
 #
 
+import functools
 import random
 
 from federatedml.param.intersect_param import DEFAULT_RANDOM_BIT
@@ -51,6 +52,8 @@ class RsaIntersect(Intersect):
         self.first_hash_operator = Hash(self.rsa_params.hash_method, False)
         self.final_hash_operator = Hash(self.rsa_params.final_hash_method, False)
         self.salt = self.rsa_params.salt
+        self.blinding_pool_size = self.rsa_params.blinding_pool_size
+        self.powmod_thread_num = self.rsa_params.powmod_thread_num
 
     def get_intersect_method_meta(self):
         rsa_meta = {"intersect_method": consts.RSA,
@@ -65,7 +68,8 @@ class RsaIntersect(Intersect):
         return v1 + v2
 
     @staticmethod
-    def pubkey_id_process(data, fraction, random_bit, rsa_e, rsa_n, hash_operator=None, salt=''):
+    def pubkey_id_process(data, fraction, random_bit, rsa_e, rsa_n, hash_operator=None, salt='',
+                          blinding_pool_size=None, thread_num=1):
         if fraction and fraction <= consts.MAX_BASE_FRACTION:
             LOGGER.debug(f"fraction value: {fraction} provided, use fraction in pubkey id process")
             count = max(round(data.count() * max(fraction, consts.MIN_BASE_FRACTION)), 1)
@@ -91,8 +95,58 @@ class RsaIntersect(Intersect):
             return reduced_pair_group.flatMap(pubkey_id_generate)
         else:
             LOGGER.debug(f"fraction not provided or invalid, fraction value: {fraction}.")
-            return data.map(lambda k, v: RsaIntersect.pubkey_id_process_per(k, v, random_bit, rsa_e, rsa_n,
-                                                                            hash_operator, salt))
+            blinding_pool = None
+            if blinding_pool_size:
+                LOGGER.debug(f"blinding pool size: {blinding_pool_size} provided, use precomputed blinding pool")
+                blinding_pool = RsaIntersect.generate_blinding_pool(blinding_pool_size, random_bit, rsa_e, rsa_n,
+                                                                    thread_num)
+            f = functools.partial(RsaIntersect.pubkey_id_process_partition,
+                                  random_bit=random_bit,
+                                  rsa_e=rsa_e,
+                                  rsa_n=rsa_n,
+                                  hash_operator=hash_operator,
+                                  salt=salt,
+                                  blinding_pool=blinding_pool,
+                                  thread_num=thread_num)
+            return data.mapPartitions(f, use_previous_behavior=False, preserves_partitioning=False)
+
+    @staticmethod
+    def generate_blinding_pool(pool_size, random_bit, rsa_e, rsa_n, thread_num=1):
+        """
+        precompute pool_size pairs of blinding factor r & r^e mod n,
+        ids are blinded by product of two pairs randomly drawn from pool, which takes no powmod
+        """
+        rand = random.SystemRandom()
+        r_list = [rand.getrandbits(random_bit) for _ in range(pool_size)]
+        return r_list, gmpy_math.powmod_base_list(r_list, rsa_e, rsa_n, thread_num)
+
+    @staticmethod
+    def pubkey_id_process_partition(kv_iterator, random_bit, rsa_e, rsa_n, hash_operator=None, salt='',
+                                    blinding_pool=None, thread_num=1):
+        hash_sids, origin_ids = [], []
+        for k, v in kv_iterator:
+            if hash_operator:
+                hash_sids.append(int(Intersect.hash(k, hash_operator, salt), 16))
+                origin_ids.append(k)
+            else:
+                hash_sids.append(k)
+                origin_ids.append(v[0])
+
+        rand = random.SystemRandom()
+        if blinding_pool is None:
+            r_list = [rand.getrandbits(random_bit) for _ in hash_sids]
+            r_e_list = gmpy_math.powmod_base_list(r_list, rsa_e, rsa_n, thread_num)
+        else:
+            pool_r, pool_r_e = blinding_pool
+            pool_size = len(pool_r)
+            r_list, r_e_list = [], []
+            for _ in hash_sids:
+                i, j = rand.randrange(pool_size), rand.randrange(pool_size)
+                r_list.append(pool_r[i] * pool_r[j] % rsa_n)
+                r_e_list.append(pool_r_e[i] * pool_r_e[j] % rsa_n)
+
+        return [(r_e * hash_sid % rsa_n, (origin_id, r))
+                for hash_sid, origin_id, r, r_e in zip(hash_sids, origin_ids, r_list, r_e_list)]
 
     @staticmethod
     def generate_rsa_key(rsa_bit=1024):
@@ -126,50 +180,53 @@ class RsaIntersect(Intersect):
             self.cq = cq
 
     @staticmethod
-    def pubkey_id_process_per(hash_sid, v, random_bit, rsa_e, rsa_n, hash_operator=None, salt=''):
-        r = random.SystemRandom().getrandbits(random_bit)
-        if hash_operator:
-            processed_id = gmpy_math.powmod(r, rsa_e, rsa_n) * \
-                int(Intersect.hash(hash_sid, hash_operator, salt), 16) % rsa_n
-            return processed_id, (hash_sid, r)
-        else:
-            processed_id = gmpy_math.powmod(r, rsa_e, rsa_n) * hash_sid % rsa_n
-            return processed_id, (v[0], r)
+    def prvkey_id_process_partition(kv_iterator, rsa_d, rsa_n, rsa_p, rsa_q, cp, cq, final_hash_operator, salt,
+                                    first_hash_operator=None, thread_num=1):
+        hash_sids, origin_ids = [], []
+        for k, v in kv_iterator:
+            if first_hash_operator:
+                hash_sids.append(int(Intersect.hash(k, first_hash_operator, salt), 16))
+                origin_ids.append(k)
+            else:
+                hash_sids.append(k)
+                origin_ids.append(v[0])
 
-    @staticmethod
-    def prvkey_id_process(
-            hash_sid,
-            v,
-            rsa_d,
-            rsa_n,
-            rsa_p,
-            rsa_q,
-            cp,
-            cq,
-            final_hash_operator,
-            salt,
-            first_hash_operator=None):
-        if first_hash_operator:
-            processed_id = Intersect.hash(gmpy_math.powmod_crt(int(Intersect.hash(
-                hash_sid, first_hash_operator, salt), 16), rsa_d, rsa_n, rsa_p, rsa_q, cp, cq), final_hash_operator, salt)
-            return processed_id, hash_sid
-        else:
-            processed_id = Intersect.hash(gmpy_math.powmod_crt(hash_sid, rsa_d, rsa_n, rsa_p, rsa_q, cp, cq),
-                                          final_hash_operator,
-                                          salt)
-            return processed_id, v[0]
+        signed_ids = gmpy_math.powmod_crt_list(hash_sids, rsa_d, rsa_n, rsa_p, rsa_q, cp, cq, thread_num)
+        return [(Intersect.hash(signed_id, final_hash_operator, salt), origin_id)
+                for signed_id, origin_id in zip(signed_ids, origin_ids)]
 
     def cal_prvkey_ids_process_pair(self, data_instances, d, n, p, q, cp, cq, first_hash_operator=None):
-        return data_instances.map(
-            lambda k, v: self.prvkey_id_process(k, v, d, n, p, q, cp, cq,
-                                                self.final_hash_operator,
-                                                self.rsa_params.salt,
-                                                first_hash_operator)
-        )
+        f = functools.partial(self.prvkey_id_process_partition,
+                              rsa_d=d,
+                              rsa_n=n,
+                              rsa_p=p,
+                              rsa_q=q,
+                              cp=cp,
+                              cq=cq,
+                              final_hash_operator=self.final_hash_operator,
+                              salt=self.rsa_params.salt,
+                              first_hash_operator=first_hash_operator,
+                              thread_num=self.powmod_thread_num)
+        return data_instances.mapPartitions(f, use_previous_behavior=False, preserves_partitioning=False)
 
     @staticmethod
-    def sign_id(hash_sid, rsa_d, rsa_n, rsa_p, rsa_q, cp, cq):
-        return gmpy_math.powmod_crt(hash_sid, rsa_d, rsa_n, rsa_p, rsa_q, cp, cq)
+    def sign_id_partition(kv_iterator, rsa_d, rsa_n, rsa_p, rsa_q, cp, cq, thread_num=1):
+        keys = [k for k, _ in kv_iterator]
+        return list(zip(keys, gmpy_math.powmod_crt_list(keys, rsa_d, rsa_n, rsa_p, rsa_q, cp, cq, thread_num)))
+
+    def sign_ids(self, pubkey_ids, d, n, p, q, cp, cq):
+        """
+        sign blinded ids partition by partition, id itself is reserved as key
+        """
+        f = functools.partial(self.sign_id_partition,
+                              rsa_d=d,
+                              rsa_n=n,
+                              rsa_p=p,
+                              rsa_q=q,
+                              cp=cp,
+                              cq=cq,
+                              thread_num=self.powmod_thread_num)
+        return pubkey_ids.mapPartitions(f, use_previous_behavior=False, preserves_partitioning=True)
 
     def split_calculation_process(self, data_instances):
         raise NotImplementedError("This method should not be called here")
@@ -180,6 +237,9 @@ class RsaIntersect(Intersect):
     def cache_unified_calculation_process(self, data_instances, cache_set):
         raise NotImplementedError("This method should not be called here")
 
+    def incremental_cache_calculation_process(self, data_instances, cache_data):
+        raise NotImplementedError("This method should not be called here")
+
     def run_intersect(self, data_instances):
         LOGGER.info("Start RSA Intersection")
         if self.split_calculation:
@@ -197,7 +257,10 @@ class RsaIntersect(Intersect):
         LOGGER.info("Start RSA Intersection with cache")
         if self.split_calculation:
             LOGGER.warning(f"split_calculation not applicable to cache-enabled RSA intersection.")
-        intersect_ids = self.cache_unified_calculation_process(data_instances, cache_data)
+        if self.incremental_cache:
+            intersect_ids = self.incremental_cache_calculation_process(data_instances, cache_data)
+        else:
+            intersect_ids = self.cache_unified_calculation_process(data_instances, cache_data)
         if intersect_ids is not None:
             intersect_ids = intersect_ids.mapValues(lambda v: None)
         return intersect_ids
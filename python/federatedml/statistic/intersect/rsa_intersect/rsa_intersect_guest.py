@@ -45,14 +45,13 @@ class RsaIntersectionGuest(RsaIntersect):
 
     def sign_host_ids(self, host_pubkey_ids_list):
         # Process(signs) hosts' ids
-        guest_sign_host_ids_list = [host_pubkey_ids.map(lambda k, v:
-                                                        (k, self.sign_id(k,
-                                                                         self.d[i],
-                                                                         self.n[i],
-                                                                         self.p[i],
-                                                                         self.q[i],
-                                                                         self.cp[i],
-                                                                         self.cq[i])))
+        guest_sign_host_ids_list = [self.sign_ids(host_pubkey_ids,
+                                                  self.d[i],
+                                                  self.n[i],
+                                                  self.p[i],
+                                                  self.q[i],
+                                                  self.cp[i],
+                                                  self.cq[i])
                                     for i, host_pubkey_ids in enumerate(host_pubkey_ids_list)]
         LOGGER.info("Sign host_pubkey_ids with guest prv_keys")
 
@@ -114,7 +113,10 @@ class RsaIntersectionGuest(RsaIntersect):
                                                           fraction=self.random_base_fraction,
                                                           random_bit=self.random_bit,
                                                           rsa_e=self.rcv_e[i],
-                                                          rsa_n=self.rcv_n[i]) for i in range(len(self.rcv_e))]
+                                                          rsa_n=self.rcv_n[i],
+                                                          blinding_pool_size=self.blinding_pool_size,
+                                                          thread_num=self.powmod_thread_num)
+                                   for i in range(len(self.rcv_e))]
         LOGGER.info(f"Perform pubkey_ids_process")
         for i, guest_id in enumerate(pubkey_ids_process_list):
             mask_guest_id = guest_id.mapValues(lambda v: None)
@@ -201,7 +203,10 @@ class RsaIntersectionGuest(RsaIntersect):
                                                           rsa_e=self.rcv_e[i],
                                                           rsa_n=self.rcv_n[i],
                                                           hash_operator=self.first_hash_operator,
-                                                          salt=self.salt) for i in range(len(self.rcv_e))]
+                                                          salt=self.salt,
+                                                          blinding_pool_size=self.blinding_pool_size,
+                                                          thread_num=self.powmod_thread_num)
+                                   for i in range(len(self.rcv_e))]
         LOGGER.info(f"Finish pubkey_ids_process")
 
         for i, guest_id in enumerate(pubkey_ids_process_list):
@@ -273,7 +278,10 @@ class RsaIntersectionGuest(RsaIntersect):
                                                           rsa_e=self.rcv_e[i],
                                                           rsa_n=self.rcv_n[i],
                                                           hash_operator=self.first_hash_operator,
-                                                          salt=self.salt) for i in range(len(self.rcv_e))]
+                                                          salt=self.salt,
+                                                          blinding_pool_size=self.blinding_pool_size,
+                                                          thread_num=self.powmod_thread_num)
+                                   for i in range(len(self.rcv_e))]
         LOGGER.info(f"Finish pubkey_ids_process")
 
         for i, guest_id in enumerate(pubkey_ids_process_list):
@@ -305,7 +313,7 @@ class RsaIntersectionGuest(RsaIntersect):
         # sid_host_sign_guest_ids_list = [g.map(lambda k, v: (v[1], v[0])) for g in host_sign_guest_ids_list]
 
         # filter ids
-        intersect_ids_list = [host_sign_guest_ids_list[i].filter(lambda k, v: host_filter_list[i].check(v[1]))
+        intersect_ids_list = [self.filter_by_filter(host_sign_guest_ids_list[i], host_filter_list[i], value_idx=1)
                               for i in range(len(self.host_party_id_list))]
         intersect_ids_list = [ids.map(lambda k, v: (v[0], None)) for ids in intersect_ids_list]
         intersect_ids = self.get_common_intersection(intersect_ids_list)
@@ -353,7 +361,10 @@ class RsaIntersectionGuest(RsaIntersect):
                                                           rsa_e=self.rcv_e[i],
                                                           rsa_n=self.rcv_n[i],
                                                           hash_operator=self.first_hash_operator,
-                                                          salt=self.salt) for i in range(len(self.rcv_e))]
+                                                          salt=self.salt,
+                                                          blinding_pool_size=self.blinding_pool_size,
+                                                          thread_num=self.powmod_thread_num)
+                                   for i in range(len(self.rcv_e))]
         LOGGER.info(f"Finish pubkey_ids_process")
 
         for i, guest_id in enumerate(pubkey_ids_process_list):
@@ -394,3 +405,94 @@ class RsaIntersectionGuest(RsaIntersect):
             LOGGER.info("Skip sync intersect ids with Host(s).")
 
         return intersect_ids
+
+    def incremental_cache_calculation_process(self, data_instances, cache_data):
+        LOGGER.info("RSA intersect using incremental cache.")
+        cache_id_list = self.cache_transfer_variable.get(idx=-1)
+        LOGGER.info("Get new cache_id from all host")
+
+        # merge delta of host ids into cached table(hash(host_ids_process), None)
+        added_host_prvkey_ids_list = self.get_host_prvkey_ids()
+        removed_host_prvkey_ids_list = self.transfer_variable.host_removed_prvkey_ids.get(idx=-1)
+        LOGGER.info("Get added & removed host_prvkey_ids")
+        cache_list = self.extract_cache_list(cache_data, self.host_party_id_list)
+        host_prvkey_ids_list = [self.merge_id_delta(cache, added_host_prvkey_ids_list[i],
+                                                    removed_host_prvkey_ids_list[i])
+                                for i, cache in enumerate(cache_list)]
+
+        # table(hash(guest_ids_process/r), sid) cached by last incremental intersection, empty if not exists
+        own_ids_list = []
+        for party_id in self.host_party_id_list:
+            own_ids = cache_data.get(self.own_ids_cache_key(party_id))
+            if own_ids is None:
+                LOGGER.info(f"no cached guest ids for host {party_id}, all guest ids will be processed")
+                own_ids = data_instances.filter(lambda k, v: False).mapValues(lambda v: None)
+            own_ids_list.append(own_ids)
+
+        delta_list = [self.split_id_delta(data_instances, own_ids.map(lambda k, v: (v, k))) for own_ids in
+                      own_ids_list]
+        for i, (added_ids, removed_ids) in enumerate(delta_list):
+            LOGGER.info(f"{added_ids.count()} ids added & {removed_ids.count()} ids removed since cache generated "
+                        f"for host {self.host_party_id_list[i]}")
+
+        # only encrypt added ids
+        pubkey_ids_process_list = [self.pubkey_id_process(added_ids,
+                                                          fraction=self.random_base_fraction,
+                                                          random_bit=self.random_bit,
+                                                          rsa_e=self.rcv_e[i],
+                                                          rsa_n=self.rcv_n[i],
+                                                          hash_operator=self.first_hash_operator,
+                                                          salt=self.salt,
+                                                          blinding_pool_size=self.blinding_pool_size,
+                                                          thread_num=self.powmod_thread_num)
+                                   for i, (added_ids, _) in enumerate(delta_list)]
+        LOGGER.info("Finish pubkey_ids_process")
+
+        for i, guest_id in enumerate(pubkey_ids_process_list):
+            mask_guest_id = guest_id.mapValues(lambda v: None)
+            self.transfer_variable.guest_pubkey_ids.remote(mask_guest_id,
+                                                           role=consts.HOST,
+                                                           idx=i)
+            LOGGER.info("Remote guest_pubkey_ids to Host {}".format(i))
+
+        # Recv signed guest ids
+        recv_host_sign_guest_ids_list = self.transfer_variable.host_sign_guest_ids.get(idx=-1)
+        LOGGER.info("Get host_sign_guest_ids from Host")
+
+        # table(r^e % n *hash(sid), sid, hash(guest_ids_process/r))
+        host_sign_guest_ids_list = [v.join(recv_host_sign_guest_ids_list[i],
+                                           lambda g, r: (g[0], RsaIntersectionGuest.hash(gmpy2.divm(int(r),
+                                                                                                    int(g[1]),
+                                                                                                    self.rcv_n[i]),
+                                                                                         self.final_hash_operator,
+                                                                                         self.rsa_params.salt)))
+                                    for i, v in enumerate(pubkey_ids_process_list)]
+
+        # merge delta of guest ids into table(hash(guest_ids_process/r), sid)
+        own_ids_list = [self.merge_id_delta(own_ids,
+                                            host_sign_guest_ids_list[i].map(lambda k, v: (v[1], v[0])),
+                                            delta_list[i][1].map(lambda k, v: (v, None)))
+                        for i, own_ids in enumerate(own_ids_list)]
+
+        # intersect table(hash(guest_ids_process/r), sid)
+        encrypt_intersect_ids_list = [v.join(host_prvkey_ids_list[i], lambda sid, h: sid) for i, v in
+                                      enumerate(own_ids_list)]
+
+        intersect_ids = self.filter_intersect_ids(encrypt_intersect_ids_list, keep_encrypt_ids=True)
+
+        if self.sync_intersect_ids:
+            self.send_intersect_ids(encrypt_intersect_ids_list, intersect_ids)
+        else:
+            LOGGER.info("Skip sync intersect ids with Host(s).")
+
+        cache_data, cache_meta = {}, {}
+        intersect_meta = self.get_intersect_method_meta()
+        for i, party_id in enumerate(self.host_party_id_list):
+            cache_meta[party_id] = {"cache_id": cache_id_list[i],
+                                    "intersect_meta": intersect_meta,
+                                    "intersect_key": self.get_intersect_key(party_id)}
+            cache_data[party_id] = host_prvkey_ids_list[i]
+            cache_data[self.own_ids_cache_key(party_id)] = own_ids_list[i]
+        self.cache_output = cache_data, cache_meta
+
+        return intersect_ids
@@ -64,7 +64,9 @@ class RsaIntersectionHost(RsaIntersect):
                                                     fraction=self.random_base_fraction,
                                                     random_bit=self.random_bit,
                                                     rsa_e=self.rcv_e,
-                                                    rsa_n=self.rcv_n)
+                                                    rsa_n=self.rcv_n,
+                                                    blinding_pool_size=self.blinding_pool_size,
+                                                    thread_num=self.powmod_thread_num)
         LOGGER.info(f"Finish pubkey_ids_process")
         mask_host_id = pubkey_ids_process.mapValues(lambda v: None)
         self.transfer_variable.host_pubkey_ids.remote(mask_host_id,
@@ -90,13 +92,7 @@ class RsaIntersectionHost(RsaIntersect):
         # get & sign guest pubkey-encrypted odd ids
         guest_pubkey_ids = self.transfer_variable.guest_pubkey_ids.get(idx=0)
         LOGGER.info(f"Get guest_pubkey_ids from guest")
-        host_sign_guest_ids = guest_pubkey_ids.map(lambda k, v: (k, self.sign_id(k,
-                                                                                 self.d,
-                                                                                 self.n,
-                                                                                 self.p,
-                                                                                 self.q,
-                                                                                 self.cp,
-                                                                                 self.cq)))
+        host_sign_guest_ids = self.sign_ids(guest_pubkey_ids, self.d, self.n, self.p, self.q, self.cp, self.cq)
         LOGGER.debug(f"host sign guest_pubkey_ids")
         # send signed guest odd ids
         self.transfer_variable.host_sign_guest_ids.remote(host_sign_guest_ids,
@@ -173,13 +169,7 @@ class RsaIntersectionHost(RsaIntersect):
         LOGGER.info("Get guest_pubkey_ids from guest")
 
         # Process(signs) guest ids and return to guest
-        host_sign_guest_ids = guest_pubkey_ids.map(lambda k, v: (k, self.sign_id(k,
-                                                                                 self.d,
-                                                                                 self.n,
-                                                                                 self.p,
-                                                                                 self.q,
-                                                                                 self.cp,
-                                                                                 self.cq)))
+        host_sign_guest_ids = self.sign_ids(guest_pubkey_ids, self.d, self.n, self.p, self.q, self.cp, self.cq)
         self.transfer_variable.host_sign_guest_ids.remote(host_sign_guest_ids,
                                                           role=consts.GUEST,
                                                           idx=0)
@@ -252,13 +242,7 @@ class RsaIntersectionHost(RsaIntersect):
         LOGGER.info("Get guest_pubkey_ids from guest")
 
         # Process(signs) guest ids and return to guest
-        host_sign_guest_ids = guest_pubkey_ids.map(lambda k, v: (k, self.sign_id(k,
-                                                                                 self.d,
-                                                                                 self.n,
-                                                                                 self.p,
-                                                                                 self.q,
-                                                                                 self.cp,
-                                                                                 self.cq)))
+        host_sign_guest_ids = self.sign_ids(guest_pubkey_ids, self.d, self.n, self.p, self.q, self.cp, self.cq)
         self.transfer_variable.host_sign_guest_ids.remote(host_sign_guest_ids,
                                                           role=consts.GUEST,
                                                           idx=0)
@@ -322,13 +306,7 @@ class RsaIntersectionHost(RsaIntersect):
         LOGGER.info("Get guest_pubkey_ids from guest")
 
         # Process(signs) guest ids and return to guest
-        host_sign_guest_ids = guest_pubkey_ids.map(lambda k, v: (k, self.sign_id(k,
-                                                                                 self.d,
-                                                                                 self.n,
-                                                                                 self.p,
-                                                                                 self.q,
-                                                                                 self.cp,
-                                                                                 self.cq)))
+        host_sign_guest_ids = self.sign_ids(guest_pubkey_ids, self.d, self.n, self.p, self.q, self.cp, self.cq)
         self.transfer_variable.host_sign_guest_ids.remote(host_sign_guest_ids,
                                                           role=consts.GUEST,
                                                           idx=0)
@@ -343,3 +321,59 @@ class RsaIntersectionHost(RsaIntersect):
             LOGGER.info("Get intersect ids from Guest")
 
         return intersect_ids
+
+    def incremental_cache_calculation_process(self, data_instances, cache_data):
+        LOGGER.info("RSA intersect using incremental cache.")
+        # table(hash(sid)^d, sid)
+        cache = self.extract_cache_list(cache_data, self.guest_party_id)[0]
+        added_ids, removed_ids = self.split_id_delta(data_instances, cache.map(lambda k, v: (v, k)))
+        LOGGER.info(f"{added_ids.count()} ids added & {removed_ids.count()} ids removed since cache generated")
+
+        # only hash & sign added ids
+        added_prvkey_ids_pair = self.cal_prvkey_ids_process_pair(added_ids,
+                                                                 self.d,
+                                                                 self.n,
+                                                                 self.p,
+                                                                 self.q,
+                                                                 self.cp,
+                                                                 self.cq,
+                                                                 self.first_hash_operator)
+        removed_prvkey_ids = removed_ids.map(lambda k, v: (v, None))
+
+        cache_id = str(uuid.uuid4())
+        self.cache_transfer_variable.remote(cache_id, role=consts.GUEST, idx=0)
+        LOGGER.info("remote new cache_id to guest")
+        self.transfer_variable.host_prvkey_ids.remote(added_prvkey_ids_pair.mapValues(lambda v: None),
+                                                      role=consts.GUEST,
+                                                      idx=0)
+        self.transfer_variable.host_removed_prvkey_ids.remote(removed_prvkey_ids,
+                                                              role=consts.GUEST,
+                                                              idx=0)
+        LOGGER.info("Remote added & removed host_ids_process to Guest.")
+        cache = self.merge_id_delta(cache, added_prvkey_ids_pair, removed_prvkey_ids)
+
+        # Recv guest ids added since cache generated
+        guest_pubkey_ids = self.transfer_variable.guest_pubkey_ids.get(idx=0)
+        LOGGER.info("Get guest_pubkey_ids from guest")
+
+        # Process(signs) guest ids and return to guest
+        host_sign_guest_ids = self.sign_ids(guest_pubkey_ids, self.d, self.n, self.p, self.q, self.cp, self.cq)
+        self.transfer_variable.host_sign_guest_ids.remote(host_sign_guest_ids,
+                                                          role=consts.GUEST,
+                                                          idx=0)
+        LOGGER.info("Remote host_sign_guest_ids_process to Guest.")
+
+        # recv intersect ids
+        intersect_ids = None
+        if self.sync_intersect_ids:
+            encrypt_intersect_ids = self.transfer_variable.intersect_ids.get(idx=0)
+            intersect_ids_pair = encrypt_intersect_ids.join(cache, lambda e, h: h)
+            intersect_ids = intersect_ids_pair.map(lambda k, v: (v, None))
+            LOGGER.info("Get intersect ids from Guest")
+
+        cache_meta = {self.guest_party_id: {"cache_id": cache_id,
+                                            "intersect_meta": self.get_intersect_method_meta(),
+                                            "intersect_key": self.get_intersect_key()}}
+        self.cache_output = {self.guest_party_id: cache}, cache_meta
+
+        return intersect_ids
@@ -0,0 +1,71 @@
+#
+#  Copyright 2021 The FATE Authors. All Rights Reserved.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import unittest
+
+import numpy as np
+
+from federatedml.secureprotol.hash.hash_factory import Hash
+from federatedml.statistic.intersect.intersect_preprocess import BitArray
+
+
+class TestBitArray(unittest.TestCase):
+    def setUp(self):
+        self.ids = [str(i) for i in range(2000)]
+        self.bit_count, self.hash_func_count = BitArray.get_filter_param(1000, 0.01)
+
+    def _ind_set(self, filter, x):
+        hash_encoder = Hash(filter.hash_method, False)
+        return set(int(hash_encoder.compute(x, suffix_salt=filter.salt[i]), 16) % filter.bit_count
+                   for i in range(filter.hash_func_count))
+
+    def test_hash_batch(self):
+        hash_operator = Hash("sha256", False)
+        self.assertListEqual(hash_operator.compute_batch(self.ids, prefix_salt="a", suffix_salt="b"),
+                             [hash_operator.compute(x, prefix_salt="a", suffix_salt="b") for x in self.ids])
+        digests = hash_operator.compute_digest_batch(self.ids[:10], suffix_salt=["1", "2"])
+        self.assertEqual(digests.shape, (2, 10, 32))
+        self.assertEqual(bytes(digests[1, 3]).hex(), hash_operator.compute(self.ids[3], suffix_salt="2"))
+
+    def test_ind_array(self):
+        for hash_method in ["md5", "sha256", "sha512"]:
+            filter = BitArray(self.bit_count, self.hash_func_count, hash_method, random_state=7)
+            ind_array = filter.get_ind_array(self.ids[:100])
+            for x, inds in zip(self.ids, ind_array):
+                self.assertSetEqual(set(inds.tolist()), self._ind_set(filter, x))
+                self.assertSetEqual(filter.get_ind_set(x), self._ind_set(filter, x))
+
+    def test_insert_check(self):
+        filter = BitArray(self.bit_count, self.hash_func_count, "sha256", random_state=7)
+        filter.insert_batch(self.ids[:1000])
+        expect = np.zeros(filter.get_array().shape, dtype=np.uint64)
+        for x in self.ids[:1000]:
+            for ind in self._ind_set(filter, x):
+                expect[ind >> 6] |= np.uint64(1 << (ind & 63))
+        self.assertTrue(np.array_equal(filter.get_array(), expect))
+
+        set_bit_count = sum(bin(int(v)).count('1') for v in expect)
+        self.assertAlmostEqual(filter.sparsity, 1 - set_bit_count / filter.bit_count)
+
+        check_rs = filter.check_batch(self.ids)
+        self.assertTrue(check_rs[:1000].all())
+        self.assertLess(check_rs[1000:].mean(), 0.05)
+        self.assertTrue(filter.check(self.ids[0]))
+        self.assertTrue(filter.check_ind_set(self._ind_set(filter, self.ids[0])))
+
+
+if __name__ == "__main__":
+    unittest.main()
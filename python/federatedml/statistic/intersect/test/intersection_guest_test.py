@@ -17,8 +17,11 @@
 import unittest
 import uuid
 
+import gmpy2
+
 from fate_arch.session import computing_session as session
 from federatedml.param.intersect_param import IntersectParam
+from federatedml.secureprotol import gmpy_math
 from federatedml.secureprotol.hash.hash_factory import Hash
 
 
@@ -54,6 +57,37 @@ class TestRsaIntersectGuest(unittest.TestCase):
         res = str(self.rsa_op2.hash("1", hash_operator))
         self.assertEqual(res, "6b86b273ff34fce19d6b804eff5a3f5747ada4eaa22f1d49c01e52ddb7875b4b")
 
+    def test_pubkey_prvkey_id_process(self):
+        self.rsa_op2.powmod_thread_num = 2
+        e, d, n, p, q = self.rsa_op2.generate_rsa_key()
+        cp, cq = gmpy_math.crt_coefficient(p, q)
+        ids = [str(i) for i in range(50)]
+        table = self.data_to_table([(sid, None) for sid in ids])
+        gt = self.rsa_op2.cal_prvkey_ids_process_pair(table, d, n, p, q, cp, cq,
+                                                      self.rsa_op2.first_hash_operator)
+        gt = dict((v, k) for k, v in gt.collect())
+        self.assertListEqual(sorted(gt.keys()), sorted(ids))
+
+        for pool_size in [None, 4]:
+            pubkey_ids = self.rsa_op2.pubkey_id_process(table, fraction=None, random_bit=128, rsa_e=e, rsa_n=n,
+                                                        hash_operator=self.rsa_op2.first_hash_operator,
+                                                        blinding_pool_size=pool_size, thread_num=2)
+            signed_ids = dict(self.rsa_op2.sign_ids(pubkey_ids.mapValues(lambda v: None), d, n, p, q, cp, cq).collect())
+            for pubkey_id, (sid, r) in pubkey_ids.collect():
+                unblind_id = int(gmpy2.divm(signed_ids[pubkey_id], r, n))
+                self.assertEqual(self.rsa_op2.hash(unblind_id, self.rsa_op2.final_hash_operator), gt[sid])
+
+    def test_id_delta(self):
+        cache = self.data_to_table([("h" + str(i), str(i)) for i in range(10)])
+        data = self.data_to_table([(str(i), i) for i in range(5, 15)])
+        added, removed = self.rsa_op2.split_id_delta(data, cache.map(lambda k, v: (v, k)))
+        self.assertListEqual(sorted(k for k, _ in added.collect()), [str(i) for i in range(10, 15)])
+        self.assertListEqual(sorted(v for _, v in removed.collect()), ["h" + str(i) for i in range(5)])
+
+        added_cache = added.map(lambda k, v: ("h" + k, k))
+        new_cache = self.rsa_op2.merge_id_delta(cache, added_cache, removed.map(lambda k, v: (v, None)))
+        self.assertListEqual(sorted(new_cache.collect()), sorted(("h" + str(i), str(i)) for i in range(5, 15)))
+
     def tearDown(self):
         session.stop()
 
@@ -25,9 +25,9 @@ def map_partition_handle(iterable, feat_num=10, max_bin_num=20, is_sparse=False,
     for k, v in iterable:
         # last bin is for missing value
         if is_sparse:
-            feature_dict = v.features.sparse_vec
+            indices, data = v.features.get_arrays()
             arr = np.zeros(feat_num, dtype=np.int64) + max_bin_num - 1  # max_bin_num - 1 is the missing bin val
-            arr[list(feature_dict.keys())] = list(feature_dict.values())
+            arr[indices] = data
         else:
             arr = v.features
             arr[arr == missing_val] = max_bin_num - 1
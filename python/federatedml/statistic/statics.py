@@ -355,10 +355,9 @@ class MissingStatistic(object):
                 else:
                     idx_arr = np.argwhere(~(arr == missing_val)).flatten()
 
-            # in sparse input, missing features have no key in the dict
+            # in sparse input, missing features have no stored index
             else:
-                feature = v.features.sparse_vec  # a dict
-                idx_arr = np.array(list(feature.keys()))
+                idx_arr, _ = v.features.get_arrays()
 
             if len(idx_arr) != 0:
                 count_arr[idx_arr] += 1
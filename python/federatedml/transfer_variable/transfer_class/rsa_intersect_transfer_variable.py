@@ -34,6 +34,8 @@ class RsaIntersectTransferVariable(BaseTransferVariables):
         self.host_pubkey_ids = self._create_variable(name='host_pubkey_ids', src=['host'], dst=['guest'])
 
         self.host_prvkey_ids = self._create_variable(name='host_prvkey_ids', src=['host'], dst=['guest'])
+        self.host_removed_prvkey_ids = self._create_variable(name='host_removed_prvkey_ids', src=['host'],
+                                                             dst=['guest'])
         self.guest_prvkey_ids = self._create_variable(name='guest_prvkey_ids', src=['guest'], dst=['host'])
 
         self.host_sign_guest_ids = self._create_variable(name='host_sign_guest_ids', src=['host'], dst=['guest'])
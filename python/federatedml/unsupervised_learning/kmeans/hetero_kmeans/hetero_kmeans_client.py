@@ -189,7 +189,7 @@ class HeteroKmeansClient(BaseKmeansModel):
         self.aggregator.send_model(NumpyWeights(
             np.array(cluster_dist)), suffix=('predict_cluster_dist', ))
 
-        LOGGER.debug(f"first_data: {data_instances.first()[1].__dict__}")
+        LOGGER.debug(f"first_data: {data_instances.first()[1].features}")
         predict_result = data_instances.join(cluster_result, lambda v1, v2: Instance(
             features=[v1.label, int(v2)], inst_id=v1.inst_id))
         LOGGER.debug(f"predict_data: {predict_result.first()[1].__dict__}")